@@ -291,17 +291,26 @@ def create_export_tarball(course_module, course_key, context, status=None):
     root_dir = path(mkdtemp())
 
     try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
-        else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
-
-        if status:
-            status.set_state(u'Compressing')
-            status.increment_completed_steps()
         LOGGER.debug(u'tar file being generated at %s', export_file.name)
         with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+            # The static assets are added to the tarball directly from the contentstore,
+            # rather than copied to the export directory first.
+            if isinstance(course_key, LibraryLocator):
+                export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name, tar_file=tar_file)
+            else:
+                export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name, tar_file=tar_file)
+
+            if status:
+                status.set_state(u'Compressing')
+                status.increment_completed_steps()
+
+            # The assets override the files of the same name written to the export directory,
+            # as they do when they're written there.
+            asset_names = set(tar_file.getnames())
+            tar_file.add(
+                root_dir / name, arcname=name,
+                filter=lambda tar_info: None if tar_info.name in asset_names else tar_info
+            )
 
     except SerializationError as exc:
         LOGGER.exception(u'There was an error exporting %s', course_key, exc_info=True)
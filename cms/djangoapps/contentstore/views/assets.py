@@ -23,6 +23,7 @@ from ..utils import reverse_course_url
 from contentstore.views.exception import AssetNotFoundException, AssetSizeTooLargeException
 from edxmako.shortcuts import render_to_response
 from openedx.core.djangoapps.contentserver.caching import del_cached_content
+from static_replace import invalidate_static_url_table
 from student.auth import has_course_author_access
 from util.date_utils import get_default_time_display
 from util.json_request import JsonResponse
@@ -544,6 +545,7 @@ def _update_asset(request, course_key, asset_key):
         contentstore().set_attr(asset_key, 'locked', modified_asset['locked'])
         # delete the asset from the cache so we check the lock status the next time it is requested.
         del_cached_content(asset_key)
+        invalidate_static_url_table(course_key)
         return JsonResponse(modified_asset, status=201)
 
 
@@ -781,6 +781,12 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# Directory of the local disk cache of the course assets served by the StaticContentServer
+# middleware which are too large for the cache, or None to disable it. The cache holds at
+# most COURSE_ASSETS_DISK_CACHE_MAX_SIZE bytes, evicting the least recently served assets.
+COURSE_ASSETS_DISK_CACHE_DIR = None
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
 MODULESTORE_BRANCH = 'draft-preferred'
 
 MODULESTORE = {
@@ -1870,6 +1876,14 @@ CACHES = {
     },
 }
 
+# Maximum total size, in bytes of pickled data, of the course structures kept in
+# memory by each process, in front of the 'course_structure_cache'. 0 disables it.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# Whether the definitions of the blocks in a lazily loaded split modulestore
+# subtree are fetched with a single query as soon as the first one is needed.
+SPLIT_MODULESTORE_PREFETCH_DEFINITIONS = True
+
 ############################ OAUTH2 Provider ###################################
 
 
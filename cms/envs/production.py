@@ -163,6 +163,10 @@ if STATIC_ROOT_BASE:
     WEBPACK_LOADER['DEFAULT']['STATS_FILE'] = STATIC_ROOT / "webpack-stats.json"
     WEBPACK_LOADER['WORKERS']['STATS_FILE'] = STATIC_ROOT / "webpack-worker-stats.json"
 
+# MAKO_MODULE_DIR specifies the directory where the mako templates are compiled,
+# e.g. ahead of time by the compile_mako_templates management command
+MAKO_MODULE_DIR = ENV_TOKENS.get('MAKO_MODULE_DIR', MAKO_MODULE_DIR)
+
 EMAIL_BACKEND = ENV_TOKENS.get('EMAIL_BACKEND', EMAIL_BACKEND)
 EMAIL_FILE_PATH = ENV_TOKENS.get('EMAIL_FILE_PATH', None)
 
@@ -208,6 +212,13 @@ if 'loc_cache' not in CACHES:
 if 'staticfiles' in CACHES:
     CACHES['staticfiles']['KEY_PREFIX'] = EDX_PLATFORM_REVISION
 
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE', COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE
+)
+SPLIT_MODULESTORE_PREFETCH_DEFINITIONS = ENV_TOKENS.get(
+    'SPLIT_MODULESTORE_PREFETCH_DEFINITIONS', SPLIT_MODULESTORE_PREFETCH_DEFINITIONS
+)
+
 # In order to transition from local disk asset storage to S3 backed asset storage,
 # we need to run asset collection twice, once for local disk and once for S3.
 # Once we have migrated to service assets off S3, then we can convert this back to
@@ -425,6 +436,10 @@ XBLOCK_FIELD_DATA_WRAPPERS = ENV_TOKENS.get(
 )
 
 CONTENTSTORE = AUTH_TOKENS['CONTENTSTORE']
+COURSE_ASSETS_DISK_CACHE_DIR = ENV_TOKENS.get('COURSE_ASSETS_DISK_CACHE_DIR', COURSE_ASSETS_DISK_CACHE_DIR)
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_ASSETS_DISK_CACHE_MAX_SIZE', COURSE_ASSETS_DISK_CACHE_MAX_SIZE
+)
 DOC_STORE_CONFIG = AUTH_TOKENS['DOC_STORE_CONFIG']
 
 ############################### BLOCKSTORE #####################################
@@ -178,6 +178,12 @@ CACHES = {
     },
 }
 
+# Don't keep course structures across tests.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = 0
+
+# Keep the modulestore query counts asserted by tests independent of prefetching.
+SPLIT_MODULESTORE_PREFETCH_DEFINITIONS = False
+
 ############################### BLOCKSTORE #####################################
 # Blockstore tests
 RUN_BLOCKSTORE_TESTS = os.environ.get('EDXAPP_RUN_BLOCKSTORE_TESTS', 'no').lower() in ('true', 'yes', '1')
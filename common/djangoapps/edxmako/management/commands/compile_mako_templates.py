@@ -0,0 +1,78 @@
+"""
+Management command to compile the mako templates ahead of time.
+
+The templates of every lookup namespace, including the templates of every
+theme, are compiled to python modules in the MAKO_MODULE_DIR, where mako
+imports them from instead of compiling the templates on their first use.
+It's meant to be run at build time, with the settings the workers use, so
+that the module directories match the template lookup paths of the workers.
+"""
+
+
+import logging
+import os
+
+from django.core.management import BaseCommand
+
+from edxmako import LOOKUP
+from openedx.core.djangoapps.theming.helpers import get_themes
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Compile the mako templates of all the lookup namespaces and themes.
+    """
+
+    help = 'Compile the mako templates of all the lookup namespaces and themes into the MAKO_MODULE_DIR.'
+
+    # Like compile_sass, this allows to compile the templates without database access.
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--extensions',
+            type=str,
+            nargs='+',
+            default=['.html', '.txt'],
+            help="Extensions of the template files to compile.",
+        )
+
+    def handle(self, *args, **options):
+        extensions = tuple(options['extensions'])
+        num_compiled = 0
+        num_failed = 0
+        for namespace, lookup in LOOKUP.items():
+            for uri in template_uris(lookup, extensions):
+                try:
+                    lookup.get_template(uri)
+                    num_compiled += 1
+                except Exception:  # pylint: disable=broad-except
+                    log.warning(u'Could not compile the %s template %s', namespace, uri, exc_info=True)
+                    num_failed += 1
+
+        self.stdout.write(u'Compiled {} templates, {} failed.'.format(num_compiled, num_failed))
+
+
+def template_uris(lookup, extensions):
+    """
+    Yields the uris of the template files of the given lookup, with the given
+    extensions.  The templates of the themes are yielded with the uris they
+    are looked up with, e.g. `red-theme/lms/templates/header.html`.
+    """
+    theme_template_dirs = {}
+    for theme in get_themes():
+        themes_base_dir = os.path.normpath(str(theme.themes_base_dir))
+        theme_template_dirs.setdefault(themes_base_dir, []).append(
+            (str(theme.path / 'templates'), str(theme.template_path))
+        )
+
+    for directory in lookup.directories:
+        # Only the templates of the themes are looked up in the directories containing the themes.
+        for template_dir, uri_prefix in theme_template_dirs.get(directory, [(directory, '')]):
+            for dirpath, __, filenames in os.walk(template_dir):
+                for filename in filenames:
+                    if filename.endswith(extensions):
+                        relative_path = os.path.relpath(os.path.join(dirpath, filename), template_dir)
+                        yield os.path.join(uri_prefix, relative_path)
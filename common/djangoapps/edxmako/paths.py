@@ -13,6 +13,7 @@ from django.conf import settings
 from mako.exceptions import TopLevelLookupException
 from mako.lookup import TemplateLookup
 
+from openedx.core.djangoapps.theming import helpers as theming_helpers
 from openedx.core.djangoapps.theming.helpers import get_template_path_with_theme, strip_site_theme_templates_path
 from openedx.core.lib.cache_utils import request_cached
 
@@ -36,6 +37,8 @@ class DynamicTemplateLookup(TemplateLookup):
     def __init__(self, *args, **kwargs):
         super(DynamicTemplateLookup, self).__init__(*args, **kwargs)
         self.__original_module_directory = self.template_args['module_directory']
+        # The templates found by get_template, keyed by (theme, uri).
+        self._resolved_templates = {}
 
     def __repr__(self):
         return "<{0.__class__.__name__} {0.directories}>".format(self)
@@ -57,9 +60,13 @@ class DynamicTemplateLookup(TemplateLookup):
         unique = hashlib.md5(six.b(":".join(str(d) for d in self.directories))).hexdigest()
         self.template_args['module_directory'] = os.path.join(self.__original_module_directory, unique)
 
-        # Also clear the internal caches. Ick.
-        self._collection.clear()
-        self._uri_cache.clear()
+        # A template found before a directory is appended is still the one
+        # that would be found, but a prepended directory can override it, so
+        # also clear the internal caches in that case. Ick.
+        if prepend:
+            self._collection.clear()
+            self._uri_cache.clear()
+            self._resolved_templates.clear()
 
     def adjust_uri(self, uri, relativeto):
         """
@@ -93,7 +100,15 @@ class DynamicTemplateLookup(TemplateLookup):
 
         If still unable to find a template, it will fallback to the default template directories after stripping off
         the prefix path to theme.
+
+        The templates found are kept for the life of the process, except in
+        DEBUG mode where mako checks whether they have been modified.
         """
+        key = (self._get_current_theme_dir_name(), isinstance(uri, TopLevelTemplateURI), uri)
+        template = self._resolved_templates.get(key)
+        if template is not None:
+            return template
+
         if isinstance(uri, TopLevelTemplateURI):
             template = self._get_toplevel_template(uri)
         else:
@@ -103,8 +118,20 @@ class DynamicTemplateLookup(TemplateLookup):
             except TopLevelLookupException:
                 template = self._get_toplevel_template(uri)
 
+        if not settings.DEBUG:
+            self._resolved_templates[key] = template
         return template
 
+    @staticmethod
+    def _get_current_theme_dir_name():
+        """
+        Returns the directory name of the theme of the current site, or None.
+        """
+        if not theming_helpers.is_comprehensive_theming_enabled():
+            return None
+        site_theme = theming_helpers.get_current_site_theme()
+        return site_theme.theme_dir_name if site_theme else None
+
     def _get_toplevel_template(self, uri):
         """
         Lookup a default/toplevel template, ignoring current theme.
@@ -1,9 +1,13 @@
 
 
+import os
+import shutil
+import tempfile
 import unittest
 
 import ddt
 from django.conf import settings
+from django.core.management import call_command
 from django.http import HttpResponse
 from django.test import TestCase
 from django.test.client import RequestFactory
@@ -12,7 +16,10 @@ from django.urls import reverse
 from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
 
+from mako.exceptions import TemplateLookupException
+
 from edxmako import LOOKUP, add_lookup
+from edxmako.paths import DynamicTemplateLookup
 from edxmako.request_context import get_template_request_context
 from edxmako.shortcuts import is_any_marketing_link_set, is_marketing_link_set, marketing_link, render_to_string
 from student.tests.factories import UserFactory
@@ -111,6 +118,49 @@ class AddLookupTests(TestCase):
         self.assertTrue(dirs[0].endswith('management'))
 
 
+class DynamicTemplateLookupTests(TestCase):
+    """
+    Test the `DynamicTemplateLookup` class.
+    """
+    def setUp(self):
+        super(DynamicTemplateLookupTests, self).setUp()
+        self.templates_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.templates_dir)
+        with open(os.path.join(self.templates_dir, 'test.html'), 'w') as template_file:
+            template_file.write('Test template')
+
+        self.lookup = DynamicTemplateLookup(module_directory=os.path.join(self.templates_dir, 'modules'))
+        self.lookup.add_directory(self.templates_dir)
+
+    def test_resolved_templates(self):
+        template = self.lookup.get_template('test.html')
+        self.assertEqual(template.render(), 'Test template')
+
+        # The template found is kept, even when a directory is appended.
+        os.remove(os.path.join(self.templates_dir, 'test.html'))
+        self.lookup.add_directory(tempfile.gettempdir())
+        self.assertIs(self.lookup.get_template('test.html'), template)
+
+        # Prepending a directory might override the template.
+        self.lookup.add_directory(tempfile.gettempdir(), prepend=True)
+        with self.assertRaises(TemplateLookupException):
+            self.lookup.get_template('test.html')
+
+    @override_settings(DEBUG=True)
+    def test_resolved_templates_debug(self):
+        self.lookup.get_template('test.html')
+        os.remove(os.path.join(self.templates_dir, 'test.html'))
+        with self.assertRaises(TemplateLookupException):
+            self.lookup.get_template('test.html')
+
+    def test_compile_mako_templates(self):
+        with patch.dict('edxmako.LOOKUP', {'test': self.lookup}, clear=True):
+            call_command('compile_mako_templates')
+        self.assertTrue(os.path.exists(
+            os.path.join(self.lookup.template_args['module_directory'], 'test.html.py')
+        ))
+
+
 class MakoRequestContextTest(TestCase):
     """
     Test MakoMiddleware.
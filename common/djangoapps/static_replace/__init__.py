@@ -1,21 +1,34 @@
 
 
+import hashlib
 import logging
 import re
+from uuid import uuid4
+
 import six
 from six import text_type
 
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.contrib.staticfiles import finders
 from django.conf import settings
+from django.core.cache import cache
+from django.dispatch import receiver
+from edx_django_utils.cache import RequestCache
 
 from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.django import COURSE_ASSETS_CHANGED
 
 from opaque_keys.edx.locator import AssetLocator
 
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock'
 
+# Timeout, in seconds, of the cached tables of the resolved static urls of courses.
+STATIC_URL_TABLE_TIMEOUT = 60 * 60
+
+# Namespace of the request cache of the StaticUrlTables used during the request.
+STATIC_URL_TABLES_NAMESPACE = 'static_replace.url_tables'
+
 
 def _url_replace_regex(prefix):
     """
@@ -97,21 +110,65 @@ def replace_course_urls(text, course_key):
     return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
 
 
-def process_static_urls(text, replacement_function, data_dir=None):
+def replace_urls(text, course_id, jump_to_id_base_url, data_directory=None, static_asset_path=''):
     """
-    Run an arbitrary replacement function on any urls matching the static file
-    directory
+    Replace the /static/, /course/ and /jump_to_id/ urls in the text in a single pass,
+    as replace_static_urls, replace_course_urls and replace_jump_to_id_urls do.
+
+    text: The source text to do the substitution in
+    course_id: The course identifier
+    jump_to_id_base_url: The base of the jump_to_id urls, see replace_jump_to_id_urls
+    data_directory: The directory in which course data is stored
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+
+    output: <text> after the link rewriting rules are applied
     """
-    def wrap_part_extraction(match):
+    course_url_base = u'/courses/{}/'.format(text_type(course_id))
+    replace_static_url = _StaticUrlReplacer(data_directory, course_id, static_asset_path, [])
+    other_prefixes = ('/course/', '/jump_to_id/')
+
+    def prefetch_static_urls(matched_urls):
         """
-        Unwraps a match group for the captures specified in _url_replace_regex
-        and forward them on as function arguments
+        Prefetches the resolved urls of the matched static urls.
         """
-        original = match.group(0)
-        prefix = match.group('prefix')
-        quote = match.group('quote')
-        rest = match.group('rest')
+        replace_static_url.prefetch([
+            (prefix, rest) for prefix, rest in matched_urls if prefix not in other_prefixes
+        ])
+
+    def replace_url(original, prefix, quote, rest):
+        """
+        Replace a single matched url, according to its prefix.
+        """
+        if prefix == '/course/':
+            return "".join([quote, course_url_base, rest, quote])
+        elif prefix == '/jump_to_id/':
+            return "".join([quote, jump_to_id_base_url + rest, quote])
+        return replace_static_url(original, prefix, quote, rest)
+
+    text = process_static_urls(
+        text,
+        replace_url,
+        data_dir=static_asset_path or data_directory,
+        other_prefixes=other_prefixes,
+        prefetch_function=prefetch_static_urls,
+    )
+    replace_static_url.save()
+    return text
+
 
+def process_static_urls(text, replacement_function, data_dir=None, other_prefixes=(), prefetch_function=None):
+    """
+    Run an arbitrary replacement function on any urls matching the static file
+    directory, or any of the other given prefixes
+
+    If given, prefetch_function is first called with the (prefix, rest) pairs
+    of all the urls to be replaced, so that it can read what the replacements
+    need at once.
+    """
+    def should_replace(prefix, rest):
+        """
+        Returns whether the matched url should be replaced.
+        """
         # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
         # works for actual static assets and for magical course asset URLs....
         full_url = prefix + rest
@@ -119,19 +176,48 @@ def process_static_urls(text, replacement_function, data_dir=None):
         starts_with_static_url = full_url.startswith(six.text_type(settings.STATIC_URL))
         starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
         contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        return not (starts_with_prefix or (starts_with_static_url and contains_prefix))
+
+    def wrap_part_extraction(match):
+        """
+        Unwraps a match group for the captures specified in _url_replace_regex
+        and forward them on as function arguments
+        """
+        original = match.group(0)
+        prefix = match.group('prefix')
+        quote = match.group('quote')
+        rest = match.group('rest')
+        if not should_replace(prefix, rest):
             return original
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
+    prefix_regex = u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
     )
+    if other_prefixes:
+        prefix_regex = u'|'.join([prefix_regex] + [re.escape(prefix) for prefix in other_prefixes])
+    url_regex = re.compile(_url_replace_regex(prefix_regex))
+
+    if prefetch_function is None:
+        return url_regex.sub(wrap_part_extraction, text)
+
+    # Find the urls in a single pass, and replace the matches found once prefetched.
+    matches = list(url_regex.finditer(text))
+    prefetch_function([
+        (match.group('prefix'), match.group('rest'))
+        for match in matches
+        if should_replace(match.group('prefix'), match.group('rest'))
+    ])
+    parts = []
+    end = 0
+    for match in matches:
+        parts.append(text[end:match.start()])
+        parts.append(wrap_part_extraction(match))
+        end = match.end()
+    parts.append(text[end:])
+    return ''.join(parts)
 
 
 def make_static_urls_absolute(request, html):
@@ -170,23 +256,74 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     if static_paths_out is None:
         static_paths_out = []
 
-    def replace_static_url(original, prefix, quote, rest):
+    replace_static_url = _StaticUrlReplacer(data_directory, course_id, static_asset_path, static_paths_out)
+    text = process_static_urls(
+        text,
+        replace_static_url,
+        data_dir=static_asset_path or data_directory,
+        prefetch_function=replace_static_url.prefetch,
+    )
+    replace_static_url.save()
+    return text
+
+
+class _StaticUrlReplacer(object):
+    """
+    Replacement function of static urls for process_static_urls, see
+    replace_static_urls.
+
+    When a course_id is given, the urls to which the static urls are
+    resolved are memoized in the course's StaticUrlTable, which must be
+    saved once the replacements are done.
+    """
+    def __init__(self, data_directory, course_id, static_asset_path, static_paths_out):
+        self.data_directory = data_directory
+        self.course_id = course_id
+        self.static_asset_path = static_asset_path
+        self.static_paths_out = static_paths_out
+        self.url_table = get_static_url_table(
+            course_id, static_asset_path or data_directory, in_contentstore=not static_asset_path,
+        ) if course_id else None
+
+    def prefetch(self, matched_urls):
+        """
+        Reads the memoized urls of all the given (prefix, rest) matched urls at once.
+        """
+        if self.url_table is not None:
+            self.url_table.prefetch([
+                "".join([prefix, rest]) for prefix, rest in matched_urls if not rest.endswith('?raw')
+            ])
+
+    def __call__(self, original, prefix, quote, rest):
         """
         Replace a single matched url.
         """
         original_uri = "".join([prefix, rest])
         # Don't mess with things that end in '?raw'
         if rest.endswith('?raw'):
-            static_paths_out.append((original_uri, original_uri))
+            self.static_paths_out.append((original_uri, original_uri))
             return original
 
         # In debug mode, if we can find the url as is,
         if settings.DEBUG and finders.find(rest, True):
-            static_paths_out.append((original_uri, original_uri))
+            self.static_paths_out.append((original_uri, original_uri))
             return original
 
+        url = self.url_table.get(original_uri) if self.url_table is not None else None
+        if url is None:
+            url = self._resolve_url(prefix, rest)
+            if self.url_table is not None:
+                self.url_table.add(original_uri, url)
+
+        self.static_paths_out.append((original_uri, url))
+        return "".join([quote, url, quote])
+
+    def _resolve_url(self, prefix, rest):
+        """
+        Returns the url to which the matched url is resolved.
+        """
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id:
+        if (not self.static_asset_path) and self.course_id:
             # first look in the static file pipeline and see if we are trying to reference
             # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
@@ -206,14 +343,14 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
                 from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
                 base_url = AssetBaseUrlConfig.get_base_url()
                 excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+                url = StaticContent.get_canonicalized_asset_path(self.course_id, rest, base_url, excluded_exts)
 
                 if AssetLocator.CANONICAL_NAMESPACE in url:
                     url = url.replace('block@', 'block/', 1)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
+            course_path = "/".join((self.static_asset_path or self.data_directory, rest))
 
             try:
                 if staticfiles_storage.exists(rest):
@@ -226,7 +363,152 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
                     rest, str(err)))
                 url = "".join([prefix, course_path])
 
-        static_paths_out.append((original_uri, url))
-        return "".join([quote, url, quote])
+        return url
+
+    def save(self):
+        """
+        Saves the urls resolved by the replacements, if memoized.
+        """
+        if self.url_table is not None:
+            self.url_table.save()
+
+
+class StaticUrlTable(object):
+    """
+    Table of the urls to which the static urls of a course are resolved,
+    kept in the cache so that they aren't resolved again, with lookups in the
+    staticfiles storage and the contentstore, on each rendering of the
+    course's content.
+
+    Each url is cached under its own key, which includes the current
+    generation of the course's static urls, the platform revision, whose
+    collected static files have their own hashed names, and the asset url
+    configuration.  The generation is started anew by
+    invalidate_static_url_table whenever the assets of the course change.
+
+    The tables are kept for the rest of the request, see get_static_url_table,
+    so the version of a table, and each of its urls, are only read from the
+    cache once per request.
+    """
+    def __init__(self, course_id, data_directory, in_contentstore):
+        """
+        Arguments:
+            course_id (CourseKey) - The course whose static urls are resolved.
+            data_directory (str) - The static asset path or data directory of the course.
+            in_contentstore (bool) - Whether the urls are resolved in the
+                contentstore, with the asset url configuration.
+        """
+        self.course_id = course_id
+        self.data_directory = data_directory
+        self.in_contentstore = in_contentstore
+        self._key_prefix = None
+        self._urls = {}
+        self._new_urls = {}
+        # The static urls whose resolved urls were read from the cache.
+        self._prefetched = set()
+
+    def prefetch(self, static_urls):
+        """
+        Reads the resolved urls of the given static urls from the cache, at once.
+        """
+        static_urls_by_key = {
+            self._cache_key(static_url): static_url
+            for static_url in set(static_urls) - self._prefetched
+        }
+        self._prefetched.update(static_urls)
+        if static_urls_by_key:
+            for key, url in six.iteritems(cache.get_many(list(static_urls_by_key))):
+                self._urls[static_urls_by_key[key]] = url
+
+    def get(self, static_url):
+        """
+        Returns the url to which the given static url was resolved, or None.
+        """
+        if static_url not in self._prefetched:
+            self.prefetch([static_url])
+        return self._urls.get(static_url)
+
+    def add(self, static_url, url):
+        """
+        Adds the url to which the given static url is resolved.
+        """
+        self._urls[static_url] = url
+        self._new_urls[self._cache_key(static_url)] = url
+
+    def save(self):
+        """
+        Caches the urls added to the table, if any.
+        """
+        if self._new_urls:
+            cache.set_many(self._new_urls, timeout=STATIC_URL_TABLE_TIMEOUT)
+            self._new_urls = {}
+
+    def _cache_key(self, static_url):
+        """
+        Returns the cache key of the url to which the given static url is resolved.
+        """
+        if self._key_prefix is None:
+            self._key_prefix = u'static_replace.url.{}'.format(
+                hashlib.md5(self._table_version().encode('utf-8')).hexdigest()
+            )
+        return u'{}.{}'.format(self._key_prefix, hashlib.md5(static_url.encode('utf-8')).hexdigest())
+
+    def _table_version(self):
+        """
+        Returns the version of the table, which changes whenever the urls to
+        which the static urls are resolved may change.
+        """
+        generation = cache.get(_static_url_generation_cache_key(self.course_id))
+        if generation is None:
+            generation = uuid4().hex
+            cache.set(_static_url_generation_cache_key(self.course_id), generation, timeout=STATIC_URL_TABLE_TIMEOUT)
+        version = [
+            text_type(self.course_id),
+            self.data_directory or u'',
+            generation,
+            getattr(settings, 'EDX_PLATFORM_REVISION', u''),
+        ]
+        if self.in_contentstore:
+            # Import is placed here to avoid model import at project startup.
+            from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+            version.append(AssetBaseUrlConfig.get_base_url())
+            version.append(u','.join(AssetExcludedExtensionsConfig.get_excluded_extensions()))
+        return u'|'.join(version)
+
+
+def get_static_url_table(course_id, data_directory, in_contentstore):
+    """
+    Returns the StaticUrlTable of the given course, data directory and
+    resolution, which is kept for the rest of the request.
+    """
+    url_tables = RequestCache(STATIC_URL_TABLES_NAMESPACE).data
+    table_key = (text_type(course_id), data_directory, in_contentstore)
+    url_table = url_tables.get(table_key)
+    if url_table is None:
+        url_table = url_tables[table_key] = StaticUrlTable(course_id, data_directory, in_contentstore)
+    return url_table
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+def invalidate_static_url_table(course_id):
+    """
+    Invalidates the resolved static urls of the given course, so that they
+    are resolved again with the course's current assets.
+    """
+    cache.delete(_static_url_generation_cache_key(course_id))
+    RequestCache(STATIC_URL_TABLES_NAMESPACE).clear()
+
+
+@receiver(COURSE_ASSETS_CHANGED)
+def _handle_course_assets_changed(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the resolved static urls of a course whenever its assets are
+    saved or deleted in the contentstore.
+    """
+    invalidate_static_url_table(course_key)
+
+
+def _static_url_generation_cache_key(course_id):
+    """
+    Returns the cache key of the current generation of the static urls of the given course.
+    """
+    return u'static_replace.urls.generation.{}'.format(course_id)
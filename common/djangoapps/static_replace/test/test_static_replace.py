@@ -8,22 +8,26 @@ from six.moves.urllib.parse import parse_qsl, urlparse, urlunparse
 
 import ddt
 import pytest
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import override_settings
 from django.utils.http import urlencode, urlquote
+from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
 from opaque_keys.edx.keys import CourseKey
 from PIL import Image
 
 from static_replace import (
     _url_replace_regex,
+    invalidate_static_url_table,
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
-    replace_static_urls
+    replace_static_urls,
+    replace_urls
 )
 from xmodule.assetstore.assetmgr import AssetManager
 from xmodule.contentstore.content import StaticContent
-from xmodule.contentstore.django import contentstore
+from xmodule.contentstore.django import COURSE_ASSETS_CHANGED, contentstore
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -37,6 +41,14 @@ COURSE_KEY = CourseKey.from_string('org/course/run')
 STATIC_SOURCE = '"/static/file.png"'
 
 
+@pytest.fixture(autouse=True)
+def clear_request_cache():
+    """
+    Starts each test with empty request caches, as a new request does.
+    """
+    RequestCache.clear_all_namespaces()
+
+
 def encode_unicode_characters_in_url(url):
     """
     Encodes all Unicode characters to their percent-encoding representation
@@ -132,6 +144,106 @@ def test_mongo_filestore(mock_get_excluded_extensions, mock_get_base_url, mock_m
     mock_static_content.get_canonicalized_asset_path.assert_called_once_with(COURSE_KEY, 'file.png', u'', ['foobar'])
 
 
+@patch('static_replace.cache', LocMemCache('static_replace', {}))
+@patch('static_replace.StaticContent', autospec=True)
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.models.AssetBaseUrlConfig.get_base_url', Mock(return_value=u''))
+@patch('static_replace.models.AssetExcludedExtensionsConfig.get_excluded_extensions', Mock(return_value=[]))
+def test_static_url_table(mock_storage, mock_static_content):
+    mock_storage.exists.return_value = False
+    mock_static_content.get_canonicalized_asset_path.return_value = '/asset-v1:org+course+run+type@asset+block/file.png'
+    expected = '"' + mock_static_content.get_canonicalized_asset_path.return_value + '"'
+
+    # the resolved urls are memoized for the course
+    assert replace_static_urls(STATIC_SOURCE, course_id=COURSE_KEY) == expected
+    assert replace_static_urls(STATIC_SOURCE, course_id=COURSE_KEY) == expected
+    static_paths = []
+    assert replace_static_urls(STATIC_SOURCE, course_id=COURSE_KEY, static_paths_out=static_paths) == expected
+    assert static_paths == [('/static/file.png', expected.strip('"'))]
+    mock_storage.exists.assert_called_once_with('file.png')
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 1
+
+    # and resolved again once invalidated
+    invalidate_static_url_table(COURSE_KEY)
+    assert replace_static_urls(STATIC_SOURCE, course_id=COURSE_KEY) == expected
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 2
+
+    # or once the assets of the course change in the contentstore
+    COURSE_ASSETS_CHANGED.send(sender=None, course_key=COURSE_KEY)
+    assert replace_static_urls(STATIC_SOURCE, course_id=COURSE_KEY) == expected
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 3
+
+    # or once the platform is deployed with new static files, on the next request
+    RequestCache.clear_all_namespaces()
+    with override_settings(EDX_PLATFORM_REVISION='new-revision'):
+        assert replace_static_urls(STATIC_SOURCE, course_id=COURSE_KEY) == expected
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 4
+
+
+@patch('static_replace.cache', LocMemCache('static_replace', {}))
+@patch('static_replace.StaticContent', autospec=True)
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.models.AssetBaseUrlConfig.get_base_url')
+@patch('static_replace.models.AssetExcludedExtensionsConfig.get_excluded_extensions', Mock(return_value=[]))
+def test_static_url_table_config(mock_get_base_url, mock_storage, mock_static_content):
+    mock_get_base_url.return_value = u''
+    mock_storage.exists.return_value = False
+    mock_static_content.get_canonicalized_asset_path.side_effect = (
+        lambda course_key, path, base_url, excluded_exts: u'{}/asset/{}'.format(base_url, path)
+    )
+    text = '"/static/file.png" "/static/other.png"'
+
+    assert replace_static_urls(text, course_id=COURSE_KEY) == '"/asset/file.png" "/asset/other.png"'
+    RequestCache.clear_all_namespaces()
+    assert replace_static_urls(text, course_id=COURSE_KEY) == '"/asset/file.png" "/asset/other.png"'
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 2
+
+    # the urls are resolved again with the new asset url configuration, on the next request
+    mock_get_base_url.return_value = u'//cdn'
+    RequestCache.clear_all_namespaces()
+    assert replace_static_urls(text, course_id=COURSE_KEY) == '"//cdn/asset/file.png" "//cdn/asset/other.png"'
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 4
+
+
+@patch('static_replace.cache')
+@patch('static_replace.StaticContent', autospec=True)
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.models.AssetBaseUrlConfig.get_base_url', Mock(return_value=u''))
+@patch('static_replace.models.AssetExcludedExtensionsConfig.get_excluded_extensions', Mock(return_value=[]))
+def test_static_url_table_request_cache(mock_storage, mock_static_content, mock_cache):
+    mock_cache.get.return_value = 'generation'
+    mock_cache.get_many.return_value = {}
+    mock_storage.exists.return_value = False
+    mock_static_content.get_canonicalized_asset_path.side_effect = (
+        lambda course_key, path, base_url, excluded_exts: u'/asset/{}'.format(path)
+    )
+
+    # the table of the course is read once per request, and each url looked up once
+    for __ in range(2):
+        assert replace_static_urls('"/static/file.png" "/static/file.png"', course_id=COURSE_KEY) == (
+            '"/asset/file.png" "/asset/file.png"'
+        )
+    assert replace_static_urls('"/static/file.png" "/static/other.png"', course_id=COURSE_KEY) == (
+        '"/asset/file.png" "/asset/other.png"'
+    )
+    assert mock_cache.get.call_count == 1
+    assert mock_cache.get_many.call_count == 2
+    assert mock_cache.set_many.call_count == 2
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 2
+
+
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_replace_urls(mock_storage):
+    mock_storage.exists.return_value = False
+    mock_storage.url.return_value = '/static/data_dir/file.png'
+    text = '<a href="/course/id"><a href="/jump_to_id/id"><img src="/static/file.png"><a href="/other/id">'
+
+    assert replace_urls(text, COURSE_KEY, '/courses/org/course/run/jump_to_id/', DATA_DIRECTORY, 'data_dir') == (
+        '<a href="/courses/org/course/run/id"><a href="/courses/org/course/run/jump_to_id/id">'
+        '<img src="/static/data_dir/file.png"><a href="/other/id">'
+    )
+
+
 @patch('static_replace.settings', autospec=True)
 @patch('xmodule.modulestore.django.modulestore', autospec=True)
 @patch('static_replace.staticfiles_storage', autospec=True)
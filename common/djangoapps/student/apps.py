@@ -26,6 +26,9 @@ class StudentConfig(AppConfig):
         from .signals.receivers import on_user_updated
         pre_save.connect(on_user_updated, sender=User)
 
+        # Connect the receivers keeping the dashboard snapshots up to date.
+        from . import dashboard_snapshot  # pylint: disable=unused-import
+
         # The django-simple-history model on CourseEnrollment creates performance
         # problems in testing, we mock it here so that the mock impacts all tests.
         if os.environ.get('DISABLE_COURSEENROLLMENT_HISTORY', False):
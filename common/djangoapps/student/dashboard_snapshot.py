@@ -0,0 +1,182 @@
+"""
+Per-user snapshot of the data shown for each course on the student dashboard.
+
+Computing the certificate, credit and verification statuses of every enrolled
+course on each load of the dashboard is slow for users with many enrollments.
+The snapshot is a document stored in the cache with a section for each kind of
+status, holding the statuses computed so far by course key.  The statuses of
+the courses a user enrolls in are added to the snapshot on the next load of
+the dashboard.
+
+The cache key of the snapshot includes a generation of the user, which is
+started anew whenever an enrollment, certificate, verification or credit
+status of the user changes or is deleted, so that the snapshot is computed
+again on the next load.  Since a snapshot computed before the change is set
+under the key of the previous generation, it is never read again.  The new
+generation is only started once the change is committed, so that a snapshot
+computed from the data of before the commit isn't kept for it.
+
+The certificate and verification statuses also depend on the current time,
+e.g. on certificate availability dates and verification deadlines, and
+changes to courses and configuration are not signaled, so the key also
+includes the current period of STUDENT_DASHBOARD_SNAPSHOT_TIMEOUT seconds,
+and the snapshots are computed again in each period.
+"""
+
+
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from lms.djangoapps.certificates.models import GeneratedCertificate
+from lms.djangoapps.verify_student.models import ManualVerification, SoftwareSecurePhotoVerification, SSOVerification
+from openedx.core.djangoapps.credit.models import CreditEligibility, CreditRequest
+from student.models import CourseEnrollment, CourseEnrollmentAttribute
+
+CERT_STATUSES = 'cert_statuses'
+CREDIT_STATUSES = 'credit_statuses'
+VERIFICATION_STATUS_BY_COURSE = 'verification_status_by_course'
+
+# Increment this when the structure of the snapshot, or of its statuses, changes.
+SNAPSHOT_VERSION = 1
+
+
+def _snapshot_cache_key(user_id):
+    """
+    Returns the cache key of the snapshot of the user, for the current
+    generation of the user and period.
+    """
+    timeout = _snapshot_timeout()
+    generation_cache_key = _generation_cache_key(user_id)
+    generation = cache.get(generation_cache_key)
+    if generation is None:
+        generation = uuid4().hex
+        cache.set(generation_cache_key, generation, timeout)
+    return u'student.dashboard_snapshot.{}.{}.{}.{}'.format(
+        SNAPSHOT_VERSION, user_id, generation, int(time.time() // timeout)
+    )
+
+
+def _generation_cache_key(user_id):
+    return u'student.dashboard_snapshot.generation.{}'.format(user_id)
+
+
+def _snapshot_timeout():
+    return getattr(settings, 'STUDENT_DASHBOARD_SNAPSHOT_TIMEOUT', 0)
+
+
+def get_dashboard_statuses(user, course_enrollments, status_functions):
+    """
+    Returns the statuses of the given enrollments of the user, from the
+    snapshot of the user, computing only the missing ones.
+
+    Arguments:
+        user (User): the user of the dashboard.
+        course_enrollments (list[CourseEnrollment]): the enrollments shown on
+            the dashboard.
+        status_functions (dict): for each section, a function taking a list of
+            enrollments, and returning a dict of statuses by course key.  The
+            courses without a status in this dict have no status in the section.
+
+    Returns:
+        dict: for each section, a dict of the statuses of the given enrollments
+            by course key.
+    """
+    timeout = _snapshot_timeout()
+    if not timeout:
+        return {
+            section: status_function(course_enrollments)
+            for section, status_function in status_functions.items()
+        }
+
+    cache_key = _snapshot_cache_key(user.id)
+    snapshot = cache.get(cache_key) or {}
+    is_snapshot_updated = False
+    statuses = {}
+    for section, status_function in status_functions.items():
+        section_data = snapshot.setdefault(section, {'course_ids': set(), 'statuses': {}})
+        missing_enrollments = [
+            enrollment for enrollment in course_enrollments
+            if enrollment.course_id not in section_data['course_ids']
+        ]
+        if missing_enrollments:
+            missing_course_ids = {enrollment.course_id for enrollment in missing_enrollments}
+            section_data['course_ids'].update(missing_course_ids)
+            section_data['statuses'].update({
+                course_id: status
+                for course_id, status in status_function(missing_enrollments).items()
+                if course_id in missing_course_ids
+            })
+            is_snapshot_updated = True
+
+        statuses[section] = {
+            enrollment.course_id: section_data['statuses'][enrollment.course_id]
+            for enrollment in course_enrollments
+            if enrollment.course_id in section_data['statuses']
+        }
+
+    if is_snapshot_updated:
+        cache.set(cache_key, snapshot, timeout)
+    return statuses
+
+
+def invalidate_dashboard_snapshot(user_id):
+    """
+    Starts a new generation of the snapshot of the user, once the current
+    transaction is committed, so that its statuses are computed again on the
+    next load of the dashboard.
+    """
+    timeout = _snapshot_timeout()
+    if timeout:
+        transaction.on_commit(lambda: cache.set(_generation_cache_key(user_id), uuid4().hex, timeout))
+
+
+@receiver(post_save, sender=CourseEnrollment, dispatch_uid='dashboard_snapshot_enrollment_changed')
+@receiver(post_delete, sender=CourseEnrollment, dispatch_uid='dashboard_snapshot_enrollment_deleted')
+@receiver(post_save, sender=GeneratedCertificate, dispatch_uid='dashboard_snapshot_certificate_changed')
+@receiver(post_delete, sender=GeneratedCertificate, dispatch_uid='dashboard_snapshot_certificate_deleted')
+@receiver(post_save, sender=ManualVerification, dispatch_uid='dashboard_snapshot_manual_verification_changed')
+@receiver(post_delete, sender=ManualVerification, dispatch_uid='dashboard_snapshot_manual_verification_deleted')
+@receiver(post_save, sender=SSOVerification, dispatch_uid='dashboard_snapshot_sso_verification_changed')
+@receiver(post_delete, sender=SSOVerification, dispatch_uid='dashboard_snapshot_sso_verification_deleted')
+@receiver(post_save, sender=SoftwareSecurePhotoVerification, dispatch_uid='dashboard_snapshot_photo_verification_changed')
+@receiver(post_delete, sender=SoftwareSecurePhotoVerification, dispatch_uid='dashboard_snapshot_photo_verification_deleted')
+def _listen_for_user_status_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshot of the user of a changed or deleted enrollment,
+    certificate or ID verification.
+    """
+    invalidate_dashboard_snapshot(instance.user_id)
+
+
+@receiver(post_save, sender=CourseEnrollmentAttribute, dispatch_uid='dashboard_snapshot_enrollment_attribute_changed')
+@receiver(post_delete, sender=CourseEnrollmentAttribute, dispatch_uid='dashboard_snapshot_enrollment_attribute_deleted')
+def _listen_for_enrollment_attribute_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshot of the user of the enrollment of a changed or
+    deleted enrollment attribute, e.g. the credit provider of a credit
+    enrollment.
+    """
+    if _snapshot_timeout():
+        invalidate_dashboard_snapshot(instance.enrollment.user_id)
+
+
+@receiver(post_save, sender=CreditEligibility, dispatch_uid='dashboard_snapshot_credit_eligibility_changed')
+@receiver(post_delete, sender=CreditEligibility, dispatch_uid='dashboard_snapshot_credit_eligibility_deleted')
+@receiver(post_save, sender=CreditRequest, dispatch_uid='dashboard_snapshot_credit_request_changed')
+@receiver(post_delete, sender=CreditRequest, dispatch_uid='dashboard_snapshot_credit_request_deleted')
+def _listen_for_credit_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the snapshot of the user of a changed or deleted credit
+    eligibility or request.  Both are linked to users by username.
+    """
+    if not _snapshot_timeout():
+        return
+    for user_id in User.objects.filter(username=instance.username).values_list('id', flat=True):
+        invalidate_dashboard_snapshot(user_id)
@@ -0,0 +1,161 @@
+"""Tests for the dashboard snapshots of the users."""
+
+
+import mock
+from django.test import override_settings
+
+from lms.djangoapps.certificates.tests.factories import GeneratedCertificateFactory
+from lms.djangoapps.verify_student.models import ManualVerification
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from student import dashboard_snapshot
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+
+
+@override_settings(STUDENT_DASHBOARD_SNAPSHOT_TIMEOUT=60)
+class DashboardSnapshotTest(CacheIsolationTestCase):
+    """Tests for the statuses kept in the dashboard snapshots."""
+
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(DashboardSnapshotTest, self).setUp()
+        # The snapshots are invalidated on commit, which never comes within a test case,
+        # so the invalidations are run at once, unless on_commit_callbacks is a list.
+        self.on_commit_callbacks = None
+        patcher = mock.patch.object(dashboard_snapshot, 'transaction')
+        self.addCleanup(patcher.stop)
+        patcher.start().on_commit.side_effect = self._on_commit
+        self.user = UserFactory.create()
+        self.enrollments = [CourseEnrollmentFactory.create(user=self.user) for __ in range(2)]
+        self.cert_statuses = mock.Mock(side_effect=self._statuses)
+        self.verification_statuses = mock.Mock(side_effect=self._statuses)
+
+    def _on_commit(self, func):
+        """
+        Runs the given function at once, or keeps it in on_commit_callbacks.
+        """
+        if self.on_commit_callbacks is None:
+            func()
+        else:
+            self.on_commit_callbacks.append(func)
+
+    @staticmethod
+    def _statuses(enrollments):
+        return {enrollment.course_id: {'status': 'ok'} for enrollment in enrollments}
+
+    def _get_statuses(self, enrollments=None):
+        return dashboard_snapshot.get_dashboard_statuses(self.user, enrollments or self.enrollments, {
+            dashboard_snapshot.CERT_STATUSES: self.cert_statuses,
+            dashboard_snapshot.VERIFICATION_STATUS_BY_COURSE: self.verification_statuses,
+        })
+
+    def _computed_course_ids(self, status_function):
+        """
+        Returns the course keys whose statuses were computed by the given
+        status function at its last call.
+        """
+        return {enrollment.course_id for enrollment in status_function.call_args[0][0]}
+
+    def test_statuses_computed_once(self):
+        expected_statuses = self._statuses(self.enrollments)
+        for __ in range(2):
+            statuses = self._get_statuses()
+            self.assertEqual(statuses[dashboard_snapshot.CERT_STATUSES], expected_statuses)
+            self.assertEqual(statuses[dashboard_snapshot.VERIFICATION_STATUS_BY_COURSE], expected_statuses)
+        self.assertEqual(self.cert_statuses.call_count, 1)
+        self.assertEqual(self.verification_statuses.call_count, 1)
+
+    def test_courses_without_status(self):
+        self.cert_statuses.side_effect = lambda enrollments: {}
+        self._get_statuses()
+        self.assertEqual(self._get_statuses()[dashboard_snapshot.CERT_STATUSES], {})
+        self.assertEqual(self.cert_statuses.call_count, 1)
+
+    def test_missing_course(self):
+        self._get_statuses(self.enrollments[:1])
+        self._get_statuses()
+        self.assertEqual(self.cert_statuses.call_count, 2)
+        self.assertEqual(self._computed_course_ids(self.cert_statuses), {self.enrollments[1].course_id})
+
+    def _assert_all_computed_again(self):
+        """
+        Asserts that all the statuses were computed again at the last call.
+        """
+        self._get_statuses()
+        all_course_ids = {enrollment.course_id for enrollment in self.enrollments}
+        self.assertEqual(self.cert_statuses.call_count, 2)
+        self.assertEqual(self._computed_course_ids(self.cert_statuses), all_course_ids)
+        self.assertEqual(self.verification_statuses.call_count, 2)
+        self.assertEqual(self._computed_course_ids(self.verification_statuses), all_course_ids)
+
+    def test_enrollment_change(self):
+        self._get_statuses()
+        self.enrollments.append(CourseEnrollmentFactory.create(user=self.user))
+        self._assert_all_computed_again()
+
+    def test_enrollment_deletion(self):
+        self._get_statuses()
+        self.enrollments.pop().delete()
+        self._assert_all_computed_again()
+
+    def test_certificate_change(self):
+        self._get_statuses()
+        GeneratedCertificateFactory.create(user=self.user, course_id=self.enrollments[0].course_id)
+        self._assert_all_computed_again()
+
+    def test_certificate_deletion(self):
+        certificate = GeneratedCertificateFactory.create(user=self.user, course_id=self.enrollments[0].course_id)
+        self._get_statuses()
+        certificate.delete()
+        self._assert_all_computed_again()
+
+    def test_verification_change(self):
+        self._get_statuses()
+        ManualVerification.objects.create(user=self.user, status='approved')
+        self._assert_all_computed_again()
+
+    def test_verification_deletion(self):
+        verification = ManualVerification.objects.create(user=self.user, status='approved')
+        self._get_statuses()
+        verification.delete()
+        self._assert_all_computed_again()
+
+    def test_change_while_computing(self):
+        """
+        The statuses computed before a change aren't used after it, even
+        when they are stored in the cache after it.
+        """
+        def change_while_computing(enrollments):
+            ManualVerification.objects.create(user=self.user, status='approved')
+            return self._statuses(enrollments)
+
+        self.verification_statuses.side_effect = change_while_computing
+        self._get_statuses()
+        self.verification_statuses.side_effect = self._statuses
+        self._assert_all_computed_again()
+
+    def test_change_before_commit(self):
+        """
+        The snapshot is only invalidated once a change is committed.
+        """
+        self.on_commit_callbacks = []
+        self._get_statuses()
+        ManualVerification.objects.create(user=self.user, status='approved')
+        self._get_statuses()
+        self.assertEqual(self.verification_statuses.call_count, 1)
+
+        for func in self.on_commit_callbacks:
+            func()
+        self._assert_all_computed_again()
+
+    def test_new_period(self):
+        with mock.patch.object(dashboard_snapshot.time, 'time', return_value=59):
+            self._get_statuses()
+        with mock.patch.object(dashboard_snapshot.time, 'time', return_value=60):
+            self._assert_all_computed_again()
+
+    @override_settings(STUDENT_DASHBOARD_SNAPSHOT_TIMEOUT=0)
+    def test_snapshot_disabled(self):
+        self._get_statuses()
+        self._get_statuses()
+        self.assertEqual(self.cert_statuses.call_count, 2)
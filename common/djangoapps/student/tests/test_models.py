@@ -6,6 +6,7 @@ import hashlib
 
 import ddt
 import factory
+import mock
 import pytz
 from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
@@ -245,6 +246,25 @@ class CourseEnrollmentTests(SharedModuleStoreTestCase):
         self.assertTrue(enrollment_refetched.exists())
         self.assertEqual(enrollment_refetched.all()[0], enrollment)
 
+    @mock.patch.dict('openedx.core.djangoapps.content.course_overviews.models._PREFETCHED_OVERVIEWS', clear=True)
+    def test_enrollments_for_user_with_overviews_preload(self):
+        courses = [self.course, CourseFactory()]
+        for course in courses:
+            CourseEnrollmentFactory(user=self.user, course_id=course.id)
+
+        enrollments = CourseEnrollment.enrollments_for_user_with_overviews_preload(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                {enrollment.course_overview.id for enrollment in enrollments},
+                {course.id for course in courses},
+            )
+            for enrollment in enrollments:
+                self.assertIs(enrollment.course, enrollment.course_overview)
+                list(enrollment.course_overview.tabs)
+
+        enrollments = CourseEnrollment.enrollments_for_user_with_overviews_preload(self.user, courses_limit=1)
+        self.assertEqual(len(enrollments), 1)
+
 
 class PendingNameChangeTests(SharedModuleStoreTestCase):
     """
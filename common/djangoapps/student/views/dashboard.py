@@ -25,6 +25,7 @@ from opaque_keys.edx.keys import CourseKey
 from pytz import UTC
 from shoppingcart.models import CourseRegistrationCode, DonationConfiguration
 from six import iteritems, text_type
+from student import dashboard_snapshot
 from student.api import COURSE_DASHBOARD_PLUGIN_VIEW_NAME
 from student.helpers import cert_info, check_verify_status_by_course, get_resume_urls_for_enrollments
 from student.models import (
@@ -754,11 +755,22 @@ def student_dashboard(request):
     #
     # If a course is not included in this dictionary,
     # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
-    cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview)
-        for enrollment in course_enrollments
-    }
+    #
+    # The certificate, credit and verification statuses are kept in the
+    # dashboard snapshot of the user, so that they are only computed again
+    # once the statuses of the user change, or the snapshot period ends.
+    dashboard_statuses = dashboard_snapshot.get_dashboard_statuses(user, course_enrollments, {
+        dashboard_snapshot.VERIFICATION_STATUS_BY_COURSE: lambda enrollments: check_verify_status_by_course(
+            user, enrollments
+        ),
+        dashboard_snapshot.CERT_STATUSES: lambda enrollments: {
+            enrollment.course_id: cert_info(user, enrollment.course_overview)
+            for enrollment in enrollments
+        },
+        dashboard_snapshot.CREDIT_STATUSES: lambda enrollments: _credit_statuses(user, enrollments),
+    })
+    verify_status_by_course = dashboard_statuses[dashboard_snapshot.VERIFICATION_STATUS_BY_COURSE]
+    cert_statuses = dashboard_statuses[dashboard_snapshot.CERT_STATUSES]
 
     # only show email settings for Mongo course and when bulk email is turned on
     show_email_settings_for = frozenset(
@@ -848,7 +860,7 @@ def student_dashboard(request):
         'show_courseware_links_for': show_courseware_links_for,
         'all_course_modes': course_mode_info,
         'cert_statuses': cert_statuses,
-        'credit_statuses': _credit_statuses(user, course_enrollments),
+        'credit_statuses': dashboard_statuses[dashboard_snapshot.CREDIT_STATUSES],
         'show_email_settings_for': show_email_settings_for,
         'reverifications': reverifications,
         'verification_display': verification_status['should_display'],
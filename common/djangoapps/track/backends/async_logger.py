@@ -0,0 +1,239 @@
+"""
+Event tracker backend that saves events to a python logger from a
+background thread.
+
+Events are put on a bounded in-memory queue by `send`, and a background
+thread serializes them to JSON and logs them, so that neither the
+serialization nor the write to the sink (a file, the syslog socket...) of
+the logger happens on the request path.  Each event is still logged as its
+own record, as the sinks expect one line per event.
+
+It can be used in place of the logger backend of the `tracking_logs`
+routing backend, e.g. with the following EVENT_TRACKING_BACKENDS in the
+AUTH_TOKENS:
+
+    "EVENT_TRACKING_BACKENDS": {
+        "logger": {
+            "ENGINE": "track.backends.async_logger.AsyncLoggerBackend",
+            "OPTIONS": {
+                "name": "tracking",
+                "max_queue_size": 10000,
+                "overflow_policy": "drop_newest"
+            }
+        }
+    }
+
+"""
+
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from edx_django_utils import monitoring as monitoring_utils
+from six.moves import queue
+
+from track.backends import BaseBackend
+from track.utils import DateTimeJSONEncoder
+
+log = logging.getLogger(__name__)
+
+# What to do with an event when the queue is full.
+DROP_NEWEST = 'drop_newest'  # Drop the event.
+DROP_OLDEST = 'drop_oldest'  # Drop the oldest queued event to make room for the event.
+BLOCK = 'block'  # Wait up to block_timeout seconds for room, and then drop the event.
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+# Maximum number of seconds that flush waits for the background thread to log
+# the events it has already taken off the queue.
+FLUSH_TIMEOUT = 5
+
+# Queued by flush to stop the background thread once the events before it are logged.
+_STOP = object()
+
+
+class AsyncLoggerBackend(BaseBackend):
+    """
+    Event tracker backend that uses a python logger, from a background thread.
+
+    Events are logged to the INFO level as JSON strings, like with the
+    LoggerBackend.  A shallow copy of each event is queued, so the nested
+    data of the events must not be modified after they're sent.
+    """
+
+    def __init__(
+            self,
+            name,
+            max_event_size=None,
+            max_queue_size=10000,
+            batch_size=100,
+            overflow_policy=DROP_NEWEST,
+            block_timeout=0.1,
+            **kwargs
+    ):
+        """
+        Event tracker backend that uses a python logger, from a background thread.
+
+        :Parameters:
+          - `name`: identifier of the logger, which should have
+            been configured using the default python mechanisms.
+          - `max_event_size`: maximum length of the serialized events,
+            TRACK_MAX_EVENT by default.
+          - `max_queue_size`: maximum number of events waiting to be logged.
+          - `batch_size`: maximum number of events taken off the queue at once.
+          - `overflow_policy`: what to do with an event when the queue is
+            full, one of OVERFLOW_POLICIES.
+          - `block_timeout`: maximum number of seconds that the `block`
+            policy waits for room in the queue.
+
+        """
+        super(AsyncLoggerBackend, self).__init__(**kwargs)
+
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(u'Invalid overflow policy: {}'.format(overflow_policy))
+
+        self.event_logger = logging.getLogger(name)
+        self.max_event_size = max_event_size or settings.TRACK_MAX_EVENT
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+
+        self.num_dropped = 0
+        self.num_logged = 0
+        self.last_flush_latency = 0.0
+
+        atexit.register(self.flush)
+
+    def send(self, event):
+        self._start_thread()
+
+        event = dict(event)
+        try:
+            if self.overflow_policy == BLOCK:
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            self._overflow(event)
+
+        monitoring_utils.set_custom_metric('tracking_queue_depth', self._queue.qsize())
+        monitoring_utils.set_custom_metric('tracking_dropped_events', self.num_dropped)
+        monitoring_utils.set_custom_metric('tracking_flush_latency', self.last_flush_latency)
+
+    def _overflow(self, event):
+        """
+        Applies the overflow policy to the given event, which didn't fit in
+        the queue.
+        """
+        if self.overflow_policy == DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+                self.num_dropped += 1
+                self._queue.put_nowait(event)
+                return
+            except (queue.Empty, queue.Full):
+                pass
+
+        self.num_dropped += 1
+        if self.num_dropped == 1 or self.num_dropped % 1000 == 0:
+            log.warning(u'Dropped %d tracking events so far, since the queue is full.', self.num_dropped)
+
+    def _start_thread(self):
+        """
+        Starts the thread logging the queued events, if it isn't running in
+        this process, e.g. after a fork.
+        """
+        pid = os.getpid()
+        if self._thread_pid == pid:
+            return
+
+        with self._lock:
+            if self._thread_pid == pid:
+                return
+            thread = threading.Thread(target=self._run, name='tracking-logger')
+            thread.daemon = True
+            thread.start()
+            self._thread = thread
+            self._thread_pid = pid
+
+    def _run(self):
+        """
+        Logs the queued events, taking off the queue the events queued at
+        the time, until flush stops it.
+        """
+        while True:
+            batch = self._next_batch([self._queue.get()])
+            if batch[-1] is _STOP:
+                self._log_batch(batch[:-1])
+                return
+            self._log_batch(batch)
+
+    def _next_batch(self, batch):
+        """
+        Adds the events waiting in the queue to the given batch, up to the
+        batch size, without waiting for more, nor going past a stop marker.
+        """
+        while len(batch) < self.batch_size and (not batch or batch[-1] is not _STOP):
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _log_batch(self, batch):
+        """
+        Serializes and logs the given events, one record per event.
+        """
+        start = time.time()
+        for event in batch:
+            try:
+                event_str = json.dumps(event, cls=DateTimeJSONEncoder)
+                self.event_logger.info(event_str[:self.max_event_size])
+            except UnicodeDecodeError:
+                log.exception(u'UnicodeDecodeError Event_data: %r', event)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u'Failed to log tracking event: %r', event)
+        self.num_logged += len(batch)
+        self.last_flush_latency = time.time() - start
+
+    def flush(self):
+        """
+        Logs the events waiting in the queue, and those already taken off
+        the queue by the background thread, before returning, e.g. when the
+        process exits.
+
+        The background thread, if running in this process, is stopped once
+        it has logged the events queued before the call, waiting up to
+        FLUSH_TIMEOUT seconds.  It's started again by the next event.
+        Otherwise, the events are logged from the calling thread.
+        """
+        with self._lock:
+            thread = self._thread if self._thread_pid == os.getpid() else None
+            self._thread = None
+            self._thread_pid = None
+
+        if thread is None or not thread.is_alive():
+            while True:
+                batch = self._next_batch([])
+                if not batch:
+                    break
+                self._log_batch(batch)
+            return
+
+        while True:
+            try:
+                self._queue.put(_STOP, timeout=self.block_timeout)
+                break
+            except queue.Full:
+                # Help the background thread make room in the queue.
+                self._log_batch(self._next_batch([]))
+        thread.join(FLUSH_TIMEOUT)
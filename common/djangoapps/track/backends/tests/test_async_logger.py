@@ -0,0 +1,114 @@
+"""Tests for the asynchronous event tracker backend."""
+
+
+import datetime
+import json
+import logging
+import time
+
+import mock
+import pytest
+
+from track.backends.async_logger import BLOCK, DROP_NEWEST, DROP_OLDEST, AsyncLoggerBackend
+
+LOGGER_NAME = 'track.backends.async_logger.test'
+
+
+def _saved_events(caplog):
+    """
+    Returns the events recorded by the test logger.
+    """
+    return [json.loads(e[2]) for e in caplog.record_tuples if e[0] == LOGGER_NAME]
+
+
+@mock.patch.object(AsyncLoggerBackend, '_start_thread')
+def test_async_logger_backend(_mock_start_thread, caplog):
+    """
+    Send a couple of events and check that they are recorded by the logger
+    once flushed. The events are serialized to JSON.
+    """
+    caplog.set_level(logging.INFO)
+    backend = AsyncLoggerBackend(name=LOGGER_NAME)
+    event = {
+        'test': True,
+        'time': datetime.datetime(2012, 5, 1, 7, 27, 1, 200),
+        'date': datetime.date(2012, 5, 7),
+    }
+
+    backend.send(event)
+    backend.send(event)
+    assert _saved_events(caplog) == []
+
+    backend.flush()
+    unpacked_event = {
+        'test': True,
+        'time': '2012-05-01T07:27:01.000200+00:00',
+        'date': '2012-05-07'
+    }
+    assert _saved_events(caplog) == [unpacked_event, unpacked_event]
+    assert backend.num_logged == 2
+
+
+@pytest.mark.parametrize('overflow_policy, expected_events', [
+    (DROP_NEWEST, [{'n': 0}]),
+    (DROP_OLDEST, [{'n': 1}]),
+    (BLOCK, [{'n': 0}]),
+])
+@mock.patch.object(AsyncLoggerBackend, '_start_thread')
+def test_overflow_policy(_mock_start_thread, overflow_policy, expected_events, caplog):
+    """
+    Check that events are dropped according to the policy when the queue is full.
+    """
+    caplog.set_level(logging.INFO)
+    backend = AsyncLoggerBackend(
+        name=LOGGER_NAME, max_queue_size=1, overflow_policy=overflow_policy, block_timeout=0.01,
+    )
+
+    backend.send({'n': 0})
+    backend.send({'n': 1})
+    backend.flush()
+
+    assert _saved_events(caplog) == expected_events
+    assert backend.num_dropped == 1
+
+
+def test_invalid_overflow_policy():
+    with pytest.raises(ValueError):
+        AsyncLoggerBackend(name=LOGGER_NAME, overflow_policy='invalid')
+
+
+def test_background_thread(caplog):
+    """
+    Check that the events are logged by the background thread.
+    """
+    caplog.set_level(logging.INFO)
+    backend = AsyncLoggerBackend(name=LOGGER_NAME, batch_size=2)
+
+    for n in range(5):
+        backend.send({'n': n})
+
+    deadline = time.time() + 5
+    while backend.num_logged < 5 and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert _saved_events(caplog) == [{'n': n} for n in range(5)]
+
+
+def test_flush_background_thread():
+    """
+    Check that flush returns once the events already taken off the queue by
+    the background thread are logged too.
+    """
+    backend = AsyncLoggerBackend(name=LOGGER_NAME, batch_size=10)
+    logged_events = []
+
+    def slow_info(message):
+        time.sleep(0.01)
+        logged_events.append(json.loads(message))
+
+    with mock.patch.object(backend.event_logger, 'info', side_effect=slow_info):
+        for n in range(5):
+            backend.send({'n': n})
+        backend.flush()
+
+    assert logged_events == [{'n': n} for n in range(5)]
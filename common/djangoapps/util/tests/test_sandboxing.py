@@ -3,12 +3,13 @@ Tests for sandboxing.py in util app
 """
 
 
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import TestCase
 from django.test.utils import override_settings
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import CourseLocator, LibraryLocator
 
-from xmodule.util.sandboxing import can_execute_unsafe_code
+from xmodule.util.sandboxing import SafeExecCache, can_execute_unsafe_code
 
 
 class SandboxingTest(TestCase):
@@ -39,3 +40,47 @@ class SandboxingTest(TestCase):
         self.assertFalse(can_execute_unsafe_code(CourseLocator('edX', 'full', '2012_Fall')))
         self.assertFalse(can_execute_unsafe_code(CourseLocator('edX', 'full', '2013_Spring')))
         self.assertFalse(can_execute_unsafe_code(LibraryLocator('edX', 'test_bank')))
+
+
+class SafeExecCacheTest(TestCase):
+    """
+    Test the cache of safe_exec results
+    """
+    def setUp(self):
+        super(SafeExecCacheTest, self).setUp()
+        self.backend = LocMemCache('safe_exec', {})
+        self.course_key = CourseLocator('edX', 'full', '2012_Fall')
+        self.result = (None, {'answer': 42})
+
+    def test_get_and_set(self):
+        cache = SafeExecCache(self.course_key, cache=self.backend)
+        self.assertIsNone(cache.get('safe_exec.1.abc'))
+        cache.set('safe_exec.1.abc', self.result)
+        self.assertEqual(cache.get('safe_exec.1.abc'), self.result)
+
+        # results are shared by the caches of the course only
+        self.assertEqual(SafeExecCache(self.course_key, cache=self.backend).get('safe_exec.1.abc'), self.result)
+        other_course_key = CourseLocator('edX', 'full', '2013_Spring')
+        self.assertIsNone(SafeExecCache(other_course_key, cache=self.backend).get('safe_exec.1.abc'))
+
+    def test_evict(self):
+        cache = SafeExecCache(self.course_key, cache=self.backend)
+        cache.set('safe_exec.1.abc', self.result)
+        SafeExecCache(self.course_key, cache=self.backend).evict()
+        self.assertIsNone(SafeExecCache(self.course_key, cache=self.backend).get('safe_exec.1.abc'))
+
+    def test_python_lib_digest(self):
+        python_lib_digest = 'abc'
+        cache = SafeExecCache(self.course_key, cache=self.backend, get_python_lib_digest=lambda: python_lib_digest)
+        cache.set('safe_exec.1.abc', self.result)
+        self.assertEqual(cache.get('safe_exec.1.abc'), self.result)
+
+        # results computed with a previous version of the course's code library are not used
+        python_lib_digest = 'def'
+        self.assertIsNone(cache.get('safe_exec.1.abc'))
+
+    @override_settings(SAFE_EXEC_CACHE_MAX_RESULT_SIZE=10)
+    def test_oversized_result(self):
+        cache = SafeExecCache(self.course_key, cache=self.backend)
+        cache.set('safe_exec.1.abc', self.result)
+        self.assertIsNone(cache.get('safe_exec.1.abc'))
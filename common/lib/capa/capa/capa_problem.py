@@ -14,9 +14,11 @@ This is used by capa_module.
 """
 
 
+import hashlib
 import logging
 import os.path
 import re
+import threading
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
@@ -76,6 +78,11 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# Maximum number of parsed problems kept by each process, see LoncapaProblem._parse_problem_text.
+PARSED_PROBLEM_CACHE_SIZE = 1000
+_parsed_problem_cache = OrderedDict()
+_parsed_problem_cache_lock = threading.Lock()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -179,21 +186,8 @@ class LoncapaProblem(object):
         self.done = state.get('done', False)
         self.input_state = state.get('input_state', {})
 
-        # Convert startouttext and endouttext to proper <text></text>
-        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
-        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
-        self.problem_text = problem_text
-
         # parse problem XML file into an element tree
-        if isinstance(problem_text, six.text_type):
-            # etree chokes on Unicode XML with an encoding declaration
-            problem_text = problem_text.encode('utf-8')
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        self._parse_problem_text(problem_text)
 
         # construct script processor context (eg for customresponse problems)
         if minimal_init:
@@ -226,6 +220,51 @@ class LoncapaProblem(object):
             if extract_tree:
                 self.extracted_tree = self._extract_html(self.tree)
 
+    def _parse_problem_text(self, problem_text):
+        """
+        Sets `problem_text` and `tree` from the given problem XML, with the
+        compatibility translations applied and the included files inserted.
+
+        This doesn't depend on the seed or the state, so the result is kept in a
+        per-process cache by the hash of the XML, and each problem gets its own
+        copy of the cached tree.  Problems including files aren't cached, since
+        the included files are read from the filestore of the course.
+        """
+        if isinstance(problem_text, six.text_type):
+            cache_key = hashlib.sha1(problem_text.encode('utf-8')).hexdigest()
+        else:
+            cache_key = hashlib.sha1(problem_text).hexdigest()
+        with _parsed_problem_cache_lock:
+            cached = _parsed_problem_cache.pop(cache_key, None)
+            if cached is not None:
+                _parsed_problem_cache[cache_key] = cached
+        if cached is not None:
+            self.problem_text, tree = cached
+            self.tree = deepcopy(tree)
+            return
+
+        # Convert startouttext and endouttext to proper <text></text>
+        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
+        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
+        self.problem_text = problem_text
+
+        if isinstance(problem_text, six.text_type):
+            # etree chokes on Unicode XML with an encoding declaration
+            problem_text = problem_text.encode('utf-8')
+        self.tree = etree.XML(problem_text)
+
+        self.make_xml_compatible(self.tree)
+
+        # handle any <include file="foo"> tags
+        if self.tree.find('.//include') is not None:
+            self._process_includes()
+            return
+
+        with _parsed_problem_cache_lock:
+            _parsed_problem_cache[cache_key] = (self.problem_text, deepcopy(self.tree))
+            while len(_parsed_problem_cache) > PARSED_PROBLEM_CACHE_SIZE:
+                _parsed_problem_cache.popitem(last=False)
+
     def make_xml_compatible(self, tree):
         """
         Adjust tree xml in-place for compatibility before creating
@@ -881,7 +920,6 @@ class LoncapaProblem(object):
         """
         context = {}
         context['seed'] = self.seed
-        context['anonymous_student_id'] = self.capa_system.anonymous_student_id
         all_code = ''
 
         python_path = []
@@ -904,6 +942,11 @@ class LoncapaProblem(object):
             code = unescape(script.text, XMLESC)
             all_code += code
 
+        # The anonymous student id is only given to script code that refers to it, so that
+        # the cached results of executing the code can be shared by all students with the same seed.
+        if 'anonymous_student_id' in all_code:
+            context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+
         extra_files = []
         if all_code:
             # An asset named python_lib.zip can be imported by Python code.
@@ -928,6 +971,7 @@ class LoncapaProblem(object):
                 msg = Text("Error while executing script code: %s" % str(err))
                 raise responsetypes.LoncapaProblemError(msg)
 
+        context['anonymous_student_id'] = self.capa_system.anonymous_student_id
         # Store code source in context, along with the Python path needed to run it correctly.
         context['script_code'] = all_code
         context['python_path'] = python_path
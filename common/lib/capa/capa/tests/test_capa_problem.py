@@ -12,6 +12,7 @@ from lxml import etree
 from markupsafe import Markup
 from mock import patch
 
+from capa.capa_problem import LoncapaProblem
 from capa.responsetypes import LoncapaProblemError
 from capa.tests.helpers import new_loncapa_problem
 from openedx.core.djangolib.markup import HTML
@@ -509,6 +510,61 @@ class CAPAProblemTest(unittest.TestCase):
         problem = new_loncapa_problem(xml.format(correctness=False))
         self.assertIsNotNone(problem)
 
+    @ddt.data(
+        ('answer = 42', False),
+        ('answer = anonymous_student_id', True),
+    )
+    @ddt.unpack
+    def test_script_anonymous_student_id(self, script, has_anonymous_student_id):
+        """
+        Verify that the anonymous student id is only given to script code that refers to
+        it, so that the results of other code can be cached for all students.
+        """
+        xml = """
+        <problem>
+            <script type="loncapa/python">{}</script>
+        </problem>
+        """.format(script)
+        executed_globals = []
+        with patch('capa.capa_problem.safe_exec', side_effect=lambda code, globals_dict, **kwargs: (
+            executed_globals.append(dict(globals_dict))
+        )):
+            problem = new_loncapa_problem(xml)
+        self.assertEqual('anonymous_student_id' in executed_globals[0], has_anonymous_student_id)
+        self.assertEqual(problem.context['anonymous_student_id'], 'student')
+
+    def test_parsed_problem_cache(self):
+        """
+        Verify that the XML of a problem is parsed once, and that each problem
+        gets its own tree with its own seed-dependent transformations.
+        """
+        xml = """
+        <problem>
+            <startouttext/>Which is a color?<endouttext/>
+            <multiplechoiceresponse>
+                <choicegroup type="MultipleChoice" shuffle="true">
+                    <choice correct="false">Apple</choice>
+                    <choice correct="false">Banana</choice>
+                    <choice correct="false">Chocolate</choice>
+                    <choice correct="true">Donut</choice>
+                </choicegroup>
+            </multiplechoiceresponse>
+        </problem>
+        """
+        make_xml_compatible = LoncapaProblem.make_xml_compatible
+        with patch.object(
+            LoncapaProblem, 'make_xml_compatible', autospec=True, side_effect=make_xml_compatible
+        ) as mock_make_xml_compatible:
+            problems = [new_loncapa_problem(xml, seed=seed) for seed in (0, 1)]
+        self.assertEqual(mock_make_xml_compatible.call_count, 1)
+        self.assertIsNot(problems[0].tree, problems[1].tree)
+        self.assertEqual(problems[0].problem_text, problems[1].problem_text)
+        self.assertEqual(len(problems[1].tree.findall('.//text')), 1)
+        self.assertNotEqual(
+            etree.tostring(problems[0].tree.find('.//choicegroup')),
+            etree.tostring(problems[1].tree.find('.//choicegroup')),
+        )
+
 
 @ddt.ddt
 class CAPAMultiInputProblemTest(unittest.TestCase):
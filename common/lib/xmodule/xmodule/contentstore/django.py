@@ -3,9 +3,13 @@
 from importlib import import_module
 
 from django.conf import settings
+from django.dispatch import Signal
 
 _CONTENTSTORE = {}
 
+# Sent by the contentstore whenever assets of a course are saved or deleted.
+COURSE_ASSETS_CHANGED = Signal(providing_args=['course_key'])
+
 
 def load_function(path):
     """
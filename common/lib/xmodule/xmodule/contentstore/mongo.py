@@ -3,8 +3,10 @@ MongoDB/GridFS-level code for the contentstore.
 """
 
 
+import calendar
 import json
 import os
+import tarfile
 
 import gridfs
 import pymongo
@@ -13,9 +15,12 @@ from bson.son import SON
 from fs.osfs import OSFS
 from gridfs.errors import NoFile, FileExists
 from mongodb_proxy import autoretry_read
+from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import AssetKey
+from opaque_keys.edx.locator import CourseLocator
 
 from xmodule.contentstore.content import XASSET_LOCATION_TAG
+from xmodule.contentstore.django import COURSE_ASSETS_CHANGED
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import ASSET_IGNORE_REGEX
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
@@ -115,6 +120,7 @@ class MongoContentStore(ContentStore):
                 else:
                     fp.write(content.data)
 
+        self._send_course_assets_changed(content.location.course_key)
         return content
 
     def delete(self, location_or_id):
@@ -122,9 +128,35 @@ class MongoContentStore(ContentStore):
         Delete an asset.
         """
         if isinstance(location_or_id, AssetKey):
+            course_key = location_or_id.course_key
             location_or_id, _ = self.asset_db_key(location_or_id)
+        else:
+            course_key = self._course_key_for_asset_id(location_or_id)
         # Deletes of non-existent files are considered successful
         self.fs.delete(location_or_id)
+        if course_key is not None:
+            self._send_course_assets_changed(course_key)
+
+    @staticmethod
+    def _course_key_for_asset_id(asset_id):
+        """
+        Returns the key of the course of the asset with the given database _id,
+        or None for the _id of an asset of a deprecated course, which lacks the run.
+        """
+        if isinstance(asset_id, six.string_types):
+            try:
+                return AssetKey.from_string(asset_id).course_key
+            except InvalidKeyError:
+                return None
+        if asset_id.get('run'):
+            return CourseLocator(asset_id['org'], asset_id['course'], asset_id['run'])
+        return None
+
+    def _send_course_assets_changed(self, course_key):
+        """
+        Signals that assets of the given course were saved or deleted.
+        """
+        COURSE_ASSETS_CHANGED.send(sender=self.__class__, course_key=course_key)
 
     @autoretry_read()
     def find(self, location, throw_on_not_found=True, as_stream=False):
@@ -193,7 +225,38 @@ class MongoContentStore(ContentStore):
         with disk_fs.open(export_name, 'wb') as asset_file:
             asset_file.write(content.data)
 
-    def export_all_for_course(self, course_key, output_directory, assets_policy_file):
+    def export_to_tar(self, location, tar_file, output_directory):
+        """
+        Add the file of the asset at the given location to the given tarball, under the
+        output_directory path. The data is copied from the GridFS chunks as they're read,
+        without loading the whole file in memory.
+        """
+        content_id, __ = self.asset_db_key(location)
+        try:
+            fp = self.fs.get(content_id)
+        except NoFile:
+            raise NotFoundError(content_id)
+
+        with fp:
+            # Need to replace dict IDs with SON for chunk lookup to work under Python 3
+            # because field order can be different and mongo cares about the order
+            if isinstance(fp._id, dict):
+                fp._file['_id'] = content_id
+
+            import_path = getattr(fp, 'import_path', None)
+            if import_path is not None:
+                output_directory = output_directory + '/' + os.path.dirname(import_path)
+
+            # Escape invalid char from filename.
+            export_name = escape_invalid_characters(name=fp.displayname, invalid_char_list=['/', '\\'])
+
+            tar_info = tarfile.TarInfo(os.path.normpath(output_directory + '/' + export_name))
+            tar_info.size = fp.length
+            tar_info.mtime = calendar.timegm(fp.uploadDate.utctimetuple())
+            tar_info.mode = 0o644
+            tar_file.addfile(tar_info, fp)
+
+    def export_all_for_course(self, course_key, output_directory, assets_policy_file, tar_file=None):
         """
         Export all of this course's assets to the output_directory. Export all of the assets'
         attributes to the policy file.
@@ -203,6 +266,9 @@ class MongoContentStore(ContentStore):
             output_directory: the directory under which to put all the asset files
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
+            tar_file (tarfile.TarFile): if given, the asset files are added to this tarball,
+                with output_directory as their path in the tarball, instead of being written
+                to the disk.
         """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
@@ -216,7 +282,10 @@ class MongoContentStore(ContentStore):
             #
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
+            if tar_file is None:
+                self.export(asset['asset_key'], output_directory)
+            else:
+                self.export_to_tar(asset['asset_key'], tar_file, output_directory)
             for attr, value in six.iteritems(asset):
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
@@ -436,6 +505,7 @@ class MongoContentStore(ContentStore):
             except FileExists:
                 self.fs.delete(file_id=asset_id)
                 self.create_asset(source_content, asset_id, asset, asset_key)
+        self._send_course_assets_changed(dest_course_key)
 
     def create_asset(self, source_content, asset_id, asset, asset_key):
         """
@@ -469,6 +539,7 @@ class MongoContentStore(ContentStore):
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
             self.fs.delete(asset_key)
+        self._send_course_assets_changed(course_key)
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -1,5 +1,5 @@
 /* eslint-disable no-underscore-dangle */
-/* globals Logger, interpolate */
+/* globals _, $script, Logger, interpolate */
 
 (function() {
     'use strict';
@@ -46,6 +46,7 @@
             };
 
             this.updatedProblems = {};
+            this.unitRequests = {};
             this.requestToken = $(element).data('request-token');
             this.el = $(element).find('.sequence');
             this.path = $('.path');
@@ -229,6 +230,17 @@
         Sequence.prototype.render = function(newPosition) {
             var bookmarked, currentTab, modxFullUrl, sequenceLinks,
                 self = this;
+            this.pendingPosition = newPosition;
+            if (this.position !== newPosition && this.contents.eq(newPosition - 1).data('lazy')) {
+                // The unit wasn't rendered with the sequence, render it before switching to it,
+                // unless the learner has navigated somewhere else in the meantime.
+                this.renderUnit(newPosition).always(function() {
+                    if (self.pendingPosition === newPosition) {
+                        self.render(newPosition);
+                    }
+                });
+                return;
+            }
             if (this.position !== newPosition) {
                 if (this.position) {
                     this.mark_visited(this.position);
@@ -287,6 +299,96 @@
             }
         };
 
+        Sequence.prototype.renderUnit = function(position) {
+            /**
+            * Fetches the content of a unit that wasn't rendered with the sequence,
+            * and loads the resources it depends upon. Returns a promise.
+            * params:
+            *   'position' is the position of the unit in the sequence.
+            */
+            var self = this,
+                $unit = this.contents.eq(position - 1);
+
+            if (!this.unitRequests[position]) {
+                this.unitRequests[position] = $.postWithPrefix(this.ajaxUrl + '/render_unit', {
+                    position: position
+                }).then(function(fragment) {
+                    return self.addXBlockFragmentResources(fragment.resources || []).then(function() {
+                        // The content of the units is stored as text, see render.
+                        $unit.text(fragment.content);
+                    });
+                }).always(function() {
+                    $unit.data('lazy', false);
+                    delete self.unitRequests[position];
+                });
+            }
+            return this.unitRequests[position];
+        };
+
+        Sequence.prototype.addXBlockFragmentResources = function(resources) {
+            /**
+            * Dynamically loads the given resources of an XBlock fragment, in order,
+            * skipping the ones already loaded. Returns a promise.
+            */
+            var self = this,
+                deferred = $.Deferred(),
+                applyResource;
+
+            window.loadedXBlockResources = window.loadedXBlockResources || [];
+            applyResource = function(index) {
+                var resource = resources[index];
+                if (index >= resources.length) {
+                    deferred.resolve();
+                } else if (_.some(window.loadedXBlockResources, _.partial(_.isEqual, resource))) {
+                    applyResource(index + 1);
+                } else {
+                    window.loadedXBlockResources.push(resource);
+                    self.loadResource(resource).done(function() {
+                        applyResource(index + 1);
+                    }).fail(function() {
+                        deferred.reject();
+                    });
+                }
+            };
+            applyResource(0);
+            return deferred.promise();
+        };
+
+        Sequence.prototype.loadResource = function(resource) {
+            /**
+            * Loads the given resource into the page. Returns a promise.
+            * XBlock fragments are given free rein to add javascript and CSS to the page,
+            * so XSS escaping doesn't matter much in this context.
+            */
+            var $head = $('head'),
+                loaded;
+
+            if (resource.mimetype === 'text/css') {
+                if (resource.kind === 'text') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append("<style type='text/css'>" + resource.data + '</style>');
+                } else if (resource.kind === 'url') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append("<link rel='stylesheet' href='" + resource.data + "' type='text/css'>");
+                }
+            } else if (resource.mimetype === 'application/javascript') {
+                if (resource.kind === 'text') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append('<script>' + resource.data + '</script>');
+                } else if (resource.kind === 'url') {
+                    loaded = $.Deferred();
+                    $script(resource.data, resource.data, function() {
+                        loaded.resolve();
+                    });
+                    return loaded.promise();
+                }
+            } else if (resource.mimetype === 'text/html' && resource.placement === 'head') {
+                // xss-lint: disable=javascript-jquery-append
+                $head.append(resource.data);
+            }
+            return $.Deferred().resolve().promise();
+        };
+
         Sequence.prototype.goto = function(event) {
             var alertTemplate, alertText, isBottomNav, newPosition, widgetPlacement;
             event.preventDefault();
@@ -23,9 +23,16 @@ from xmodule.modulestore.inheritance import InheritanceMixin, inheriting_field_d
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader
 from xmodule.modulestore.split_mongo.id_manager import SplitMongoIdManager
+from xmodule.modulestore.split_mongo.mongo_connection import TIMER
 from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS
 from xmodule.x_module import XModuleMixin
 
+try:
+    from django.conf import settings
+    DJANGO_AVAILABLE = True
+except ImportError:
+    DJANGO_AVAILABLE = False
+
 log = logging.getLogger(__name__)
 
 new_contract('BlockUsageLocator', BlockUsageLocator)
@@ -87,6 +94,13 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.local_modules = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
 
+        # Ids of the definitions to fetch together with the first one of them that is needed,
+        # and the definitions so fetched, by id.
+        self._definitions_to_prefetch = set()
+        self._prefetched_definitions = {}
+        # Number of single definition queries avoided by prefetching definitions.
+        self.definition_round_trips_saved = 0
+
     @lazy
     @contract(returns="dict(BlockKey: BlockKey)")
     def _parent_map(self):
@@ -162,6 +176,49 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         return json_data
 
+    def prefetch_definitions(self, definition_ids):
+        """
+        Marks the given definitions to be fetched with a single query, as
+        soon as any of them is needed, if prefetching is enabled.
+
+        Arguments:
+            definition_ids: the ids of the definitions of lazily loaded blocks
+        """
+        if not _prefetch_definitions_enabled():
+            return
+        self._definitions_to_prefetch.update(
+            definition_id for definition_id in definition_ids
+            if definition_id is not None and definition_id not in self._prefetched_definitions
+        )
+
+    def get_definition(self, course_key, definition_id):
+        """
+        Returns the definition with the given id, fetching all the definitions
+        marked by prefetch_definitions along with it, if it is one of them.
+
+        The returned definition may be shared, so callers must copy it before
+        changing it.
+        """
+        if definition_id in self._prefetched_definitions:
+            return self._prefetched_definitions[definition_id]
+
+        if definition_id not in self._definitions_to_prefetch:
+            return self.modulestore.get_definition(course_key, definition_id)
+
+        definition_ids = list(self._definitions_to_prefetch)
+        self._definitions_to_prefetch.clear()
+        with TIMER.timer("prefetch_definitions", course_key) as tagger:
+            for definition in self.modulestore.get_definitions(course_key, definition_ids):
+                self._prefetched_definitions[definition['_id']] = definition
+            round_trips_saved = len(definition_ids) - 1
+            tagger.measure('definitions', len(definition_ids))
+            tagger.measure('round_trips_saved', round_trips_saved)
+        self.definition_round_trips_saved += round_trips_saved
+
+        if definition_id not in self._prefetched_definitions:
+            return self.modulestore.get_definition(course_key, definition_id)
+        return self._prefetched_definitions[definition_id]
+
     # xblock's runtime does not always pass enough contextual information to figure out
     # which named container (course x branch) or which parent is requesting an item. Because split allows
     # a many:1 mapping from named containers to structures and because item's identities encode
@@ -196,7 +253,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         if definition_id is not None and not block_data.definition_loaded:
             definition_loader = DefinitionLazyLoader(
-                self.modulestore,
+                self,
                 course_key,
                 block_key.type,
                 definition_id,
@@ -396,3 +453,13 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         block.add_aside(new_aside)
         return new_aside
+
+
+def _prefetch_definitions_enabled():
+    """
+    Returns whether the definitions of lazily loaded subtrees should be
+    fetched with a single query.
+    """
+    if not DJANGO_AVAILABLE:
+        return False
+    return getattr(settings, 'SPLIT_MODULESTORE_PREFETCH_DEFINITIONS', False)
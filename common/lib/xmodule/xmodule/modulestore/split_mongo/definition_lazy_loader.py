@@ -15,7 +15,8 @@ class DefinitionLazyLoader(object):
     def __init__(self, modulestore, course_key, block_type, definition_id, field_converter):
         """
         Simple placeholder for yet-to-be-fetched data
-        :param modulestore: the pymongo db connection with the definitions
+        :param modulestore: the modulestore, or the runtime of the block, whose get_definition
+            returns the definitions
         :param definition_locator: the id of the record in the above to fetch
         """
         self.modulestore = modulestore
@@ -3,11 +3,14 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 """
 
 
+import copy
 import datetime
 import logging
 import math
 import re
+import threading
 import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -26,6 +29,7 @@ from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
@@ -204,10 +208,122 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+def _copy_structure(structure):
+    """
+    Returns a copy of the given structure, whose blocks' data can be
+    modified in place without modifying the given structure.  The
+    field values of the blocks are shared with the given structure.
+    """
+    new_structure = dict(structure)
+    new_structure['blocks'] = {
+        block_key: _copy_block_data(block_data)
+        for block_key, block_data in six.iteritems(structure['blocks'])
+    }
+    return new_structure
+
+
+def _copy_block_data(block_data):
+    """
+    Returns a copy of the given BlockData, whose fields, defaults and
+    edit_info can be modified in place without modifying the given
+    BlockData.
+    """
+    new_block_data = copy.copy(block_data)
+    new_block_data.fields = dict(block_data.fields)
+    new_block_data.defaults = dict(block_data.defaults)
+    new_block_data.edit_info = copy.copy(block_data.edit_info)
+    return new_block_data
+
+
+class StructureProcessCache(object):
+    """
+    In-process LRU cache of course structures, keyed by structure id, in
+    front of the CourseStructureCache.
+
+    Structures are immutable by id, so they are kept across requests.
+    Since the modulestore modifies the data of the blocks of a structure
+    in place while loading them, copies of the cached structures are
+    returned (see _copy_structure).
+
+    The cache is bounded by the total size of the cached structures, as
+    measured by the size of their pickled data, which is capped by the
+    COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE setting, in bytes.  The cache
+    is disabled if the setting is 0 or undefined.
+    """
+    def __init__(self):
+        # Cached (structure, size) tuples, from least to most recently used.
+        self._structures = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_size(self):
+        """
+        Returns the maximum total size of the cached structures.
+        """
+        if not DJANGO_AVAILABLE:
+            return 0
+        return getattr(settings, 'COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE', 0)
+
+    def get(self, key):
+        """
+        Returns a copy of the cached structure with the given id, or None
+        if not found.
+        """
+        if not self.max_size:
+            return None
+
+        with self._lock:
+            entry = self._structures.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            # Re-insert the structure as the most recently used.
+            self._structures[key] = entry
+            self.hits += 1
+        return _copy_structure(entry[0])
+
+    def set(self, key, structure, size):
+        """
+        Caches a copy of the given structure with the given id and size,
+        evicting the least recently used structures as needed.
+        """
+        max_size = self.max_size
+        if size > max_size:
+            return
+
+        new_entry = (_copy_structure(structure), size)
+        with self._lock:
+            previous_entry = self._structures.pop(key, None)
+            if previous_entry is not None:
+                self.size -= previous_entry[1]
+            self._structures[key] = new_entry
+            self.size += size
+            while self.size > max_size:
+                _, (_, evicted_size) = self._structures.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Removes all the cached structures.
+        """
+        with self._lock:
+            self._structures.clear()
+            self.size = 0
+
+
+STRUCTURE_PROCESS_CACHE = StructureProcessCache()
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
+    Deserialized course structures are also kept in the STRUCTURE_PROCESS_CACHE.
 
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
@@ -226,6 +342,12 @@ class CourseStructureCache(object):
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            structure = STRUCTURE_PROCESS_CACHE.get(key)
+            tagger.tag(from_process_cache=str(structure is not None).lower())
+            tagger.measure('process_cache_size', STRUCTURE_PROCESS_CACHE.size)
+            if structure is not None:
+                return structure
+
             try:
                 compressed_pickled_data = self.cache.get(key)
                 tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
@@ -241,9 +363,11 @@ class CourseStructureCache(object):
                 tagger.measure('uncompressed_size', len(pickled_data))
 
                 if six.PY2:
-                    return pickle.loads(pickled_data)
+                    structure = pickle.loads(pickled_data)
                 else:
-                    return pickle.loads(pickled_data, encoding='latin-1')
+                    structure = pickle.loads(pickled_data, encoding='latin-1')
+                STRUCTURE_PROCESS_CACHE.set(key, structure, len(pickled_data))
+                return structure
             except Exception:
                 # The cached data is corrupt in some way, get rid of it.
                 log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
@@ -266,6 +390,8 @@ class CourseStructureCache(object):
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
 
+            STRUCTURE_PROCESS_CACHE.set(key, structure, len(pickled_data))
+
 
 class MongoConnection(object):
     """
@@ -618,5 +744,7 @@ class MongoConnection(object):
             self.structures.remove({})
             self.definitions.remove({})
 
+        STRUCTURE_PROCESS_CACHE.clear()
+
         if connections:
             connection.close()
@@ -812,6 +812,14 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                         # convert_fields gets done later in the runtime's xblock_from_json
                         block.fields.update(definition.get('fields'))
                         block.definition_loaded = True
+            elif depth != 0:
+                # Lazy loading of a subtree: fetch all of its definitions together with the first
+                # one that is needed, instead of one at a time.
+                system.prefetch_definitions(
+                    block.definition
+                    for block in six.itervalues(new_module_data)
+                    if not block.definition_loaded
+                )
 
             system.module_data.update(new_module_data)
             return system.module_data
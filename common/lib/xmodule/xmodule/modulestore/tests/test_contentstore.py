@@ -3,9 +3,11 @@
 """
 
 
+import io
 import logging
 import mimetypes
 import shutil
+import tarfile
 import unittest
 from tempfile import mkdtemp
 from uuid import uuid4
@@ -148,6 +150,39 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(True, False)
+    def test_export_for_course_to_tar(self, deprecated):
+        """
+        Test export to a tarball
+        """
+        self.set_up_assets(deprecated)
+        root_dir = path.Path(mkdtemp())
+        try:
+            tar_buffer = io.BytesIO()
+            with tarfile.open(fileobj=tar_buffer, mode='w:gz') as tar_file:
+                self.contentstore.export_all_for_course(
+                    self.course1_key, 'course/static',
+                    path.Path(root_dir / "policy.json"),
+                    tar_file=tar_file,
+                )
+            self.assertTrue(path.Path(root_dir / "policy.json").isfile())
+            self.assertEqual(root_dir.listdir(), [root_dir / "policy.json"])
+
+            tar_buffer.seek(0)
+            with tarfile.open(fileobj=tar_buffer, mode='r:gz') as tar_file:
+                self.assertEqual(
+                    set(tar_file.getnames()),
+                    {'course/static/' + filename for filename in self.course1_files}
+                )
+                for filename in self.course1_files:
+                    asset_key = self.course1_key.make_asset_key('asset', filename)
+                    self.assertEqual(
+                        tar_file.extractfile('course/static/' + filename).read(),
+                        self.contentstore.find(asset_key).data
+                    )
+        finally:
+            shutil.rmtree(root_dir)
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
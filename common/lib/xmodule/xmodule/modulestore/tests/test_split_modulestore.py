@@ -15,6 +15,7 @@ import six
 from ccx_keys.locator import CCXBlockUsageLocator
 from contracts import contract
 from django.core.cache import InvalidCacheBackendError, caches
+from django.test.utils import override_settings
 from mock import patch
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId, VersionTree
 from path import Path as path
@@ -36,6 +37,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import STRUCTURE_PROCESS_CACHE, StructureProcessCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -1013,6 +1015,29 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @override_settings(COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE=10 * 1024 * 1024)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_process_cache(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        self.addCleanup(STRUCTURE_PROCESS_CACHE.clear)
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # the structure is kept in the process, even if evicted from the cache
+        self.cache.clear()
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+        self.assertEqual(cached_structure, not_cached_structure)
+
+        # modifying the returned structure doesn't modify the cached one
+        root_block = cached_structure['blocks'][cached_structure['root']]
+        root_block.fields['display_name'] = 'Modified'
+        root_block.edit_info.edited_by = 'Modified'
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+        self.assertEqual(cached_structure, not_cached_structure)
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1022,6 +1047,45 @@ class TestCourseStructureCache(SplitModuleTest):
         )
 
 
+class TestStructureProcessCache(unittest.TestCase):
+    """Tests for the StructureProcessCache"""
+
+    def setUp(self):
+        super(TestStructureProcessCache, self).setUp()
+        self.cache = StructureProcessCache()
+
+    def _structure(self, structure_id):
+        """
+        Returns a structure without blocks, with the given id.
+        """
+        return {'_id': structure_id, 'blocks': {}}
+
+    @override_settings(COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE=100)
+    def test_lru_eviction(self):
+        self.cache.set('a', self._structure('a'), 40)
+        self.cache.set('b', self._structure('b'), 40)
+        self.assertEqual(self.cache.get('a'), self._structure('a'))
+
+        # 'b' is now the least recently used structure
+        self.cache.set('c', self._structure('c'), 40)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), self._structure('a'))
+        self.assertEqual(self.cache.get('c'), self._structure('c'))
+        self.assertEqual(self.cache.size, 80)
+        self.assertEqual(self.cache.evictions, 1)
+
+        # structures larger than the maximum size aren't cached
+        self.cache.set('d', self._structure('d'), 101)
+        self.assertIsNone(self.cache.get('d'))
+        self.assertEqual(self.cache.size, 80)
+
+    @override_settings(COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE=0)
+    def test_disabled(self):
+        self.cache.set('a', self._structure('a'), 1)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.size, 0)
+
+
 class SplitModuleItemTests(SplitModuleTest):
     '''
     Item read tests including inheritance
@@ -1275,6 +1339,27 @@ class SplitModuleItemTests(SplitModuleTest):
             expected_ids.remove(child.location.block_id)
         self.assertEqual(len(expected_ids), 0)
 
+    @override_settings(SPLIT_MODULESTORE_PREFETCH_DEFINITIONS=True)
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_prefetch_definitions(self, _from_json):
+        """
+        Test that the definitions of a subtree loaded with a depth are fetched together
+        """
+        locator = BlockUsageLocator(
+            CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT), 'course', 'head12345'
+        )
+        block = modulestore().get_item(locator, depth=1)
+        blocks = [block] + block.get_children()
+        runtime = block.runtime
+        definition_ids = set(child.scope_ids.def_id.definition_id for child in blocks)
+
+        with patch.object(modulestore(), 'get_definition') as mock_get_definition:
+            for definition_id in definition_ids:
+                definition = runtime.get_definition(block.location.course_key, definition_id)
+                self.assertEqual(definition['_id'], definition_id)
+        mock_get_definition.assert_not_called()
+        self.assertEqual(runtime.definition_round_trips_saved, len(definition_ids) - 1)
+
 
 def version_agnostic(children):
     """
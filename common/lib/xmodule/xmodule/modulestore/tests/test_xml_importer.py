@@ -3,8 +3,13 @@ Tests for XML importer.
 """
 
 
+import hashlib
 import importlib
 import os
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 from uuid import uuid4
 
@@ -381,6 +386,48 @@ class StaticContentImporterTest(unittest.TestCase):
                 'static/inner/file1.txt', base_dir=expected_base_dir
             )
 
+    @mock.patch('xmodule.modulestore.xml_importer.STATIC_CONTENT_IMPORT_MAX_BYTES', 10)
+    def test_import_static_content_directory_files(self):
+        course_data_path = path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, course_data_path)
+        os.makedirs(course_data_path / 'static' / 'inner')
+        file_subpaths = ['file{}.txt'.format(index) for index in range(4)] + ['inner/file.txt']
+        for file_subpath in file_subpaths:
+            with open(course_data_path / 'static' / file_subpath, 'wb') as static_file:
+                static_file.write(u'data:{}'.format(file_subpath[-5]).encode('utf-8'))
+
+        # Record the files being saved at once, which are at most 10 bytes in total.
+        saving = []
+        max_saving = []
+        saving_lock = threading.Lock()
+
+        def save(content):
+            with saving_lock:
+                saving.append(content)
+                max_saving.append(len(saving))
+            time.sleep(0.01)
+            with saving_lock:
+                saving.remove(content)
+
+        self.mocked_content_store.find.return_value = None
+        self.mocked_content_store.generate_thumbnail.return_value = (None, None)
+        self.mocked_content_store.save.side_effect = save
+        static_content_importer = StaticContentImporter(
+            static_content_store=self.mocked_content_store,
+            course_data_path=course_data_path,
+            target_id=CourseKey.from_string('course-v1:edX+DemoX+Demo_Course')
+        )
+        remap_dict = static_content_importer.import_static_content_directory('static')
+
+        six.assertCountEqual(self, remap_dict.keys(), file_subpaths)
+        saved_data = {
+            call[0][0].import_path: call[0][0].data for call in self.mocked_content_store.save.call_args_list
+        }
+        self.assertEqual(saved_data, {
+            file_subpath: u'data:{}'.format(file_subpath[-5]).encode('utf-8') for file_subpath in file_subpaths
+        })
+        self.assertEqual(max(max_saving), 1)
+
     def test_import_static_file(self):
         base_dir = path('/path/to/dir')
         full_file_path = os.path.join(base_dir, 'static/some_file.txt')
@@ -392,3 +439,21 @@ class StaticContentImporterTest(unittest.TestCase):
             )
             mock_file.assert_called_with(full_file_path, 'rb')
             self.mocked_content_store.generate_thumbnail.assert_called_once()
+
+    def test_import_unchanged_static_file(self):
+        base_dir = path('/path/to/dir')
+        full_file_path = os.path.join(base_dir, 'static/some_file.txt')
+        self.mocked_content_store.find.return_value = mock.Mock(
+            content_digest=hashlib.md5(b"data").hexdigest(),
+            content_type='text/plain',
+            import_path='static/some_file.txt',
+            locked=False,
+        )
+        self.mocked_content_store.find.return_value.name = 'some_file.txt'
+        with mock.patch(OPEN_BUILTIN, mock.mock_open(read_data=b"data")):
+            self.static_content_importer.import_static_file(
+                full_file_path=full_file_path,
+                base_dir=base_dir
+            )
+        self.mocked_content_store.generate_thumbnail.assert_not_called()
+        self.mocked_content_store.save.assert_not_called()
@@ -107,7 +107,7 @@ class ExportManager(object):
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir, tar_file=None):
         """
         Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -116,12 +116,16 @@ class ExportManager(object):
         `courselike_key`: The Locator of the Descriptor to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `tar_file`: A `tarfile.TarFile` to add the static assets to, under `target_dir`, instead of
+            writing them to `root_dir`. The caller is responsible for adding the rest of the export
+            to the tarball.
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = text_type(target_dir)
+        self.tar_file = tar_file
 
     @abstractmethod
     def get_key(self):
@@ -222,8 +226,9 @@ class CourseExportManager(ExportManager):
         if self.contentstore:
             self.contentstore.export_all_for_course(
                 self.courselike_key,
-                root_courselike_dir + '/static/',
+                self.target_dir + '/static/' if self.tar_file else root_courselike_dir + '/static/',
                 root_courselike_dir + '/policies/assets.json',
+                tar_file=self.tar_file,
             )
 
             # If we are using the default course image, export it to the
@@ -321,8 +326,9 @@ class LibraryExportManager(ExportManager):
         if self.contentstore:
             self.contentstore.export_all_for_course(
                 self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
+                self.target_dir + '/static/' if self.tar_file else self.root_dir + '/' + self.target_dir + '/static/',
                 self.root_dir + '/' + self.target_dir + '/policies/assets.json',
+                tar_file=self.tar_file,
             )
 
     def post_process(self, root, export_fs):
@@ -338,18 +344,18 @@ class LibraryExportManager(ExportManager):
         xml_file.close()
 
 
-def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
+def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir, tar_file=None):
     """
     Thin wrapper for the Course Export Manager. See ExportManager for details.
     """
-    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir).export()
+    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir, tar_file=tar_file).export()
 
 
-def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir):
+def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir, tar_file=None):
     """
     Thin wrapper for the Library Export Manager. See ExportManager for details.
     """
-    LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
+    LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir, tar_file=tar_file).export()
 
 
 def adapt_references(subtree, destination_course_key, export_fs):
@@ -22,13 +22,16 @@ Modulestore virtual   |          XML physical (draft, published)
 """
 
 
+import hashlib
 import json
 import io
 import logging
 import mimetypes
 import os
 import re
+import threading
 from abc import abstractmethod
+from multiprocessing.pool import ThreadPool
 
 import six
 import xblock
@@ -61,6 +64,41 @@ log = logging.getLogger(__name__)
 
 DEFAULT_STATIC_CONTENT_SUBDIR = 'static'
 
+# Number of threads reading and saving the static files of a course in parallel.
+STATIC_CONTENT_IMPORT_WORKERS = 8
+
+# Maximum total size, in bytes, of the static files held in memory by these
+# threads at once.  A larger file is imported alone.
+STATIC_CONTENT_IMPORT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class _BytesInFlight(object):
+    """
+    Bounds the total size of the files read in memory at once by the threads
+    importing static files.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size):
+        """
+        Waits until a file of the given size can be read, and accounts for it.
+        """
+        with self._condition:
+            while self.bytes and self.bytes + size > self.max_bytes:
+                self._condition.wait()
+            self.bytes += size
+
+    def release(self, size):
+        """
+        Accounts for the release of a file of the given size.
+        """
+        with self._condition:
+            self.bytes -= size
+            self._condition.notify_all()
+
 
 class LocationMixin(XBlockMixin):
     """
@@ -104,6 +142,7 @@ class StaticContentImporter:
         remap_dict = {}
 
         static_dir = self.course_data_path / content_subdir
+        file_paths = []
         for dirname, _, filenames in os.walk(static_dir):
             for filename in filenames:
 
@@ -114,15 +153,40 @@ class StaticContentImporter:
                         log.debug('skipping static content %s...', file_path)
                     continue
 
+                file_paths.append(file_path)
+
+        bytes_in_flight = _BytesInFlight(STATIC_CONTENT_IMPORT_MAX_BYTES)
+
+        def import_file(file_path):
+            """
+            Imports the given static file, from a thread of the pool, once the
+            other threads hold few enough bytes in memory.
+            """
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                # The error is handled when the file is read.
+                size = 0
+            bytes_in_flight.acquire(size)
+            try:
                 if verbose:
                     log.debug('importing static content %s...', file_path)
+                return self.import_static_file(file_path, base_dir=static_dir)
+            finally:
+                bytes_in_flight.release(size)
 
-                imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
-
+        # The files are mostly read from the disk and written to the contentstore,
+        # so they're imported in parallel by threads.
+        pool = ThreadPool(STATIC_CONTENT_IMPORT_WORKERS)
+        try:
+            for imported_file_attrs in pool.map(import_file, file_paths):
                 if imported_file_attrs:
                     # store the remapping information which will be needed
                     # to subsitute in the module data
                     remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
+        finally:
+            pool.close()
+            pool.join()
 
         return remap_dict
 
@@ -163,6 +227,10 @@ class StaticContentImporter:
             import_path=file_subpath, locked=locked
         )
 
+        # Skip the assets which are already in the contentstore, e.g. when a course is imported again.
+        if self._is_asset_unchanged(content):
+            return file_subpath, asset_key
+
         # first let's save a thumbnail so we can get back a thumbnail location
         thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(content)
 
@@ -179,6 +247,27 @@ class StaticContentImporter:
 
         return file_subpath, asset_key
 
+    def _is_asset_unchanged(self, content):
+        """
+        Returns whether the contentstore has an asset with the same location,
+        data digest and attributes as the given content.
+        """
+        existing_content = self.static_content_store.find(
+            content.location, throw_on_not_found=False, as_stream=True
+        )
+        if existing_content is None:
+            return False
+        try:
+            return (
+                existing_content.content_digest == hashlib.md5(content.data).hexdigest() and
+                existing_content.name == content.name and
+                existing_content.content_type == content.content_type and
+                existing_content.import_path == content.import_path and
+                existing_content.locked == content.locked
+            )
+        finally:
+            existing_content.close()
+
 
 class ImportManager(object):
     """
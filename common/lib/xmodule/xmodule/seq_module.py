@@ -254,6 +254,8 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             meta = self._get_render_metadata(context, display_items, prereq_met, prereq_meta_info, banner_text, STUDENT_VIEW)
             meta['display_name'] = self.display_name_with_default
             return json.dumps(meta)
+        elif dispatch == 'render_unit':
+            return json.dumps(self._render_unit_fragment(data.get('position', u'')).to_dict())
         raise NotFoundError('Unexpected dispatch type')
 
     @classmethod
@@ -503,11 +505,17 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
         """
         render_items = not context.get('exclude_units', False)
         is_user_authenticated = self.is_user_authenticated(context)
+        # In the lazy_units mode, only the active unit is rendered, and the
+        # others are fetched with the render_unit dispatch on navigation.
+        render_active_item_only = (
+            context.get('lazy_units', False) and
+            view == STUDENT_VIEW and
+            is_user_authenticated and
+            not self.is_time_limited and
+            not context.get('specific_masquerade', False)
+        )
         completion_service = self.runtime.service(self, 'completion')
-        try:
-            bookmarks_service = self.runtime.service(self, 'bookmarks')
-        except NoSuchServiceError:
-            bookmarks_service = None
+        bookmarks_service = self._get_bookmarks_service()
         context['username'] = self.runtime.service(self, 'user').get_current_user().opt_attrs.get(
             'edx-platform.username')
         display_names = [
@@ -515,7 +523,7 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             self.display_name_with_default
         ]
         contents = []
-        for item in display_items:
+        for position, item in enumerate(display_items, start=1):
             # NOTE (CCB): This seems like a hack, but I don't see a better method of determining the type/category.
             item_type = item.get_icon_class()
             usage_id = item.scope_ids.usage_id
@@ -530,7 +538,8 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             context['show_bookmark_button'] = show_bookmark_button
             context['bookmarked'] = is_bookmarked
 
-            if render_items:
+            is_lazy = render_active_item_only and position != self.position
+            if render_items and not is_lazy:
                 rendered_item = item.render(view, context)
                 fragment.add_fragment_resources(rendered_item)
                 content = rendered_item.content
@@ -545,6 +554,8 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
                 'path': " > ".join(display_names + [item.display_name_with_default]),
                 'graded': item.graded
             }
+            if render_items and is_lazy:
+                iteminfo['lazy'] = True
             if not render_items:
                 # The item url format can be defined in the template context like so:
                 # context['item_url'] = '/my/item/path/{usage_key}/whatever'
@@ -557,6 +568,45 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
 
         return contents
 
+    def _get_bookmarks_service(self):
+        """
+        Returns the bookmarks service, or None if it isn't available.
+        """
+        try:
+            return self.runtime.service(self, 'bookmarks')
+        except NoSuchServiceError:
+            return None
+
+    def _render_unit_fragment(self, position):
+        """
+        Returns the rendered student view of the unit at the given position,
+        for the units that weren't rendered with the sequence in the
+        lazy_units mode.
+
+        Raises NotFoundError if there's no such unit, or if the content of
+        the sequence is not available to the user.
+        """
+        display_items = self.get_display_items()
+        if not position.isdigit() or not 1 <= int(position) <= len(display_items):
+            raise NotFoundError('Unexpected position')
+
+        if self.is_time_limited or not self._can_user_view_content(self._get_course()):
+            raise NotFoundError('Unavailable content')
+        if self._required_prereq() and not self.runtime.user_is_staff:
+            prereq_met, __ = self._compute_is_prereq_met(False)
+            if not prereq_met:
+                raise NotFoundError('Unavailable content')
+
+        item = display_items[int(position) - 1]
+        bookmarks_service = self._get_bookmarks_service()
+        context = {
+            'username': self.runtime.service(self, 'user').get_current_user().opt_attrs.get(
+                'edx-platform.username'),
+            'show_bookmark_button': bookmarks_service is not None,
+            'bookmarked': bool(bookmarks_service and bookmarks_service.is_bookmarked(usage_key=item.scope_ids.usage_id)),
+        }
+        return item.render(STUDENT_VIEW, context)
+
     def _locations_in_subtree(self, node):
         """
         The usage keys for all descendants of an XBlock/XModule as a flat list.
@@ -15,6 +15,7 @@ from freezegun import freeze_time
 from mock import Mock, patch
 from six.moves import range
 
+from xmodule.exceptions import NotFoundError
 from xmodule.seq_module import SequenceModule
 from xmodule.tests import get_test_system
 from xmodule.tests.helpers import StubUserService
@@ -356,6 +357,37 @@ class SequenceBlockTestCase(XModuleXmlImportTest):
         self.assertEqual(metadata['tag'], 'sequential')
         self.assertEqual(metadata['display_name'], self.sequence_3_1.display_name_with_default)
 
+    @ddt.data(STUDENT_VIEW, PUBLIC_VIEW)
+    def test_render_lazy_units(self, view):
+        html = self._get_rendered_view(
+            self.sequence_3_1,
+            requested_child='last',
+            extra_context=dict(lazy_units=True),
+            view=view,
+        )
+        self._assert_view_at_position(html, expected_position=3)
+        if view == STUDENT_VIEW:
+            # Only the active unit is rendered.
+            self.assertEqual(html.count('vert_module.html'), 1)
+            self.assertEqual(html.count("'lazy': True"), 2)
+        else:
+            self.assertEqual(html.count('vert_module.html'), 3)
+            self.assertNotIn("'lazy': True", html)
+
+    def test_handle_ajax_render_unit(self):
+        """
+        Test that the units that aren't rendered with the sequence are
+        returned by the render_unit ajax handler.
+        """
+        with patch.object(SequenceModule, '_get_course', return_value=self.course):
+            fragment = json.loads(self.sequence_3_1.handle_ajax('render_unit', {'position': u'2'}))
+            self.assertIn('vert_module.html', fragment['content'])
+            self.assertIn(six.text_type(self.sequence_3_1.get_children()[1].location), fragment['content'])
+
+            for position in (u'0', u'4', u'invalid'):
+                with self.assertRaises(NotFoundError):
+                    self.sequence_3_1.handle_ajax('render_unit', {'position': position})
+
     def get_context_dict_from_string(self, data):
         """
         Retrieve dictionary from string.
@@ -1,12 +1,23 @@
 
 
+import logging
 import re
+import time
+from uuid import uuid4
 
 import six
 from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import RequestCache
+from six.moves import cPickle as pickle
+
+log = logging.getLogger(__name__)
 
 DEFAULT_PYTHON_LIB_FILENAME = 'python_lib.zip'
 
+PYTHON_LIB_DIGEST_CACHE_NAMESPACE = u'sandboxing.python_lib_digest'
+
 
 def can_execute_unsafe_code(course_id):
     """
@@ -33,12 +44,130 @@ def can_execute_unsafe_code(course_id):
     return False
 
 
+def _python_lib_zip_asset_key(course_id):
+    """Return the asset key of the course code library file."""
+    python_lib_filename = getattr(settings, 'PYTHON_LIB_FILENAME', DEFAULT_PYTHON_LIB_FILENAME)
+    return course_id.make_asset_key("asset", python_lib_filename)
+
+
 def get_python_lib_zip(contentstore, course_id):
     """Return the bytes of the course code library file, if it exists."""
-    python_lib_filename = getattr(settings, 'PYTHON_LIB_FILENAME', DEFAULT_PYTHON_LIB_FILENAME)
-    asset_key = course_id.make_asset_key("asset", python_lib_filename)
-    zip_lib = contentstore().find(asset_key, throw_on_not_found=False)
+    zip_lib = contentstore().find(_python_lib_zip_asset_key(course_id), throw_on_not_found=False)
     if zip_lib is not None:
         return zip_lib.data
     else:
         return None
+
+
+def get_python_lib_zip_digest(contentstore, course_id):
+    """
+    Return the digest of the course code library file, or an empty string if
+    it doesn't exist.  Only the file's metadata is read, and the digest is
+    cached for the rest of the request.
+    """
+    cache = RequestCache(PYTHON_LIB_DIGEST_CACHE_NAMESPACE).data
+    if course_id not in cache:
+        zip_lib = contentstore().find(
+            _python_lib_zip_asset_key(course_id), as_stream=True, throw_on_not_found=False
+        )
+        if zip_lib is None:
+            cache[course_id] = u''
+        else:
+            cache[course_id] = six.text_type(zip_lib.content_digest or zip_lib.last_modified_at)
+    return cache[course_id]
+
+
+class SafeExecCache(object):
+    """
+    Cache of the results of capa's safe_exec for the problems of a course,
+    providing the get and set methods expected of safe_exec's `cache`.
+
+    The results are stored in the 'safe_exec' cache, if configured, else in
+    the default cache.  They are kept under the current generation of the
+    course, so that all of the course's results can be evicted at once by
+    starting a new generation, and under the digest of the course's code
+    library, so that results computed with a previous version of the library
+    are not used.  Results whose pickled size exceeds the
+    SAFE_EXEC_CACHE_MAX_RESULT_SIZE setting are not cached.
+
+    The numbers of cache hits and misses and the time spent executing code
+    after a miss are reported as custom metrics.
+    """
+    def __init__(self, course_id, cache=None, get_python_lib_digest=None):
+        """
+        Arguments:
+            course_id (CourseKey) - The course whose problems execute code.
+            cache (django.core.cache.backends.base.BaseCache) - The cache
+                in which to store the results, if not the configured one.
+            get_python_lib_digest (function) - Returns the digest of the
+                course's code library, see get_python_lib_zip_digest.
+        """
+        self.course_id = course_id
+        self._cache = cache or _get_safe_exec_cache()
+        self._get_python_lib_digest = get_python_lib_digest
+        self._generation = None
+        # Times of the cache misses, by key, to measure the execution time
+        # of the code until its result is set.
+        self._miss_times = {}
+
+    def get(self, key):
+        """
+        Returns the cached result for the given safe_exec key, or None.
+        """
+        result = self._cache.get(self._cache_key(key))
+        if result is None:
+            self._miss_times[key] = time.time()
+            monitoring_utils.accumulate('safe_exec.cache_misses', 1)
+        else:
+            monitoring_utils.accumulate('safe_exec.cache_hits', 1)
+        return result
+
+    def set(self, key, value):
+        """
+        Caches the result for the given safe_exec key, unless it is too large.
+        """
+        miss_time = self._miss_times.pop(key, None)
+        if miss_time is not None:
+            monitoring_utils.accumulate('safe_exec.execution_time', time.time() - miss_time)
+
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if size > settings.SAFE_EXEC_CACHE_MAX_RESULT_SIZE:
+            log.info(u'Not caching safe_exec result of %d bytes in course %s', size, self.course_id)
+            monitoring_utils.accumulate('safe_exec.cache_oversized', 1)
+            return
+        self._cache.set(self._cache_key(key), value, timeout=settings.SAFE_EXEC_CACHE_TIMEOUT)
+
+    def evict(self):
+        """
+        Evicts all the cached results of the course, by starting a new
+        generation for it.
+        """
+        self._generation = uuid4().hex
+        self._cache.set(self._generation_cache_key(), self._generation, timeout=None)
+
+    def _cache_key(self, key):
+        """
+        Returns the cache key of the result for the given safe_exec key.
+        """
+        if self._generation is None:
+            self._generation = self._cache.get(self._generation_cache_key())
+            if self._generation is None:
+                self.evict()
+        python_lib_digest = self._get_python_lib_digest() if self._get_python_lib_digest else u''
+        return u'{}.{}.{}.{}'.format(key, self.course_id, self._generation, python_lib_digest)
+
+    def _generation_cache_key(self):
+        """
+        Returns the cache key of the course's current generation.
+        """
+        return u'safe_exec.generation.{}'.format(self.course_id)
+
+
+def _get_safe_exec_cache():
+    """
+    Returns the cache in which to store safe_exec results.
+    """
+    try:
+        return caches['safe_exec']
+    except InvalidCacheBackendError:
+        return caches['default']
@@ -4,6 +4,7 @@ Models for bulk email
 
 
 import logging
+import re
 
 import markupsafe
 import six
@@ -23,7 +24,7 @@ from openedx.core.djangoapps.enrollments.errors import CourseModeNotFoundError
 from openedx.core.lib.html_to_text import html_to_text
 from openedx.core.lib.mail_utils import wrap_message
 from student.roles import CourseInstructorRole, CourseStaffRole
-from util.keyword_substitution import substitute_keywords_with_data
+from util.keyword_substitution import anonymous_id_from_user_id, substitute_keywords_with_data
 from util.query import use_read_replica_if_available
 
 log = logging.getLogger(__name__)
@@ -380,6 +381,14 @@ class CourseEmailTemplate(models.Model):
 
     @staticmethod
     def _render(format_string, message_body, context):
+        """
+        Create a text message using a template, message body and context,
+        see _format, after wrapping long lines.
+        """
+        return wrap_message(CourseEmailTemplate._format(format_string, message_body, context))
+
+    @staticmethod
+    def _format(format_string, message_body, context):
         """
         Create a text message using a template, message body and context.
 
@@ -406,10 +415,9 @@ class CourseEmailTemplate(models.Model):
         # "formatted", so we need to do the same to the tag being
         # searched for.
         message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
-        result = result.replace(message_body_tag, message_body, 1)
 
-        # finally, return the result, after wrapping long lines and without converting to an encoded byte array.
-        return wrap_message(result)
+        # finally, return the result, without converting to an encoded byte array.
+        return result.replace(message_body_tag, message_body, 1)
 
     def render_plaintext(self, plaintext, context):
         """
@@ -433,6 +441,115 @@ class CourseEmailTemplate(models.Model):
                 context[key] = markupsafe.escape(value)
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    @staticmethod
+    def _compile(format_string, message_body, context):
+        """
+        Create a text message using a template, message body and context,
+        leaving a placeholder for each of the RECIPIENT_FIELDS, so that it
+        can be rendered for each recipient by CompiledEmailMessage.
+
+        The `context` dict contains the values that are the same for all
+        the recipients.
+        """
+        context = dict(context, **{field: _recipient_field_placeholder(field) for field in RECIPIENT_FIELDS})
+        message_body = message_body.replace('%%USER_ID%%', _recipient_field_placeholder('anonymous_user_id'))
+        return CourseEmailTemplate._format(format_string, message_body, context)
+
+    def compile_plaintext(self, plaintext, context):
+        """
+        Create plain text message to be rendered for each recipient.
+
+        Convert plain text body (`plaintext`) into a CompiledEmailMessage
+        using the stored plain template and the provided `context` dict.
+        """
+        return CompiledEmailMessage(CourseEmailTemplate._compile(self.plain_template, plaintext, context))
+
+    def compile_htmltext(self, htmltext, context):
+        """
+        Create HTML text message to be rendered for each recipient.
+
+        Convert HTML text body (`htmltext`) into a CompiledEmailMessage
+        using the stored HTML template and the provided `context` dict.
+        """
+        # HTML-escape string values in the context (used for keyword substitution).
+        context = {
+            key: markupsafe.escape(value) if isinstance(value, six.string_types) else value
+            for key, value in six.iteritems(context)
+        }
+        return CompiledEmailMessage(
+            CourseEmailTemplate._compile(self.html_template, htmltext, context), escape_fields=True
+        )
+
+
+# The fields of a CompiledEmailMessage that are specific to each recipient.
+# The anonymous_user_id field is not given by the recipients, but is computed
+# from their user_id when the message uses it.
+RECIPIENT_FIELDS = ('name', 'email', 'user_id', 'unsubscribe_link')
+
+RECIPIENT_FIELD_PLACEHOLDER_RE = re.compile(u'\x00(\\w+)\x00')
+
+
+def _recipient_field_placeholder(field):
+    """
+    Returns the placeholder of the given recipient field in compiled messages.
+    """
+    return u'\x00{}\x00'.format(field)
+
+
+class CompiledEmailMessage(object):
+    """
+    An email message rendered once for all the recipients, with
+    placeholders for the fields specific to each recipient.
+
+    The lines without placeholders are wrapped once, while the lines
+    with placeholders are split around them, to be joined with the
+    values of the fields and wrapped for each recipient.
+    """
+    def __init__(self, message, escape_fields=False):
+        self.escape_fields = escape_fields
+        self.fields = set()
+        # A list of either wrapped text without placeholders,
+        # or lists of the parts of the lines with placeholders,
+        # where every other part is the name of a field.
+        self._chunks = []
+        static_lines = []
+        for line in message.split('\n'):
+            parts = RECIPIENT_FIELD_PLACEHOLDER_RE.split(line)
+            if len(parts) == 1:
+                static_lines.append(line)
+                continue
+            if static_lines:
+                self._chunks.append(wrap_message(u'\n'.join(static_lines)))
+                static_lines = []
+            self._chunks.append(parts)
+            self.fields.update(parts[1::2])
+        if static_lines:
+            self._chunks.append(wrap_message(u'\n'.join(static_lines)))
+
+    def render(self, recipient_context):
+        """
+        Returns the message for the recipient whose fields are given by
+        the `recipient_context` dict.
+        """
+        values = {}
+        for field in self.fields:
+            if field == 'anonymous_user_id':
+                value = anonymous_id_from_user_id(recipient_context['user_id'])
+            else:
+                value = recipient_context[field]
+            if self.escape_fields and isinstance(value, six.string_types):
+                value = markupsafe.escape(value)
+            values[field] = text_type(value)
+
+        chunks = []
+        for chunk in self._chunks:
+            if isinstance(chunk, list):
+                chunk = wrap_message(u''.join(
+                    values[part] if index % 2 else part for index, part in enumerate(chunk)
+                ))
+            chunks.append(chunk)
+        return u'\n'.join(chunks)
+
 
 @python_2_unicode_compatible
 class CourseAuthorization(models.Model):
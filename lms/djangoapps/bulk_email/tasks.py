@@ -12,6 +12,7 @@ import re
 import time
 from collections import Counter
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
 from smtplib import SMTPConnectError, SMTPDataError, SMTPException, SMTPServerDisconnected
 from time import sleep
 
@@ -33,12 +34,14 @@ from celery.states import FAILURE, RETRY, SUCCESS
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives, get_connection
 from django.core.mail.message import forbid_multi_line_headers
+from django.db.models import Exists, OuterRef
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import override as override_language
 from django.utils.translation import ugettext as _
 from markupsafe import escape
 from six import text_type
+from six.moves import zip
 
 from bulk_email.models import CourseEmail, Optout
 from bulk_email.api import get_unsubscribed_link
@@ -47,7 +50,7 @@ from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.subtasks import (
     SubtaskStatus,
     check_subtask_is_valid,
-    queue_subtasks_for_query,
+    queue_subtasks_for_id_ranges,
     update_subtask_status
 )
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
@@ -181,15 +184,7 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
     targets = email_obj.targets.all()
     global_email_context = _get_course_email_context(course)
 
-    recipient_qsets = [
-        target.get_users(course_id, user_id)
-        for target in targets
-    ]
-    # Use union here to combine the qsets instead of the | operator.  This avoids generating an
-    # inefficient OUTER JOIN query that would read the whole user table.
-    combined_set = recipient_qsets[0].union(*recipient_qsets[1:]) if len(recipient_qsets) > 1 \
-        else recipient_qsets[0]
-    recipient_fields = ['profile__name', 'email', 'username']
+    combined_set = _combine_querysets(_get_target_users(targets, course_id, user_id))
 
     log.info(u"Task %s: Preparing to queue subtasks for sending emails for course %s, email %s",
              task_id, course_id, email_id)
@@ -205,28 +200,33 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
         log.warning(msg)
         raise ValueError(msg)
 
-    def _create_send_email_subtask(to_list, initial_subtask_status):
-        """Creates a subtask to send email to a given recipient list."""
+    def _create_send_email_subtask(recipient_range, initial_subtask_status):
+        """Creates a subtask to send email to the recipients in a given range of user ids."""
         subtask_id = initial_subtask_status.task_id
         new_subtask = send_course_email.subtask(
             (
                 entry_id,
                 email_id,
-                to_list,
+                [],
                 global_email_context,
                 initial_subtask_status.to_dict(),
+                recipient_range,
             ),
             task_id=subtask_id,
             routing_key=routing_key,
         )
         return new_subtask
 
-    progress = queue_subtasks_for_query(
+    recipient_ids = _combine_querysets([
+        queryset.values_list('id', flat=True)
+        for queryset in _get_target_users(targets, course_id, user_id)
+    ]).order_by('id')
+
+    progress = queue_subtasks_for_id_ranges(
         entry,
         action_name,
         _create_send_email_subtask,
-        [combined_set],
-        recipient_fields,
+        recipient_ids,
         settings.BULK_EMAIL_EMAILS_PER_TASK,
         total_recipients,
     )
@@ -239,8 +239,61 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
     return progress
 
 
+def _get_target_users(targets, course_id, user_id, after_id=None, through_id=None):
+    """
+    Returns a list of the querysets of the users of each of the given targets,
+    restricted to the users whose ids are greater than `after_id` and lower
+    than or equal to `through_id`, when given.
+    """
+    querysets = []
+    for target in targets:
+        queryset = target.get_users(course_id, user_id)
+        if after_id is not None:
+            queryset = queryset.filter(id__gt=after_id)
+        if through_id is not None:
+            queryset = queryset.filter(id__lte=through_id)
+        querysets.append(queryset)
+    return querysets
+
+
+def _combine_querysets(querysets):
+    """
+    Returns the union of the given querysets.
+    """
+    # Use union here to combine the qsets instead of the | operator.  This avoids generating an
+    # inefficient OUTER JOIN query that would read the whole user table.
+    return querysets[0].union(*querysets[1:]) if len(querysets) > 1 else querysets[0]
+
+
+def _get_recipients_in_range(course_email, user_id, recipient_range):
+    """
+    Returns the list of recipients of the given email whose user ids are in the given
+    (after_id, through_id) range, excluding the users who opted out of the course's
+    emails, along with the number of users who opted out.
+
+    The opt-outs are joined into the query of the recipients, so that a single query
+    returns both.
+    """
+    after_id, through_id = recipient_range
+    optouts = Optout.objects.filter(course_id=course_email.course_id, user=OuterRef('pk'))
+    recipients = _combine_querysets([
+        queryset.annotate(opted_out=Exists(optouts)).values('profile__name', 'email', 'username', 'pk', 'opted_out')
+        for queryset in _get_target_users(
+            course_email.targets.all(), course_email.course_id, user_id, after_id=after_id, through_id=through_id
+        )
+    ])
+    to_list = []
+    num_optout = 0
+    for recipient in recipients:
+        if recipient.pop('opted_out'):
+            num_optout += 1
+        else:
+            to_list.append(recipient)
+    return to_list, num_optout
+
+
 @task(default_retry_delay=settings.BULK_EMAIL_DEFAULT_RETRY_DELAY, max_retries=settings.BULK_EMAIL_MAX_RETRIES)
-def send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status_dict):
+def send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status_dict, recipient_range=None):
     """
     Sends an email to a list of recipients.
 
@@ -269,6 +322,9 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
 
         Most values will be zero on initial call, but may be different when the task is
         invoked as part of a retry.
+      * `recipient_range`: (after_id, through_id) range of the user ids of the recipients of the
+        email's targets to send to, on the initial call.  In that case, the recipients are queried
+        by the subtask, and `to_list` is empty.  Retries are given the remaining `to_list` instead.
 
     Sends to all addresses contained in to_list that are not also in the Optout table.
     Emails are sent multi-part, in both plain text and html.  Updates InstructorTask object
@@ -277,9 +333,10 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
     subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
     current_task_id = subtask_status.task_id
     num_to_send = len(to_list)
-    log.info((u"Preparing to send email %s to %d recipients as subtask %s "
+    log.info((u"Preparing to send email %s to %d recipients (in range %s) as subtask %s "
               u"for instructor task %d: context = %s, status=%s, time=%s"),
-             email_id, num_to_send, current_task_id, entry_id, global_email_context, subtask_status, datetime.now())
+             email_id, num_to_send, recipient_range, current_task_id, entry_id, global_email_context, subtask_status,
+             datetime.now())
 
     # Check that the requested subtask is actually known to the current InstructorTask entry.
     # If this fails, it throws an exception, which should fail this subtask immediately.
@@ -303,6 +360,7 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
             to_list,
             global_email_context,
             subtask_status,
+            recipient_range,
         )
         log.info(
             u"BulkEmail ==> _send_course_email completed in : %s for task : %s with recipient count: %s",
@@ -429,7 +487,58 @@ def _get_source_address(course_id, course_title, course_language, truncate=True)
     return from_addr
 
 
-def _send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status):
+class _MessageBatch(list):
+    """
+    A batch of email messages to send together, which keeps count of
+    the messages that the email backend attempts to send, so that when
+    sending fails, the messages sent before the failing one are known.
+    """
+    def __init__(self, *args, **kwargs):
+        super(_MessageBatch, self).__init__(*args, **kwargs)
+        # The (index, recipient number) of the recipient of each message.
+        self.recipients = []
+        self.num_attempted = 0
+
+    def __iter__(self):
+        self.num_attempted = 0
+        for message in super(_MessageBatch, self).__iter__():
+            self.num_attempted += 1
+            yield message
+
+    @property
+    def num_sent(self):
+        """
+        Returns the number of messages sent before sending failed.
+        """
+        return max(self.num_attempted, 1) - 1
+
+
+def _send_message_batches(connections, batches, pool=None):
+    """
+    Sends each of the given batches of email messages on one of the
+    given connections, concurrently if a pool of threads is given.
+
+    Returns a list of the exceptions raised while sending each batch,
+    or None for the batches that were sent successfully.
+    """
+    def send_message_batch(connection_and_batch):
+        """
+        Sends the batch on the connection and returns the raised exception, if any.
+        """
+        connection, batch = connection_and_batch
+        try:
+            connection.send_messages(batch)
+        except Exception as exc:  # pylint: disable=broad-except
+            return exc
+        return None
+
+    connections_and_batches = list(zip(connections, batches))
+    if pool is not None and len(connections_and_batches) > 1:
+        return pool.map(send_message_batch, connections_and_batches)
+    return [send_message_batch(connection_and_batch) for connection_and_batch in connections_and_batches]
+
+
+def _send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status, recipient_range=None):
     """
     Performs the email sending task.
 
@@ -446,9 +555,13 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         for all recipients of this email.  This dict is to be used to fill in slots in email
         template.  It does not include 'name' and 'email', which will be provided by the to_list.
       * `subtask_status` : object of class SubtaskStatus representing current status.
+      * `recipient_range`: (after_id, through_id) range of the user ids of the recipients to
+        query instead of using `to_list`, if not None.
 
     Sends to all addresses contained in to_list that are not also in the Optout table.
-    Emails are sent multi-part, in both plain text and html.
+    Emails are sent multi-part, in both plain text and html, in batches of
+    settings.BULK_EMAIL_SEND_BATCH_SIZE emails, on each of the
+    settings.BULK_EMAIL_CONNECTIONS_PER_SUBTASK connections concurrently.
 
     Returns a tuple of two values:
       * First value is a SubtaskStatus object which represents current progress at the end of this call.
@@ -458,7 +571,8 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         'failed' count above.
     """
     # Get information from current task's request:
-    parent_task_id = InstructorTask.objects.get(pk=entry_id).task_id
+    entry = InstructorTask.objects.get(pk=entry_id)
+    parent_task_id = entry.task_id
     task_id = subtask_status.task_id
     total_recipients = len(to_list)
     recipient_num = 0
@@ -492,7 +606,11 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
     # that existed at that time, and we don't need to keep checking for changes
     # in the Optout list.
     if subtask_status.get_retry_count() == 0:
-        to_list, num_optout = _filter_optouts_from_recipients(to_list, course_email.course_id)
+        if recipient_range is not None:
+            to_list, num_optout = _get_recipients_in_range(course_email, entry.requester_id, recipient_range)
+            total_recipients = len(to_list) + num_optout
+        else:
+            to_list, num_optout = _filter_optouts_from_recipients(to_list, course_email.course_id)
         subtask_status.increment(skipped=num_optout)
 
     course_title = global_email_context['course_title']
@@ -505,150 +623,198 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
 
+    pool = None
+    connections = []
     try:
-        connection = get_connection()
-        connection.open()
+        # Open the connections to send the batches of emails on, concurrently if there are several.
+        num_connections = max(settings.BULK_EMAIL_CONNECTIONS_PER_SUBTASK, 1)
+        for __ in range(num_connections):
+            connection = get_connection()
+            connection.open()
+            connections.append(connection)
+        if num_connections > 1:
+            pool = ThreadPool(num_connections)
 
         # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
+        email_context = {'course_id': course_email.course_id}
         email_context.update(global_email_context)
 
+        # Construct message content using templates and context, once for all the recipients:
+        plaintext_template = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        html_template = course_email_template.compile_htmltext(course_email.html_message, email_context)
+
         start_time = time.time()
         while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
-            # That way, the to_list will always contain the recipients remaining to be emailed.
+            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
+            # but if a task has been retried for rate-limiting reasons, then we send
+            # emails one at a time on a single connection, and sleep for a period of time
+            # between all emails within this task.  Choice of the value depends on the
+            # number of workers that might be sending email in parallel, and what the SES
+            # throttle rate is.
+            throttled = subtask_status.retried_nomax > 0
+            num_batches = 1 if throttled else num_connections
+            batch_size = 1 if throttled else max(settings.BULK_EMAIL_SEND_BATCH_SIZE, 1)
+
+            # Create the emails for the users at the end of the list.  At the end of
+            # processing these users, they will be removed from the to_list.  That way,
+            # the to_list will always contain the recipients remaining to be emailed.
             # This is convenient for retries, which will need to send to those who haven't
             # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            if _has_non_ascii_characters(email):
-                to_list.pop()
-                total_recipients_failed += 1
-                log.info(
-                    u"BulkEmail ==> Email address %s contains non-ascii characters. Skipping sending "
-                    u"email to %s, EmailId: %s ",
-                    email,
-                    current_recipient['profile__name'],
-                    email_id
-                )
-                subtask_status.increment(failed=1)
-                continue
-
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-            email_context['unsubscribe_link'] = get_unsubscribed_link(current_recipient['username'],
-                                                                      text_type(course_email.course_id))
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                course_email.subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
-
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
-
-            try:
-                log.info(
-                    u"BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                    Recipient name: %s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    current_recipient['profile__name'],
-                    email
-                )
-                connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.error(
-                    u"BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
-                    # This will fall through and not retry the message.
-                    log.warning(
-                        u'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                        Email not delivered to %s due to error %s',
-                        parent_task_id,
-                        task_id,
-                        email_id,
-                        recipient_num,
-                        total_recipients,
+            pending_recipients = to_list[-num_batches * batch_size:]
+            processed = set()
+            batches = []
+            batch = _MessageBatch()
+            for index in reversed(range(len(pending_recipients))):
+                recipient_num += 1
+                current_recipient = pending_recipients[index]
+                email = current_recipient['email']
+                if _has_non_ascii_characters(email):
+                    processed.add(index)
+                    total_recipients_failed += 1
+                    log.info(
+                        u"BulkEmail ==> Email address %s contains non-ascii characters. Skipping sending "
+                        u"email to %s, EmailId: %s ",
                         email,
-                        exc.smtp_error
+                        current_recipient['profile__name'],
+                        email_id
                     )
                     subtask_status.increment(failed=1)
-
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                total_recipients_failed += 1
-                log.error(
-                    u"BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
-                    EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email,
-                    exc
-                )
-                subtask_status.increment(failed=1)
-
-            else:
-                total_recipients_successful += 1
-                log.info(
-                    u"BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s,",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
+                    continue
+
+                recipient_context = {
+                    'email': email,
+                    'name': current_recipient['profile__name'],
+                    'user_id': current_recipient['pk'],
+                    'unsubscribe_link': get_unsubscribed_link(
+                        current_recipient['username'], text_type(course_email.course_id)
+                    ),
+                }
+
+                # Create email:
+                email_msg = EmailMultiAlternatives(
+                    course_email.subject,
+                    plaintext_template.render(recipient_context),
+                    from_addr,
+                    [email],
                 )
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info(u'Email with id %s sent to %s', email_id, email)
-                else:
-                    log.debug(u'Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
-
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+                email_msg.attach_alternative(html_template.render(recipient_context), 'text/html')
+                batch.append(email_msg)
+                batch.recipients.append((index, recipient_num))
+
+                if len(batch) == batch_size:
+                    batches.append(batch)
+                    batch = _MessageBatch()
+            if batch:
+                batches.append(batch)
+
+            if throttled:
+                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+
+            log.info(
+                u"BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Sending %s emails in %s batches",
+                parent_task_id,
+                task_id,
+                email_id,
+                sum(len(batch) for batch in batches),
+                len(batches)
+            )
+            send_errors = _send_message_batches(connections, batches, pool)
+
+            # Record the outcome of sending each email.  When sending a batch fails, the
+            # emails before the failing one have been sent, and the ones after it have not
+            # been attempted, so they remain on the to_list.
+            retry_exc = None
+            for batch, send_error in zip(batches, send_errors):
+                num_sent = len(batch) if send_error is None else batch.num_sent
+                for message_num, (index, current_recipient_num) in enumerate(batch.recipients):
+                    email = pending_recipients[index]['email']
+                    if message_num < num_sent:
+                        total_recipients_successful += 1
+                        log.info(
+                            u"BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
+                            Recipient num: %s/%s, Email address: %s,",
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            current_recipient_num,
+                            total_recipients,
+                            email
+                        )
+                        if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                            log.info(u'Email with id %s sent to %s', email_id, email)
+                        else:
+                            log.debug(u'Email with id %s sent to %s', email_id, email)
+                        subtask_status.increment(succeeded=1)
+
+                    elif message_num == num_sent:
+                        if isinstance(send_error, SMTPDataError):
+                            # According to SMTP spec, we'll retry error codes in the 4xx range.
+                            # 5xx range indicates hard failure.
+                            total_recipients_failed += 1
+                            log.error(
+                                u"BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
+                                Recipient num: %s/%s, Email address: %s",
+                                parent_task_id,
+                                task_id,
+                                email_id,
+                                current_recipient_num,
+                                total_recipients,
+                                email
+                            )
+                            if send_error.smtp_code >= 400 and send_error.smtp_code < 500:
+                                # This will cause the outer handler to catch the exception and retry
+                                # the entire task.
+                                retry_exc = retry_exc or send_error
+                                break
+                            # This will fall through and not retry the message.
+                            log.warning(
+                                u'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                                Email not delivered to %s due to error %s',
+                                parent_task_id,
+                                task_id,
+                                email_id,
+                                current_recipient_num,
+                                total_recipients,
+                                email,
+                                send_error.smtp_error
+                            )
+                            subtask_status.increment(failed=1)
+
+                        elif isinstance(send_error, SINGLE_EMAIL_FAILURE_ERRORS):
+                            # This will fall through and not retry the message.
+                            total_recipients_failed += 1
+                            log.error(
+                                u"BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                                EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
+                                parent_task_id,
+                                task_id,
+                                email_id,
+                                current_recipient_num,
+                                total_recipients,
+                                email,
+                                send_error
+                            )
+                            subtask_status.increment(failed=1)
+
+                        else:
+                            # This will cause the outer handlers to catch the exception.
+                            retry_exc = retry_exc or send_error
+                            break
+
+                    else:
+                        break
+
+                    # The user that was emailed is removed from the list only once they have
+                    # successfully been processed.  (That way, if there were a failure that
+                    # needed to be retried, the user is still on the list.)
+                    recipients_info[email] += 1
+                    processed.add(index)
+
+            to_list[len(to_list) - len(pending_recipients):] = [
+                recipient for index, recipient in enumerate(pending_recipients) if index not in processed
+            ]
+            if retry_exc is not None:
+                raise retry_exc
 
         log.info(
             u"BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
@@ -726,7 +892,10 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        for connection in connections:
+            connection.close()
+        if pool is not None:
+            pool.close()
 
 
 def _get_current_task():
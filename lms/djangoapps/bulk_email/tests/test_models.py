@@ -269,6 +269,24 @@ class CourseEmailTemplateTest(TestCase):
         self.assertIn(context['course_title'], message)
         self.assertIn(context['name'], message)
 
+    @ddt.data('plaintext', 'htmltext')
+    def test_compile(self, message_format):
+        template = CourseEmailTemplate.get_template()
+        context = self._add_xss_fields(self._get_sample_html_context())
+        context['user_id'] = UserFactory().id
+        recipient_fields = ('name', 'email', 'user_id', 'unsubscribe_link')
+        message = u"Dear %%USER_FULLNAME%% (%%USER_ID%%), thanks for enrolling in %%COURSE_DISPLAY_NAME%%.\n" + (
+            u"This is a long line. " * 50 + u"%%USER_FULLNAME%%"
+        )
+
+        compiled_message = getattr(template, 'compile_' + message_format)(
+            message, {key: value for key, value in context.items() if key not in recipient_fields}
+        )
+        self.assertEqual(
+            compiled_message.render({field: context[field] for field in recipient_fields}),
+            getattr(template, 'render_' + message_format)(message, dict(context)),
+        )
+
 
 class CourseAuthorizationTest(TestCase):
     """Test the CourseAuthorization model."""
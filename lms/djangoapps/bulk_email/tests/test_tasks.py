@@ -13,6 +13,7 @@ from itertools import chain, cycle, repeat
 from smtplib import SMTPAuthenticationError, SMTPConnectError, SMTPDataError, SMTPServerDisconnected
 from uuid import uuid4
 
+import six
 from boto.exception import AWSConnectionError
 from boto.ses.exceptions import (
     SESAddressBlacklistedError,
@@ -28,12 +29,13 @@ from boto.ses.exceptions import (
 from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 from mock import Mock, patch
 from opaque_keys.edx.locator import CourseLocator
 from six.moves import range
 
 from bulk_email.models import SEND_TO_LEARNERS, SEND_TO_MYSELF, SEND_TO_STAFF, CourseEmail, Optout
-from bulk_email.tasks import _get_course_email_context
+from bulk_email.tasks import _get_course_email_context, _get_recipients_in_range
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, update_subtask_status
 from lms.djangoapps.instructor_task.tasks import send_bulk_course_email
@@ -462,6 +464,88 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
             get_conn.return_value.send_messages.side_effect = cycle([None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
 
+    def _send_messages_side_effect(self, sent_emails, failing_emails, exception):
+        """
+        Returns a side effect for send_messages that sends the messages in turn, like
+        email backends do, recording the emails that are sent and raising the exception
+        the first time that a message is sent to one of the failing emails.
+        """
+        def send_messages(messages):
+            """
+            Sends the messages, or raises the exception.
+            """
+            for message in messages:
+                email = message.to[0]
+                if email in failing_emails:
+                    failing_emails.remove(email)
+                    raise exception
+                sent_emails.append(email)
+            return len(messages)
+        return send_messages
+
+    @override_settings(BULK_EMAIL_SEND_BATCH_SIZE=4, BULK_EMAIL_CONNECTIONS_PER_SUBTASK=2)
+    def test_batches_with_email_address_failures(self):
+        num_emails = 20
+        # We also send email to the instructor:
+        students = self._create_students(num_emails - 1)
+        failing_emails = [student.email for student in students[::5]]
+        expected_fails = len(failing_emails)
+        sent_emails = []
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = self._send_messages_side_effect(
+                sent_emails, list(failing_emails), SESAddressBlacklistedError(554, "Email address is blacklisted"),
+            )
+            self._test_run_with_task(
+                send_bulk_course_email, 'emailed', num_emails, num_emails - expected_fails, failed=expected_fails
+            )
+        self.assertEqual(get_conn.call_count, 2)
+        six.assertCountEqual(
+            self,
+            sent_emails,
+            [self.instructor.email] + [student.email for student in students if student.email not in failing_emails],
+        )
+
+    @override_settings(BULK_EMAIL_SEND_BATCH_SIZE=4, BULK_EMAIL_CONNECTIONS_PER_SUBTASK=2)
+    def test_batches_with_retry(self):
+        num_emails = 20
+        # We also send email to the instructor:
+        students = self._create_students(num_emails - 1)
+        sent_emails = []
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = self._send_messages_side_effect(
+                sent_emails, [students[10].email], SMTPDataError(455, "Throttling: Sending rate exceeded"),
+            )
+            self._test_run_with_task(
+                send_bulk_course_email, 'emailed', num_emails, num_emails, retried_nomax=1
+            )
+        # Every email is sent once, whether it was sent before or after the retry.
+        six.assertCountEqual(self, sent_emails, [self.instructor.email] + [student.email for student in students])
+
+    def test_get_recipients_in_range(self):
+        students = self._create_students(6)
+        Optout.objects.create(user=students[1], course_id=self.course.id)
+        course_email = CourseEmail.create(
+            self.course.id,
+            self.instructor,
+            [SEND_TO_MYSELF, SEND_TO_STAFF, SEND_TO_LEARNERS],
+            "Test Subject",
+            "<p>This is a test message</p>",
+        )
+        with self.assertNumQueries(2):
+            to_list, num_optout = _get_recipients_in_range(
+                course_email, self.instructor.id, (students[0].id, students[3].id)
+            )
+        self.assertEqual(num_optout, 1)
+        six.assertCountEqual(
+            self,
+            to_list,
+            [
+                {'pk': student.id, 'email': student.email, 'username': student.username,
+                 'profile__name': student.profile.name}
+                for student in students[2:4]
+            ],
+        )
+
     def test_get_course_email_context_has_correct_keys(self):
         result = _get_course_email_context(self.course)
         self.assertIn('course_title', result)
@@ -22,3 +22,5 @@ instead (https://openedx.atlassian.net/browse/MA-1019).  We have
 introduced this redundancy in the short-term as an incremental
 implementation approach, reducing risk with initial release of this app.
 """
+
+default_app_config = 'lms.djangoapps.course_blocks.apps.CourseBlocksConfig'  # pylint: disable=invalid-name
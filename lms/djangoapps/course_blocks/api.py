@@ -5,14 +5,20 @@ get_course_blocks function.
 
 
 from django.conf import settings
-from edx_when import field_data
 
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.features.content_type_gating.block_transformers import ContentTypeGateTransformer
 
-from .transformers import library_content, load_override_data, start_date, user_partitions, visibility
-from .usage_info import CourseUsageInfo
+from .transformers import (
+    date_overrides,
+    library_content,
+    load_override_data,
+    start_date,
+    user_partitions,
+    visibility
+)
+from .usage_info import CourseUsageInfo, invalidate_user_version
 
 INDIVIDUAL_STUDENT_OVERRIDE_PROVIDER = (
     'lms.djangoapps.courseware.student_field_overrides.IndividualStudentOverrideProvider'
@@ -43,7 +49,7 @@ def get_course_block_access_transformers(user):
         ContentTypeGateTransformer(),
         user_partitions.UserPartitionTransformer(),
         visibility.VisibilityTransformer(),
-        field_data.DateOverrideTransformer(user),
+        date_overrides.DateOverrideTransformer(user),
     ]
 
     if has_individual_student_override_provider():
@@ -97,3 +103,13 @@ def get_course_blocks(
         starting_block_usage_key,
         collected_block_structure,
     )
+
+
+def invalidate_user_course_blocks(course_key, user_id):
+    """
+    Invalidates any transformed course blocks that were cached for the
+    given user in the given course.  To be called whenever user state
+    that is read by the course block transformers changes, such as the
+    user's cohort, enrollment or overrides.
+    """
+    invalidate_user_version(course_key, user_id)
@@ -0,0 +1,81 @@
+"""
+Signal handlers for invalidating cached transformed course blocks when
+the user and course state read by the course block transformers changes.
+"""
+
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from lms.djangoapps.courseware.models import StudentFieldOverride
+from openedx.core.djangoapps.content.block_structure.api import clear_transformed_course_from_cache
+from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup
+from openedx.core.djangoapps.course_groups.signals.signals import COHORT_MEMBERSHIP_UPDATED
+from openedx.core.djangoapps.schedules.models import Schedule
+from student.models import CourseAccessRole
+from student.signals import ENROLL_STATUS_CHANGE, ENROLLMENT_TRACK_UPDATED
+
+from .api import invalidate_user_course_blocks
+
+
+@receiver(COHORT_MEMBERSHIP_UPDATED)
+@receiver(ENROLLMENT_TRACK_UPDATED)
+def _handle_user_course_state_change(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the user's cached course blocks when the user's cohort
+    or enrollment track changes.
+    """
+    invalidate_user_course_blocks(course_key, user.id)
+
+
+@receiver(ENROLL_STATUS_CHANGE)
+def _handle_enroll_status_change(sender, user, course_id=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the user's cached course blocks when the user enrolls
+    in or unenrolls from the course.
+    """
+    if course_id:
+        invalidate_user_course_blocks(course_id, user.id)
+
+
+@receiver(post_save, sender=StudentFieldOverride)
+@receiver(post_delete, sender=StudentFieldOverride)
+def _handle_student_field_override_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the student's cached course blocks when the student's
+    field overrides change.
+    """
+    invalidate_user_course_blocks(instance.course_id, instance.student_id)
+
+
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+def _handle_schedule_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the learner's cached course blocks when the learner's
+    schedule changes, since it determines the learner's personalized dates.
+    """
+    invalidate_user_course_blocks(instance.enrollment.course_id, instance.enrollment.user_id)
+
+
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+def _handle_course_access_role_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the user's cached course blocks when the user's roles in
+    the course change, such as becoming a beta tester.  Staff access is
+    part of the user's fingerprint, so org wide roles need no invalidation.
+    """
+    if instance.course_id:
+        invalidate_user_course_blocks(instance.course_id, instance.user_id)
+
+
+@receiver(post_save, sender=CourseUserGroupPartitionGroup)
+@receiver(post_delete, sender=CourseUserGroupPartitionGroup)
+def _handle_cohort_partition_group_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates all cached course blocks of the course when a cohort is
+    linked to or unlinked from a content group, since that changes the
+    partition groups of all the cohort's members.
+    """
+    clear_transformed_course_from_cache(instance.course_user_group.course_id)
@@ -0,0 +1,83 @@
+"""
+Tests for the invalidation of cached transformed course blocks.
+"""
+
+
+from opaque_keys.edx.locator import CourseLocator
+
+from lms.djangoapps.courseware.student_field_overrides import override_field_for_user
+from openedx.core.djangoapps.schedules.tests.factories import ScheduleFactory
+from openedx.core.djangoapps.schedules.utils import reset_self_paced_schedule
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from student.models import CourseEnrollment
+from student.roles import CourseBetaTesterRole, OrgStaffRole
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import ToyCourseFactory
+
+from ..usage_info import get_user_version
+
+
+class UserVersionSignalsTest(CacheIsolationTestCase):
+    """
+    Tests that changes to the user's state in the course start a new
+    version of the user's state.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(UserVersionSignalsTest, self).setUp()
+        self.user = UserFactory.create()
+        self.course_key = CourseLocator('org', 'course', 'run')
+
+    def assert_version_changes(self, change, course_key=None, user=None):
+        """
+        Asserts that the version of the user's state in the course changes
+        when calling the given function.
+        """
+        course_key = course_key or self.course_key
+        user = user or self.user
+        version = get_user_version(course_key, user.id)
+        change()
+        self.assertNotEqual(get_user_version(course_key, user.id), version)
+
+    def test_beta_tester_role(self):
+        role = CourseBetaTesterRole(self.course_key)
+        self.assert_version_changes(lambda: role.add_users(self.user))
+        self.assert_version_changes(lambda: role.remove_users(self.user))
+
+    def test_org_role(self):
+        version = get_user_version(self.course_key, self.user.id)
+        OrgStaffRole(self.course_key.org).add_users(self.user)
+        self.assertEqual(get_user_version(self.course_key, self.user.id), version)
+
+    def test_schedule(self):
+        schedule = ScheduleFactory.create(enrollment__course__self_paced=True)
+        enrollment = schedule.enrollment
+        self.assert_version_changes(schedule.save, enrollment.course_id, enrollment.user)
+        self.assert_version_changes(
+            lambda: reset_self_paced_schedule(enrollment.user, enrollment.course_id),
+            enrollment.course_id,
+            enrollment.user,
+        )
+
+
+class CourseUserStateSignalsTest(ModuleStoreTestCase):
+    """
+    Tests that enrollments and field overrides start a new version of the
+    user's state in the course.
+    """
+    def setUp(self):
+        super(CourseUserStateSignalsTest, self).setUp()
+        self.user = UserFactory.create()
+        self.course = ToyCourseFactory.create()
+
+    def test_enrollment(self):
+        version = get_user_version(self.course.id, self.user.id)
+        CourseEnrollment.enroll(self.user, self.course.id)
+        self.assertNotEqual(get_user_version(self.course.id, self.user.id), version)
+
+    def test_field_override(self):
+        version = get_user_version(self.course.id, self.user.id)
+        override_field_for_user(self.user, self.course, 'display_name', u'Overridden')
+        self.assertNotEqual(get_user_version(self.course.id, self.user.id), version)
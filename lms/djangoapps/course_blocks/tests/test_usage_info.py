@@ -0,0 +1,58 @@
+"""
+Tests for CourseUsageInfo and the versions of the users' course state.
+"""
+
+
+from opaque_keys.edx.locator import CourseLocator
+
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from student.tests.factories import UserFactory
+
+from ..usage_info import CourseUsageInfo, get_user_version, get_user_version_fingerprint, invalidate_user_version
+
+
+class UserVersionTest(CacheIsolationTestCase):
+    """
+    Tests for the versions of the users' state in a course.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(UserVersionTest, self).setUp()
+        self.user = UserFactory.create()
+        self.other_user = UserFactory.create()
+        self.course_key = CourseLocator('org', 'course', 'run')
+
+    def test_version_is_stable(self):
+        self.assertEqual(
+            get_user_version(self.course_key, self.user.id),
+            get_user_version(self.course_key, self.user.id),
+        )
+
+    def test_invalidate_user_version(self):
+        version = get_user_version(self.course_key, self.user.id)
+        other_version = get_user_version(self.course_key, self.other_user.id)
+        invalidate_user_version(self.course_key, self.user.id)
+        self.assertNotEqual(get_user_version(self.course_key, self.user.id), version)
+        self.assertEqual(get_user_version(self.course_key, self.other_user.id), other_version)
+
+    def test_user_version_fingerprint(self):
+        fingerprint = get_user_version_fingerprint(self.course_key, self.user.id)
+        self.assertTrue(fingerprint.startswith(u'{}.'.format(self.user.id)))
+        invalidate_user_version(self.course_key, self.user.id)
+        self.assertNotEqual(get_user_version_fingerprint(self.course_key, self.user.id), fingerprint)
+
+    def _user_fingerprint(self, has_staff_access=False):
+        """
+        Returns the user fingerprint of a new CourseUsageInfo for the user.
+        """
+        usage_info = CourseUsageInfo(self.course_key, self.user)
+        usage_info._has_staff_access = has_staff_access  # pylint: disable=protected-access
+        return usage_info.user_fingerprint
+
+    def test_user_fingerprint(self):
+        fingerprint = self._user_fingerprint()
+        self.assertEqual(self._user_fingerprint(), fingerprint)
+        self.assertNotEqual(self._user_fingerprint(has_staff_access=True), fingerprint)
+        invalidate_user_version(self.course_key, self.user.id)
+        self.assertNotEqual(self._user_fingerprint(), fingerprint)
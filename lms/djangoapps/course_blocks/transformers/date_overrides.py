@@ -0,0 +1,21 @@
+"""
+Date Overrides Transformer
+"""
+
+
+from edx_when import field_data
+
+from ..usage_info import get_user_version_fingerprint
+
+
+class DateOverrideTransformer(field_data.DateOverrideTransformer):
+    """
+    Extends edx-when's DateOverrideTransformer, which applies the user's
+    personalized dates, with support for caching its transform output.
+    """
+    def transform_fingerprint(self, usage_info):
+        # The personalized dates are applied for self.user rather than
+        # for the usage_info's user, and are determined by the user's
+        # enrollment, schedule and due date extensions, all part of the
+        # user's version.
+        return get_user_version_fingerprint(usage_info.course_key, self.user.id)
@@ -71,6 +71,11 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
                 summary = summarize_block(child_key)
                 block_structure.set_transformer_block_field(child_key, cls, 'block_analytics_summary', summary)
 
+    def transform_fingerprint(self, usage_info):
+        # The children selected for the user are stored in the user's
+        # state, and remain the same once selected.
+        return usage_info.user_fingerprint
+
     def transform_block_filters(self, usage_info, block_structure):
         all_library_children = set()
         all_selected_children = set()
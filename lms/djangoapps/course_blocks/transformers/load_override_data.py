@@ -8,6 +8,8 @@ import json
 from lms.djangoapps.courseware.models import StudentFieldOverride
 from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
 
+from ..usage_info import get_user_version_fingerprint
+
 # The list of fields are in support of Individual due dates and could be expanded for other use cases.
 REQUESTED_FIELDS = [
     'start',
@@ -80,6 +82,11 @@ class OverrideDataTransformer(BlockStructureTransformer):
         # collect basic xblock fields
         block_structure.request_xblock_fields(*REQUESTED_FIELDS)
 
+    def transform_fingerprint(self, usage_info):
+        # The overrides are loaded for self.user rather than for the
+        # usage_info's user.
+        return get_user_version_fingerprint(usage_info.course_key, self.user.id)
+
     def transform(self, usage_info, block_structure):
         """
         loads override data into blocks
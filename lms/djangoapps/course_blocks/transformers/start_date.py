@@ -69,6 +69,13 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
             func_merge_ancestors=max,
         )
 
+    def transform_fingerprint(self, usage_info):
+        # The output depends on the current time and on whether the
+        # user is a beta tester.
+        if usage_info.has_staff_access:
+            return u'staff'
+        return u'{}.{}'.format(usage_info.user_fingerprint, usage_info.time_fingerprint)
+
     def transform_block_filters(self, usage_info, block_structure):
         # Users with staff access bypass the Start Date check.
         if usage_info.has_staff_access:
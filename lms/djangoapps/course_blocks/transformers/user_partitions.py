@@ -78,6 +78,12 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
             merged_group_access = _MergedGroupAccess(user_partitions, xblock, merged_parent_access_list)
             block_structure.set_transformer_block_field(block_key, cls, 'merged_group_access', merged_group_access)
 
+    def transform_fingerprint(self, usage_info):
+        # The user's partition groups are determined by the user's
+        # cohort, enrollment and masquerade, all part of the user's
+        # fingerprint.
+        return usage_info.user_fingerprint
+
     def transform_block_filters(self, usage_info, block_structure):
         user = usage_info.user
         result_list = SplitTestTransformer().transform_block_filters(usage_info, block_structure)
@@ -4,7 +4,15 @@ Transformers.
 """
 
 
+import time
+from uuid import uuid4
+
+import six
+from django.core.cache import cache
+
 from lms.djangoapps.courseware.access import _has_access_to_course
+from lms.djangoapps.courseware.masquerade import get_course_masquerade
+from openedx.core.djangoapps.content.block_structure import config as block_structure_config
 
 
 class CourseUsageInfo(object):
@@ -24,6 +32,9 @@ class CourseUsageInfo(object):
         # Cached value of whether the user has staff access (bool/None)
         self._has_staff_access = None
 
+        # Cached value of the user's fingerprint (string/None)
+        self._user_fingerprint = None
+
     @property
     def has_staff_access(self):
         '''
@@ -36,3 +47,79 @@ class CourseUsageInfo(object):
         if self._has_staff_access is None:
             self._has_staff_access = _has_access_to_course(self.user, 'staff', self.course_key)
         return self._has_staff_access
+
+    @property
+    def user_fingerprint(self):
+        '''
+        Returns a fingerprint of the user's state in the course, for use
+        by the transform_fingerprint method of transformers whose output
+        depends on the user.
+
+        The fingerprint includes the user's masquerade settings, whether
+        the user has staff access, and the user's version for the course,
+        which changes whenever the user's cohort, enrollment, schedule,
+        roles or overrides in the course change.
+        '''
+        if self._user_fingerprint is None:
+            course_masquerade = get_course_masquerade(self.user, self.course_key)
+            self._user_fingerprint = u'{version}.{staff}.{masquerade}'.format(
+                version=get_user_version_fingerprint(self.course_key, self.user.id),
+                staff=int(self.has_staff_access),
+                masquerade=(
+                    u'{0.role}.{0.user_partition_id}.{0.group_id}.{0.user_name}'.format(course_masquerade)
+                    if course_masquerade else u''
+                ),
+            )
+        return self._user_fingerprint
+
+    @property
+    def time_fingerprint(self):
+        '''
+        Returns a fingerprint of the current time, for use by the
+        transform_fingerprint method of transformers whose output depends
+        on the current time.
+
+        The fingerprint changes once per transformed cache timeout, so
+        that date changes take effect no later than if the transformed
+        block structure had expired.
+        '''
+        timeout = block_structure_config.transformed_cache_timeout_in_seconds() or 1
+        return six.text_type(int(time.time()) // timeout)
+
+
+def get_user_version_fingerprint(course_key, user_id):
+    '''
+    Returns a fingerprint of the given user's state in the given course,
+    made of the user's id and current version for the course.
+    '''
+    return u'{}.{}'.format(user_id, get_user_version(course_key, user_id))
+
+
+def get_user_version(course_key, user_id):
+    '''
+    Returns the current version of the given user's state in the given
+    course, starting a new version if there is none.
+    '''
+    cache_key = _user_version_cache_key(course_key, user_id)
+    version = cache.get(cache_key)
+    if not version:
+        version = uuid4().hex
+        cache.set(cache_key, version, timeout=block_structure_config.cache_timeout_in_seconds())
+    return version
+
+
+def invalidate_user_version(course_key, user_id):
+    '''
+    Starts a new version of the given user's state in the given course,
+    so that any transformed block structures cached for the user are
+    no longer used.
+    '''
+    cache.delete(_user_version_cache_key(course_key, user_id))
+
+
+def _user_version_cache_key(course_key, user_id):
+    '''
+    Returns the cache key of the version of the given user's state in
+    the given course.
+    '''
+    return u'course_blocks.user_version.{}.{}'.format(six.text_type(course_key), user_id)
@@ -0,0 +1,67 @@
+"""
+Tests for the warm_safe_exec_cache management command
+"""
+
+
+from django.core.management import call_command
+from mock import patch
+from six import text_type
+
+from capa.tests.response_xml_factory import CustomResponseXMLFactory
+from xmodule.capa_base import NUM_RANDOMIZATION_BINS
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+COMMAND_MODULE = 'lms.djangoapps.courseware.management.commands.warm_safe_exec_cache'
+
+
+class WarmSafeExecCacheTest(SharedModuleStoreTestCase):
+    """
+    Tests that the code of the problems is executed for all their seeds.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(WarmSafeExecCacheTest, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        script = 'answer = random.randint(0, 100)'
+        cls.never_problem = cls._create_problem(script, 'never')
+        cls.per_student_problem = cls._create_problem(script, 'per_student')
+        cls._create_problem('answer = anonymous_student_id', 'never')
+        cls._create_problem(None, 'never')
+
+    @classmethod
+    def _create_problem(cls, script, rerandomize):
+        """
+        Creates a custom response problem with the given script.
+        """
+        return ItemFactory.create(
+            parent_location=cls.course.location,
+            category='problem',
+            data=CustomResponseXMLFactory().build_xml(script=script, cfn='check_func') if script else '<problem/>',
+            rerandomize=rerandomize,
+        )
+
+    @patch(COMMAND_MODULE + '.execute_problem_code')
+    def test_seeds(self, mock_execute_problem_code):
+        call_command('warm_safe_exec_cache', text_type(self.course.id))
+        executions = [
+            (problem.location, seed) for (problem, seed, _cache), _kwargs in mock_execute_problem_code.call_args_list
+        ]
+        self.assertEqual(
+            sorted(executions),
+            sorted(
+                [(self.never_problem.location, 1)] +
+                [(self.per_student_problem.location, seed) for seed in range(NUM_RANDOMIZATION_BINS)]
+            ),
+        )
+
+    @patch(COMMAND_MODULE + '.execute_problem_code')
+    def test_max_seeds(self, mock_execute_problem_code):
+        call_command('warm_safe_exec_cache', text_type(self.course.id), max_seeds=2)
+        self.assertEqual(mock_execute_problem_code.call_count, 3)
+
+    @patch(COMMAND_MODULE + '.SafeExecCache.evict')
+    def test_evict(self, mock_evict):
+        with patch(COMMAND_MODULE + '.execute_problem_code'):
+            call_command('warm_safe_exec_cache', text_type(self.course.id), evict=True)
+        mock_evict.assert_called_once_with()
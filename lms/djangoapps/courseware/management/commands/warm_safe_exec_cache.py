@@ -0,0 +1,128 @@
+"""
+Pre-execute the code of the problems of a course for every random seed that
+the problems can be given, so that the results are cached before learners
+load the problems, e.g. at the start of an exam.
+
+The seeds follow each problem's rerandomize setting: a single seed for
+"never", one per randomization bin for "per_student", and up to the maximum
+number of seeds for "always" and "onreset".
+
+Problems whose code refers to the anonymous student id are skipped, since
+their results are specific to each learner.
+"""
+
+
+import gettext
+import logging
+from textwrap import dedent
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from capa.capa_problem import LoncapaProblem, LoncapaSystem
+from edxmako.shortcuts import render_to_string
+from xmodule.capa_base import MAX_RANDOMIZATION_BINS, NUM_RANDOMIZATION_BINS, RANDOMIZATION
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.django import modulestore
+from xmodule.util.sandboxing import (
+    SafeExecCache,
+    can_execute_unsafe_code,
+    get_python_lib_zip,
+    get_python_lib_zip_digest
+)
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id',
+                            help='the course whose problems to pre-execute')
+        parser.add_argument('--max-seeds',
+                            type=int,
+                            default=MAX_RANDOMIZATION_BINS,
+                            help='maximum number of seeds to pre-execute per problem')
+        parser.add_argument('--evict',
+                            action='store_true',
+                            help='evict the cached results of the course first')
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError("Invalid course_id")
+
+        store = modulestore()
+        if not store.get_course(course_key):
+            raise CommandError("Invalid course_id")
+
+        cache = SafeExecCache(
+            course_key,
+            get_python_lib_digest=lambda: get_python_lib_zip_digest(contentstore, course_key),
+        )
+        if options['evict']:
+            cache.evict()
+
+        num_executions = 0
+        for problem in store.get_items(course_key, qualifiers={'category': 'problem'}):
+            if '<script' not in problem.data:
+                continue
+            if 'anonymous_student_id' in problem.data:
+                log.info(u'Skipping problem %s, which refers to the anonymous student id', problem.location)
+                continue
+            for seed in problem_seeds(problem)[:options['max_seeds']]:
+                try:
+                    execute_problem_code(problem, seed, cache)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception(u'Error while executing the code of problem %s with seed %s', problem.location, seed)
+                    break
+                num_executions += 1
+
+        log.info(u'Executed the code of the problems of course %s with %d seeds', course_key, num_executions)
+
+
+def problem_seeds(problem):
+    """
+    Returns the list of seeds that the given problem can be given.
+    """
+    if problem.rerandomize == RANDOMIZATION.NEVER:
+        return [1]
+    elif problem.rerandomize == RANDOMIZATION.PER_STUDENT:
+        return list(range(NUM_RANDOMIZATION_BINS))
+    else:
+        return list(range(MAX_RANDOMIZATION_BINS))
+
+
+def execute_problem_code(problem, seed, cache):
+    """
+    Executes the code of the given problem with the given seed, caching
+    the results in the given cache.
+    """
+    course_key = problem.location.course_key
+    capa_system = LoncapaSystem(
+        ajax_url=None,
+        anonymous_student_id=None,
+        cache=cache,
+        can_execute_unsafe_code=lambda: can_execute_unsafe_code(course_key),
+        get_python_lib_zip=lambda: get_python_lib_zip(contentstore, course_key),
+        DEBUG=settings.DEBUG,
+        filestore=problem.runtime.resources_fs,
+        i18n=gettext.NullTranslations(),
+        node_path=settings.NODE_PATH,
+        render_template=render_to_string,
+        seed=seed,
+        STATIC_URL=settings.STATIC_URL,
+        xqueue=None,
+    )
+    LoncapaProblem(
+        problem_text=problem.data,
+        id=problem.location.html_id(),
+        capa_system=capa_system,
+        capa_module=problem,
+        seed=seed,
+        extract_tree=False,
+    )
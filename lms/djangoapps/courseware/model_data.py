@@ -25,7 +25,7 @@ DjangoOrmFieldCache: A base-class for single-row-per-field caches.
 import json
 import logging
 from abc import ABCMeta, abstractmethod
-from collections import defaultdict, namedtuple
+from collections import OrderedDict, defaultdict, namedtuple
 
 import six
 from contracts import contract, new_contract
@@ -748,6 +748,15 @@ class FieldDataCache(object):
             descriptor_filter is a function that accepts a descriptor and return whether the field data
                 should be cached
         """
+        self.add_descriptors_descendents([descriptor], depth, descriptor_filter)
+
+    def add_descriptors_descendents(self, descriptors, depth=None, descriptor_filter=lambda descriptor: True):
+        """
+        Add all descendants of each of the `descriptors` to this FieldDataCache,
+        reading their data together.
+
+        See add_descriptor_descendents for the arguments.
+        """
 
         def get_child_descriptors(descriptor, depth, descriptor_filter):
             """
@@ -772,10 +781,13 @@ class FieldDataCache(object):
 
             return descriptors
 
-        with modulestore().bulk_operations(descriptor.location.course_key):
-            descriptors = get_child_descriptors(descriptor, depth, descriptor_filter)
+        descendents = OrderedDict()
+        for descriptor in descriptors:
+            with modulestore().bulk_operations(descriptor.location.course_key):
+                for descendent in get_child_descriptors(descriptor, depth, descriptor_filter):
+                    descendents.setdefault(descendent.location, descendent)
 
-        self.add_descriptors_to_cache(descriptors)
+        self.add_descriptors_to_cache(list(descendents.values()))
 
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
@@ -989,6 +1001,31 @@ class ScoresClient(object):
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def bulk_create_for_locations(cls, course_id, user_ids, scorable_locations):
+        """
+        Create a ScoresClient for each of the given users, with data for the
+        given locations pre-fetched in a single query.
+
+        Returns a dict of ScoresClient objects keyed by user id.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=list(clients),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total, created in scores_qset.values_list(
+                'student_id', 'module_state_key', 'grade', 'max_grade', 'created'
+        ):
+            # pylint: disable=protected-access
+            clients[user_id]._locations_to_scores[location.map_into_course(course_id)] = cls.Score(
+                correct, total, created
+            )
+        for client in six.itervalues(clients):
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
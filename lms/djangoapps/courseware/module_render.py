@@ -3,6 +3,7 @@ Module rendering
 """
 
 
+import base64
 import hashlib
 import json
 import logging
@@ -15,9 +16,8 @@ from completion import waffle as completion_waffle
 from completion.models import BlockCompletion
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.cache import cache
 from django.db import transaction
-from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.http import Http404, HttpResponse, HttpResponseForbidden, HttpResponseNotAllowed
 from django.middleware.csrf import CsrfViewMiddleware
 from django.template.context_processors import csrf
 from django.urls import reverse
@@ -37,7 +37,9 @@ from requests.auth import HTTPBasicAuth
 from rest_framework.decorators import api_view
 from rest_framework.exceptions import APIException
 from six import text_type
+from six.moves.urllib.parse import urlencode  # pylint: disable=import-error
 from web_fragments.fragment import Fragment
+from webob import Request as WebobRequest
 from xblock.core import XBlock
 from xblock.django.request import django_to_webob_request, webob_to_django_response
 from xblock.exceptions import NoSuchHandlerError, NoSuchViewError
@@ -79,9 +81,7 @@ from openedx.core.lib.xblock_utils import (
     get_aside_from_xblock,
     hash_resource,
     is_xblock_aside,
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls
+    replace_urls
 )
 from openedx.core.lib.xblock_utils import request_token as xblock_request_token
 from openedx.core.lib.xblock_utils import wrap_xblock
@@ -99,7 +99,12 @@ from xmodule.exceptions import NotFoundError, ProcessingError
 from xmodule.lti_module import LTIModule
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from xmodule.util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
+from xmodule.util.sandboxing import (
+    SafeExecCache,
+    can_execute_unsafe_code,
+    get_python_lib_zip,
+    get_python_lib_zip_digest
+)
 from xmodule.x_module import XModuleDescriptor
 
 log = logging.getLogger(__name__)
@@ -706,27 +711,21 @@ def get_module_system_for_user(
     # prefix is going to have to be specific to the module, not the directory
     # that the xml was loaded from
 
-    # Rewrite urls beginning in /static to point to course-specific content
-    block_wrappers.append(partial(
-        replace_static_urls,
-        getattr(descriptor, 'data_dir', None),
-        course_id=course_id,
-        static_asset_path=static_asset_path or descriptor.static_asset_path
-    ))
-
-    # Allow URLs of the form '/course/' refer to the root of multicourse directory
+    # Rewrite, in a single pass:
+    # * urls beginning in /static to point to course-specific content
+    # * urls of the form '/course/' to refer to the root of multicourse directory
     #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
-
-    # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
-    # is an improvement over the /course/... format for studio authored courses,
-    # because it is agnostic to course-hierarchy.
+    # * intra-courseware links (/jump_to_id/<id>). This format is an improvement
+    #   over the /course/... format for studio authored courses, because it is
+    #   agnostic to course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
     block_wrappers.append(partial(
-        replace_jump_to_id_urls,
+        replace_urls,
         course_id,
         reverse('jump_to_id', kwargs={'course_id': text_type(course_id), 'module_id': ''}),
+        getattr(descriptor, 'data_dir', None),
+        static_asset_path=static_asset_path or descriptor.static_asset_path
     ))
 
     block_wrappers.append(partial(display_access_messages, user))
@@ -802,7 +801,10 @@ def get_module_system_for_user(
         publish=publish,
         anonymous_student_id=anonymous_student_id,
         course_id=course_id,
-        cache=cache,
+        cache=SafeExecCache(
+            course_id,
+            get_python_lib_digest=lambda: get_python_lib_zip_digest(contentstore, course_id),
+        ),
         can_execute_unsafe_code=(lambda: can_execute_unsafe_code(course_id)),
         get_python_lib_zip=(lambda: get_python_lib_zip(contentstore, course_id)),
         # TODO: When we merge the descriptor and module systems, we can stop reaching into the mixologist (cpennington)
@@ -1026,6 +1028,160 @@ def handle_xblock_callback(request, course_id, usage_id, handler, suffix=None):
         HttpResponseForbidden: If the request method is not `GET` and user is not authenticated.
         Http404: If the course is not found in the modulestore.
     """
+    error = _authenticate_xblock_handler_request(request, handler)
+    if error:
+        return error
+
+    try:
+        course_key = CourseKey.from_string(course_id)
+    except InvalidKeyError:
+        raise Http404(u'{} is not a valid course key'.format(course_id))
+
+    with modulestore().bulk_operations(course_key):
+        try:
+            course = modulestore().get_course(course_key)
+        except ItemNotFoundError:
+            raise Http404(u'{} does not exist in the modulestore'.format(course_id))
+
+        return _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course=course)
+
+
+@csrf_exempt
+@transaction.non_atomic_requests
+def handle_xblock_batch_callback(request, course_id):
+    """
+    Invokes several XBlock handlers of a course in one request, e.g. for the
+    bursts of AJAX calls of the video and problem blocks.
+
+    The body of the POST request is a JSON object with a list of calls:
+
+        {
+            "calls": [
+                {
+                    "usage_id": "block-v1:edX+DemoX+Demo_Course+type@video+block@intro",
+                    "handler": "xmodule_handler",
+                    "suffix": "save_user_state",
+                    "payload": {"saved_video_position": "00:01:10"}
+                },
+                ...
+            ]
+        }
+
+    The payload of each call is passed to its handler in the body of a POST
+    request, form encoded, or JSON encoded if the "content_type" of the call
+    is "application/json", along with the headers and cookies of the batch
+    request.
+
+    The course, the state of the blocks and the masquerade of the user are
+    read once for all the calls, and the block of each call is only bound
+    once. The calls are invoked in order, and an error of one call doesn't
+    prevent the other calls from being invoked.
+
+    Returns a JSON object with the list of the results of the calls, each
+    with the "status_code", "content_type" and "body" of the response that
+    handle_xblock_callback would have returned for the call.  Bodies that
+    aren't UTF-8 text are base64 encoded, with a "body_encoding" of "base64".
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    error = _authenticate_xblock_handler_request(request, 'batch')
+    if error:
+        return error
+
+    try:
+        calls = json.loads(request.body.decode('utf-8'))['calls']
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'The body must be a JSON object with a list of calls.'}, status=400)
+    if not isinstance(calls, list) or not all(_is_valid_xblock_handler_call(call) for call in calls):
+        return JsonResponse({'error': 'Each call must have a usage_id and a handler.'}, status=400)
+    if len(calls) > settings.XBLOCK_HANDLER_BATCH_MAX_CALLS:
+        return JsonResponse(
+            {'error': u'At most {} calls can be batched.'.format(settings.XBLOCK_HANDLER_BATCH_MAX_CALLS)},
+            status=400,
+        )
+
+    try:
+        course_key = CourseKey.from_string(course_id)
+    except InvalidKeyError:
+        raise Http404(u'{} is not a valid course key'.format(course_id))
+
+    set_custom_metrics_for_course_key(course_key)
+    set_monitoring_transaction_name('batch', group="Python/XBlock/Handler")
+
+    with modulestore().bulk_operations(course_key):
+        try:
+            course = modulestore().get_course(course_key)
+        except ItemNotFoundError:
+            raise Http404(u'{} does not exist in the modulestore'.format(course_id))
+
+        # Read the blocks of all the calls first, so that their state can be
+        # read together.
+        descriptors = OrderedDict()
+        for call in calls:
+            try:
+                usage_key = _handler_block_usage_key(call['usage_id'])
+            except Http404:
+                continue
+            if usage_key not in descriptors:
+                try:
+                    descriptors[usage_key] = _get_descriptor_by_usage_id(course_key, six.text_type(usage_key))
+                except Http404:
+                    descriptors[usage_key] = None
+
+        unused_masquerade, user = setup_masquerade(
+            request, course_key, has_access(request.user, 'staff', course, course_key)
+        )
+        field_data_cache = FieldDataCache([], course_key, user, read_only=CrawlersConfig.is_crawler(request))
+        field_data_cache.add_descriptors_descendents([
+            descriptor_and_context[0] for descriptor_and_context in descriptors.values() if descriptor_and_context
+        ])
+
+        instances = {}
+        results = []
+        for call in calls:
+            try:
+                usage_key = _handler_block_usage_key(call['usage_id'])
+                if descriptors.get(usage_key) is None:
+                    raise Http404
+                descriptor, tracking_context = descriptors[usage_key]
+                if usage_key not in instances:
+                    instances[usage_key] = get_module_for_descriptor(
+                        user, request, descriptor, field_data_cache, course_key, course=course
+                    )
+                if instances[usage_key] is None:
+                    log.debug(u"No module %s for user %s -- access denied?", usage_key, user)
+                    raise Http404
+
+                response = _call_xblock_handler(
+                    request,
+                    instances[usage_key],
+                    UsageKey.from_string(unquote_slashes(call['usage_id'])),
+                    call['handler'],
+                    _xblock_handler_call_request(request, call),
+                    call.get('suffix') or '',
+                    course,
+                    tracking_context,
+                )
+                result = _xblock_handler_call_result(response)
+            except Http404:
+                result = _xblock_handler_call_result(HttpResponse(status=404))
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u"error executing xblock handler %r of %s in batch", call['handler'], call['usage_id'])
+                result = _xblock_handler_call_result(HttpResponse(status=500))
+
+            results.append(result)
+
+    return JsonResponse({'results': results})
+
+
+def _authenticate_xblock_handler_request(request, handler):
+    """
+    Authenticates the user of an XBlock handler request, with the session,
+    checking the CSRF token, or with a JWT or OAuth2 token.
+
+    Returns an error response, or None if the request can be handled.
+    """
     # In this case, we are using Session based authentication, so we need to check CSRF token.
     if request.user.is_authenticated:
         error = CsrfViewMiddleware().process_view(request, None, (), {})
@@ -1057,19 +1213,99 @@ def handle_xblock_callback(request, course_id, usage_id, handler, suffix=None):
         return HttpResponseForbidden('Unauthenticated')
 
     request.user.known = request.user.is_authenticated
+    return None
+
+
+def _is_valid_xblock_handler_call(call):
+    """
+    Returns whether the given call of a batch is an object with the
+    usage_id and handler strings.
+    """
+    return (
+        isinstance(call, dict) and
+        isinstance(call.get('usage_id'), six.string_types) and
+        isinstance(call.get('handler'), six.string_types)
+    )
+
+
+def _handler_block_usage_key(usage_id):
+    """
+    Returns the usage key of the block whose handler, or whose aside's
+    handler, is called with the given usage id.
 
+    Raises Http404 if the usage id is invalid.
+    """
     try:
-        course_key = CourseKey.from_string(course_id)
+        usage_key = UsageKey.from_string(unquote_slashes(usage_id))
     except InvalidKeyError:
-        raise Http404(u'{} is not a valid course key'.format(course_id))
+        raise Http404
+    if is_xblock_aside(usage_key):
+        # Get the usage key for the block being wrapped by the aside (not the aside itself)
+        return usage_key.usage_key
+    return usage_key
 
-    with modulestore().bulk_operations(course_key):
-        try:
-            course = modulestore().get_course(course_key)
-        except ItemNotFoundError:
-            raise Http404(u'{} does not exist in the modulestore'.format(course_id))
 
-        return _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course=course)
+def _xblock_handler_call_result(response):
+    """
+    Returns the result of a call of a batch, with the status code, content
+    type and body of the response of its handler.  Bodies that aren't UTF-8
+    text are base64 encoded, and flagged with the base64 body_encoding.
+    """
+    if response.streaming:
+        body = b''.join(response.streaming_content)
+    else:
+        body = response.content
+    result = {
+        'status_code': response.status_code,
+        'content_type': response.get('Content-Type'),
+    }
+    try:
+        result['body'] = body.decode('utf-8')
+    except UnicodeDecodeError:
+        result['body'] = base64.b64encode(body).decode('ascii')
+        result['body_encoding'] = 'base64'
+    return result
+
+
+# The WSGI environ variables of a batch request, besides its HTTP headers,
+# which are passed on to the request of each of its calls.
+XBLOCK_HANDLER_CALL_ENVIRON_KEYS = (
+    'REMOTE_ADDR',
+    'REMOTE_HOST',
+    'REMOTE_USER',
+    'SERVER_NAME',
+    'SERVER_PORT',
+    'SERVER_PROTOCOL',
+    'wsgi.url_scheme',
+)
+
+
+def _xblock_handler_call_request(request, call):
+    """
+    Returns the webob POST request passed to the handler of the given call
+    of a batch, with the payload of the call as its body, and the headers,
+    cookies and client and server environ of the batch request.
+    """
+    environ = {
+        key: value for key, value in six.iteritems(request.META)
+        if (
+            key.startswith('HTTP_') and key not in ('HTTP_CONTENT_TYPE', 'HTTP_CONTENT_LENGTH')
+        ) or key in XBLOCK_HANDLER_CALL_ENVIRON_KEYS
+    }
+    payload = call.get('payload') or {}
+    if call.get('content_type') == 'application/json':
+        content_type = 'application/json'
+        body = json.dumps(payload)
+    else:
+        content_type = 'application/x-www-form-urlencoded'
+        body = urlencode(payload, doseq=True)
+    return WebobRequest.blank(
+        request.path,
+        environ=environ,
+        method='POST',
+        body=body.encode('utf-8'),
+        content_type=content_type,
+    )
 
 
 def get_module_by_usage_id(request, course_id, usage_id, disable_staff_debug_info=False, course=None):
@@ -1082,33 +1318,11 @@ def get_module_by_usage_id(request, course_id, usage_id, disable_staff_debug_inf
 
     try:
         course_id = CourseKey.from_string(course_id)
-        usage_key = UsageKey.from_string(unquote_slashes(usage_id)).map_into_course(course_id)
     except InvalidKeyError:
         raise Http404("Invalid location")
 
-    try:
-        descriptor = modulestore().get_item(usage_key)
-        descriptor_orig_usage_key, descriptor_orig_version = modulestore().get_block_original_usage(usage_key)
-    except ItemNotFoundError:
-        log.warn(
-            u"Invalid location for course id %s: %s",
-            usage_key.course_key,
-            usage_key
-        )
-        raise Http404
-
-    tracking_context = {
-        'module': {
-            # xss-lint: disable=python-deprecated-display-name
-            'display_name': descriptor.display_name_with_default_escaped,
-            'usage_key': six.text_type(descriptor.location),
-        }
-    }
-
-    # For blocks that are inherited from a content library, we add some additional metadata:
-    if descriptor_orig_usage_key is not None:
-        tracking_context['module']['original_usage_key'] = six.text_type(descriptor_orig_usage_key)
-        tracking_context['module']['original_usage_version'] = six.text_type(descriptor_orig_version)
+    descriptor, tracking_context = _get_descriptor_by_usage_id(course_id, usage_id)
+    usage_key = descriptor.location
 
     unused_masquerade, user = setup_masquerade(request, course_id, has_access(user, 'staff', descriptor, course_id))
     field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
@@ -1135,6 +1349,45 @@ def get_module_by_usage_id(request, course_id, usage_id, disable_staff_debug_inf
     return (instance, tracking_context)
 
 
+def _get_descriptor_by_usage_id(course_key, usage_id):
+    """
+    Gets the descriptor of the block with the given `usage_id` in a course,
+    along with its tracking context.
+
+    Returns (descriptor, tracking_context)
+    """
+    try:
+        usage_key = UsageKey.from_string(unquote_slashes(usage_id)).map_into_course(course_key)
+    except InvalidKeyError:
+        raise Http404("Invalid location")
+
+    try:
+        descriptor = modulestore().get_item(usage_key)
+        descriptor_orig_usage_key, descriptor_orig_version = modulestore().get_block_original_usage(usage_key)
+    except ItemNotFoundError:
+        log.warn(
+            u"Invalid location for course id %s: %s",
+            usage_key.course_key,
+            usage_key
+        )
+        raise Http404
+
+    tracking_context = {
+        'module': {
+            # xss-lint: disable=python-deprecated-display-name
+            'display_name': descriptor.display_name_with_default_escaped,
+            'usage_key': six.text_type(descriptor.location),
+        }
+    }
+
+    # For blocks that are inherited from a content library, we add some additional metadata:
+    if descriptor_orig_usage_key is not None:
+        tracking_context['module']['original_usage_key'] = six.text_type(descriptor_orig_usage_key)
+        tracking_context['module']['original_usage_version'] = six.text_type(descriptor_orig_version)
+
+    return descriptor, tracking_context
+
+
 def _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course=None):
     """
     Invoke an XBlock handler, either authenticated or not.
@@ -1182,44 +1435,57 @@ def _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course
         nr_tx_name += "/{}".format(suffix) if (suffix and handler == "xmodule_handler") else ""
         set_monitoring_transaction_name(nr_tx_name, group="Python/XBlock/Handler")
 
-        tracking_context_name = 'module_callback_handler'
-        req = django_to_webob_request(request)
-        try:
-            with tracker.get_tracker().context(tracking_context_name, tracking_context):
-                if is_xblock_aside(usage_key):
-                    # In this case, 'instance' is the XBlock being wrapped by the aside, so
-                    # the actual aside instance needs to be retrieved in order to invoke its
-                    # handler method.
-                    handler_instance = get_aside_from_xblock(instance, usage_key.aside_type)
-                else:
-                    handler_instance = instance
-                resp = handler_instance.handle(handler, req, suffix)
-                if suffix == 'problem_check' \
-                        and course \
-                        and getattr(course, 'entrance_exam_enabled', False) \
-                        and getattr(instance, 'in_entrance_exam', False):
-                    ee_data = {'entrance_exam_passed': user_has_passed_entrance_exam(request.user, course)}
-                    resp = append_data_to_webob_response(resp, ee_data)
-
-        except NoSuchHandlerError:
-            log.exception(u"XBlock %s attempted to access missing handler %r", instance, handler)
-            raise Http404
+        return _call_xblock_handler(
+            request, instance, usage_key, handler, django_to_webob_request(request), suffix, course, tracking_context
+        )
 
-        # If we can't find the module, respond with a 404
-        except NotFoundError:
-            log.exception("Module indicating to user that request doesn't exist")
-            raise Http404
 
-        # For XModule-specific errors, we log the error and respond with an error message
-        except ProcessingError as err:
-            log.warning("Module encountered an error while processing AJAX call",
-                        exc_info=True)
-            return JsonResponse({'success': err.args[0]}, status=200)
+def _call_xblock_handler(request, instance, usage_key, handler, req, suffix, course, tracking_context):
+    """
+    Calls the handler of the given block instance, or of its aside if the
+    usage key is the one of an aside, with the given webob request.
 
-        # If any other error occurred, re-raise it to trigger a 500 response
-        except Exception:
-            log.exception("error executing xblock handler")
-            raise
+    Returns the django response of the handler.
+
+    Raises Http404 if the handler or what it looks for is not found.
+    """
+    tracking_context_name = 'module_callback_handler'
+    try:
+        with tracker.get_tracker().context(tracking_context_name, tracking_context):
+            if is_xblock_aside(usage_key):
+                # In this case, 'instance' is the XBlock being wrapped by the aside, so
+                # the actual aside instance needs to be retrieved in order to invoke its
+                # handler method.
+                handler_instance = get_aside_from_xblock(instance, usage_key.aside_type)
+            else:
+                handler_instance = instance
+            resp = handler_instance.handle(handler, req, suffix)
+            if suffix == 'problem_check' \
+                    and course \
+                    and getattr(course, 'entrance_exam_enabled', False) \
+                    and getattr(instance, 'in_entrance_exam', False):
+                ee_data = {'entrance_exam_passed': user_has_passed_entrance_exam(request.user, course)}
+                resp = append_data_to_webob_response(resp, ee_data)
+
+    except NoSuchHandlerError:
+        log.exception(u"XBlock %s attempted to access missing handler %r", instance, handler)
+        raise Http404
+
+    # If we can't find the module, respond with a 404
+    except NotFoundError:
+        log.exception("Module indicating to user that request doesn't exist")
+        raise Http404
+
+    # For XModule-specific errors, we log the error and respond with an error message
+    except ProcessingError as err:
+        log.warning("Module encountered an error while processing AJAX call",
+                    exc_info=True)
+        return JsonResponse({'success': err.args[0]}, status=200)
+
+    # If any other error occurred, re-raise it to trigger a 500 response
+    except Exception:
+        log.exception("error executing xblock handler")
+        raise
 
     return webob_to_django_response(resp)
 
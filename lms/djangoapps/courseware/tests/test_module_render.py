@@ -4,6 +4,7 @@ Test for lms courseware app, module render unit
 """
 
 
+import base64
 import itertools
 import json
 import textwrap
@@ -36,6 +37,7 @@ from pyquery import PyQuery
 from six import text_type
 from six.moves import range
 from web_fragments.fragment import Fragment
+from webob import Response
 from xblock.completable import CompletableXBlockMixin
 from xblock.core import XBlock, XBlockAside
 from xblock.field_data import FieldData
@@ -134,6 +136,27 @@ class GradedStatelessXBlock(XBlock):
         )
 
 
+class EchoXBlock(XBlock):
+    """
+    This XBlock exists to test the requests passed to, and the responses
+    returned by, the handlers of batched calls.
+    """
+
+    @XBlock.handler
+    def echo_user_agent(self, request, suffix=''):  # pylint: disable=unused-argument
+        """
+        Returns the user agent of the request.
+        """
+        return Response(request.user_agent, content_type='text/plain', charset='utf-8')
+
+    @XBlock.handler
+    def binary(self, request, suffix=''):  # pylint: disable=unused-argument
+        """
+        Returns a body which isn't UTF-8 text.
+        """
+        return Response(body=b'\x89PNG\xff', content_type='image/png')
+
+
 class StubCompletableXBlock(CompletableXBlockMixin):
     """
     This XBlock exists to test completion storage.
@@ -753,6 +776,80 @@ class TestHandleXBlockCallback(SharedModuleStoreTestCase, LoginEnrollmentTestCas
         self.assertEqual(student_module.grade, 0.75)
         self.assertEqual(student_module.max_grade, 1)
 
+    def _batch_request(self, calls):
+        """
+        Returns a request to the batch handler endpoint with the given calls.
+        """
+        request = self.request_factory.post(
+            'dummy_url',
+            data=json.dumps({'calls': calls}),
+            content_type='application/json'
+        )
+        request.user = self.mock_user
+        return request
+
+    @XBlock.register_temp_plugin(GradedStatelessXBlock, identifier='stateless_scorer')
+    def test_batch_callback(self):
+        course = CourseFactory.create()
+        blocks = [ItemFactory.create(category='stateless_scorer', parent=course) for __ in range(2)]
+        calls = [
+            {
+                'usage_id': quote_slashes(text_type(block.scope_ids.usage_id)),
+                'handler': 'set_score',
+                'payload': {'grade': grade},
+                'content_type': 'application/json',
+            }
+            for block, grade in zip(blocks, (0.75, 0.5))
+        ]
+        calls.insert(1, {
+            'usage_id': quote_slashes(text_type(course.id.make_usage_key('chapter', 'bad_location'))),
+            'handler': 'set_score',
+        })
+        calls.insert(2, {'usage_id': quote_slashes(text_type(blocks[0].scope_ids.usage_id)), 'handler': 'bad_handler'})
+
+        response = render.handle_xblock_batch_callback(self._batch_request(calls), text_type(course.id))
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.content.decode('utf-8'))['results']
+        self.assertEqual([result['status_code'] for result in results], [200, 404, 404, 200])
+
+        for block, grade in zip(blocks, (0.75, 0.5)):
+            student_module = StudentModule.objects.get(
+                student=self.mock_user,
+                module_state_key=block.scope_ids.usage_id,
+            )
+            self.assertEqual(student_module.grade, grade)
+
+    @XBlock.register_temp_plugin(EchoXBlock, identifier='echo')
+    def test_batch_callback_request_and_response(self):
+        course = CourseFactory.create()
+        block = ItemFactory.create(category='echo', parent=course)
+        usage_id = quote_slashes(text_type(block.scope_ids.usage_id))
+        request = self._batch_request([
+            {'usage_id': usage_id, 'handler': 'echo_user_agent'},
+            {'usage_id': usage_id, 'handler': 'binary'},
+        ])
+        request.META['HTTP_USER_AGENT'] = 'Test Agent'
+
+        response = render.handle_xblock_batch_callback(request, text_type(course.id))
+        self.assertEqual(response.status_code, 200)
+        echo_result, binary_result = json.loads(response.content.decode('utf-8'))['results']
+        self.assertEqual(echo_result['body'], 'Test Agent')
+        self.assertNotIn('body_encoding', echo_result)
+        self.assertEqual(binary_result['status_code'], 200)
+        self.assertEqual(binary_result['body_encoding'], 'base64')
+        self.assertEqual(base64.b64decode(binary_result['body']), b'\x89PNG\xff')
+
+    def test_batch_callback_invalid_calls(self):
+        for calls in ([{'handler': 'xmodule_handler'}], 'calls'):
+            response = render.handle_xblock_batch_callback(self._batch_request(calls), text_type(self.course_key))
+            self.assertEqual(response.status_code, 400)
+
+    @override_settings(XBLOCK_HANDLER_BATCH_MAX_CALLS=1)
+    def test_batch_callback_too_many_calls(self):
+        calls = [{'usage_id': quote_slashes(text_type(self.location)), 'handler': 'xmodule_handler'}] * 2
+        response = render.handle_xblock_batch_callback(self._batch_request(calls), text_type(self.course_key))
+        self.assertEqual(response.status_code, 400)
+
     @ddt.data(
         ('complete', {'completion': 0.625}),
         ('progress', {}),
@@ -38,6 +38,22 @@ REDIRECT_TO_COURSEWARE_MICROFRONTEND = ExperimentWaffleFlag(WAFFLE_FLAG_NAMESPAC
 # .. toggle_status: supported
 COURSEWARE_MICROFRONTEND_COURSE_TEAM_PREVIEW = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'microfrontend_course_team_preview')
 
+# Waffle flag to render only the active unit of a sequence, and to fetch the other units on navigation.
+#
+# .. toggle_name: courseware.lazy_sequence_units
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Renders only the active unit of the courseware sequences, along with the titles, bookmarks
+#   and completion of the other units, which are rendered when the learner navigates to them.
+# .. toggle_category: courseware
+# .. toggle_use_cases: incremental_release, open_edx
+# .. toggle_creation_date: 2020-04-20
+# .. toggle_expiration_date: None
+# .. toggle_warnings: None
+# .. toggle_tickets: None
+# .. toggle_status: supported
+LAZY_SEQUENCE_UNITS = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'lazy_sequence_units')
+
 
 def should_redirect_to_courseware_microfrontend(course_key):
     return (
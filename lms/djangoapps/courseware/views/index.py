@@ -82,6 +82,7 @@ from ..module_render import get_module_for_descriptor, toc_for_course
 from ..permissions import MASQUERADE_AS_STUDENT
 from ..toggles import (
     COURSEWARE_MICROFRONTEND_COURSE_TEAM_PREVIEW,
+    LAZY_SEQUENCE_UNITS,
     REDIRECT_TO_COURSEWARE_MICROFRONTEND,
     should_redirect_to_courseware_microfrontend,
 )
@@ -633,6 +634,7 @@ class CoursewareIndex(View):
             'progress_url': reverse('progress', kwargs={'course_id': six.text_type(self.course_key)}),
             'user_authenticated': self.request.user.is_authenticated,
             'position': position,
+            'lazy_units': LAZY_SEQUENCE_UNITS.is_enabled(self.course_key),
         }
         if previous_of_active_section:
             section_context['prev_url'] = _compute_section_url(previous_of_active_section, 'last')
@@ -6,7 +6,7 @@ Defines grading configuration.
 from django.conf import settings
 
 from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
-from lms.djangoapps.grades.config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT
+from lms.djangoapps.grades.config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, BULK_UPDATE_COURSE_GRADES
 from lms.djangoapps.grades.config.waffle import waffle as waffle_func
 
 
@@ -27,3 +27,11 @@ def should_persist_grades(course_key):
     Returns whether grades should be persisted.
     """
     return PersistentGradesEnabledFlag.feature_enabled(course_key)
+
+
+def should_bulk_update_grades(course_key):
+    """
+    Returns whether grades of multiple users should be computed
+    and persisted in bulk when they are force updated.
+    """
+    return should_persist_grades(course_key) and waffle_func().is_enabled(BULK_UPDATE_COURSE_GRADES)
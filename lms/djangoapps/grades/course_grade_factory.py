@@ -4,25 +4,33 @@ Course Grade Factory Class
 
 
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
 import six
 from six import text_type
 
+from lms.djangoapps.courseware.model_data import ScoresClient
 from openedx.core.djangoapps.signals.signals import (
     COURSE_GRADE_CHANGED,
     COURSE_GRADE_NOW_FAILED,
     COURSE_GRADE_NOW_PASSED
 )
 
-from .config import assume_zero_if_absent, should_persist_grades
+from .config import assume_zero_if_absent, should_bulk_update_grades, should_persist_grades
 from .course_data import CourseData
 from .course_grade import CourseGrade, ZeroCourseGrade
-from .models import PersistentCourseGrade
+from .models import PersistentCourseGrade, PersistentSubsectionGrade, PersistentSubsectionGradeOverride
 from .models_api import prefetch_grade_overrides_and_visible_blocks
+from .scores import possibly_scored
+from .subsection_grade_factory import SubsectionGradeFactory, bulk_get_submissions_scores
 
 log = getLogger(__name__)
 
+# Number of users whose grades are computed and persisted together
+# when grades are updated in bulk.
+BULK_UPDATE_BATCH_SIZE = 100
+
 
 class CourseGradeFactory(object):
     """
@@ -99,6 +107,10 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        If force_update is True and bulk updates are enabled for the course,
+        the grades are computed and persisted in batches of users, reading
+        their scores and writing their grades with a few queries per batch.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -109,8 +121,17 @@ class CourseGradeFactory(object):
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
         stats_tags = [u'action:{}'.format(course_data.course_key)]
-        for user in users:
-            yield self._iter_grade_result(user, course_data, force_update)
+        if force_update and should_bulk_update_grades(course_data.course_key):
+            users = iter(users)
+            while True:
+                batch = list(islice(users, BULK_UPDATE_BATCH_SIZE))
+                if not batch:
+                    break
+                for result in self._bulk_update_grade_results(batch, course_data):
+                    yield result
+        else:
+            for user in users:
+                yield self._iter_grade_result(user, course_data, force_update)
 
     def _iter_grade_result(self, user, course_data, force_update):
         try:
@@ -137,6 +158,108 @@ class CourseGradeFactory(object):
             )
             return self.GradeResult(user, None, exc)
 
+    def _bulk_update_grade_results(self, users, course_data):
+        """
+        Computes and persists the grades of the given batch of users, and
+        returns a list of GradeResults in the same order as the users.
+
+        The scores of all the users are read in bulk, the grades are
+        computed for each user, and all the subsection and course grades
+        are then persisted in bulk.
+        """
+        course_key = course_data.course_key
+        scorable_locations = [
+            block_key for block_key in course_data.collected_structure if possibly_scored(block_key)
+        ]
+        csm_scores = ScoresClient.bulk_create_for_locations(
+            course_key, [user.id for user in users], scorable_locations
+        )
+        submissions_scores = bulk_get_submissions_scores(course_key, users)
+        PersistentSubsectionGradeOverride.bulk_prefetch(course_key, users)
+
+        results = []
+        for user in users:
+            try:
+                user_course_data = CourseData(
+                    user,
+                    course=course_data.course,
+                    collected_block_structure=course_data.collected_structure,
+                    course_key=course_key,
+                )
+                subsection_grade_factory = SubsectionGradeFactory(
+                    user,
+                    course_data=user_course_data,
+                    csm_scores=csm_scores[user.id],
+                    submissions_scores=submissions_scores[user.id],
+                    defer_updates=True,
+                )
+                course_grade = CourseGrade(
+                    user,
+                    user_course_data,
+                    force_update_subsections=True,
+                    subsection_grade_factory=subsection_grade_factory,
+                ).update()
+                results.append(self.GradeResult(user, course_grade, None))
+            except Exception as exc:  # pylint: disable=broad-except
+                # Keep marching on even if this student couldn't be graded for
+                # some reason, but log it for future reference.
+                log.exception(
+                    u'Cannot grade student %s in course %s because of exception: %s',
+                    user.id,
+                    course_key,
+                    text_type(exc)
+                )
+                results.append(self.GradeResult(user, None, exc))
+
+        course_grades = [result.course_grade for result in results if result.course_grade]
+        try:
+            self._bulk_persist(course_key, course_grades)
+        except Exception as exc:  # pylint: disable=broad-except
+            log.exception(
+                u'Cannot persist grades of %d students in course %s because of exception: %s',
+                len(course_grades),
+                course_key,
+                text_type(exc)
+            )
+            return [
+                self.GradeResult(result.student, None, result.error or exc)
+                for result in results
+            ]
+
+        for course_grade in course_grades:
+            self._send_course_grade_signals(course_grade)
+            log.info(
+                u'Grades: Bulk update, %s, User: %s, %s, persisted: %s',
+                course_grade.course_data.full_string(), course_grade.user.id, course_grade, course_grade.attempted,
+            )
+        return results
+
+    @staticmethod
+    def _bulk_persist(course_key, course_grades):
+        """
+        Persists the given course grades, computed with deferred updates,
+        along with their subsection grades, in bulk.
+        """
+        subsection_grade_params = []
+        course_grade_params = []
+        for course_grade in course_grades:
+            # pylint: disable=protected-access
+            subsection_grade_params.extend(course_grade._subsection_grade_factory.unsaved_grades_params())
+            if course_grade.attempted:
+                course_data = course_grade.course_data
+                course_grade_params.append(dict(
+                    user_id=course_grade.user.id,
+                    course_version=course_data.version,
+                    course_edited_timestamp=course_data.edited_on,
+                    grading_policy_hash=course_data.grading_policy_hash,
+                    percent_grade=course_grade.percent,
+                    letter_grade=course_grade.letter_grade or "",
+                    passed=course_grade.passed,
+                ))
+
+        PersistentSubsectionGrade.bulk_update_or_create_grades(subsection_grade_params, course_key)
+        PersistentCourseGrade.bulk_update_or_create(course_key, course_grade_params)
+
     @staticmethod
     def _create_zero(user, course_data):
         """
@@ -199,6 +322,24 @@ class CourseGradeFactory(object):
                 passed=course_grade.passed,
             )
 
+        CourseGradeFactory._send_course_grade_signals(course_grade)
+
+        log.info(
+            u'Grades: Update, %s, User: %s, %s, persisted: %s',
+            course_data.full_string(), user.id, course_grade, should_persist,
+        )
+
+        return course_grade
+
+    @staticmethod
+    def _send_course_grade_signals(course_grade):
+        """
+        Sends a COURSE_GRADE_CHANGED signal to listeners and
+        COURSE_GRADE_NOW_PASSED if learner has passed course or
+        COURSE_GRADE_NOW_FAILED if learner is now failing course
+        """
+        user = course_grade.user
+        course_data = course_grade.course_data
         COURSE_GRADE_CHANGED.send_robust(
             sender=None,
             user=user,
@@ -219,10 +360,3 @@ class CourseGradeFactory(object):
                 course_id=course_data.course_key,
                 grade=course_grade,
             )
-
-        log.info(
-            u'Grades: Update, %s, User: %s, %s, persisted: %s',
-            course_data.full_string(), user.id, course_grade, should_persist,
-        )
-
-        return course_grade
@@ -18,7 +18,8 @@ from hashlib import sha1
 import six
 from django.apps import apps
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.timezone import now
 from lazy import lazy
@@ -26,7 +27,7 @@ from model_utils.models import TimeStampedModel
 from opaque_keys.edx.django.models import CourseKeyField, UsageKeyField
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from simple_history.models import HistoricalRecords
-from six.moves import map
+from six.moves import map, range
 
 from lms.djangoapps.courseware.fields import UnsignedBigIntAutoField
 from lms.djangoapps.grades import constants, events
@@ -37,6 +38,10 @@ log = logging.getLogger(__name__)
 
 BLOCK_RECORD_LIST_VERSION = 1
 
+# The number of grades whose changed fields are saved with a single
+# UPDATE query by the bulk grade updates.
+BULK_UPDATE_BATCH_SIZE = 500
+
 # Used to serialize information about a block at the time it was used in
 # grade calculation.
 BlockRecord = namedtuple('BlockRecord', ['locator', 'weight', 'raw_possible', 'graded'])
@@ -234,6 +239,30 @@ class VisibleBlocks(models.Model):
         non_existent_brls = {brl for brl in block_record_lists if brl.hash_value not in cached_records}
         cls.bulk_create(user_id, course_key, non_existent_brls)
 
+    @classmethod
+    def bulk_get_or_create_for_course(cls, course_key, block_record_lists):
+        """
+        Bulk creates VisibleBlocks for the given iterator of
+        BlockRecordList objects of any number of users in the given
+        course, but only for those that aren't already created.
+
+        Unlike bulk_get_or_create, this doesn't rely on the per-user
+        request cache, since block records are shared across users.
+        """
+        brls_by_hash = {brl.hash_value: brl for brl in block_record_lists}
+        existing_hashes = set(
+            cls.objects.filter(hashed__in=list(brls_by_hash)).values_list('hashed', flat=True)
+        )
+        cls.objects.bulk_create([
+            VisibleBlocks(
+                blocks_json=brl.json_value,
+                hashed=brl.hash_value,
+                course_id=course_key,
+            )
+            for hashed, brl in six.iteritems(brls_by_hash)
+            if hashed not in existing_hashes
+        ])
+
     @classmethod
     def _initialize_cache(cls, user_id, course_key):
         """
@@ -475,6 +504,55 @@ class PersistentSubsectionGrade(TimeStampedModel):
             cls._emit_grade_calculated_event(grade)
         return grades
 
+    @classmethod
+    def bulk_update_or_create_grades(cls, grade_params_iter, course_key):
+        """
+        Bulk creation or update of the grades of any number of users
+        in the given course.
+
+        New grades are created with a single query, while existing
+        grades are only saved if any of their values changed.
+        """
+        if not grade_params_iter:
+            return []
+
+        list(map(cls._prepare_params, grade_params_iter))
+        VisibleBlocks.bulk_get_or_create_for_course(
+            course_key, [params['visible_blocks'] for params in grade_params_iter]
+        )
+        list(map(cls._prepare_params_visible_blocks_id, grade_params_iter))
+
+        existing_grades = {
+            (grade.user_id, grade.full_usage_key): grade
+            for grade in cls.objects.filter(
+                user_id__in={params['user_id'] for params in grade_params_iter},
+                course_id=course_key,
+            )
+        }
+
+        grades, new_grades, changed_fields = [], [], []
+        with transaction.atomic():
+            for params in grade_params_iter:
+                grade = existing_grades.get((params['user_id'], params['usage_key']))
+                if grade is None:
+                    new_grades.append(PersistentSubsectionGrade(**params))
+                    continue
+
+                field_values = {
+                    field_name: value for field_name, value in six.iteritems(params)
+                    if field_name not in ('user_id', 'usage_key', 'course_id', 'first_attempted')
+                }
+                if params['first_attempted'] is not None and grade.first_attempted is None:
+                    field_values['first_attempted'] = params['first_attempted']
+                changed_fields.append((grade, _set_changed_fields(grade, field_values)))
+                grades.append(grade)
+            _bulk_update_changed_fields(cls, changed_fields)
+            grades.extend(cls.objects.bulk_create(new_grades))
+
+        for grade in grades:
+            cls._emit_grade_calculated_event(grade)
+        return grades
+
     @classmethod
     def _prepare_params(cls, params):
         """
@@ -629,6 +707,53 @@ class PersistentCourseGrade(TimeStampedModel):
         cls._update_cache(course_id, user_id, grade)
         return grade
 
+    @classmethod
+    def bulk_update_or_create(cls, course_id, grade_params_iter):
+        """
+        Creates or updates the course grades of any number of users in
+        the given course, given an iterator of dicts with the same
+        parameters as update_or_create.
+
+        New grades are created with a single query, while existing
+        grades are only saved if any of their values changed.
+        Returns the PersistedCourseGrade objects.
+        """
+        existing_grades = {
+            grade.user_id: grade
+            for grade in cls.objects.filter(
+                user_id__in=[params['user_id'] for params in grade_params_iter],
+                course_id=course_id,
+            )
+        }
+
+        grades, new_grades, changed_fields = [], [], []
+        with transaction.atomic():
+            for params in grade_params_iter:
+                passed = params.pop('passed')
+                if params.get('course_version', None) is None:
+                    params['course_version'] = ""
+
+                grade = existing_grades.get(params['user_id'])
+                if grade is None:
+                    new_grades.append(cls(
+                        course_id=course_id,
+                        passed_timestamp=now() if passed else None,
+                        **params
+                    ))
+                    continue
+
+                if passed and not grade.passed_timestamp:
+                    params['passed_timestamp'] = now()
+                changed_fields.append((grade, _set_changed_fields(grade, params)))
+                grades.append(grade)
+            _bulk_update_changed_fields(cls, changed_fields)
+            grades.extend(cls.objects.bulk_create(new_grades))
+
+        for grade in grades:
+            cls._emit_grade_calculated_event(grade)
+            cls._update_cache(course_id, grade.user_id, grade)
+        return grades
+
     @classmethod
     def _update_cache(cls, course_id, user_id, grade):
         course_cache = get_cache(cls._CACHE_NAMESPACE).get(cls._cache_key(course_id))
@@ -700,6 +825,21 @@ class PersistentSubsectionGradeOverride(models.Model):
             cls.objects.filter(grade__user_id=user_id, grade__course_id=course_key)
         }
 
+    @classmethod
+    def bulk_prefetch(cls, course_key, users):
+        """
+        Prefetches the overrides of the given users in the given course,
+        with a single query.
+        """
+        prefetched = {(user.id, str(course_key)): {} for user in users}
+        queryset = cls.objects.select_related('grade').filter(
+            grade__user_id__in=[user.id for user in users],
+            grade__course_id=course_key,
+        )
+        for override in queryset:
+            prefetched[(override.grade.user_id, str(course_key))][override.grade.usage_key] = override
+        get_cache(cls._CACHE_NAMESPACE).update(prefetched)
+
     @classmethod
     def get_override(cls, user_id, usage_key):
         prefetch_values = get_cache(cls._CACHE_NAMESPACE).get((user_id, str(usage_key.course_key)), None)
@@ -770,3 +910,51 @@ class PersistentSubsectionGradeOverride(models.Model):
                 getattr(subsection_grade_model, field_name)
             )
         return cleaned_data
+
+
+def _set_changed_fields(model, field_values):
+    """
+    Sets the given field values on the given model instance.
+    Returns the names of the fields whose values changed.
+    """
+    changed_fields = [
+        field_name for field_name, value in six.iteritems(field_values)
+        if getattr(model, field_name) != value
+    ]
+    for field_name in changed_fields:
+        setattr(model, field_name, field_values[field_name])
+    return changed_fields
+
+
+def _bulk_update_changed_fields(model_class, changed_fields_by_model):
+    """
+    Saves the changed fields of the given model instances, given as
+    (instance, changed field names) pairs, with one UPDATE query per
+    BULK_UPDATE_BATCH_SIZE instances.  Each changed field is set with a
+    CASE expression on the primary key, and the modified timestamp of
+    all the instances is updated.
+    """
+    changed_fields_by_model = [
+        (model, changed_fields) for model, changed_fields in changed_fields_by_model if changed_fields
+    ]
+    modified = now()
+    for start in range(0, len(changed_fields_by_model), BULK_UPDATE_BATCH_SIZE):
+        batch = changed_fields_by_model[start:start + BULK_UPDATE_BATCH_SIZE]
+        models_by_field = defaultdict(list)
+        for model, changed_fields in batch:
+            model.modified = modified
+            for field_name in changed_fields:
+                models_by_field[field_name].append(model)
+
+        updates = {}
+        for field_name, field_models in six.iteritems(models_by_field):
+            field = model_class._meta.get_field(field_name)
+            updates[field_name] = Case(
+                *[
+                    When(pk=model.pk, then=Value(getattr(model, field_name), output_field=field))
+                    for model in field_models
+                ],
+                default=F(field_name),
+                output_field=field
+            )
+        model_class.objects.filter(pk__in=[model.pk for model, __ in batch]).update(modified=modified, **updates)
@@ -321,6 +321,33 @@ class CreateSubsectionGrade(NonZeroSubsectionGrade):
 
             return model
 
+    def apply_override(self, override):
+        """
+        Updates the aggregated scores of this subsection grade to reflect
+        the given override, as update_or_create_model does when the
+        persisted model has an associated override.
+        """
+        self.override = override
+        self.all_total = self._overridden_score(
+            self.all_total, override.earned_all_override, override.possible_all_override,
+        )
+        self.graded_total = self._overridden_score(
+            self.graded_total, override.earned_graded_override, override.possible_graded_override,
+        )
+
+    @staticmethod
+    def _overridden_score(score, earned_override, possible_override):
+        """
+        Returns a copy of the given `AggregatedScore` with the given
+        override values, if not None, instead of its own values.
+        """
+        return AggregatedScore(
+            tw_earned=earned_override if earned_override is not None else score.earned,
+            tw_possible=possible_override if possible_override is not None else score.possible,
+            graded=score.graded,
+            first_attempted=score.first_attempted,
+        )
+
     @classmethod
     def bulk_create_models(cls, student, subsection_grades, course_key):
         """
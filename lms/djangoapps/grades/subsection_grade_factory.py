@@ -6,12 +6,15 @@ SubsectionGrade Factory Class
 from collections import OrderedDict
 from logging import getLogger
 
+import six
 from lazy import lazy
 from submissions import api as submissions_api
+from submissions.models import ScoreSummary
+from submissions.serializers import UnannotatedScoreSerializer
 
 from lms.djangoapps.courseware.model_data import ScoresClient
 from lms.djangoapps.grades.config import assume_zero_if_absent, should_persist_grades
-from lms.djangoapps.grades.models import PersistentSubsectionGrade
+from lms.djangoapps.grades.models import PersistentSubsectionGrade, PersistentSubsectionGradeOverride
 from lms.djangoapps.grades.scores import possibly_scored
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
 from student.models import anonymous_id_for_user
@@ -26,12 +29,38 @@ class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
-    def __init__(self, student, course=None, course_structure=None, course_data=None):
+    def __init__(
+            self,
+            student,
+            course=None,
+            course_structure=None,
+            course_data=None,
+            csm_scores=None,
+            submissions_scores=None,
+            defer_updates=False,
+    ):
+        """
+        Optionally, the student's csm_scores and submissions_scores can
+        be given if already fetched in bulk, in which case they aren't
+        queried again.
+
+        If defer_updates is True, updated grades aren't saved by the
+        update method, but are kept with the unsaved grades to be saved
+        in bulk, see unsaved_grades_params.
+        """
         self.student = student
         self.course_data = course_data or CourseData(student, course=course, structure=course_structure)
 
         self._cached_subsection_grades = None
         self._unsaved_subsection_grades = OrderedDict()
+        self._deferred_grade_params = {}
+        self._defer_updates = defer_updates
+
+        # Override the lazily queried scores, if given.
+        if csm_scores is not None:
+            self._csm_scores = csm_scores
+        if submissions_scores is not None:
+            self._submissions_scores = submissions_scores
 
     def create(self, subsection, read_only=False, force_calculate=False):
         """
@@ -69,6 +98,23 @@ class SubsectionGradeFactory(object):
             self.student, list(self._unsaved_subsection_grades.values()), self.course_data.course_key
         )
         self._unsaved_subsection_grades.clear()
+        self._deferred_grade_params.clear()
+
+    def unsaved_grades_params(self):
+        """
+        Returns the parameters for persisting all the unsaved
+        subsection_grades to this point, for use with
+        PersistentSubsectionGrade.bulk_update_or_create_grades,
+        and clears them.
+        """
+        params = [
+            self._deferred_grade_params.get(location) or
+            subsection_grade._persisted_model_params(self.student)  # pylint: disable=protected-access
+            for location, subsection_grade in six.iteritems(self._unsaved_subsection_grades)
+        ]
+        self._unsaved_subsection_grades.clear()
+        self._deferred_grade_params.clear()
+        return params
 
     def update(self, subsection, only_if_higher=None, score_deleted=False, force_update_subsections=False, persist_grade=True):
         """
@@ -97,6 +143,10 @@ class SubsectionGradeFactory(object):
                     ):
                         return orig_subsection_grade
 
+            if self._defer_updates:
+                self._defer_update(calculated_grade, score_deleted, force_update_subsections)
+                return calculated_grade
+
             grade_model = calculated_grade.update_or_create_model(
                 self.student,
                 score_deleted,
@@ -106,6 +156,28 @@ class SubsectionGradeFactory(object):
 
         return calculated_grade
 
+    def _defer_update(self, calculated_grade, score_deleted, force_update_subsections):
+        """
+        Keeps the given calculated grade with the unsaved grades, if it
+        should be persisted, after applying any override of the student's
+        persisted grade to it.
+
+        As with update_or_create_model, the raw scores are persisted and
+        the override only applies to the returned grade, so the persisted
+        params are captured before the override is applied.
+        """
+        # pylint: disable=protected-access
+        if not calculated_grade._should_persist_per_attempted(score_deleted, force_update_subsections):
+            return
+
+        self._deferred_grade_params[calculated_grade.location] = calculated_grade._persisted_model_params(
+            self.student
+        )
+        override = PersistentSubsectionGradeOverride.get_override(self.student.id, calculated_grade.location)
+        if override:
+            calculated_grade.apply_override(override)
+        self._unsaved_subsection_grades[calculated_grade.location] = calculated_grade
+
     @lazy
     def _csm_scores(self):
         """
@@ -169,3 +241,27 @@ class SubsectionGradeFactory(object):
             getattr(subsection, 'subtree_edited_on', None),
             self.student.id,
         ))
+
+
+def bulk_get_submissions_scores(course_key, users):
+    """
+    Returns the scores stored by the Submissions API for the course
+    for each of the given users, with a single query, as a dict keyed
+    by user id of the dicts returned by submissions_api.get_scores.
+    """
+    # The anonymous ids are deterministic, so there is no need to
+    # save them if they don't exist yet.
+    user_ids_by_anonymous_id = {
+        anonymous_id_for_user(user, course_key, save=False): user.id
+        for user in users
+    }
+    submissions_scores = {user.id: {} for user in users}
+    score_summaries = ScoreSummary.objects.filter(
+        student_item__course_id=str(course_key),
+        student_item__student_id__in=list(user_ids_by_anonymous_id),
+    ).select_related('latest', 'latest__submission', 'student_item')
+    for summary in score_summaries:
+        if not summary.latest.is_hidden():
+            user_id = user_ids_by_anonymous_id[summary.student_item.student_id]
+            submissions_scores[user_id][summary.student_item.item_id] = UnannotatedScoreSerializer(summary.latest).data
+    return submissions_scores
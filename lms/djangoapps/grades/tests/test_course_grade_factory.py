@@ -17,7 +17,7 @@ from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
-from ..config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, waffle
+from ..config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, BULK_UPDATE_COURSE_GRADES, waffle
 from ..course_grade import CourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
 from ..subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
@@ -187,6 +187,22 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         self.assertEqual(mock_update.called, force_update)
 
+    @ddt.data((1, 2, 0.5), (2, 2, 1.0), (0, 0, 0.0))
+    @ddt.unpack
+    def test_iter_bulk_force_update(self, earned, possible, expected_percent):
+        users = [self.request.user, UserFactory.create(), UserFactory.create()]
+        with waffle().override(BULK_UPDATE_COURSE_GRADES, active=True), mock_get_score(earned, possible):
+            grade_results = list(CourseGradeFactory().iter(users=users, course=self.course, force_update=True))
+
+        self.assertEqual([result.student for result in grade_results], users)
+        for user, course_grade, error in grade_results:
+            self.assertIsNone(error)
+            self.assertEqual(course_grade.percent, expected_percent)
+
+            read_grade = CourseGradeFactory().read(user, self.course, create_if_needed=False)
+            self.assertEqual(read_grade.percent, expected_percent)
+            self.assertIsInstance(read_grade.subsection_grades[self.sequence.location], ReadSubsectionGrade)
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
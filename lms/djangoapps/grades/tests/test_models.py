@@ -12,8 +12,10 @@ from hashlib import sha1
 import ddt
 import pytz
 import six
+from django.db import connection
 from django.db.utils import IntegrityError
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 from freezegun import freeze_time
 from mock import patch
@@ -279,6 +281,23 @@ class PersistentSubsectionGradeTest(GradesModelTestCase):
         self.assertEqual(grade.earned_all, 0.0)
         self.assertEqual(grade.earned_graded, 0.0)
 
+    def test_bulk_update_or_create_grades(self):
+        created_grade = PersistentSubsectionGrade.update_or_create_grade(**dict(self.params))
+
+        other_user = UserFactory()
+        updated_params = dict(self.params, earned_all=7.0, first_attempted=now())
+        new_params = dict(self.params, user_id=other_user.id)
+        PersistentSubsectionGrade.bulk_update_or_create_grades([updated_params, new_params], self.course_key)
+
+        updated_grade = PersistentSubsectionGrade.read_grade(self.params["user_id"], self.usage_key)
+        self.assertEqual(updated_grade.id, created_grade.id)
+        self.assertEqual(updated_grade.earned_all, 7.0)
+        self.assertEqual(updated_grade.first_attempted, self.params["first_attempted"])
+
+        new_grade = PersistentSubsectionGrade.read_grade(other_user.id, self.usage_key)
+        self.assertEqual(new_grade.earned_all, 6.0)
+        self.assertEqual(new_grade.visible_blocks.blocks, self.block_records)
+
     def test_first_attempted_not_changed_on_update(self):
         PersistentSubsectionGrade.update_or_create_grade(**self.params)
         moment = now()
@@ -475,6 +494,51 @@ class PersistentCourseGradesTest(GradesModelTestCase):
             grade = PersistentCourseGrade.update_or_create(**self.params)
         self._assert_tracker_emitted_event(tracker_mock, grade)
 
+    def test_bulk_update_or_create(self):
+        course_id = self.params.pop("course_id")
+        created_grade = PersistentCourseGrade.update_or_create(course_id=course_id, **self.params)
+
+        updated_params = dict(self.params, percent_grade=88.8, letter_grade="Better job")
+        new_params = dict(self.params, user_id=54321, passed=False)
+        PersistentCourseGrade.bulk_update_or_create(course_id, [dict(updated_params), dict(new_params)])
+
+        updated_grade = PersistentCourseGrade.read(updated_params["user_id"], course_id)
+        self.assertEqual(updated_grade.id, created_grade.id)
+        self.assertEqual(updated_grade.percent_grade, 88.8)
+        self.assertEqual(updated_grade.letter_grade, "Better job")
+        self.assertEqual(updated_grade.passed_timestamp, created_grade.passed_timestamp)
+
+        new_grade = PersistentCourseGrade.read(new_params["user_id"], course_id)
+        self.assertEqual(new_grade.percent_grade, new_params["percent_grade"])
+        self.assertIsNone(new_grade.passed_timestamp)
+
+    def test_bulk_update_or_create_unchanged(self):
+        course_id = self.params.pop("course_id")
+        created_grade = PersistentCourseGrade.update_or_create(course_id=course_id, **self.params)
+        grades = PersistentCourseGrade.bulk_update_or_create(course_id, [dict(self.params)])
+        self.assertEqual(grades, [created_grade])
+        self.assertEqual(grades[0].modified, created_grade.modified)
+
+    def test_bulk_update_in_one_query(self):
+        course_id = self.params.pop("course_id")
+        other_params = dict(self.params, user_id=54321)
+        PersistentCourseGrade.bulk_update_or_create(course_id, [dict(self.params), dict(other_params)])
+
+        updated_params = [
+            dict(self.params, percent_grade=88.8),
+            dict(other_params, letter_grade="Better job"),
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            PersistentCourseGrade.bulk_update_or_create(course_id, updated_params)
+        self.assertEqual(
+            len([query for query in queries.captured_queries if query['sql'].startswith('UPDATE')]), 1
+        )
+
+        grade = PersistentCourseGrade.read(self.params["user_id"], course_id)
+        self.assertEqual((grade.percent_grade, grade.letter_grade), (88.8, self.params["letter_grade"]))
+        other_grade = PersistentCourseGrade.read(other_params["user_id"], course_id)
+        self.assertEqual((other_grade.percent_grade, other_grade.letter_grade), (77.7, "Better job"))
+
     def _assert_tracker_emitted_event(self, tracker_mock, grade):
         """
         Helper function to ensure that the mocked event tracker
@@ -13,7 +13,7 @@ from student.tests.factories import UserFactory
 
 from ..constants import GradeOverrideFeatureEnum
 from ..models import PersistentSubsectionGrade, PersistentSubsectionGradeOverride
-from ..subsection_grade_factory import ZeroSubsectionGrade
+from ..subsection_grade_factory import SubsectionGradeFactory, ZeroSubsectionGrade
 from .base import GradeTestBase
 from .utils import mock_get_score
 
@@ -172,3 +172,40 @@ class TestSubsectionGradeFactory(ProblemSubmissionTestMixin, GradeTestBase):
             if possible_graded_override is None:
                 expected_possible = persistent_grade.possible_graded
             self.assert_grade(grade, expected_earned, expected_possible)
+
+    def test_deferred_update_with_override(self):
+        """
+        Tests that when a PersistentSubsectionGradeOverride exists, a
+        deferred update returns a grade that accounts for the override,
+        while the raw scores are persisted when saved in bulk.
+        """
+        with mock_get_score(2, 3):
+            self.subsection_grade_factory.update(self.sequence)
+        persistent_grade = PersistentSubsectionGrade.objects.first()
+        PersistentSubsectionGradeOverride.update_or_create_override(
+            UserFactory(),
+            persistent_grade,
+            earned_graded_override=0,
+            earned_all_override=0,
+            feature=GradeOverrideFeatureEnum.gradebook,
+        )
+
+        subsection_grade_factory = SubsectionGradeFactory(
+            self.request.user, self.course, self.course_structure, defer_updates=True,
+        )
+        with mock_get_score(1, 3):
+            grade = subsection_grade_factory.update(self.sequence)
+        self.assert_grade(grade, 0, 3)
+
+        PersistentSubsectionGrade.bulk_update_or_create_grades(
+            subsection_grade_factory.unsaved_grades_params(), self.course.id,
+        )
+        persistent_grade.refresh_from_db()
+        self.assertEqual(
+            (persistent_grade.earned_all, persistent_grade.possible_all),
+            (1, 3),
+        )
+        self.assertEqual(
+            (persistent_grade.earned_graded, persistent_grade.possible_graded),
+            (1, 3),
+        )
@@ -17,6 +17,7 @@ from pytz import UTC
 from six import string_types, text_type
 from six.moves import zip
 
+from lms.djangoapps.course_blocks.api import invalidate_user_course_blocks
 from student.models import get_user_by_username_or_email, CourseEnrollment
 
 
@@ -176,6 +177,8 @@ def set_due_date_extension(course, unit, student, due_date, actor=None, reason='
     else:
         api.set_date_for_block(course.id, unit.location, 'due', None, user=student, reason=reason, actor=actor)
 
+    invalidate_user_course_blocks(course.id, student.id)
+
 
 def dump_module_extensions(course, unit):
     """
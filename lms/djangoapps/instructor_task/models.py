@@ -20,13 +20,16 @@ import hashlib
 import json
 import logging
 import os.path
+import shutil
+from contextlib import contextmanager
+from tempfile import SpooledTemporaryFile
 from uuid import uuid4
 
 import six
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.db import models, transaction
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext as _
@@ -41,6 +44,8 @@ logger = logging.getLogger(__name__)
 QUEUING = 'QUEUING'
 PROGRESS = 'PROGRESS'
 TASK_INPUT_LENGTH = 10000
+# Size up to which concatenated reports are assembled in memory, rather than in a temporary file.
+REPORT_SPOOL_MAX_SIZE = 10 * 1024 * 1024
 
 
 @python_2_unicode_compatible
@@ -196,9 +201,9 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. For the sake of memory efficiency, large reports should be
+    written incrementally with a rows_writer, rather than passing in the
+    whole dataset.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -291,14 +296,61 @@ class DjangoStorageReportStore(ReportStore):
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
         """
-        output_buffer = ContentFile('')
-        # Adding unicode signature (BOM) for MS Excel 2013 compatibility
-        if six.PY2:
-            output_buffer.write(codecs.BOM_UTF8)
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        with self.rows_writer(course_id, filename) as writer:
+            writer.writerows(rows)
+
+    @contextmanager
+    def rows_writer(self, course_id, filename):
+        """
+        Context manager that yields a ReportRowsWriter to which rows can be
+        written incrementally, and which writes them to the storage backend
+        in csv format, with the given course_id and filename, on exit.
+
+        Nothing is written to the storage backend if an exception is raised
+        or if the writer is discarded.
+        """
+        writer = ReportRowsWriter(self)
+        try:
+            yield writer
+            if not writer.discarded:
+                writer.file.seek(0)
+                self.storage.save(self.path_to(course_id, filename), File(writer.file))
+        finally:
+            writer.file.close()
+
+    def store_concatenated_rows(self, course_id, filename, rows, part_filenames):
+        """
+        Given a course_id, filename, rows (each row is an iterable of
+        strings) and the filenames of csv files previously stored for the
+        course with `store_rows`, write the rows followed by the contents
+        of those files to the storage backend in csv format.
+        """
+        with self.rows_writer(course_id, filename) as writer:
+            writer.writerows(rows)
+            for part_filename in part_filenames:
+                with self.storage.open(self.path_to(course_id, part_filename), 'rb') as part_file:
+                    writer.write_csv_file(part_file)
+
+    def list_files(self, course_id, dirname):
+        """
+        For a given `course_id`, return the sorted list of the names of the
+        files stored in the `dirname` directory of the course.
+        """
+        try:
+            _, filenames = self.storage.listdir(self.path_to(course_id, dirname))
+        except OSError:
+            # Django's FileSystemStorage fails with an OSError if the
+            # dir does not exist; other storage types return an empty list.
+            return []
+        return sorted(filenames)
+
+    def delete_files(self, course_id, dirname):
+        """
+        Delete all the files stored in the `dirname` directory of the
+        course with the given `course_id`.
+        """
+        for filename in self.list_files(course_id, dirname):
+            self.storage.delete(self.path_to(course_id, os.path.join(dirname, filename)))
 
     def links_for(self, course_id):
         """
@@ -334,3 +386,46 @@ class DjangoStorageReportStore(ReportStore):
         """
         hashed_course_id = hashlib.sha1(text_type(course_id).encode('utf-8')).hexdigest()
         return os.path.join(hashed_course_id, filename)
+
+
+class ReportRowsWriter(object):
+    """
+    Writer of the rows of a csv report, which are encoded and spooled to
+    a temporary file as they are written, so that the report is never
+    held in memory as a whole.  See DjangoStorageReportStore.rows_writer.
+    """
+    def __init__(self, report_store):
+        self._report_store = report_store
+        self.file = SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE)
+        self.num_rows = 0
+        self.discarded = False
+        if six.PY2:
+            # Adding unicode signature (BOM) for MS Excel 2013 compatibility
+            self.file.write(codecs.BOM_UTF8)
+            self._csvwriter = csv.writer(self.file)
+        else:
+            self._csvwriter = csv.writer(codecs.getwriter('utf-8')(self.file))
+
+    def writerows(self, rows):
+        """
+        Writes the given rows, each an iterable of strings.
+        """
+        for row in self._report_store._get_utf8_encoded_rows(rows):  # pylint: disable=protected-access
+            self._csvwriter.writerow(row)
+            self.num_rows += 1
+
+    def write_csv_file(self, csv_file):
+        """
+        Writes the contents of the given binary csv file, as previously
+        written by a ReportRowsWriter.
+        """
+        # The file starts with its own BOM, if any, which must not be repeated.
+        if csv_file.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8:
+            csv_file.seek(0)
+        shutil.copyfileobj(csv_file, self.file)
+
+    def discard(self):
+        """
+        Discards the report, so that it is not written to the storage backend.
+        """
+        self.discarded = True
@@ -122,6 +122,42 @@ def _generate_items_for_subtask(
         TASK_LOG.info(u"Number of items generated by chunking %s not equal to original total %s", num_items_queued, total_num_items)
 
 
+def _generate_id_ranges_for_subtask(item_ids, items_per_task, total_num_subtasks):
+    """
+    Generates the ranges of ids of the "items" that should be processed by each subtask.
+
+    Arguments:
+        `item_ids` : an ordered queryset of the ids of the items.
+        `items_per_task` : maximum number of items in each range, except the last one.
+        `total_num_subtasks` : the result of _get_number_of_subtasks for the items.
+
+    Returns:  yields (after_id, through_id) tuples, where the range of a subtask contains the
+    ids greater than after_id (if not None) and lower than or equal to through_id (if not None).
+
+    The ranges are cut from a single pass over the ordered ids, which are the only values read.
+    The last range is open-ended, so that, as with _generate_items_for_subtask, items added in
+    the meantime are included.  If items were removed in the meantime, empty ranges are
+    generated instead of the missing ones, so that there are always `total_num_subtasks` ranges.
+    """
+    after_id = None
+    num_subtasks = 0
+    num_items_in_range = 0
+    if total_num_subtasks > 1:
+        for item_id in item_ids.iterator():
+            num_items_in_range += 1
+            if num_items_in_range == items_per_task:
+                yield (after_id, item_id)
+                after_id = item_id
+                num_items_in_range = 0
+                num_subtasks += 1
+                if num_subtasks == total_num_subtasks - 1:
+                    break
+
+    for __ in range(num_subtasks, total_num_subtasks - 1):
+        yield (after_id, after_id)
+    yield (after_id, None)
+
+
 @python_2_unicode_compatible
 class SubtaskStatus(object):
     """
@@ -301,10 +337,68 @@ def queue_subtasks_for_query(
     Returns:  the task progress as stored in the InstructorTask object.
 
     """
-    task_id = entry.task_id
+    total_num_subtasks = _get_number_of_subtasks(total_num_items, items_per_task)
+
+    # Construct a generator that will return the recipients to use for each subtask.
+    # Pass in the desired fields to fetch for each recipient.
+    item_list_generator = _generate_items_for_subtask(
+        item_querysets,
+        item_fields,
+        total_num_items,
+        items_per_task,
+        total_num_subtasks,
+        entry.course_id,
+    )
+    return _queue_subtasks(
+        entry, action_name, create_subtask_fcn, item_list_generator, total_num_items, total_num_subtasks
+    )
+
+
+def queue_subtasks_for_id_ranges(
+    entry,
+    action_name,
+    create_subtask_fcn,
+    item_ids,
+    items_per_task,
+    total_num_items,
+):
+    """
+    Generates and queues subtasks to each process the "items" in a range of ids.
 
-    # Calculate the number of tasks that will be created, and create a list of ids for each task.
+    Unlike queue_subtasks_for_query, the items themselves aren't passed to the subtasks,
+    which query them by their range of ids, so that the messages queued for the subtasks
+    stay small however many items there are.
+
+    Arguments:
+        `entry` : the InstructorTask object for which subtasks are being queued.
+        `action_name` : a past-tense verb that can be used for constructing readable status messages.
+        `create_subtask_fcn` : a function of two arguments that constructs the desired kind of subtask object.
+            Arguments are the (after_id, through_id) range of ids of the items to be processed by this
+            subtask, see _generate_id_ranges_for_subtask, and a SubtaskStatus object reflecting initial
+            status (and containing the subtask's id).
+        `item_ids` : an ordered queryset of the ids of the items.
+        `items_per_task` : maximum number of items to be processed by a subtask.
+        `total_num_items` : total amount of items that will be put into subtasks
+
+    Returns:  the task progress as stored in the InstructorTask object.
+    """
     total_num_subtasks = _get_number_of_subtasks(total_num_items, items_per_task)
+    id_range_generator = _generate_id_ranges_for_subtask(item_ids, items_per_task, total_num_subtasks)
+    return _queue_subtasks(
+        entry, action_name, create_subtask_fcn, id_range_generator, total_num_items, total_num_subtasks
+    )
+
+
+def _queue_subtasks(entry, action_name, create_subtask_fcn, item_generator, total_num_items, total_num_subtasks):
+    """
+    Queues a subtask for each of the values yielded by the given generator, after updating
+    the InstructorTask object with information about the subtasks.
+
+    Returns:  the task progress as stored in the InstructorTask object.
+    """
+    task_id = entry.task_id
+
+    # Create a list of ids for each task.
     subtask_id_list = [str(uuid4()) for _ in range(total_num_subtasks)]
 
     # Update the InstructorTask  with information about the subtasks we've defined.
@@ -319,17 +413,6 @@ def queue_subtasks_for_query(
     with outer_atomic():
         progress = initialize_subtask_info(entry, action_name, total_num_items, subtask_id_list)
 
-    # Construct a generator that will return the recipients to use for each subtask.
-    # Pass in the desired fields to fetch for each recipient.
-    item_list_generator = _generate_items_for_subtask(
-        item_querysets,
-        item_fields,
-        total_num_items,
-        items_per_task,
-        total_num_subtasks,
-        entry.course_id,
-    )
-
     # Now create the subtasks, and start them running.
     TASK_LOG.info(
         u"Task %s: creating %s subtasks to process %s items.",
@@ -338,11 +421,11 @@ def queue_subtasks_for_query(
         total_num_items,
     )
     num_subtasks = 0
-    for item_list in item_list_generator:
+    for items in item_generator:
         subtask_id = subtask_id_list[num_subtasks]
         num_subtasks += 1
         subtask_status = SubtaskStatus.create(subtask_id)
-        new_subtask = create_subtask_fcn(item_list, subtask_status)
+        new_subtask = create_subtask_fcn(items, subtask_status)
         TASK_LOG.info(
             u"Queueing BulkEmail Task: %s Subtask: %s at timestamp: %s",
             task_id, subtask_id, datetime.now()
@@ -459,7 +542,7 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
         raise DuplicateTaskException(msg)
 
 
-def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0):
+def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0, complete_entry=True):
     """
     Update the status of the subtask in the parent InstructorTask object tracking its progress.
 
@@ -470,16 +553,22 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
     The subtask lock acquired in the call to check_subtask_is_valid() is released here, only when
     the attempting of retries has concluded.
+
+    Returns True if this update completed the last of the InstructorTask's subtasks.  If
+    `complete_entry` is False, the InstructorTask's state is then left unchanged, for the
+    caller to set once it has finished its own work.
     """
     try:
-        _update_subtask_status(entry_id, current_task_id, new_subtask_status)
+        return _update_subtask_status(entry_id, current_task_id, new_subtask_status, complete_entry)
     except DatabaseError:
         # If we fail, try again recursively.
         retry_count += 1
         if retry_count < MAX_DATABASE_LOCK_RETRIES:
             TASK_LOG.info(u"Retrying to update status for subtask %s of instructor task %d with status %s:  retry %d",
                           current_task_id, entry_id, new_subtask_status, retry_count)
-            update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
+            return update_subtask_status(
+                entry_id, current_task_id, new_subtask_status, retry_count, complete_entry
+            )
         else:
             TASK_LOG.info(u"Failed to update status after %d retries for subtask %s of instructor task %d with status %s",
                           retry_count, current_task_id, entry_id, new_subtask_status)
@@ -492,7 +581,7 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
 
 @transaction.atomic
-def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
+def _update_subtask_status(entry_id, current_task_id, new_subtask_status, complete_entry=True):
     """
     Update the status of the subtask in the parent InstructorTask object tracking its progress.
 
@@ -512,12 +601,14 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     subtasks.  'Total' is expected to have been set at the time the subtasks were created.
     The other three counters are incremented depending on the value of `status`.  Once the counters
     for 'succeeded' and 'failed' match the 'total', the subtasks are done and the InstructorTask's
-    "status" is changed to SUCCESS.
+    "status" is changed to SUCCESS, unless `complete_entry` is False.
 
     The "subtasks" field also contains a 'status' key, that contains a dict that stores status
     information for each subtask.  At the moment, the value for each subtask (keyed by its task_id)
     is the value of the SubtaskStatus.to_dict(), but could be expanded in future to store information
     about failure messages, progress made, etc.
+
+    Returns True if all the subtasks are now done.
     """
     TASK_LOG.info(u"Preparing to update status for subtask %s for instructor task %d with status %s",
                   current_task_id, entry_id, new_subtask_status)
@@ -568,7 +659,7 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         # At present, we mark the task as having succeeded.  In future, we should see
         # if there was a catastrophic failure that occurred, and figure out how to
         # report that here.
-        if num_remaining <= 0:
+        if num_remaining <= 0 and complete_entry:
             entry.task_state = SUCCESS
         entry.subtasks = json.dumps(subtask_dict)
         entry.task_output = InstructorTask.create_output_for_success(task_progress)
@@ -577,6 +668,7 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         entry.save()
         TASK_LOG.info(u"Task output updated to %s for subtask %s of instructor task %d",
                       entry.task_output, current_task_id, entry_id)
+        return num_remaining <= 0
     except Exception:
         TASK_LOG.exception("Unexpected error while updating InstructorTask.")
         raise
@@ -29,6 +29,7 @@ from django.conf import settings
 from django.utils.translation import ugettext_noop
 
 from bulk_email.tasks import perform_delegate_email_batches
+from lms.djangoapps.instructor_task.config.waffle import parallel_grade_reports_enabled
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
@@ -185,10 +186,29 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(CourseGradeReport.generate, xmodule_instance_args)
+    if parallel_grade_reports_enabled():
+        task_fn = partial(CourseGradeReport.generate_in_shards, calculate_grades_csv_shard, xmodule_instance_args)
+    else:
+        task_fn = partial(CourseGradeReport.generate, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)
+def calculate_grades_csv_shard(entry_id, action_name, after_user_id, through_user_id, subtask_status_dict):
+    """
+    Grade the learners with ids in the given range, as a subtask of
+    calculate_grades_csv, and push the results to an S3 bucket for
+    download once all the learners in the course are graded.
+    """
+    TASK_LOG.info(
+        u"InstructorTask ID: %s, Task type: %s, Preparing to grade users %s to %s",
+        entry_id, action_name, after_user_id, through_user_id
+    )
+    CourseGradeReport.generate_shard(
+        None, entry_id, action_name, after_user_id, through_user_id, subtask_status_dict
+    )
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
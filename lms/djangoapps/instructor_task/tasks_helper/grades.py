@@ -2,14 +2,18 @@
 Functionality for generating grade reports.
 """
 
+import json
 import logging
+import os.path
 import re
+import traceback
 from collections import OrderedDict, defaultdict
 from datetime import datetime
-from itertools import chain
+from itertools import chain, islice
 from time import time
 
 import six
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from lazy import lazy
@@ -31,6 +35,13 @@ from lms.djangoapps.instructor_task.config.waffle import (
     generate_grade_report_for_verified_only,
     optimize_get_learners_switch_enabled
 )
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_id_ranges,
+    update_subtask_status
+)
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from opaque_keys.edx.keys import UsageKey
@@ -44,7 +55,7 @@ from xmodule.partitions.partitions_service import PartitionService
 from xmodule.split_test_module import get_split_user_partitions
 
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store
+from .utils import csv_report_writer, upload_csv_parts_to_report_store, upload_csv_to_report_store
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -68,6 +79,34 @@ def _flatten(iterable):
     return list(chain.from_iterable(iterable))
 
 
+def _upload_batched_rows(context, csv_name, success_headers, error_headers, batched_rows):
+    """
+    Creates and uploads a CSV for the given headers and batches of
+    (success_rows, error_rows), along with a CSV of the errors if there
+    are any, writing each batch as it is generated.  Also updates the
+    metrics on task status.
+    """
+    date = datetime.now(UTC)
+    num_succeeded, num_failed = 0, 0
+    with csv_report_writer(csv_name + '_err', context.course_id, date) as error_writer:
+        with csv_report_writer(csv_name, context.course_id, date) as success_writer:
+            success_writer.writerows([success_headers])
+            error_writer.writerows([error_headers])
+            for success_rows, error_rows in batched_rows:
+                success_writer.writerows(success_rows)
+                error_writer.writerows(error_rows)
+                num_succeeded += len(success_rows)
+                num_failed += len(error_rows)
+        if num_failed == 0:
+            error_writer.discard()
+
+    # update metrics on task status
+    context.task_progress.succeeded = num_succeeded
+    context.task_progress.failed = num_failed
+    context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
+    context.task_progress.total = context.task_progress.attempted
+
+
 class GradeReportBase(object):
     """
     Base class for grade reports (ProblemGradeReport and CourseGradeReport).
@@ -129,31 +168,11 @@ class GradeReportBase(object):
         report_for_verified_only = generate_grade_report_for_verified_only()
         return get_enrolled_learners_for_course(course_id=course_id, verified_only=report_for_verified_only)
 
-    def _compile(self, context, batched_rows):
-        """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
-        """
-        # partition and chain successes and errors
-        success_rows, error_rows = zip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
-
-        # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
-        context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
-        context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
-
-    def _upload(self, context, success_rows, error_rows):
+    def _upload(self, context, success_headers, error_headers, batched_rows):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Creates and uploads a CSV for the given headers and batched_rows.
         """
-        date = datetime.now(UTC)
-        upload_csv_to_report_store(success_rows, context.file_name, context.course_id, date)
-        if len(error_rows) > 1:
-            upload_csv_to_report_store(error_rows, context.file_name + '_err', context.course_id, date)
+        _upload_batched_rows(context, context.file_name, success_headers, error_headers, batched_rows)
 
 
 class _CourseGradeReportContext(object):
@@ -327,6 +346,9 @@ class CourseGradeReport(object):
     # Batch size for chunking the list of enrollees in the course.
     USER_BATCH_SIZE = 100
 
+    # Directory in which the shards of a report store their parts, by InstructorTask id.
+    PARTS_DIR = u'grade_report_parts'
+
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
         """
@@ -336,6 +358,64 @@ class CourseGradeReport(object):
             context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
             return CourseGradeReport()._generate(context)
 
+    @classmethod
+    def generate_in_shards(cls, shard_task, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+        """
+        Public method to generate a grade report with parallel subtasks,
+        each generating the rows of a range of learners with the given
+        `shard_task`, which calls `generate_shard`.
+        """
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
+            return CourseGradeReport()._generate_in_shards(context, shard_task, _entry_id)
+
+    @classmethod
+    def generate_shard(
+            cls, _xmodule_instance_args, entry_id, action_name, after_user_id, through_user_id, subtask_status_dict,
+    ):
+        """
+        Public method to generate the rows of a grade report for the
+        enrolled learners with ids greater than `after_user_id` and lower
+        than or equal to `through_user_id`, when not None, as a subtask of
+        the InstructorTask with the given `entry_id`.
+
+        The subtask that completes last assembles the final report from
+        the parts stored by all the subtasks.
+        """
+        subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+        current_task_id = subtask_status.task_id
+        # Fails this subtask immediately if it is unknown to the InstructorTask
+        # entry, or was already completed, as when it is run twice by Celery.
+        check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+        entry = InstructorTask.objects.get(pk=entry_id)
+        course_id = entry.course_id
+        task_input = json.loads(entry.task_input)
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(_xmodule_instance_args, entry_id, course_id, task_input, action_name)
+            report = CourseGradeReport()
+            try:
+                num_succeeded, num_failed = report._generate_shard(
+                    context, entry_id, after_user_id, through_user_id,
+                )
+            except Exception:
+                TASK_LOG.exception(
+                    u'%s, Task type: %s, Failed to generate grades for users %s to %s',
+                    context.task_info_string, action_name, after_user_id, through_user_id,
+                )
+                subtask_status.increment(state=FAILURE)
+                if update_subtask_status(entry_id, current_task_id, subtask_status, complete_entry=False):
+                    report._assemble(context, entry_id)
+                raise
+
+            subtask_status.increment(
+                succeeded=num_succeeded,
+                failed=num_failed,
+                state=SUCCESS,
+            )
+            if update_subtask_status(entry_id, current_task_id, subtask_status, complete_entry=False):
+                report._assemble(context, entry_id)
+
     def _generate(self, context):
         """
         Internal method for generating a grade report for the given context.
@@ -345,14 +425,140 @@ class CourseGradeReport(object):
         error_headers = self._error_headers()
         batched_rows = self._batched_rows(context)
 
-        context.update_status(u'Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
-
-        context.update_status(u'Uploading grades')
-        self._upload(context, success_headers, success_rows, error_headers, error_rows)
+        context.update_status(u'Compiling and uploading grades')
+        self._upload(context, success_headers, error_headers, batched_rows)
 
         return context.update_status(u'Completed grades')
 
+    def _generate_in_shards(self, context, shard_task, entry_id):
+        """
+        Internal method for queueing the subtasks that generate a grade
+        report for the given context, each for a range of enrolled learners.
+        """
+        entry = InstructorTask.objects.get(pk=entry_id)
+        # Subtasks may have already been queued, when the same task is run
+        # again after a loss of connection to the broker.
+        if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+            TASK_LOG.warning(u'%s, Subtasks have already been queued', context.task_info_string)
+            return json.loads(entry.task_output)
+
+        users = get_user_model().objects.filter(**self._enrolled_learners_filter(context.course_id))
+        total_num_users = users.count()
+        if total_num_users == 0:
+            return self._generate(context)
+
+        def _create_shard_subtask(user_range, initial_subtask_status):
+            """Creates a subtask to generate the rows of the users in the given range of ids."""
+            after_user_id, through_user_id = user_range
+            return shard_task.subtask(
+                (
+                    entry_id,
+                    context.action_name,
+                    after_user_id,
+                    through_user_id,
+                    initial_subtask_status.to_dict(),
+                ),
+                task_id=initial_subtask_status.task_id,
+                routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+            )
+
+        context.update_status(u'Queueing grades')
+        return queue_subtasks_for_id_ranges(
+            entry,
+            context.action_name,
+            _create_shard_subtask,
+            users.order_by('id').values_list('id', flat=True),
+            settings.GRADES_DOWNLOAD_USERS_PER_TASK,
+            total_num_users,
+        )
+
+    def _generate_shard(self, context, entry_id, after_user_id, through_user_id):
+        """
+        Internal method for generating the rows of the given range of
+        learners, which are stored as headerless parts of the report.
+        Returns the numbers of learners that were graded and that failed.
+        """
+        users = get_user_model().objects.filter(**self._enrolled_learners_filter(context.course_id))
+        if after_user_id is not None:
+            users = users.filter(id__gt=after_user_id)
+        if through_user_id is not None:
+            users = users.filter(id__lte=through_user_id)
+        users = users.order_by('id').select_related('profile')
+
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        parts_dir = self._parts_dir(entry_id)
+        # The parts are named after the start of their range, to be assembled in order of user ids.
+        part_name = u'{:012d}'.format(after_user_id or 0)
+        success_part = os.path.join(parts_dir, part_name + u'.csv')
+        error_part = os.path.join(parts_dir, part_name + u'_err.csv')
+        with report_store.rows_writer(context.course_id, error_part) as error_writer:
+            with report_store.rows_writer(context.course_id, success_part) as success_writer:
+                for batch in self._grouper(users.iterator()):
+                    success_rows, error_rows = self._rows_for_users(context, batch)
+                    success_writer.writerows(success_rows)
+                    error_writer.writerows(error_rows)
+            if error_writer.num_rows == 0:
+                error_writer.discard()
+        return success_writer.num_rows, error_writer.num_rows
+
+    def _assemble(self, context, entry_id):
+        """
+        Internal method for assembling and uploading the grade report
+        from the parts stored by all the subtasks, in order of user ids,
+        and removing the parts.
+
+        The InstructorTask is only marked as succeeded once the report is
+        uploaded.  Otherwise, it is marked as failed and the parts are kept.
+        """
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        parts_dir = self._parts_dir(entry_id)
+        entry = InstructorTask.objects.get(pk=entry_id)
+        if json.loads(entry.subtasks)['failed'] > 0:
+            # The rows of some learners are missing, so don't upload an incomplete report.
+            message = u'Failed to generate grades for some of the learners'
+            TASK_LOG.error(u'%s, Task type: %s, %s', context.task_info_string, context.action_name, message)
+            entry.task_output = InstructorTask.create_output_for_failure(ValueError(message), None)
+            entry.task_state = FAILURE
+            entry.save_now()
+            return
+
+        try:
+            part_filenames = report_store.list_files(context.course_id, parts_dir)
+            success_parts = [
+                os.path.join(parts_dir, filename) for filename in part_filenames if not filename.endswith(u'_err.csv')
+            ]
+            error_parts = [
+                os.path.join(parts_dir, filename) for filename in part_filenames if filename.endswith(u'_err.csv')
+            ]
+            date = datetime.now(UTC)
+            upload_csv_parts_to_report_store(
+                [self._success_headers(context)], success_parts, 'grade_report', context.course_id, date,
+            )
+            if error_parts:
+                upload_csv_parts_to_report_store(
+                    [self._error_headers()], error_parts, 'grade_report_err', context.course_id, date,
+                )
+        except Exception as exc:
+            TASK_LOG.exception(
+                u'%s, Task type: %s, Failed to assemble grades', context.task_info_string, context.action_name,
+            )
+            entry.task_output = InstructorTask.create_output_for_failure(exc, traceback.format_exc())
+            entry.task_state = FAILURE
+            entry.save_now()
+            raise
+
+        entry.task_state = SUCCESS
+        entry.save_now()
+        report_store.delete_files(context.course_id, parts_dir)
+        TASK_LOG.info(u'%s, Task type: %s, Completed grades', context.task_info_string, context.action_name)
+
+    def _parts_dir(self, entry_id):
+        """
+        Returns the directory of the parts stored for the report of the
+        InstructorTask with the given id.
+        """
+        return os.path.join(self.PARTS_DIR, six.text_type(entry_id))
+
     def _success_headers(self, context):
         """
         Returns a list of all applicable column headers for this grade report.
@@ -382,32 +588,11 @@ class CourseGradeReport(object):
             users = [u for u in users if u is not None]
             yield self._rows_for_users(context, users)
 
-    def _compile(self, context, batched_rows):
-        """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
-        """
-        # partition and chain successes and errors
-        success_rows, error_rows = zip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
-
-        # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
-        context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
-        context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
-
-    def _upload(self, context, success_headers, success_rows, error_headers, error_rows):
+    def _upload(self, context, success_headers, error_headers, batched_rows):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Creates and uploads a CSV for the given headers and batched_rows.
         """
-        date = datetime.now(UTC)
-        upload_csv_to_report_store([success_headers] + success_rows, 'grade_report', context.course_id, date)
-        if len(error_rows) > 0:
-            error_rows = [error_headers] + error_rows
-            upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
+        _upload_batched_rows(context, 'grade_report', success_headers, error_headers, batched_rows)
 
     def _grades_header(self, context):
         """
@@ -465,12 +650,7 @@ class CourseGradeReport(object):
             This generator method fetches & loads the enrolled user objects on demand which in chunk
             size defined. This method is a workaround to avoid out-of-memory errors.
             """
-            filter_kwargs = {
-                'courseenrollment__course_id': course_id,
-            }
-            if verified_only:
-                filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
-
+            filter_kwargs = self._enrolled_learners_filter(course_id, verified_only)
             user_ids_list = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
             user_chunks = grouper(user_ids_list)
             for user_ids in user_chunks:
@@ -489,6 +669,32 @@ class CourseGradeReport(object):
         report_for_verified_only = generate_grade_report_for_verified_only()
         return get_enrolled_learners_for_course(course_id=course_id, verified_only=report_for_verified_only)
 
+    def _enrolled_learners_filter(self, course_id, verified_only=None):
+        """
+        Returns the filter kwargs of the users enrolled in the given
+        course, limited to verified enrollees if `verified_only`, which
+        defaults to the generate_grade_report_for_verified_only switch.
+        """
+        if verified_only is None:
+            verified_only = generate_grade_report_for_verified_only()
+        filter_kwargs = {
+            'courseenrollment__course_id': course_id,
+        }
+        if verified_only:
+            filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+        return filter_kwargs
+
+    def _grouper(self, iterable):
+        """
+        Returns a generator of lists of up to USER_BATCH_SIZE items of
+        the given iterable.
+        """
+        iterator = iter(iterable)
+        batch = list(islice(iterator, self.USER_BATCH_SIZE))
+        while batch:
+            yield batch
+            batch = list(islice(iterator, self.USER_BATCH_SIZE))
+
     def _user_grades(self, course_grade, context):
         """
         Returns a list of grade results for the given course_grade corresponding
@@ -670,9 +876,8 @@ class ProblemGradeReport(GradeReportBase):
 
         context.update_status('ProblemGradeReport Step 4: Retrieving problem scores for course for enrolled users')
         generated_rows = self._batched_rows(context, header_row, graded_scorable_blocks)
-        success_rows, error_rows = self._compile(context, generated_rows)
         context.update_status('ProblemGradeReport Step 5: Uploading data to CSV report file')
-        self._upload(context, [success_headers] + success_rows, [error_headers] + error_rows)
+        self._upload(context, success_headers, error_headers, generated_rows)
 
         return context.update_status('ProblemGradeReport Step 6: Completed problem grades report')
 
@@ -21,8 +21,9 @@ from pytz import UTC
 
 from lms.djangoapps.instructor_analytics.basic import get_proctored_exam_results
 from lms.djangoapps.instructor_analytics.csvs import format_dictlist
-from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, bulk_add_users_to_cohorts
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
+from student.models import get_user_by_username_or_email
 from survey.models import SurveyAnswer
 from util.file import UniversalNewlineIterator
 
@@ -32,6 +33,10 @@ from .utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED, upload_csv_to_
 # define different loggers for use within tasks and on client side
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# The number of found learners whose cohort memberships are written together
+# when cohorting students from a CSV file.
+COHORT_ASSIGNMENT_BATCH_SIZE = 1000
+
 
 def upload_course_survey_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
@@ -162,6 +167,49 @@ def _get_csv_file_content(csv_file):
         return UniversalNewlineIterator(csv_content)
 
 
+def _preassign_to_cohort(cohort_status, username_or_email, task_progress):
+    """
+    Stores the cohort of a learner who could not be found by their email
+    address, so that they are added to it if they eventually enroll, and
+    records the outcome in the cohort status and task progress.
+    """
+    try:
+        add_user_to_cohort(cohort_status['cohort'], username_or_email)
+        cohort_status['Preassigned Learners'].add(username_or_email)
+        task_progress.preassigned += 1
+    except User.DoesNotExist:
+        # Raised when a user with the username could not be found, and the email is not valid
+        cohort_status['Learners Not Found'].add(username_or_email)
+        task_progress.failed += 1
+    except ValidationError:
+        # Raised when a user with the username could not be found, and the email is not valid,
+        # but the entered string contains an "@"
+        # Since there is no way to know if the entered string is an invalid username or an invalid email,
+        # assume that a string with the "@" symbol in it is an attempt at entering an email
+        cohort_status['Invalid Email Addresses'].add(username_or_email)
+        task_progress.failed += 1
+
+
+def _add_users_to_cohorts(course_id, assignments, task_progress):
+    """
+    Adds the users of the given (cohort status, user) pairs to their cohorts in
+    bulk, and records the outcome in the cohort statuses and task progress.
+    """
+    if not assignments:
+        return
+    results = bulk_add_users_to_cohorts(
+        course_id,
+        [(cohort_status['cohort'], user) for cohort_status, user in assignments],
+    )
+    for (cohort_status, __), (added, __) in zip(assignments, results):
+        if added:
+            cohort_status['Learners Added'] += 1
+            task_progress.succeeded += 1
+        else:
+            # The user is already in the given cohort
+            task_progress.skipped += 1
+
+
 def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     Within a given course, cohort students in bulk, then upload the results
@@ -192,6 +240,10 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     # to prevent redundant cohort queries.
     cohorts_status = {}
 
+    # The (cohort status, user) pairs of the found users, whose memberships are
+    # written in bulk once COHORT_ASSIGNMENT_BATCH_SIZE of them are collected.
+    pending_assignments = []
+
     with DefaultStorage().open(task_input['file_name']) as f:
 
         if six.PY3:
@@ -228,31 +280,18 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
                 continue
 
             try:
-                # If add_user_to_cohort successfully adds a user, a user object is returned.
-                # If a user is preassigned to a cohort, no user object is returned (we already have the email address).
-                (user, previous_cohort, preassigned) = add_user_to_cohort(cohorts_status[cohort_name]['cohort'], username_or_email)
-                if preassigned:
-                    cohorts_status[cohort_name]['Preassigned Learners'].add(username_or_email)
-                    task_progress.preassigned += 1
-                else:
-                    cohorts_status[cohort_name]['Learners Added'] += 1
-                    task_progress.succeeded += 1
+                user = get_user_by_username_or_email(username_or_email)
             except User.DoesNotExist:
-                # Raised when a user with the username could not be found, and the email is not valid
-                cohorts_status[cohort_name]['Learners Not Found'].add(username_or_email)
-                task_progress.failed += 1
-            except ValidationError:
-                # Raised when a user with the username could not be found, and the email is not valid,
-                # but the entered string contains an "@"
-                # Since there is no way to know if the entered string is an invalid username or an invalid email,
-                # assume that a string with the "@" symbol in it is an attempt at entering an email
-                cohorts_status[cohort_name]['Invalid Email Addresses'].add(username_or_email)
-                task_progress.failed += 1
-            except ValueError:
-                # Raised when the user is already in the given cohort
-                task_progress.skipped += 1
+                _preassign_to_cohort(cohorts_status[cohort_name], username_or_email, task_progress)
+                continue
+
+            pending_assignments.append((cohorts_status[cohort_name], user))
+            if len(pending_assignments) >= COHORT_ASSIGNMENT_BATCH_SIZE:
+                _add_users_to_cohorts(course_id, pending_assignments, task_progress)
+                pending_assignments = []
+                task_progress.update_task_state(extra_meta=current_step)
 
-            task_progress.update_task_state(extra_meta=current_step)
+        _add_users_to_cohorts(course_id, pending_assignments, task_progress)
 
     current_step['step'] = 'Uploading CSV'
     task_progress.update_task_state(extra_meta=current_step)
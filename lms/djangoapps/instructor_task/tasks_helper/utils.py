@@ -3,6 +3,8 @@ Utility methods for instructor tasks
 """
 
 
+from contextlib import contextmanager
+
 from eventtracking import tracker
 
 from lms.djangoapps.instructor_task.models import ReportStore
@@ -37,17 +39,70 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
         report_name: string - Name of the generated report
     """
     report_store = ReportStore.from_config(config_name)
-    report_name = u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-        course_prefix=course_filename_prefix_generator(course_id),
-        csv_name=csv_name,
-        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-    )
+    report_name = _report_name(csv_name, course_id, timestamp)
 
     report_store.store_rows(course_id, report_name, rows)
     tracker_emit(csv_name)
     return report_name
 
 
+@contextmanager
+def csv_report_writer(csv_name, course_id, timestamp, config_name='GRADES_DOWNLOAD'):
+    """
+    Context manager to upload data as a CSV using ReportStore, which
+    yields a ReportRowsWriter to which the rows are written incrementally,
+    and uploads the CSV on exit unless the writer is discarded.
+
+    Arguments:
+        csv_name: Name of the resulting CSV
+        course_id: ID of the course
+    """
+    report_store = ReportStore.from_config(config_name)
+    report_name = _report_name(csv_name, course_id, timestamp)
+
+    with report_store.rows_writer(course_id, report_name) as writer:
+        yield writer
+    if not writer.discarded:
+        tracker_emit(csv_name)
+
+
+def upload_csv_parts_to_report_store(
+        rows, part_filenames, csv_name, course_id, timestamp, config_name='GRADES_DOWNLOAD',
+):
+    """
+    Upload data as a CSV using ReportStore, concatenating the given rows
+    and the CSV parts previously stored in the ReportStore.
+
+    Arguments:
+        rows: CSV data to start the report with, typically the header.
+        part_filenames: Names of the CSV parts to append to the rows, as
+            stored for the course with ReportStore.store_rows.
+        csv_name: Name of the resulting CSV
+        course_id: ID of the course
+
+    Returns:
+        report_name: string - Name of the generated report
+    """
+    report_store = ReportStore.from_config(config_name)
+    report_name = _report_name(csv_name, course_id, timestamp)
+
+    report_store.store_concatenated_rows(course_id, report_name, rows, part_filenames)
+    tracker_emit(csv_name)
+    return report_name
+
+
+def _report_name(csv_name, course_id, timestamp):
+    """
+    Returns the name of the report file for the given CSV name, course
+    and timestamp.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+
 def tracker_emit(report_name):
     """
     Emits a 'report.requested' event for the given report.
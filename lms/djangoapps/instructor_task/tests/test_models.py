@@ -7,6 +7,7 @@ import copy
 import time
 from six import StringIO
 
+import unicodecsv
 from django.conf import settings
 from django.test import SimpleTestCase, TestCase, override_settings
 from opaque_keys.edx.locator import CourseLocator
@@ -69,6 +70,30 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_rows_writer(self):
+        """
+        Test that the rows written with ReportStore.rows_writer() are
+        stored on exit, unless the writer is discarded or fails.
+        """
+        report_store = self.create_report_store()
+        with report_store.rows_writer(self.course_id, 'report.csv') as writer:
+            writer.writerows([[u'Username', u'Grade']])
+            writer.writerows([[u'ni\xf1o', 0.5], [u'student', 1]])
+        with report_store.rows_writer(self.course_id, 'discarded.csv') as writer:
+            writer.writerows([[u'Username', u'Grade']])
+            writer.discard()
+        with self.assertRaises(ValueError):
+            with report_store.rows_writer(self.course_id, 'failed.csv') as writer:
+                writer.writerows([[u'Username', u'Grade']])
+                raise ValueError
+
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['report.csv'])
+        with report_store.storage.open(report_store.path_to(self.course_id, 'report.csv')) as report_file:
+            self.assertEqual(
+                list(unicodecsv.reader(report_file, encoding='utf-8-sig')),
+                [[u'Username', u'Grade'], [u'ni\xf1o', u'0.5'], [u'student', u'1']],
+            )
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -8,7 +8,11 @@ from uuid import uuid4
 from mock import Mock, patch
 from six.moves import range
 
-from lms.djangoapps.instructor_task.subtasks import queue_subtasks_for_query
+from lms.djangoapps.instructor_task.subtasks import (
+    _generate_id_ranges_for_subtask,
+    queue_subtasks_for_id_ranges,
+    queue_subtasks_for_query
+)
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskCourseTestCase
 from student.models import CourseEnrollment
@@ -82,3 +86,60 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 5)
+
+    def test_queue_subtasks_for_id_ranges(self):
+        """Test queue_subtasks_for_id_ranges() with students enrolled in the middle of the process."""
+        instructor_task = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='bulk_course_email',
+        )
+        self._enroll_students_in_course(self.course.id, 7)
+
+        item_ids = CourseEnrollment.objects.filter(
+            course_id=self.course.id,
+        ).order_by('user_id').values_list('user_id', flat=True)
+
+        def initialize_subtask_info(*args):  # pylint: disable=unused-argument
+            """Instead of initializing subtask info enroll some more students into course."""
+            self._enroll_students_in_course(self.course.id, 2)
+            return {}
+
+        mock_create_subtask_fcn = Mock()
+        with patch('lms.djangoapps.instructor_task.subtasks.initialize_subtask_info') as mock_initialize_subtask_info:
+            mock_initialize_subtask_info.side_effect = initialize_subtask_info
+            queue_subtasks_for_id_ranges(
+                entry=instructor_task,
+                action_name='action_name',
+                create_subtask_fcn=mock_create_subtask_fcn,
+                item_ids=item_ids,
+                items_per_task=3,
+                total_num_items=7,
+            )
+
+        # The last range is open-ended, so the students enrolled in the meantime are included.
+        user_ids = list(item_ids)
+        self.assertEqual(
+            [args[0] for args, _kwargs in mock_create_subtask_fcn.call_args_list],
+            [(None, user_ids[2]), (user_ids[2], user_ids[5]), (user_ids[5], None)],
+        )
+
+    def test_generate_id_ranges_for_subtask(self):
+        """Test _generate_id_ranges_for_subtask() reads the ids once, and with fewer students than expected."""
+        self._enroll_students_in_course(self.course.id, 4)
+        item_ids = CourseEnrollment.objects.filter(
+            course_id=self.course.id,
+        ).order_by('user_id').values_list('user_id', flat=True)
+        user_ids = list(item_ids)
+
+        with self.assertNumQueries(1):
+            id_ranges = list(_generate_id_ranges_for_subtask(item_ids, 2, 3))
+        self.assertEqual(id_ranges, [(None, user_ids[1]), (user_ids[1], user_ids[3]), (user_ids[3], None)])
+
+        # There are still as many ranges when there are fewer students than expected.
+        id_ranges = list(_generate_id_ranges_for_subtask(item_ids, 2, 4))
+        self.assertEqual(
+            id_ranges,
+            [(None, user_ids[1]), (user_ids[1], user_ids[3]), (user_ids[3], user_ids[3]), (user_ids[3], None)],
+        )
@@ -9,11 +9,13 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import json
 import os
 import shutil
 import tempfile
 from contextlib import contextmanager
 from datetime import datetime, timedelta
+from uuid import uuid4
 
 from six import text_type
 from six.moves import range, zip
@@ -23,6 +25,7 @@ import ddt
 import openedx.core.djangoapps.user_api.course_tag.api as course_tag_api
 import unicodecsv
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
+from celery.states import FAILURE, SUCCESS
 from course_modes.models import CourseMode
 from course_modes.tests.factories import CourseModeFactory
 from django.conf import settings
@@ -57,6 +60,8 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_course_survey_report,
     upload_ora2_data
 )
+from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -448,6 +453,127 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
             {'attempted': expected_students, 'succeeded': expected_students, 'failed': 0}, result
         )
 
+    def _generate_in_shards(self, before_shard=None):
+        """
+        Generates the grade report of the course with subtasks that are
+        run synchronously, as soon as they are queued, and returns the
+        InstructorTask of the report.
+
+        If given, before_shard is called before running each subtask.
+        """
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='grade_course',
+        )
+
+        def create_subtask(args, task_id, routing_key):  # pylint: disable=unused-argument
+            """Returns a subtask that is applied synchronously."""
+            subtask = Mock()
+
+            def apply_async():
+                """Runs the subtask."""
+                if before_shard:
+                    before_shard()
+                CourseGradeReport.generate_shard(None, *args)
+
+            subtask.apply_async.side_effect = apply_async
+            return subtask
+
+        shard_task = Mock()
+        shard_task.subtask.side_effect = create_subtask
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            CourseGradeReport.generate_in_shards(shard_task, None, entry.id, self.course.id, {}, 'graded')
+        return InstructorTask.objects.get(pk=entry.id)
+
+    @override_settings(GRADES_DOWNLOAD_USERS_PER_TASK=2)
+    def test_generate_in_shards(self):
+        """
+        Test that the rows generated by all the shards are assembled in
+        a single report, in order of user ids.
+        """
+        students = [
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+            for index in range(5)
+        ]
+        entry = self._generate_in_shards()
+
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertEqual(json.loads(entry.subtasks)['succeeded'], 3)
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(entry.task_output))
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        self.assertEqual(len(links), 1)
+        with report_store.storage.open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            rows = list(unicodecsv.DictReader(csv_file))
+        self.assertEqual([row['Username'] for row in rows], [student.username for student in students])
+        parts_dir = os.path.join(CourseGradeReport.PARTS_DIR, str(entry.id))
+        self.assertEqual(report_store.list_files(self.course.id, parts_dir), [])
+
+    @override_settings(GRADES_DOWNLOAD_USERS_PER_TASK=2)
+    def test_generate_in_shards_late_enrollment(self):
+        """
+        Test that learners who enroll while the shards are queued are
+        included in the report.
+        """
+        students = [
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+            for index in range(3)
+        ]
+
+        def enroll_student():
+            """Enrolls a new student before the first shard is run."""
+            if len(students) == 3:
+                students.append(self.create_student(u'late_student', u'late_student@example.com'))
+
+        entry = self._generate_in_shards(before_shard=enroll_student)
+
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset({'attempted': 4, 'succeeded': 4, 'failed': 0}, json.loads(entry.task_output))
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        with report_store.storage.open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            rows = list(unicodecsv.DictReader(csv_file))
+        self.assertEqual([row['Username'] for row in rows], [student.username for student in students])
+
+    @override_settings(GRADES_DOWNLOAD_USERS_PER_TASK=2)
+    @patch('lms.djangoapps.instructor_task.tasks_helper.grades.CourseGradeReport._rows_for_users')
+    def test_generate_in_shards_failure(self, mock_rows_for_users):
+        """
+        Test that no report is uploaded when a shard fails.
+        """
+        for index in range(3):
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+        mock_rows_for_users.side_effect = [([], []), Exception('Cannot grade students')]
+        with self.assertRaises(Exception):
+            self._generate_in_shards()
+
+        entry = InstructorTask.objects.get(task_key='dummy_task_key')
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(ReportStore.from_config(config_name='GRADES_DOWNLOAD').links_for(self.course.id), [])
+
+    @override_settings(GRADES_DOWNLOAD_USERS_PER_TASK=2)
+    @patch('lms.djangoapps.instructor_task.tasks_helper.grades.upload_csv_parts_to_report_store')
+    def test_generate_in_shards_assemble_failure(self, mock_upload):
+        """
+        Test that the task is marked as failed, and the parts are kept,
+        when the report cannot be assembled.
+        """
+        for index in range(3):
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+        mock_upload.side_effect = Exception('Cannot upload report')
+        with self.assertRaises(Exception):
+            self._generate_in_shards()
+
+        entry = InstructorTask.objects.get(task_key='dummy_task_key')
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.subtasks)['succeeded'], 2)
+        parts_dir = os.path.join(CourseGradeReport.PARTS_DIR, str(entry.id))
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertNotEqual(report_store.list_files(self.course.id, parts_dir), [])
+
 
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
@@ -1886,6 +2012,26 @@ class TestCohortStudents(TestReportMixin, InstructorTaskCourseTestCase):
             verify_order=False
         )
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper.misc.COHORT_ASSIGNMENT_BATCH_SIZE', 2)
+    def test_users_in_several_rows(self):
+        result = self._cohort_students_and_upload(
+            u'username,email,cohort\n'
+            u'student_1\xec,,Cohort 1\n'
+            u'student_1\xec,,Cohort 1\n'
+            u'student_1\xec,,Cohort 2\n'
+            u'student_2,,Cohort 2\n'
+            u'student_2,,Cohort 2'
+        )
+        self.assertDictContainsSubset({'total': 5, 'attempted': 5, 'succeeded': 3, 'skipped': 2, 'failed': 0}, result)
+        self.verify_rows_in_csv(
+            [
+                dict(list(zip(self.csv_header_row, ['Cohort 1', 'True', '1', '', '', '']))),
+                dict(list(zip(self.csv_header_row, ['Cohort 2', 'True', '2', '', '', '']))),
+            ],
+            verify_order=False
+        )
+        self.assertEqual(set(self.cohort_2.users.all()), {self.student_1, self.student_2})
+
 
 @ddt.ddt
 @patch('lms.djangoapps.instructor_task.tasks_helper.misc.DefaultStorage', new=MockDefaultStorage)
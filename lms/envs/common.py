@@ -581,6 +581,13 @@ CACHES = {
         'TIMEOUT': '7200',
         'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
     },
+    'safe_exec': {
+        'KEY_PREFIX': 'safe_exec',
+        'KEY_FUNCTION': 'util.memcache.safe_key',
+        'LOCATION': ['localhost:11211'],
+        'TIMEOUT': '86400',
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+    },
     'mongo_metadata_inheritance': {
         'KEY_PREFIX': 'mongo_metadata_inheritance',
         'KEY_FUNCTION': 'util.memcache.safe_key',
@@ -615,6 +622,14 @@ CACHES = {
     },
 }
 
+# Maximum total size, in bytes of pickled data, of the course structures kept in
+# memory by each process, in front of the 'course_structure_cache'. 0 disables it.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# Whether the definitions of the blocks in a lazily loaded split modulestore
+# subtree are fetched with a single query as soon as the first one is needed.
+SPLIT_MODULESTORE_PREFETCH_DEFINITIONS = True
+
 ############################ OAUTH2 Provider ###################################
 OAUTH_EXPIRE_CONFIDENTIAL_CLIENT_DAYS = 365
 OAUTH_EXPIRE_PUBLIC_CLIENT_DAYS = 30
@@ -779,6 +794,9 @@ AUTHENTICATION_BACKENDS = [
 STUDENT_FILEUPLOAD_MAX_SIZE = 4 * 1000 * 1000  # 4 MB
 MAX_FILEUPLOADS_PER_INPUT = 20
 
+# Maximum number of XBlock handler calls in a request to the batch handler endpoint.
+XBLOCK_HANDLER_BATCH_MAX_CALLS = 20
+
 # Set request limits for maximum size of a request body and maximum number of GET/POST parameters. (>=Django 1.10)
 # Limits are currently disabled - but can be used for finer-grained denial-of-service protection.
 DATA_UPLOAD_MAX_MEMORY_SIZE = None
@@ -1036,6 +1054,12 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# Directory of the local disk cache of the course assets served by the StaticContentServer
+# middleware which are too large for the cache, or None to disable it. The cache holds at
+# most COURSE_ASSETS_DISK_CACHE_MAX_SIZE bytes, evicting the least recently served assets.
+COURSE_ASSETS_DISK_CACHE_DIR = None
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -1135,6 +1159,12 @@ CODE_JAIL = {
 #   ]
 COURSES_WITH_UNSAFE_CODE = []
 
+# Timeout, in seconds, of the cached results of executing the code of problems,
+# and maximum pickled size, in bytes, of a result to cache. The results are
+# stored in the 'safe_exec' cache if configured, else in the default cache.
+SAFE_EXEC_CACHE_TIMEOUT = 24 * 60 * 60
+SAFE_EXEC_CACHE_MAX_RESULT_SIZE = 512 * 1024
+
 ############################### DJANGO BUILT-INS ###############################
 # Change DEBUG in your environment settings files, not here
 DEBUG = False
@@ -2220,6 +2250,13 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of email messages sent together on a connection by bulk email tasks.
+BULK_EMAIL_SEND_BATCH_SIZE = 50
+
+# Number of connections on which each bulk email subtask sends batches of
+# email messages concurrently.
+BULK_EMAIL_CONNECTIONS_PER_SUBTASK = 1
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -2847,6 +2884,10 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': None,
 }
 
+# Number of learners whose rows are generated by each subtask of a grade
+# report, when the instructor_task.parallel_grade_reports switch is enabled.
+GRADES_DOWNLOAD_USERS_PER_TASK = 5000
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': None,
@@ -3328,6 +3369,11 @@ ECOMMERCE_API_SIGNING_KEY = 'SET-ME-PLEASE'
 
 COURSE_CATALOG_API_URL = 'http://localhost:8008/api/v1'
 
+# Number of seconds between checks of the version of the programs cached by the
+# cache_programs command, by the process-local snapshot of the programs.  0 disables
+# the snapshot, in which case the programs are read from the cache on every call.
+CATALOG_PROGRAMS_SNAPSHOT_REFRESH_INTERVAL = 60
+
 CREDENTIALS_INTERNAL_SERVICE_URL = 'http://localhost:8005'
 CREDENTIALS_PUBLIC_SERVICE_URL = 'http://localhost:8005'
 
@@ -3720,6 +3766,16 @@ CONTENT_TYPE_GATE_GROUP_IDS = {
 
 COURSES_API_CACHE_TIMEOUT = 3600  # Value is in seconds
 
+############## Settings for the student dashboard ######################
+
+# How long the per-user snapshot of the certificate, credit and verification
+# statuses shown on the student dashboard is cached, in seconds. The snapshot
+# is computed again when the enrollments, certificates, credit eligibilities and
+# requests, and ID verifications of the user change, and in each period of this
+# many seconds, for the statuses depending on dates, like verification deadlines.
+# Set to 0 to disable the snapshot.
+STUDENT_DASHBOARD_SNAPSHOT_TIMEOUT = 15 * 60
+
 ############## Settings for CourseGraph ############################
 COURSEGRAPH_JOB_QUEUE = DEFAULT_PRIORITY_QUEUE
 
@@ -145,6 +145,10 @@ if STATIC_ROOT_BASE:
     WEBPACK_LOADER['WORKERS']['STATS_FILE'] = STATIC_ROOT / "webpack-worker-stats.json"
 
 
+# MAKO_MODULE_DIR specifies the directory where the mako templates are compiled,
+# e.g. ahead of time by the compile_mako_templates management command
+MAKO_MODULE_DIR = ENV_TOKENS.get('MAKO_MODULE_DIR', MAKO_MODULE_DIR)
+
 # STATIC_URL_BASE specifies the base url to use for static files
 STATIC_URL_BASE = ENV_TOKENS.get('STATIC_URL_BASE', None)
 if STATIC_URL_BASE:
@@ -244,6 +248,13 @@ if 'loc_cache' not in CACHES:
 if 'staticfiles' in CACHES:
     CACHES['staticfiles']['KEY_PREFIX'] = EDX_PLATFORM_REVISION
 
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE', COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE
+)
+SPLIT_MODULESTORE_PREFETCH_DEFINITIONS = ENV_TOKENS.get(
+    'SPLIT_MODULESTORE_PREFETCH_DEFINITIONS', SPLIT_MODULESTORE_PREFETCH_DEFINITIONS
+)
+
 # In order to transition from local disk asset storage to S3 backed asset storage,
 # we need to run asset collection twice, once for local disk and once for S3.
 # Once we have migrated to service assets off S3, then we can convert this back to
@@ -293,6 +304,11 @@ BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get(
     'BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS',
     BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS
 )
+BULK_EMAIL_SEND_BATCH_SIZE = ENV_TOKENS.get('BULK_EMAIL_SEND_BATCH_SIZE', BULK_EMAIL_SEND_BATCH_SIZE)
+BULK_EMAIL_CONNECTIONS_PER_SUBTASK = ENV_TOKENS.get(
+    'BULK_EMAIL_CONNECTIONS_PER_SUBTASK',
+    BULK_EMAIL_CONNECTIONS_PER_SUBTASK
+)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -422,6 +438,8 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
         CODE_JAIL[name] = value
 
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
+SAFE_EXEC_CACHE_TIMEOUT = ENV_TOKENS.get('SAFE_EXEC_CACHE_TIMEOUT', SAFE_EXEC_CACHE_TIMEOUT)
+SAFE_EXEC_CACHE_MAX_RESULT_SIZE = ENV_TOKENS.get('SAFE_EXEC_CACHE_MAX_RESULT_SIZE', SAFE_EXEC_CACHE_MAX_RESULT_SIZE)
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
 
@@ -593,6 +611,10 @@ XQUEUE_INTERFACE = AUTH_TOKENS['XQUEUE_INTERFACE']
 # use the one from common.py
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
+COURSE_ASSETS_DISK_CACHE_DIR = ENV_TOKENS.get('COURSE_ASSETS_DISK_CACHE_DIR', COURSE_ASSETS_DISK_CACHE_DIR)
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_ASSETS_DISK_CACHE_MAX_SIZE', COURSE_ASSETS_DISK_CACHE_MAX_SIZE
+)
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
 
@@ -642,6 +664,7 @@ BLOCK_STRUCTURES_SETTINGS = ENV_TOKENS.get('BLOCK_STRUCTURES_SETTINGS', BLOCK_ST
 
 # upload limits
 STUDENT_FILEUPLOAD_MAX_SIZE = ENV_TOKENS.get("STUDENT_FILEUPLOAD_MAX_SIZE", STUDENT_FILEUPLOAD_MAX_SIZE)
+XBLOCK_HANDLER_BATCH_MAX_CALLS = ENV_TOKENS.get("XBLOCK_HANDLER_BATCH_MAX_CALLS", XBLOCK_HANDLER_BATCH_MAX_CALLS)
 
 # Event tracking
 TRACKING_BACKENDS.update(AUTH_TOKENS.get("TRACKING_BACKENDS", {}))
@@ -675,6 +698,7 @@ DISABLE_ACCOUNT_ACTIVATION_REQUIREMENT_SWITCH = ENV_TOKENS.get(
 GRADES_DOWNLOAD_ROUTING_KEY = ENV_TOKENS.get('GRADES_DOWNLOAD_ROUTING_KEY', HIGH_MEM_QUEUE)
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
+GRADES_DOWNLOAD_USERS_PER_TASK = ENV_TOKENS.get('GRADES_DOWNLOAD_USERS_PER_TASK', GRADES_DOWNLOAD_USERS_PER_TASK)
 
 # Rate limit for regrading tasks that a grading policy change can kick off
 POLICY_CHANGE_TASK_RATE_LIMIT = ENV_TOKENS.get('POLICY_CHANGE_TASK_RATE_LIMIT', POLICY_CHANGE_TASK_RATE_LIMIT)
@@ -858,6 +882,9 @@ ECOMMERCE_API_URL = ENV_TOKENS.get('ECOMMERCE_API_URL', ECOMMERCE_API_URL)
 ECOMMERCE_API_TIMEOUT = ENV_TOKENS.get('ECOMMERCE_API_TIMEOUT', ECOMMERCE_API_TIMEOUT)
 
 COURSE_CATALOG_API_URL = ENV_TOKENS.get('COURSE_CATALOG_API_URL', COURSE_CATALOG_API_URL)
+CATALOG_PROGRAMS_SNAPSHOT_REFRESH_INTERVAL = ENV_TOKENS.get(
+    'CATALOG_PROGRAMS_SNAPSHOT_REFRESH_INTERVAL', CATALOG_PROGRAMS_SNAPSHOT_REFRESH_INTERVAL
+)
 
 ECOMMERCE_SERVICE_WORKER_USERNAME = ENV_TOKENS.get(
     'ECOMMERCE_SERVICE_WORKER_USERNAME',
@@ -1158,3 +1185,6 @@ MANUAL_ENROLLMENT_ROLE_CHOICES = ENV_TOKENS.get('MANUAL_ENROLLMENT_ROLE_CHOICES'
 ########################## limiting dashboard courses ######################
 
 DASHBOARD_COURSE_LIMIT = ENV_TOKENS.get('DASHBOARD_COURSE_LIMIT', None)
+STUDENT_DASHBOARD_SNAPSHOT_TIMEOUT = ENV_TOKENS.get(
+    'STUDENT_DASHBOARD_SNAPSHOT_TIMEOUT', STUDENT_DASHBOARD_SNAPSHOT_TIMEOUT
+)
@@ -234,6 +234,19 @@ CACHES = {
     },
 }
 
+# Don't keep course structures across tests.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = 0
+
+# Keep the modulestore query counts asserted by tests independent of prefetching.
+SPLIT_MODULESTORE_PREFETCH_DEFINITIONS = False
+
+# Send bulk emails one at a time, so that the errors mocked by tests for each call
+# to send_messages apply to a single email.
+BULK_EMAIL_SEND_BATCH_SIZE = 1
+
+# Read the programs cached by tests from the cache rather than a snapshot.
+CATALOG_PROGRAMS_SNAPSHOT_REFRESH_INTERVAL = 0
+
 ############################### BLOCKSTORE #####################################
 # Blockstore tests
 RUN_BLOCKSTORE_TESTS = os.environ.get('EDXAPP_RUN_BLOCKSTORE_TESTS', 'no').lower() in ('true', 'yes', '1')
@@ -591,6 +604,7 @@ LEARNING_MICROFRONTEND_URL = "http://learning-mfe"
 ########################## limiting dashboard courses ######################
 
 DASHBOARD_COURSE_LIMIT = 250
+STUDENT_DASHBOARD_SNAPSHOT_TIMEOUT = 0
 
 PROCTORING_SETTINGS = {}
 
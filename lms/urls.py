@@ -17,6 +17,7 @@ from debug import views as debug_views
 from lms.djangoapps.certificates import views as certificates_views
 from lms.djangoapps.courseware.masquerade import handle_ajax as courseware_masquerade_handle_ajax
 from lms.djangoapps.courseware.module_render import (
+    handle_xblock_batch_callback,
     handle_xblock_callback,
     handle_xblock_callback_noauth,
     xblock_view,
@@ -255,6 +256,13 @@ urlpatterns += [
     ),
 
     # xblock Handler APIs
+    url(
+        r'^courses/{course_key}/xblock/handler_batch$'.format(
+            course_key=settings.COURSE_ID_PATTERN,
+        ),
+        handle_xblock_batch_callback,
+        name='xblock_handler_batch',
+    ),
     url(
         r'^courses/{course_key}/xblock/{usage_key}/handler/(?P<handler>[^/]*)(?:/(?P<suffix>.*))?$'.format(
             course_key=settings.COURSE_ID_PATTERN,
@@ -24,3 +24,11 @@ PROGRAMS_BY_TYPE_CACHE_KEY_TPL = 'programs-by-type-{site_id}-{program_type}'
 
 # Template used to create cache keys for organization to program uuids.
 PROGRAMS_BY_ORGANIZATION_CACHE_KEY_TPL = 'organization-programs-{org_key}'
+
+# Cache key used to locate an item containing the program UUIDs and pathway ids of
+# each site, along with the version of the programs snapshot (see snapshot.py).
+PROGRAMS_SNAPSHOT_INDEX_CACHE_KEY = 'programs-snapshot-index'
+
+# Cache key used to locate the version of the programs snapshot, which changes every
+# time the program data is cached.
+PROGRAMS_SNAPSHOT_VERSION_CACHE_KEY = 'programs-snapshot-version'
@@ -4,6 +4,7 @@
 import logging
 import sys
 from collections import defaultdict
+from uuid import uuid4
 
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
@@ -18,6 +19,8 @@ from openedx.core.djangoapps.catalog.cache import (
     PROGRAM_CACHE_KEY_TPL,
     PROGRAMS_BY_ORGANIZATION_CACHE_KEY_TPL,
     PROGRAMS_BY_TYPE_CACHE_KEY_TPL,
+    PROGRAMS_SNAPSHOT_INDEX_CACHE_KEY,
+    PROGRAMS_SNAPSHOT_VERSION_CACHE_KEY,
     SITE_PATHWAY_IDS_CACHE_KEY_TPL,
     SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
 )
@@ -65,6 +68,7 @@ class Command(BaseCommand):
         catalog_courses = {}
         programs_by_type = {}
         organizations = {}
+        snapshot_sites = {}
         for site in Site.objects.all():
             site_config = getattr(site, 'configuration', None)
             if site_config is None or not site_config.get_value('COURSE_CATALOG_API_URL'):
@@ -108,6 +112,8 @@ class Command(BaseCommand):
             ))
             cache.set(SITE_PATHWAY_IDS_CACHE_KEY_TPL.format(domain=site.domain), pathway_ids, None)
 
+            snapshot_sites[site.domain] = {'id': site.id, 'program_uuids': uuids, 'pathway_ids': pathway_ids}
+
         logger.info(u'Caching details for {} programs.'.format(len(programs)))
         cache.set_many(programs, None)
 
@@ -126,6 +132,12 @@ class Command(BaseCommand):
         logger.info(u'Caching programs uuids for {} organizations'.format(len(organizations)))
         cache.set_many(organizations, None)
 
+        # Bump the version of the programs snapshot only once all the program data is cached.
+        snapshot_version = uuid4().hex
+        logger.info(u'Caching version {} of the programs snapshot.'.format(snapshot_version))
+        cache.set(PROGRAMS_SNAPSHOT_INDEX_CACHE_KEY, {'version': snapshot_version, 'sites': snapshot_sites}, None)
+        cache.set(PROGRAMS_SNAPSHOT_VERSION_CACHE_KEY, snapshot_version, None)
+
         if failure:
             sys.exit(1)
 
@@ -0,0 +1,229 @@
+"""
+Process-local snapshot of the program data cached by the cache_programs
+management command.
+
+The cache_programs command caches each program and pathway in its own
+cache entry, along with a snapshot index of the programs and pathways of
+each site, and bumps the snapshot version.  Each process loads all the
+programs and pathways of the snapshot at once, and indexes them in
+memory, so that the catalog utils can read programs without hitting the
+cache.  The snapshot is replaced in a background thread when the version
+is bumped, and continues to be used until the new one is loaded.
+
+The snapshot is enabled by the CATALOG_PROGRAMS_SNAPSHOT_REFRESH_INTERVAL
+setting, which is the number of seconds between checks of the version.
+"""
+
+
+import copy
+import logging
+import threading
+import time
+from collections import defaultdict
+
+import six
+from django.conf import settings
+from django.core.cache import cache
+
+from openedx.core.djangoapps.catalog.cache import (
+    PATHWAY_CACHE_KEY_TPL,
+    PROGRAM_CACHE_KEY_TPL,
+    PROGRAMS_SNAPSHOT_INDEX_CACHE_KEY,
+    PROGRAMS_SNAPSHOT_VERSION_CACHE_KEY
+)
+
+log = logging.getLogger(__name__)
+
+
+class ProgramsSnapshot(object):
+    """
+    All the cached programs and pathways, with indexes of the programs by
+    site, course run, catalog course, organization and program type.
+
+    The course runs and catalog courses of the programs of each site are
+    also indexed, as sets of program uuids, along with the run keys of the
+    courses of each program, so that a learner's progress in the programs
+    can be computed from their enrollments and certificates with set
+    operations, see ProgramProgressMeter.
+
+    The programs and pathways are shared by all the requests of the
+    process, so deep copies of them are returned, see program and pathway,
+    which callers like ProgramDataExtender are free to modify.
+    """
+    def __init__(self, index, programs, pathways):
+        # pylint: disable=import-outside-toplevel
+        from openedx.core.djangoapps.catalog.utils import (
+            course_run_keys_for_program,
+            course_uuids_for_program,
+            normalize_program_type
+        )
+
+        self.version = index['version']
+        self.programs = programs
+        self.pathways = pathways
+        self.site_program_uuids = {}
+        self.site_pathway_ids = {}
+        self.course_run_program_uuids = defaultdict(list)
+        self.catalog_course_program_uuids = defaultdict(list)
+        self.organization_program_uuids = defaultdict(list)
+        self.type_program_uuids = defaultdict(list)
+        # Indexes of the courses of the programs, for ProgramProgressMeter.
+        self.program_course_run_keys = {}
+        self.site_course_run_program_uuids = {}
+        self.site_catalog_course_program_uuids = {}
+
+        for program in six.itervalues(programs):
+            self.program_course_run_keys[program['uuid']] = {
+                course['uuid']: frozenset(course_run['key'] for course_run in course['course_runs'])
+                for course in program['courses']
+            }
+            for course_run_key in course_run_keys_for_program(program):
+                self.course_run_program_uuids[course_run_key].append(program['uuid'])
+            for course_uuid in course_uuids_for_program(program):
+                self.catalog_course_program_uuids[course_uuid].append(program['uuid'])
+            for org in program['authoring_organizations']:
+                self.organization_program_uuids[org['key']].append(program['uuid'])
+
+        for domain, site_index in six.iteritems(index['sites']):
+            self.site_program_uuids[domain] = site_index['program_uuids']
+            self.site_pathway_ids[domain] = site_index['pathway_ids']
+            course_run_program_uuids = self.site_course_run_program_uuids[domain] = defaultdict(set)
+            catalog_course_program_uuids = self.site_catalog_course_program_uuids[domain] = defaultdict(set)
+            for uuid in site_index['program_uuids']:
+                if uuid in programs:
+                    program_type = normalize_program_type(programs[uuid].get('type'))
+                    self.type_program_uuids[(site_index['id'], program_type)].append(uuid)
+                    for course_uuid, course_run_keys in six.iteritems(self.program_course_run_keys[uuid]):
+                        catalog_course_program_uuids[course_uuid].add(uuid)
+                        for course_run_key in course_run_keys:
+                            course_run_program_uuids[course_run_key].add(uuid)
+
+    def program(self, uuid):
+        """
+        Returns a deep copy of the program with the given uuid, or None.
+        """
+        return copy.deepcopy(self.programs.get(six.text_type(uuid)))
+
+    def pathway(self, pathway_id):
+        """
+        Returns a deep copy of the pathway with the given id, or None.
+        """
+        return copy.deepcopy(self.pathways.get(pathway_id))
+
+    def organization_programs(self, organization):
+        """
+        Returns a copy of the uuids of the programs authored by the given
+        organization, or None.
+        """
+        return copy.deepcopy(self.organization_program_uuids.get(organization))
+
+    @classmethod
+    def load(cls):
+        """
+        Loads the snapshot of the programs from the cache, or returns
+        None if the cache_programs command hasn't cached a snapshot.
+        """
+        index = cache.get(PROGRAMS_SNAPSHOT_INDEX_CACHE_KEY)
+        if index is None:
+            return None
+
+        program_uuids = set()
+        pathway_ids = set()
+        for site_index in six.itervalues(index['sites']):
+            program_uuids.update(site_index['program_uuids'])
+            pathway_ids.update(site_index['pathway_ids'])
+
+        programs = _get_many(PROGRAM_CACHE_KEY_TPL, 'uuid', program_uuids)
+        pathways = _get_many(PATHWAY_CACHE_KEY_TPL, 'id', pathway_ids)
+        return cls(index, programs, pathways)
+
+
+def _get_many(key_template, id_field, ids):
+    """
+    Returns a dict of the cached items with the given ids, retrying once
+    to get the items missing from the result of the first get_many, like
+    get_programs_by_uuids.
+    """
+    keys = [key_template.format(**{id_field: item_id}) for item_id in ids]
+    items = cache.get_many(keys)
+    missing_keys = set(keys) - set(items)
+    if missing_keys:
+        items.update(cache.get_many(list(missing_keys)))
+        for key in set(keys) - set(items):
+            log.warning(u'Failed to get %s from the cache for the programs snapshot.', key)
+    return {item[id_field]: item for item in six.itervalues(items)}
+
+
+class _ProgramsSnapshotHolder(object):
+    """
+    Holds the current snapshot of the process, and replaces it when the
+    cached snapshot version changes.
+    """
+    def __init__(self):
+        self.snapshot = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self, refresh_interval):
+        """
+        Returns the current snapshot, loading it if there is none, or
+        None if there is no cached snapshot.  If the version of the cached
+        snapshot was not checked in the last refresh_interval seconds, it is
+        checked, and a new snapshot is loaded in the background if needed.
+        """
+        now = time.time()
+        if self.snapshot is not None and now - self._checked_at < refresh_interval:
+            return self.snapshot
+
+        self._checked_at = now
+        version = cache.get(PROGRAMS_SNAPSHOT_VERSION_CACHE_KEY)
+        if version is None:
+            return self.snapshot
+        if self.snapshot is None:
+            self.snapshot = ProgramsSnapshot.load()
+        elif version != self.snapshot.version:
+            self._refresh_in_background()
+        return self.snapshot
+
+    def _refresh_in_background(self):
+        """
+        Starts a thread that loads the new snapshot, unless one is already
+        running.  The current snapshot is used in the meantime.
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def refresh():
+            """
+            Loads and swaps in the new snapshot.
+            """
+            try:
+                snapshot = ProgramsSnapshot.load()
+                if snapshot is not None:
+                    self.snapshot = snapshot
+                    log.info(u'Loaded version %s of the programs snapshot.', snapshot.version)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u'Failed to load the programs snapshot.')
+            finally:
+                self._refreshing = False
+
+        thread = threading.Thread(target=refresh, name='programs-snapshot-refresh')
+        thread.daemon = True
+        thread.start()
+
+
+_holder = _ProgramsSnapshotHolder()
+
+
+def get_programs_snapshot():
+    """
+    Returns the process-local ProgramsSnapshot, or None if it is disabled
+    or not cached yet.
+    """
+    refresh_interval = getattr(settings, 'CATALOG_PROGRAMS_SNAPSHOT_REFRESH_INTERVAL', 0)
+    if not refresh_interval:
+        return None
+    return _holder.get(refresh_interval)
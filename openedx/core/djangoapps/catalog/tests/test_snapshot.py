@@ -0,0 +1,133 @@
+"""Tests covering the process-local snapshot of the cached programs."""
+# pylint: disable=missing-docstring
+
+
+import mock
+import six
+from django.core.cache import cache
+from django.test import override_settings
+
+from openedx.core.djangoapps.catalog import snapshot
+from openedx.core.djangoapps.catalog.cache import (
+    PATHWAY_CACHE_KEY_TPL,
+    PROGRAM_CACHE_KEY_TPL,
+    PROGRAMS_SNAPSHOT_INDEX_CACHE_KEY,
+    PROGRAMS_SNAPSHOT_VERSION_CACHE_KEY
+)
+from openedx.core.djangoapps.catalog.tests.factories import (
+    CourseFactory,
+    CourseRunFactory,
+    OrganizationFactory,
+    PathwayFactory,
+    ProgramFactory
+)
+from openedx.core.djangoapps.catalog.utils import (
+    get_pathways,
+    get_programs,
+    get_programs_by_type,
+    get_programs_for_organization
+)
+from openedx.core.djangoapps.site_configuration.tests.factories import SiteFactory
+from openedx.core.djangoapps.site_configuration.tests.test_util import with_site_configuration_context
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
+
+
+@skip_unless_lms
+@override_settings(CATALOG_PROGRAMS_SNAPSHOT_REFRESH_INTERVAL=60)
+class TestProgramsSnapshot(CacheIsolationTestCase):
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(TestProgramsSnapshot, self).setUp()
+        self.site = SiteFactory()
+        self.course_run = CourseRunFactory()
+        self.course = CourseFactory(course_runs=[self.course_run])
+        self.organization = OrganizationFactory()
+        self.program = ProgramFactory(
+            courses=[self.course], authoring_organizations=[self.organization], type='Masters'
+        )
+        self.other_program = ProgramFactory(type='Bachelors')
+        self.pathway = PathwayFactory(programs=[self.program])
+
+        holder_patcher = mock.patch.object(snapshot, '_holder', snapshot._ProgramsSnapshotHolder())
+        holder_patcher.start()
+        self.addCleanup(holder_patcher.stop)
+
+        self.cache_snapshot('1')
+
+    def cache_snapshot(self, version):
+        """ This function plays the role of the ``cache_programs`` management command. """
+        cache.set_many({
+            PROGRAM_CACHE_KEY_TPL.format(uuid=program['uuid']): program
+            for program in (self.program, self.other_program)
+        }, None)
+        cache.set(PATHWAY_CACHE_KEY_TPL.format(id=self.pathway['id']), self.pathway, None)
+        cache.set(PROGRAMS_SNAPSHOT_INDEX_CACHE_KEY, {
+            'version': version,
+            'sites': {
+                self.site.domain: {
+                    'id': self.site.id,
+                    'program_uuids': [self.program['uuid'], self.other_program['uuid']],
+                    'pathway_ids': [self.pathway['id']],
+                },
+            },
+        }, None)
+        cache.set(PROGRAMS_SNAPSHOT_VERSION_CACHE_KEY, version, None)
+
+    def test_read_from_snapshot(self):
+        # Load the snapshot, which is then read without hitting the cache, but for the version.
+        self.assertIsNotNone(snapshot.get_programs_snapshot())
+        with mock.patch.object(snapshot, 'cache') as mock_cache:
+            mock_cache.get.return_value = '1'
+            with mock.patch('openedx.core.djangoapps.catalog.utils.cache') as mock_utils_cache:
+                self.assertEqual(get_programs(uuid=self.program['uuid']), self.program)
+                self.assertEqual(get_programs(course=self.course_run['key']), [self.program])
+                self.assertEqual(get_programs(catalog_course_uuid=self.course['uuid']), [self.program])
+                self.assertEqual(get_programs(organization=self.organization['key']), [self.program])
+                self.assertEqual(get_programs_by_type(self.site, 'bachelors'), [self.other_program])
+                self.assertEqual(get_pathways(self.site), [self.pathway])
+                with with_site_configuration_context(
+                    domain=self.site.name, configuration={'COURSE_CATALOG_API_URL': 'foo'}
+                ):
+                    six.assertCountEqual(self, get_programs(site=self.site), [self.program, self.other_program])
+                self.assertFalse(mock_utils_cache.get.called)
+                self.assertFalse(mock_utils_cache.get_many.called)
+
+    def test_returns_copies(self):
+        program = get_programs(uuid=self.program['uuid'])
+        program['title'] = 'Modified'
+        program['courses'][0]['course_runs'][0]['is_enrolled'] = True
+        self.assertEqual(get_programs(uuid=self.program['uuid']), self.program)
+
+        get_pathways(self.site, pathway_id=self.pathway['id'])['programs'].append('Modified')
+        self.assertEqual(get_pathways(self.site, pathway_id=self.pathway['id']), self.pathway)
+
+        get_programs_for_organization(self.organization['key']).append('Modified')
+        self.assertEqual(get_programs_for_organization(self.organization['key']), [self.program['uuid']])
+
+    @override_settings(CATALOG_PROGRAMS_SNAPSHOT_REFRESH_INTERVAL=0)
+    def test_disabled(self):
+        self.assertIsNone(snapshot.get_programs_snapshot())
+
+    def test_not_cached(self):
+        cache.clear()
+        self.assertIsNone(snapshot.get_programs_snapshot())
+        self.assertIsNone(get_programs(uuid=self.program['uuid']))
+
+    @mock.patch.object(snapshot.threading, 'Thread')
+    def test_refresh(self, mock_thread):
+        first_snapshot = snapshot.get_programs_snapshot()
+
+        # The version isn't checked again during the refresh interval.
+        self.cache_snapshot('2')
+        self.assertIs(snapshot.get_programs_snapshot(), first_snapshot)
+        self.assertFalse(mock_thread.called)
+
+        # Once the interval has elapsed, the current snapshot is used while
+        # the new version is loaded in the background.
+        snapshot._holder._checked_at = 0  # pylint: disable=protected-access
+        self.assertIs(snapshot.get_programs_snapshot(), first_snapshot)
+        mock_thread.return_value.start.assert_called_once_with()
+
+        mock_thread.call_args[1]['target']()
+        self.assertEqual(snapshot.get_programs_snapshot().version, '2')
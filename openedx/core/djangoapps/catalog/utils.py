@@ -27,6 +27,7 @@ from openedx.core.djangoapps.catalog.cache import (
     SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
 )
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
+from openedx.core.djangoapps.catalog.snapshot import get_programs_snapshot
 from openedx.core.djangoapps.oauth_dispatch.jwt import create_jwt_for_user
 from openedx.core.lib.edx_api_utils import get_edx_api_data
 from student.models import CourseEnrollment
@@ -92,6 +93,8 @@ def get_programs(site=None, uuid=None, uuids=None, course=None, catalog_course_u
     """Read programs from the cache.
 
     The cache is populated by a management command, cache_programs.
+    The programs are read from the process-local snapshot of the cache,
+    if enabled, see get_programs_snapshot.
 
     Keyword Arguments:
         site (Site): django.contrib.sites.models object to fetch programs of.
@@ -108,20 +111,30 @@ def get_programs(site=None, uuid=None, uuids=None, course=None, catalog_course_u
     if len([arg for arg in (site, uuid, uuids, course, catalog_course_uuid, organization) if arg is not None]) != 1:
         raise TypeError('get_programs takes exactly one argument')
 
+    snapshot = get_programs_snapshot()
     if uuid:
-        program = cache.get(PROGRAM_CACHE_KEY_TPL.format(uuid=uuid))
+        if snapshot is not None:
+            program = snapshot.program(uuid)
+        else:
+            program = cache.get(PROGRAM_CACHE_KEY_TPL.format(uuid=uuid))
         if not program:
             logger.warning(missing_details_msg_tpl.format(uuid=uuid))
 
         return program
     elif course:
-        uuids = cache.get(COURSE_PROGRAMS_CACHE_KEY_TPL.format(course_run_id=course))
+        if snapshot is not None:
+            uuids = snapshot.course_run_program_uuids.get(text_type(course))
+        else:
+            uuids = cache.get(COURSE_PROGRAMS_CACHE_KEY_TPL.format(course_run_id=course))
         if not uuids:
             # Currently, the cache does not differentiate between a cache miss and a course
             # without programs. After this is changed, log any cache misses here.
             return []
     elif catalog_course_uuid:
-        uuids = cache.get(CATALOG_COURSE_PROGRAMS_CACHE_KEY_TPL.format(course_uuid=catalog_course_uuid))
+        if snapshot is not None:
+            uuids = snapshot.catalog_course_program_uuids.get(text_type(catalog_course_uuid))
+        else:
+            uuids = cache.get(CATALOG_COURSE_PROGRAMS_CACHE_KEY_TPL.format(course_uuid=catalog_course_uuid))
         if not uuids:
             # Currently, the cache does not differentiate between a cache miss and a course
             # without programs. After this is changed, log any cache misses here.
@@ -130,7 +143,10 @@ def get_programs(site=None, uuid=None, uuids=None, course=None, catalog_course_u
         site_config = getattr(site, 'configuration', None)
         catalog_url = site_config.get_value('COURSE_CATALOG_API_URL') if site_config else None
         if site_config and catalog_url:
-            uuids = cache.get(SITE_PROGRAM_UUIDS_CACHE_KEY_TPL.format(domain=site.domain), [])
+            if snapshot is not None:
+                uuids = snapshot.site_program_uuids.get(site.domain, [])
+            else:
+                uuids = cache.get(SITE_PROGRAM_UUIDS_CACHE_KEY_TPL.format(domain=site.domain), [])
             if not uuids:
                 logger.warning(u'Failed to get program UUIDs from the cache for site {}.'.format(site.domain))
         else:
@@ -152,10 +168,14 @@ def get_programs_by_type(site, program_type):
     Returns:
         A list of programs for the given site with the given program_type.
     """
-    program_type_cache_key = PROGRAMS_BY_TYPE_CACHE_KEY_TPL.format(
-        site_id=site.id, program_type=normalize_program_type(program_type)
-    )
-    uuids = cache.get(program_type_cache_key, [])
+    snapshot = get_programs_snapshot()
+    if snapshot is not None:
+        uuids = snapshot.type_program_uuids.get((site.id, normalize_program_type(program_type)), [])
+    else:
+        program_type_cache_key = PROGRAMS_BY_TYPE_CACHE_KEY_TPL.format(
+            site_id=site.id, program_type=normalize_program_type(program_type)
+        )
+        uuids = cache.get(program_type_cache_key, [])
     if not uuids:
         logger.warning(text_type(
             'Failed to get program UUIDs from cache for site {} and type {}'.format(site.id, program_type)
@@ -170,6 +190,17 @@ def get_programs_by_uuids(uuids):
     # a list of UUID objects would be a perfectly reasonable parameter to provide
     uuid_strings = [text_type(handle) for handle in uuids]
 
+    snapshot = get_programs_snapshot()
+    if snapshot is not None:
+        programs = []
+        for uuid in uuid_strings:
+            program = snapshot.program(uuid)
+            if program is None:
+                logger.warning(missing_details_msg_tpl.format(uuid=uuid))
+            else:
+                programs.append(program)
+        return programs
+
     programs = cache.get_many([PROGRAM_CACHE_KEY_TPL.format(uuid=handle) for handle in uuid_strings])
     programs = list(programs.values())
 
@@ -241,16 +272,33 @@ def get_pathways(site, pathway_id=None):
     """
     missing_details_msg_tpl = u'Failed to get details for credit pathway {id} from the cache.'
 
+    snapshot = get_programs_snapshot()
     if pathway_id:
-        pathway = cache.get(PATHWAY_CACHE_KEY_TPL.format(id=pathway_id))
+        if snapshot is not None:
+            pathway = snapshot.pathway(pathway_id)
+        else:
+            pathway = cache.get(PATHWAY_CACHE_KEY_TPL.format(id=pathway_id))
         if not pathway:
             logger.warning(missing_details_msg_tpl.format(id=pathway_id))
 
         return pathway
-    pathway_ids = cache.get(SITE_PATHWAY_IDS_CACHE_KEY_TPL.format(domain=site.domain), [])
+    if snapshot is not None:
+        pathway_ids = snapshot.site_pathway_ids.get(site.domain, [])
+    else:
+        pathway_ids = cache.get(SITE_PATHWAY_IDS_CACHE_KEY_TPL.format(domain=site.domain), [])
     if not pathway_ids:
         logger.warning('Failed to get credit pathway ids from the cache.')
 
+    if snapshot is not None:
+        pathways = []
+        for site_pathway_id in pathway_ids:
+            pathway = snapshot.pathway(site_pathway_id)
+            if pathway is None:
+                logger.warning(missing_details_msg_tpl.format(id=site_pathway_id))
+            else:
+                pathways.append(pathway)
+        return pathways
+
     pathways = cache.get_many([PATHWAY_CACHE_KEY_TPL.format(id=pathway_id) for pathway_id in pathway_ids])
     pathways = list(pathways.values())
 
@@ -698,4 +746,7 @@ def get_programs_for_organization(organization):
     """
     Retrieve list of program uuids authored by a given organization
     """
+    snapshot = get_programs_snapshot()
+    if snapshot is not None:
+        return snapshot.organization_programs(organization)
     return cache.get(PROGRAMS_BY_ORGANIZATION_CACHE_KEY_TPL.format(org_key=organization))
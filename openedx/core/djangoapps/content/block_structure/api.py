@@ -46,6 +46,15 @@ def clear_course_from_cache(course_key):
     get_block_structure_manager(course_key).clear()
 
 
+def clear_transformed_course_from_cache(course_key):
+    """
+    A higher order function implemented on top of the
+    block_structure.clear_transformed function that clears any cached
+    transformed block structures for the given course_key.
+    """
+    get_block_structure_manager(course_key).clear_transformed()
+
+
 def get_block_structure_manager(course_key):
     """
     Returns the manager for managing Block Structures for the given course.
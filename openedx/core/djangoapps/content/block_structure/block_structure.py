@@ -31,7 +31,12 @@ class _BlockRelations(object):
     """
     Data structure to encapsulate relationships for a single block,
     including its children and parents.
+
+    Uses __slots__ since an instance exists for every block of every
+    loaded block structure.
     """
+    __slots__ = ('parents', 'children')
+
     def __init__(self):
 
         # List of usage keys of this block's parents.
@@ -42,6 +47,25 @@ class _BlockRelations(object):
         # list [UsageKey]
         self.children = []
 
+    def __getstate__(self):
+        return {'parents': self.parents, 'children': self.children}
+
+    def __setstate__(self, state):
+        # The state is a dict for both the current and the previously
+        # pickled (__dict__ based) versions of this class.
+        self.parents = state['parents']
+        self.children = state['children']
+
+    def copy(self):
+        """
+        Returns a copy of these relations.  Since usage keys are
+        immutable, only the lists themselves are copied.
+        """
+        relations_copy = _BlockRelations()
+        relations_copy.parents = list(self.parents)
+        relations_copy.children = list(self.children)
+        return relations_copy
+
 
 class BlockStructure(object):
     """
@@ -208,26 +232,33 @@ class BlockStructure(object):
         """
         Mutates this block structure by removing any unreachable blocks.
         """
+        old_block_relations = self._block_relations
+
+        # Find the reachable blocks, in post-order, with an iterative
+        # depth-first search that only follows relations to blocks
+        # that are still in the structure.
+        reachable = {self.root_block_usage_key}
+        reachable_in_post_order = []
+        stack = [(self.root_block_usage_key, iter(old_block_relations[self.root_block_usage_key].children))]
+        while stack:
+            block_key, children = stack[-1]
+            for child in children:
+                if child not in reachable and child in old_block_relations:
+                    reachable.add(child)
+                    stack.append((child, iter(old_block_relations[child].children)))
+                    break
+            else:
+                stack.pop()
+                reachable_in_post_order.append(block_key)
 
         # Create a new block relations map to store only those blocks
-        # that are still linked
+        # that are still linked, retaining the order of the relations.
         pruned_block_relations = {}
-        old_block_relations = self._block_relations
-
-        # Build the structure from the leaves up by doing a post-order
-        # traversal of the old structure, thereby encountering only
-        # reachable blocks.
-        for block_key in self.post_order_traversal():
-            # If the block is in the old structure,
-            if block_key in old_block_relations:
-                # Add it to the new pruned structure
-                self._add_block(pruned_block_relations, block_key)
-
-                # Add a relationship to only those old children that
-                # were also added to the new pruned structure.
-                for child in old_block_relations[block_key].children:
-                    if child in pruned_block_relations:
-                        self._add_to_relations(pruned_block_relations, block_key, child)
+        for block_key in reachable_in_post_order:
+            old_relations = old_block_relations[block_key]
+            relations = pruned_block_relations[block_key] = _BlockRelations()
+            relations.parents = [parent for parent in old_relations.parents if parent in reachable]
+            relations.children = [child for child in old_relations.children if child in reachable]
 
         # Replace this structure's relations with the newly pruned one.
         self._block_relations = pruned_block_relations
@@ -283,7 +314,12 @@ class BlockStructure(object):
 class FieldData(object):
     """
     Data structure to encapsulate collected fields.
+
+    Subclasses that define fields directly on the class must also list
+    them in their __slots__.
     """
+    __slots__ = ('fields',)
+
     def class_field_names(self):
         """
         Returns list of names of fields that are defined directly
@@ -317,6 +353,15 @@ class FieldData(object):
         else:
             del self.fields[field_name]
 
+    def __getstate__(self):
+        return {field_name: getattr(self, field_name) for field_name in self.class_field_names()}
+
+    def __setstate__(self, state):
+        # The state is a dict for both the current and the previously
+        # pickled (__dict__ based) versions of this class.
+        for field_name, field_value in six.iteritems(state):
+            object.__setattr__(self, field_name, field_value)
+
     def _is_own_field(self, field_name):
         """
         Returns whether the given field_name is the name of an
@@ -329,7 +374,7 @@ class TransformerData(FieldData):
     """
     Data structure to encapsulate collected data for a transformer.
     """
-    pass
+    __slots__ = ()
 
 
 class TransformerDataMap(dict):
@@ -382,6 +427,8 @@ class BlockData(FieldData):
     """
     Data structure to encapsulate collected data for a single block.
     """
+    __slots__ = ('location', 'transformer_data')
+
     def class_field_names(self):
         return super(BlockData, self).class_field_names() + ['location', 'transformer_data']
 
@@ -425,7 +472,10 @@ class BlockStructureBlockData(BlockStructure):
         from .factory import BlockStructureFactory
         return BlockStructureFactory.create_new(
             self.root_block_usage_key,
-            deepcopy(self._block_relations),
+            {
+                usage_key: relations.copy()
+                for usage_key, relations in six.iteritems(self._block_relations)
+            },
             deepcopy(self.transformer_data),
             deepcopy(self._block_data_map),
         )
@@ -16,6 +16,8 @@ WAFFLE_NAMESPACE = u'block_structure'
 INVALIDATE_CACHE_ON_PUBLISH = u'invalidate_cache_on_publish'
 STORAGE_BACKING_FOR_CACHE = u'storage_backing_for_cache'
 RAISE_ERROR_WHEN_NOT_FOUND = u'raise_error_when_not_found'
+COLUMNAR_SERIALIZATION = u'columnar_serialization'
+CACHE_TRANSFORMED = u'cache_transformed'
 
 
 def waffle():
@@ -39,3 +41,12 @@ def cache_timeout_in_seconds():
     Returns and caches the current setting for cache_timeout_in_seconds.
     """
     return BlockStructureConfiguration.current().cache_timeout_in_seconds
+
+
+@request_cached()
+def transformed_cache_timeout_in_seconds():
+    """
+    Returns and caches the current setting for
+    transformed_cache_timeout_in_seconds.
+    """
+    return BlockStructureConfiguration.current().transformed_cache_timeout_in_seconds
@@ -17,6 +17,7 @@ class BlockStructureConfiguration(ConfigurationModel):
     """
     DEFAULT_PRUNE_KEEP_COUNT = 5
     DEFAULT_CACHE_TIMEOUT_IN_SECONDS = 60 * 60 * 24  # 24 hours
+    DEFAULT_TRANSFORMED_CACHE_TIMEOUT_IN_SECONDS = 60 * 5  # 5 minutes
 
     class Meta(object):
         app_label = 'block_structure'
@@ -24,9 +25,18 @@ class BlockStructureConfiguration(ConfigurationModel):
 
     num_versions_to_keep = IntegerField(blank=True, null=True, default=DEFAULT_PRUNE_KEEP_COUNT)
     cache_timeout_in_seconds = IntegerField(blank=True, null=True, default=DEFAULT_CACHE_TIMEOUT_IN_SECONDS)
+    transformed_cache_timeout_in_seconds = IntegerField(
+        blank=True,
+        null=True,
+        default=DEFAULT_TRANSFORMED_CACHE_TIMEOUT_IN_SECONDS,
+    )
 
     def __str__(self):
-        return u"BlockStructureConfiguration: num_versions_to_keep: {}, cache_timeout_in_seconds: {}".format(
-            self.num_versions_to_keep,
-            self.cache_timeout_in_seconds,
+        return (
+            u"BlockStructureConfiguration: num_versions_to_keep: {}, cache_timeout_in_seconds: {}, "
+            u"transformed_cache_timeout_in_seconds: {}".format(
+                self.num_versions_to_keep,
+                self.cache_timeout_in_seconds,
+                self.transformed_cache_timeout_in_seconds,
+            )
         )
@@ -0,0 +1,155 @@
+"""
+Command to compare the load time and memory of the BlockStructure
+serialization formats.
+"""
+
+
+import gc
+import time
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.locator import CourseLocator
+
+from openedx.core.djangoapps.content.block_structure import serialization
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+# Number of children of each block, per level of the synthetic course.
+BRANCHING_FACTORS = (('chapter', 10), ('sequential', 5), ('vertical', 4))
+
+# xBlock fields collected for every block of the synthetic course.
+XBLOCK_FIELDS = ('display_name', 'start', 'due', 'graded', 'format', 'visible_to_staff_only', 'weight')
+
+# Transformers whose block-specific data is collected for every block of
+# the synthetic course.
+TRANSFORMER_NAMES = ('grades', 'completion', 'visibility', 'start_date', 'user_partitions', 'block_counts')
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_serialization --num_blocks 5000 --settings=devstack
+    """
+    help = u'Compares load time and memory of the pickled and columnar BlockStructure serialization formats.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--num_blocks',
+            help=u'Approximate number of blocks in the synthetic course.',
+            default=5000,
+            type=int,
+        )
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of times each format is loaded.',
+            default=10,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        block_structure = _create_block_structure(options['num_blocks'])
+        formats = (
+            ('pickle', _pickle_serialize, _pickle_deserialize),
+            ('columnar', serialization.serialize, serialization.deserialize),
+        )
+        self.stdout.write(u'Synthetic course with {} blocks.'.format(len(block_structure)))
+        for format_name, serialize, deserialize in formats:
+            serialized_data = serialize(block_structure)
+            load_time, peak_memory = _measure_load(serialized_data, deserialize, options['iterations'])
+            self.stdout.write(
+                u'{format}: size={size} bytes, load time={time:.2f} ms, peak memory={memory}'.format(
+                    format=format_name,
+                    size=len(serialized_data),
+                    time=load_time * 1000,
+                    memory=u'{} bytes'.format(peak_memory) if peak_memory is not None else u'n/a',
+                )
+            )
+
+
+def _pickle_serialize(block_structure):
+    """
+    Serializes the given block structure in the pickled format.
+    """
+    # pylint: disable=protected-access
+    return zpickle((block_structure._block_relations, block_structure.transformer_data, block_structure._block_data_map))
+
+
+def _pickle_deserialize(serialized_data):
+    """
+    Deserializes the given data in the pickled format.
+    """
+    return zunpickle(serialized_data)
+
+
+def _measure_load(serialized_data, deserialize, iterations):
+    """
+    Returns the average time to load a block structure from the given
+    serialized data, and to read the fields of a typical request,
+    along with the peak memory allocated while doing so, if available.
+    """
+    def load():
+        """
+        Loads the block structure and reads the fields used by the
+        grades transformer.
+        """
+        block_structure = BlockStructureFactory.create_new(None, *deserialize(serialized_data))
+        for usage_key in block_structure:
+            block_structure.get_xblock_field(usage_key, 'graded')
+            block_structure.get_transformer_block_field(usage_key, 'grades', 'max_score')
+        return block_structure
+
+    gc.collect()
+    start = time.time()
+    for _ in range(iterations):
+        load()
+    load_time = (time.time() - start) / iterations
+
+    peak_memory = None
+    if tracemalloc:
+        gc.collect()
+        tracemalloc.start()
+        block_structure = load()  # pylint: disable=unused-variable
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return load_time, peak_memory
+
+
+def _create_block_structure(num_blocks):
+    """
+    Returns a collected block structure of a synthetic course with
+    approximately the given number of blocks.
+    """
+    course_key = CourseLocator('edX', 'Benchmark', 'Run')
+    root_key = course_key.make_usage_key('course', 'course')
+    block_structure = BlockStructureBlockData(root_key)
+
+    num_internal_blocks, num_parents_of_leaves = 1, 1
+    for _, branching_factor in BRANCHING_FACTORS:
+        num_parents_of_leaves *= branching_factor
+        num_internal_blocks += num_parents_of_leaves
+    num_leaves_per_parent = max((num_blocks - num_internal_blocks) // num_parents_of_leaves, 1)
+
+    parents = [root_key]
+    for block_type, branching_factor in BRANCHING_FACTORS + (('problem', num_leaves_per_parent),):
+        children = []
+        for parent_key in parents:
+            for _ in range(branching_factor):
+                child_key = course_key.make_usage_key(block_type, u'{}_{}'.format(block_type, len(children)))
+                block_structure._add_relation(parent_key, child_key)  # pylint: disable=protected-access
+                children.append(child_key)
+        parents = children
+
+    for usage_key in block_structure:
+        block_data = block_structure._get_or_create_block(usage_key)  # pylint: disable=protected-access
+        for field_name in XBLOCK_FIELDS:
+            setattr(block_data, field_name, u'{} of {}'.format(field_name, usage_key.block_id))
+        for transformer_name in TRANSFORMER_NAMES:
+            block_structure.set_transformer_block_field(usage_key, transformer_name, 'max_score', 1.0)
+            block_structure.set_transformer_block_field(usage_key, transformer_name, 'data', [usage_key.block_id])
+    return block_structure
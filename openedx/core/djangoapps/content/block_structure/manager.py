@@ -12,6 +12,7 @@ from . import config
 from .exceptions import BlockStructureNotFound, TransformerDataIncompatible, UsageKeyNotInBlockStructure
 from .factory import BlockStructureFactory
 from .store import BlockStructureStore
+from .transformed_store import TransformedBlockStructureStore
 from .transformers import BlockStructureTransformers
 
 
@@ -37,6 +38,7 @@ class BlockStructureManager(object):
         self.root_block_usage_key = root_block_usage_key
         self.modulestore = modulestore
         self.store = BlockStructureStore(cache)
+        self.transformed_store = TransformedBlockStructureStore(cache)
 
     def get_transformed(self, transformers, starting_block_usage_key=None, collected_block_structure=None):
         """
@@ -45,7 +47,10 @@ class BlockStructureManager(object):
         and modulestore, as needed.
 
         Details: Similar to the get_collected method, except the transformers'
-        transform methods are also called.
+        transform methods are also called.  If enabled, and if all the
+        transformers provide a fingerprint, the transformed block structure
+        is cached and reused until the collected data or any of the
+        fingerprints change.
 
         Arguments:
             transformers (BlockStructureTransformers) - Collection of
@@ -64,6 +69,19 @@ class BlockStructureManager(object):
             BlockStructureBlockData - A transformed block structure,
                 starting at starting_block_usage_key.
         """
+        fingerprint = None
+        if config.waffle().is_enabled(config.CACHE_TRANSFORMED):
+            fingerprint = transformers.fingerprint()
+        if fingerprint:
+            generation = self.transformed_store.get_generation(self.root_block_usage_key)
+            block_structure = self.transformed_store.get(
+                generation,
+                starting_block_usage_key or self.root_block_usage_key,
+                fingerprint,
+            )
+            if block_structure is not None:
+                return block_structure
+
         block_structure = collected_block_structure.copy() if collected_block_structure else self.get_collected()
 
         if starting_block_usage_key:
@@ -78,6 +96,9 @@ class BlockStructureManager(object):
                 )
             block_structure.set_root_block(starting_block_usage_key)
         transformers.transform(block_structure)
+
+        if fingerprint:
+            self.transformed_store.add(generation, block_structure, fingerprint)
         return block_structure
 
     def get_collected(self):
@@ -130,6 +151,7 @@ class BlockStructureManager(object):
             )
             BlockStructureTransformers.collect(block_structure)
             self.store.add(block_structure)
+            self.transformed_store.invalidate(self.root_block_usage_key)
             return block_structure
 
     def clear(self):
@@ -138,6 +160,14 @@ class BlockStructureManager(object):
         root block key.
         """
         self.store.delete(self.root_block_usage_key)
+        self.clear_transformed()
+
+    def clear_transformed(self):
+        """
+        Removes any cached transformed block structures associated with
+        the given root block key.
+        """
+        self.transformed_store.invalidate(self.root_block_usage_key)
 
     @contextmanager
     def _bulk_operations(self):
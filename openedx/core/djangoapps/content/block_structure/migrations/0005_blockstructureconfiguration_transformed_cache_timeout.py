@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('block_structure', '0004_blockstructuremodel_usagekeywithrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockstructureconfiguration',
+            name='transformed_cache_timeout_in_seconds',
+            field=models.IntegerField(default=300, null=True, blank=True),
+        ),
+    ]
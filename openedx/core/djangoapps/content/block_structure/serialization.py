@@ -0,0 +1,279 @@
+"""
+Module for the versioned columnar serialization format of collected
+BlockStructure objects.
+
+Unlike the legacy format, which zpickles the structure's relations,
+transformer data and block data map as a single object graph, the
+columnar format stores:
+
+    * an interned table of the structure's usage keys, so that every
+      block is referred to by its integer index,
+    * CSR-style (offsets, indices) arrays of each block's children,
+      from which the parents are derived when loading,
+    * the structure-wide transformer data, and
+    * one separately compressed column per collected xBlock field and
+      per transformer's block-specific data.
+
+When loading, the columns are kept compressed and are only decoded the
+first time any block's value in that column is accessed, so requests
+only pay for the fields that their transformers actually read.
+
+Both formats coexist: serialized data in this format is identified by
+its FORMAT_PREFIX, which can never start a zlib stream.
+"""
+
+
+from array import array
+from struct import Struct
+
+import six
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap, _BlockRelations
+
+# Prefix identifying serialized data in the columnar format.
+FORMAT_PREFIX = b'BSC'
+
+# The latest version of the columnar format.  Increment this value
+# whenever the layout of the serialized data changes.
+FORMAT_VERSION = 1
+
+_VERSION_STRUCT = Struct('!B')
+_HEADER_LENGTH = len(FORMAT_PREFIX) + _VERSION_STRUCT.size
+
+
+class ColumnarFormatError(Exception):
+    """
+    Exception raised when data cannot be parsed as the columnar format.
+    """
+    pass
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given serialized data is in the columnar format.
+    """
+    return bytes(serialized_data[:len(FORMAT_PREFIX)]) == FORMAT_PREFIX
+
+
+def serialize(block_structure):
+    """
+    Serializes the given block structure into the columnar format.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The collected block
+            structure that is to be serialized.
+
+    Returns:
+        bytes - The serialized data.
+    """
+    # pylint: disable=protected-access
+    usage_keys = list(block_structure._block_relations)
+    key_index = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+
+    child_offsets = array('l', [0])
+    child_indices = array('l')
+    for usage_key in usage_keys:
+        child_indices.extend(key_index[child] for child in block_structure._block_relations[usage_key].children)
+        child_offsets.append(len(child_indices))
+
+    xblock_field_columns = {}
+    transformer_columns = {}
+    for usage_key, block_data in six.iteritems(block_structure._block_data_map):
+        index = key_index.get(usage_key)
+        if index is None:
+            continue
+        _materialize(block_data)
+        for field_name, value in six.iteritems(block_data.fields):
+            xblock_field_columns.setdefault(field_name, {})[index] = value
+        for transformer_name, transformer_data in six.iteritems(block_data.transformer_data):
+            transformer_columns.setdefault(transformer_name, {})[index] = transformer_data.fields
+
+    data_to_cache = {
+        'usage_keys': usage_keys,
+        'block_data_indices': [
+            key_index[usage_key] for usage_key in block_structure._block_data_map if usage_key in key_index
+        ],
+        'child_offsets': child_offsets,
+        'child_indices': child_indices,
+        'transformer_data': block_structure.transformer_data,
+        'xblock_field_columns': {
+            field_name: zpickle(column) for field_name, column in six.iteritems(xblock_field_columns)
+        },
+        'transformer_columns': {
+            transformer_name: zpickle(column) for transformer_name, column in six.iteritems(transformer_columns)
+        },
+    }
+    return FORMAT_PREFIX + _VERSION_STRUCT.pack(FORMAT_VERSION) + zpickle(data_to_cache)
+
+
+def deserialize(serialized_data):
+    """
+    Deserializes the given columnar data.
+
+    Returns:
+        tuple - The (block_relations, transformer_data, block_data_map)
+            of the block structure, as expected by
+            BlockStructureFactory.create_new.
+
+    Raises:
+        ColumnarFormatError if the data is not in a supported version
+        of the columnar format.
+    """
+    if not is_columnar(serialized_data):
+        raise ColumnarFormatError(u"Serialized data is not in the columnar format.")
+
+    version, = _VERSION_STRUCT.unpack(bytes(serialized_data[len(FORMAT_PREFIX):_HEADER_LENGTH]))
+    if version != FORMAT_VERSION:
+        raise ColumnarFormatError(u"Unsupported columnar format version {}.".format(version))
+
+    data = zunpickle(serialized_data[_HEADER_LENGTH:])
+    usage_keys = data['usage_keys']
+    child_offsets = data['child_offsets']
+    child_indices = data['child_indices']
+
+    block_relations = {usage_key: _BlockRelations() for usage_key in usage_keys}
+    for index, usage_key in enumerate(usage_keys):
+        relations = block_relations[usage_key]
+        for child_index in child_indices[child_offsets[index]:child_offsets[index + 1]]:
+            child_key = usage_keys[child_index]
+            relations.children.append(child_key)
+            block_relations[child_key].parents.append(usage_key)
+
+    columns = _ColumnStore(data['xblock_field_columns'], data['transformer_columns'])
+    block_data_map = {}
+    for index in data['block_data_indices']:
+        usage_key = usage_keys[index]
+        block_data = BlockData(usage_key)
+        block_data.fields = _LazyFields(columns, index)
+        block_data.transformer_data = _LazyTransformerDataMap(columns, index)
+        block_data_map[usage_key] = block_data
+
+    return block_relations, data['transformer_data'], block_data_map
+
+
+def _materialize(block_data):
+    """
+    Decodes all column values of the given block data, in case it was
+    itself loaded from the columnar format.
+    """
+    for lazy_map in (block_data.fields, block_data.transformer_data):
+        if isinstance(lazy_map, (_LazyFields, _LazyTransformerDataMap)):
+            lazy_map.materialize()
+
+
+class _ColumnStore(object):
+    """
+    Holds the compressed columns of a deserialized block structure and
+    decodes each of them only upon first access.
+
+    A single instance is shared by all the blocks of a structure, so
+    copying the structure's block data map with deepcopy copies the
+    decoded columns only once.
+    """
+    def __init__(self, xblock_field_columns, transformer_columns):
+        self._encoded = {
+            'xblock_fields': xblock_field_columns,
+            'transformers': transformer_columns,
+        }
+        self._decoded = {
+            'xblock_fields': {},
+            'transformers': {},
+        }
+
+    def get(self, column_type, column_name, index):
+        """
+        Returns the value for the block at the given index in the
+        requested column.
+
+        Raises KeyError if the block has no value in the column.
+        """
+        decoded_columns = self._decoded[column_type]
+        try:
+            column = decoded_columns[column_name]
+        except KeyError:
+            encoded_column = self._encoded[column_type].get(column_name)
+            column = zunpickle(encoded_column) if encoded_column is not None else {}
+            decoded_columns[column_name] = column
+        return column[index]
+
+    def column_names(self, column_type):
+        """
+        Returns the names of all the columns of the given type.
+        """
+        return list(self._encoded[column_type])
+
+
+class _LazyColumnMixin(object):
+    """
+    Mixin for a block's dict whose entries are populated from the
+    structure's columns as they are accessed.
+
+    Note: Only item access is lazy.  Iterating over or testing for
+    membership in an instance only considers entries that were already
+    accessed or set.
+    """
+    # Type of the columns from which entries are populated.
+    COLUMN_TYPE = None
+
+    def __init__(self, columns, index):
+        super(_LazyColumnMixin, self).__init__()
+        self._columns = columns
+        self._index = index
+
+        # Names of the entries that were deleted after being loaded,
+        # and that must therefore not be loaded again.
+        self._deleted = set()
+
+    def __missing__(self, name):
+        if name in self._deleted:
+            raise KeyError(name)
+        value = self._from_column(self._columns.get(self.COLUMN_TYPE, name, self._index))
+        dict.__setitem__(self, name, value)
+        return value
+
+    def __delitem__(self, name):
+        # Load the entry first, so a KeyError is raised only if it
+        # doesn't exist at all.
+        self[name]  # pylint: disable=pointless-statement
+        super(_LazyColumnMixin, self).__delitem__(name)
+        self._deleted.add(name)
+
+    def materialize(self):
+        """
+        Populates all of this block's entries from the columns.
+        """
+        for name in self._columns.column_names(self.COLUMN_TYPE):
+            try:
+                self[name]  # pylint: disable=pointless-statement
+            except KeyError:
+                pass
+
+    def _from_column(self, column_value):
+        """
+        Returns the entry for the given value stored in the column.
+        """
+        return column_value
+
+
+class _LazyFields(_LazyColumnMixin, dict):
+    """
+    A block's xBlock fields dict, lazily populated from the columns.
+    """
+    COLUMN_TYPE = 'xblock_fields'
+
+
+class _LazyTransformerDataMap(_LazyColumnMixin, TransformerDataMap):
+    """
+    A block's TransformerDataMap, lazily populated from the columns.
+    """
+    COLUMN_TYPE = 'transformers'
+
+    def _from_column(self, column_value):
+        transformer_data = TransformerData()
+        transformer_data.fields = column_value
+        return transformer_data
+
+    def __delitem__(self, key):
+        super(_LazyTransformerDataMap, self).__delitem__(self._translate_key(key))
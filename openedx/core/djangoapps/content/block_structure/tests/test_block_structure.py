@@ -12,11 +12,12 @@ from unittest import TestCase
 
 import ddt
 import six
+from six.moves import cPickle as pickle
 from six.moves import range
 
 from openedx.core.lib.graph_traversals import traverse_post_order
 
-from ..block_structure import BlockStructure, BlockStructureModulestoreData
+from ..block_structure import BlockData, BlockStructure, BlockStructureModulestoreData, _BlockRelations
 from ..exceptions import TransformerException
 from .helpers import ChildrenMapTestMixin, MockTransformer, MockXBlock
 
@@ -312,3 +313,36 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         self.assertEqual(_get_value(block_structure), 'edit1')
         self.assertEqual(_get_value(new_copy), 'edit2')
+
+    def test_pickle(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP)
+        block_structure._get_or_create_block(3).test_field = 'test_value'
+        block_structure.set_transformer_block_field(3, 'transformer', 'test_key', 'test_value')
+
+        block_relations, block_data_map = pickle.loads(
+            pickle.dumps((block_structure._block_relations, block_structure._block_data_map), 4)
+        )
+        self.assertEqual(block_relations[3].parents, [1, 2])
+        self.assertEqual(block_relations[3].children, [5, 6])
+        self.assertEqual(block_data_map[3].location, 3)
+        self.assertEqual(block_data_map[3].test_field, 'test_value')
+        self.assertEqual(block_data_map[3].transformer_data['transformer'].test_key, 'test_value')
+
+    def test_unpickle_dict_state(self):
+        # Instances pickled before the classes defined __slots__ have
+        # their __dict__ as state.
+        block_relations = _BlockRelations.__new__(_BlockRelations)
+        block_relations.__setstate__({'parents': [1], 'children': [2]})
+        self.assertEqual((block_relations.parents, block_relations.children), ([1], [2]))
+
+        block_data = BlockData.__new__(BlockData)
+        block_data.__setstate__({'fields': {'test_field': 'test_value'}, 'location': 1, 'transformer_data': {}})
+        self.assertEqual((block_data.location, block_data.test_field), (1, 'test_value'))
+
+    def test_prune_unreachable(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP)
+        block_structure.remove_block(1, keep_descendants=False)
+        block_structure.remove_block(4, keep_descendants=False)
+        block_structure._prune_unreachable()
+        self.assert_block_structure(block_structure, [[2], [], [3], [5, 6], [], [], []], missing_blocks=[1, 4])
+        self.assertEqual(list(block_structure.get_block_keys()), [5, 6, 3, 2, 0])
@@ -8,7 +8,7 @@ import six
 from django.test import TestCase
 
 from ..block_structure import BlockStructureBlockData
-from ..config import RAISE_ERROR_WHEN_NOT_FOUND, STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import CACHE_TRANSFORMED, RAISE_ERROR_WHEN_NOT_FOUND, STORAGE_BACKING_FOR_CACHE, waffle
 from ..exceptions import BlockStructureNotFound, UsageKeyNotInBlockStructure
 from ..manager import BlockStructureManager
 from ..transformers import BlockStructureTransformers
@@ -30,6 +30,8 @@ class TestTransformer1(MockTransformer):
     collect_data_key = 't1.collect'
     transform_data_key = 't1.transform'
     collect_call_count = 0
+    transform_call_count = 0
+    fingerprint = None
 
     @classmethod
     def collect(cls, block_structure):
@@ -44,6 +46,10 @@ class TestTransformer1(MockTransformer):
         Transforms the block structure.
         """
         self._set_block_values(block_structure, self.transform_data_key)
+        TestTransformer1.transform_call_count += 1
+
+    def transform_fingerprint(self, usage_info):
+        return self.fingerprint
 
     @classmethod
     def assert_collected(cls, block_structure):
@@ -104,6 +110,8 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
         super(TestBlockStructureManager, self).setUp()
 
         TestTransformer1.collect_call_count = 0
+        TestTransformer1.transform_call_count = 0
+        TestTransformer1.fingerprint = None
         self.registered_transformers = [TestTransformer1()]
         with mock_registered_transformers(self.registered_transformers):
             self.transformers = BlockStructureTransformers(self.registered_transformers)
@@ -226,3 +234,63 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         assert TestTransformer1.collect_call_count == 2
+
+    def get_transformed_and_verify(self, expect_transformed, starting_block=0):
+        """
+        Calls the manager's get_transformed method and verifies its result
+        and whether the transformers were called.
+        """
+        TestTransformer1.transform_call_count = 0
+        with mock_registered_transformers(self.registered_transformers):
+            block_structure = self.bs_manager.get_transformed(
+                self.transformers,
+                starting_block_usage_key=self.block_key_factory(starting_block),
+            )
+        TestTransformer1.assert_collected(block_structure)
+        TestTransformer1.assert_transformed(block_structure)
+        assert block_structure.root_block_usage_key == self.block_key_factory(starting_block)
+        assert TestTransformer1.transform_call_count == (1 if expect_transformed else 0)
+
+    @ddt.data(
+        (False, 'fingerprint'),
+        (True, None),
+    )
+    @ddt.unpack
+    def test_get_transformed_not_cached(self, cache_transformed, fingerprint):
+        TestTransformer1.fingerprint = fingerprint
+        with waffle().override(CACHE_TRANSFORMED, active=cache_transformed):
+            self.get_transformed_and_verify(expect_transformed=True)
+            self.get_transformed_and_verify(expect_transformed=True)
+
+    def test_get_transformed_cached(self):
+        TestTransformer1.fingerprint = 'fingerprint'
+        with waffle().override(CACHE_TRANSFORMED, active=True):
+            self.get_transformed_and_verify(expect_transformed=True)
+            self.get_transformed_and_verify(expect_transformed=False)
+
+            # different starting block
+            self.get_transformed_and_verify(expect_transformed=True, starting_block=1)
+            self.get_transformed_and_verify(expect_transformed=False, starting_block=1)
+
+            # different fingerprint
+            TestTransformer1.fingerprint = 'another fingerprint'
+            self.get_transformed_and_verify(expect_transformed=True)
+            self.get_transformed_and_verify(expect_transformed=False)
+
+    def test_get_transformed_cache_invalidation(self):
+        TestTransformer1.fingerprint = 'fingerprint'
+        with waffle().override(CACHE_TRANSFORMED, active=True):
+            self.get_transformed_and_verify(expect_transformed=True)
+
+            self.bs_manager.clear_transformed()
+            self.get_transformed_and_verify(expect_transformed=True)
+
+            self.get_transformed_and_verify(expect_transformed=False)
+
+            # recollecting the block structure also invalidates the
+            # structure transformed during the recollection
+            with mock_registered_transformers(self.registered_transformers):
+                self.bs_manager.clear()
+            self.get_transformed_and_verify(expect_transformed=True)
+            self.get_transformed_and_verify(expect_transformed=True)
+            self.get_transformed_and_verify(expect_transformed=False)
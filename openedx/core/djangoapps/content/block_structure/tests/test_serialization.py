@@ -0,0 +1,101 @@
+"""
+Tests for block_structure/serialization.py
+"""
+
+
+from copy import deepcopy
+from unittest import TestCase
+
+import ddt
+from six.moves import cPickle as pickle
+
+from .. import serialization
+from ..factory import BlockStructureFactory
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+@ddt.ddt
+class TestColumnarSerialization(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the columnar serialization format.
+    """
+    def setUp(self):
+        super(TestColumnarSerialization, self).setUp()
+        self.block_structure = self.create_block_structure(self.LINEAR_CHILDREN_MAP)
+        self.block_structure._add_transformer(MockTransformer)  # pylint: disable=protected-access
+        for block_key in self.block_structure:
+            block_data = self.block_structure._get_or_create_block(block_key)  # pylint: disable=protected-access
+            block_data.display_name = u'name of {}'.format(block_key)
+            self.block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', block_key)
+
+    def _round_trip(self, block_structure):
+        """
+        Returns the given block structure after serializing and
+        deserializing it.
+        """
+        serialized_data = serialization.serialize(block_structure)
+        self.assertTrue(serialization.is_columnar(serialized_data))
+        return BlockStructureFactory.create_new(
+            block_structure.root_block_usage_key,
+            *serialization.deserialize(serialized_data)
+        )
+
+    def _assert_data(self, block_structure):
+        """
+        Verifies the block and transformer data of the given block
+        structure.
+        """
+        for block_key in block_structure:
+            self.assertEqual(
+                block_structure.get_xblock_field(block_key, 'display_name'),
+                u'name of {}'.format(block_key),
+            )
+            self.assertEqual(block_structure.get_transformer_block_field(block_key, MockTransformer, 'test'), block_key)
+            self.assertIsNone(block_structure.get_xblock_field(block_key, 'not_collected'))
+            self.assertIsNone(block_structure.get_transformer_block_field(block_key, 'not_collected', 'test'))
+        self.assertEqual(
+            block_structure._get_transformer_data_version(MockTransformer),  # pylint: disable=protected-access
+            MockTransformer.WRITE_VERSION,
+        )
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_relations(self, children_map):
+        block_structure = self.create_block_structure(children_map)
+        self.assert_block_structure(self._round_trip(block_structure), children_map)
+
+    def test_data(self):
+        self._assert_data(self._round_trip(self.block_structure))
+
+    def test_reserialize(self):
+        self._assert_data(self._round_trip(self._round_trip(self.block_structure)))
+
+    def test_pickle_and_copy(self):
+        block_structure = self._round_trip(self.block_structure)
+        self._assert_data(pickle.loads(pickle.dumps(block_structure, 4)))
+        self._assert_data(deepcopy(block_structure))
+        self._assert_data(block_structure.copy())
+
+    def test_copy_isolation(self):
+        block_structure = self._round_trip(self.block_structure)
+        block_key = self.block_key_factory(0)
+        block_structure_copy = block_structure.copy()
+        block_structure_copy.override_xblock_field(block_key, 'display_name', u'overridden')
+        self._assert_data(block_structure)
+
+    def test_remove_lazy_field(self):
+        block_structure = self._round_trip(self.block_structure)
+        block_key = self.block_key_factory(0)
+        del block_structure[block_key].display_name
+        self.assertIsNone(block_structure.get_xblock_field(block_key, 'display_name'))
+        self.assertIsNone(self._round_trip(block_structure).get_xblock_field(block_key, 'display_name'))
+
+    def test_unsupported_version(self):
+        serialized_data = serialization.serialize(self.block_structure)
+        header_length = len(serialization.FORMAT_PREFIX)
+        unsupported_data = serialized_data[:header_length] + b'\xff' + serialized_data[header_length + 1:]
+        with self.assertRaises(serialization.ColumnarFormatError):
+            serialization.deserialize(unsupported_data)
@@ -7,7 +7,7 @@ import ddt
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import COLUMNAR_SERIALIZATION, STORAGE_BACKING_FOR_CACHE, waffle
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
 from ..store import BlockStructureStore
@@ -67,6 +67,31 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             with self.assertRaises(BlockStructureNotFound):
                 self.store.get(self.block_structure.root_block_usage_key)
 
+    @ddt.data(
+        (True, True),
+        (True, False),
+        (False, True),
+    )
+    @ddt.unpack
+    def test_columnar_serialization(self, columnar_on_write, columnar_on_read):
+        with waffle().override(COLUMNAR_SERIALIZATION, active=columnar_on_write):
+            self.store.add(self.block_structure)
+        with waffle().override(COLUMNAR_SERIALIZATION, active=columnar_on_read):
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(stored_value, self.children_map)
+        self.assertEqual(
+            stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+            u'{} val'.format(MockTransformer.name()),
+        )
+
+    def test_corrupt_columnar_data(self):
+        with waffle().override(COLUMNAR_SERIALIZATION, active=True):
+            self.store.add(self.block_structure)
+        cache_key = list(self.mock_cache.map)[0]
+        self.mock_cache.map[cache_key] = self.mock_cache.map[cache_key][:-10]
+        with self.assertRaises(BlockStructureNotFound):
+            self.store.get(self.block_structure.root_block_usage_key)
+
     def test_uncached_without_storage(self):
         self.store.add(self.block_structure)
         self.mock_cache.map.clear()
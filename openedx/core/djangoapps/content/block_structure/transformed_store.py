@@ -0,0 +1,134 @@
+"""
+Module for the caching of transformed BlockStructure objects.
+"""
+
+
+from logging import getLogger
+from uuid import uuid4
+
+import six
+
+from . import config, serialization
+from .factory import BlockStructureFactory
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+
+class TransformedBlockStructureStore(object):
+    """
+    Cache for transformed BlockStructure objects.
+
+    Transformed structures are keyed by the generation of the collected
+    block structure they were transformed from, the starting block of
+    the transformation, and the combined fingerprint of the applied
+    transformers.  They are serialized in the columnar format, which
+    only includes the blocks that remain after the transformation.
+
+    A new generation is started whenever the collected
+    block structure is updated or cleared, so previously cached
+    transformed structures are never read again and simply expire.
+    """
+    def __init__(self, cache):
+        """
+        Arguments:
+            cache (django.core.cache.backends.base.BaseCache) - The
+                cache into which transformed block structures are
+                to be serialized.
+        """
+        self._cache = cache
+
+    def get_generation(self, root_block_usage_key):
+        """
+        Returns the current generation of the collected block structure
+        with the given root, starting a new one if there is none.
+
+        The generation should be read before the collected block
+        structure is loaded, so a transformed block structure is never
+        cached under a generation newer than its collected data.
+        """
+        generation_cache_key = self._encode_generation_cache_key(root_block_usage_key)
+        generation = self._cache.get(generation_cache_key)
+        if not generation:
+            generation = uuid4().hex
+            self._cache.set(generation_cache_key, generation, timeout=config.cache_timeout_in_seconds())
+        return generation
+
+    def get(self, generation, starting_block_usage_key, fingerprint):
+        """
+        Returns the cached transformed block structure for the given
+        arguments, or None if not found.
+
+        Arguments:
+            generation (string) - The generation of the collected block
+                structure, as returned by get_generation.
+
+            starting_block_usage_key (UsageKey) - The usage_key of the
+                starting block of the transformation.
+
+            fingerprint (string) - The combined fingerprint of the
+                applied transformers.
+        """
+        serialized_data = self._cache.get(
+            self._encode_cache_key(generation, starting_block_usage_key, fingerprint)
+        )
+        if not serialized_data:
+            return None
+
+        try:
+            block_relations, transformer_data, block_data_map = serialization.deserialize(serialized_data)
+        except Exception:  # pylint: disable=broad-except
+            # Somehow failed to de-serialized the data, assume it's corrupt.
+            logger.exception(u"BlockStructure: Failed to load transformed data from cache for %s", generation)
+            return None
+
+        return BlockStructureFactory.create_new(
+            starting_block_usage_key,
+            block_relations,
+            transformer_data,
+            block_data_map,
+        )
+
+    def add(self, generation, block_structure, fingerprint):
+        """
+        Caches the given transformed block structure.
+
+        Arguments:
+            generation (string) - The generation of the collected block
+                structure from which the given block structure was
+                transformed, as returned by get_generation.
+
+            block_structure (BlockStructureBlockData) - The transformed
+                block structure, whose root is the starting block of the
+                transformation.
+
+            fingerprint (string) - The combined fingerprint of the
+                applied transformers.
+        """
+        serialized_data = serialization.serialize(block_structure)
+        self._cache.set(
+            self._encode_cache_key(generation, block_structure.root_block_usage_key, fingerprint),
+            serialized_data,
+            timeout=config.transformed_cache_timeout_in_seconds(),
+        )
+
+    def invalidate(self, root_block_usage_key):
+        """
+        Invalidates all transformed block structures that were cached
+        for the collected block structure with the given root.
+        """
+        self._cache.delete(self._encode_generation_cache_key(root_block_usage_key))
+
+    @staticmethod
+    def _encode_generation_cache_key(root_block_usage_key):
+        """
+        Returns the cache key of the current generation of the collected
+        block structure with the given root.
+        """
+        return u"transformed.generation.{}".format(six.text_type(root_block_usage_key))
+
+    @staticmethod
+    def _encode_cache_key(generation, starting_block_usage_key, fingerprint):
+        """
+        Returns the cache key of a transformed block structure.
+        """
+        return u"transformed.{}.{}.{}".format(generation, six.text_type(starting_block_usage_key), fingerprint)
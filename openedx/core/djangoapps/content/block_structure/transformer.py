@@ -157,6 +157,32 @@ class BlockStructureTransformer(object):
         """
         raise NotImplementedError
 
+    def transform_fingerprint(self, usage_info):
+        """
+        Returns a fingerprint of all usage-specific inputs to the
+        transformer's transform method for the given usage_info, for
+        example the user's partition groups or enrollment mode.
+
+        The framework caches transformed block structures, if enabled,
+        keyed by the collected data along with the fingerprints of all
+        applied transformers.  So a transformer should only return a
+        fingerprint if its transform output is fully determined by that
+        fingerprint and the collected data.
+
+        Arguments:
+            usage_info (any negotiated type) - A usage-specific object
+                that is passed to the block_structure and forwarded to all
+                requested Transformers in order to apply a
+                usage-specific transform.
+
+        Returns:
+            string or None - The fingerprint; an empty string if the
+                transform output doesn't depend on the usage_info; or
+                None (the default) if the transform output cannot be
+                cached.
+        """
+        return None
+
 
 class FilteringTransformerMixin(BlockStructureTransformer):
     """
@@ -4,6 +4,7 @@ Module for a collection of BlockStructureTransformers.
 
 
 import functools
+from hashlib import sha1
 from logging import getLogger
 
 from .exceptions import TransformerDataIncompatible, TransformerException
@@ -106,6 +107,26 @@ class BlockStructureTransformers(object):
             )
         return True
 
+    def fingerprint(self):
+        """
+        Returns a combined fingerprint of all the transformers in the
+        collection for the collection's usage_info, or None if any of
+        the transformers doesn't support caching its transform output.
+
+        See BlockStructureTransformer.transform_fingerprint.
+        """
+        hash_obj = sha1()
+        for transformer in self._transformers['supports_filter'] + self._transformers['no_filter']:
+            transformer_fingerprint = transformer.transform_fingerprint(self.usage_info)
+            if transformer_fingerprint is None:
+                return None
+            hash_obj.update(u'{}.{}:{};'.format(
+                transformer.name(),
+                transformer.READ_VERSION,
+                transformer_fingerprint,
+            ).encode('utf-8'))
+        return hash_obj.hexdigest()
+
     def transform(self, block_structure):
         """
         The given block structure is transformed by each transformer in the
@@ -3,13 +3,16 @@ Declaration of CourseOverview model
 """
 
 
+import copy
 import json
 import logging
+from collections import OrderedDict
 
 import six
 from ccx_keys.locator import CCXLocator
 from config_models.models import ConfigurationModel
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models import Q
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, FloatField, IntegerField, TextField
@@ -39,6 +42,14 @@ from xmodule.tabs import CourseTab
 
 log = logging.getLogger(__name__)
 
+# Process-local LRU cache of the overviews loaded by CourseOverview.get_prefetched_from_ids,
+# keyed by course id, with the version and modification time of their database rows.
+_PREFETCHED_OVERVIEWS = OrderedDict()
+PREFETCHED_OVERVIEWS_MAX_SIZE = 10000
+
+# How long to wait before requesting the update of an out-of-date overview again.
+OVERVIEW_UPDATE_REQUEST_TIMEOUT = 5 * 60
+
 
 @python_2_unicode_compatible
 class CourseOverview(TimeStampedModel):
@@ -390,6 +401,88 @@ class CourseOverview(TimeStampedModel):
                     overviews[course_id] = None
         return overviews
 
+    @classmethod
+    def get_prefetched_from_ids(cls, course_ids):
+        """
+        Return a dict mapping course_ids to CourseOverviews, with their tabs and
+        image sets prefetched.
+
+        Unlike get_from_ids, this uses a fixed number of queries: the versions
+        of the overviews are selected, and then only the overviews which changed
+        since this process last loaded them are selected, with their tabs and
+        image sets.  Out-of-date overviews, and overviews missing their image
+        sets, are returned as they are while they are updated from the
+        modulestore by a celery task.  Only the overviews missing from the
+        database are loaded from the modulestore before returning.
+
+        Course IDs for non-existant courses will map to None.  The overviews
+        returned are copies, along with their image sets and tabs, so they can
+        be modified by the caller.
+
+        Arguments:
+            course_ids (iterable[CourseKey])
+
+        Returns: dict[CourseKey, CourseOverview|None]
+        """
+        course_ids = list(course_ids)
+        row_versions = {
+            course_id: (version, modified)
+            for course_id, version, modified in cls.objects.filter(
+                id__in=course_ids
+            ).values_list('id', 'version', 'modified')
+        }
+
+        overviews = {}
+        for course_id, row_version in six.iteritems(row_versions):
+            cached = _PREFETCHED_OVERVIEWS.pop(course_id, None)
+            if cached and cached[0] == row_version:
+                # Re-insert the overview, as the most recently used one.
+                _PREFETCHED_OVERVIEWS[course_id] = cached
+                overviews[course_id] = cached[1]
+
+        changed_course_ids = [course_id for course_id in row_versions if course_id not in overviews]
+        if changed_course_ids:
+            for overview in cls.objects.select_related('image_set').prefetch_related('tab_set').filter(
+                id__in=changed_course_ids
+            ):
+                _PREFETCHED_OVERVIEWS[overview.id] = ((overview.version, overview.modified), overview)
+                overviews[overview.id] = overview
+            while len(_PREFETCHED_OVERVIEWS) > PREFETCHED_OVERVIEWS_MAX_SIZE:
+                _PREFETCHED_OVERVIEWS.popitem(last=False)
+
+        check_image_sets = CourseOverviewImageConfig.current().enabled
+        cls._request_update([
+            course_id for course_id, overview in six.iteritems(overviews)
+            if overview.version < cls.VERSION or (check_image_sets and not hasattr(overview, 'image_set'))
+        ])
+
+        overviews = {course_id: _copy_prefetched_overview(overview) for course_id, overview in six.iteritems(overviews)}
+        for course_id in course_ids:
+            if course_id not in overviews:
+                try:
+                    overviews[course_id] = cls.load_from_module_store(course_id)
+                except CourseOverview.DoesNotExist:
+                    overviews[course_id] = None
+        return overviews
+
+    @classmethod
+    def _request_update(cls, course_ids):
+        """
+        Update the overviews of the given courses from the modulestore with a
+        celery task, unless their update was requested recently.
+        """
+        from openedx.core.djangoapps.content.course_overviews.tasks import enqueue_async_course_overview_update_tasks
+
+        course_ids = [
+            six.text_type(course_id) for course_id in course_ids
+            if cache.add(
+                u'course_overviews.update_requested.{}'.format(course_id), True, OVERVIEW_UPDATE_REQUEST_TIMEOUT
+            )
+        ]
+        if course_ids:
+            log.info(u'Requesting the update of %d out-of-date course overviews.', len(course_ids))
+            enqueue_async_course_overview_update_tasks(course_ids, force_update=True)
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
@@ -653,7 +746,12 @@ class CourseOverview(TimeStampedModel):
         """
         Returns an iterator of CourseTabs.
         """
-        for tab_dict in self.tab_set.all().values():
+        for tab_set_item in self.tab_set.all():
+            # Build the dicts from the items rather than with values(), so that prefetched tabs are used.
+            tab_dict = {
+                field.attname: getattr(tab_set_item, field.attname)
+                for field in tab_set_item._meta.concrete_fields  # pylint: disable=protected-access
+            }
             tab = CourseTab.from_json(tab_dict)
             if tab is None:
                 log.warning("Can't instantiate CourseTab from %r", tab_dict)
@@ -1059,6 +1157,76 @@ class SimulateCoursePublishConfig(ConfigurationModel):
         return six.text_type(self.arguments)
 
 
+def _copy_prefetched_overview(prefetched_overview):
+    """
+    Returns a copy of an overview loaded by CourseOverview.get_prefetched_from_ids,
+    with copies of its selected image set and prefetched tabs, so that the copy
+    can be modified without modifying the overview of the process-local cache,
+    nor the objects related to it.
+    """
+    overview = _copy_model_instance(prefetched_overview)
+
+    image_set_field = CourseOverview._meta.get_field('image_set')
+    image_set = _get_cached_related_object(prefetched_overview, image_set_field)
+    if image_set is not None:
+        image_set = _copy_model_instance(image_set)
+        _set_cached_related_object(image_set, CourseOverviewImageSet._meta.get_field('course_overview'), overview)
+        _set_cached_related_object(overview, image_set_field, image_set)
+
+    prefetched_objects_cache = getattr(prefetched_overview, '_prefetched_objects_cache', None)
+    if prefetched_objects_cache is not None:
+        tab_course_overview_field = CourseOverviewTab._meta.get_field('course_overview')
+        overview._prefetched_objects_cache = {}  # pylint: disable=protected-access
+        for name, queryset in six.iteritems(prefetched_objects_cache):
+            queryset_copy = queryset._clone()  # pylint: disable=protected-access
+            queryset_copy._result_cache = []  # pylint: disable=protected-access
+            for related in queryset._result_cache:  # pylint: disable=protected-access
+                related = _copy_model_instance(related)
+                if isinstance(related, CourseOverviewTab):
+                    _set_cached_related_object(related, tab_course_overview_field, overview)
+                queryset_copy._result_cache.append(related)  # pylint: disable=protected-access
+            queryset_copy._prefetch_done = True  # pylint: disable=protected-access
+            overview._prefetched_objects_cache[name] = queryset_copy  # pylint: disable=protected-access
+    return overview
+
+
+def _copy_model_instance(instance):
+    """
+    Returns a shallow copy of the given model instance, with its own state,
+    including its own cache of related objects.
+    """
+    instance_copy = copy.copy(instance)
+    instance_copy._state = copy.copy(instance._state)  # pylint: disable=protected-access
+    fields_cache = getattr(instance._state, 'fields_cache', None)  # pylint: disable=protected-access
+    if fields_cache is not None:
+        # Django 2.0+ keeps the related objects in the state instead of the instance.
+        instance_copy._state.fields_cache = dict(fields_cache)  # pylint: disable=protected-access
+    return instance_copy
+
+
+def _get_cached_related_object(instance, field):
+    """
+    Returns the object related to the given model instance by the given
+    relation field, if already cached on the instance, or None.
+    """
+    if hasattr(field, 'get_cached_value'):
+        return field.get_cached_value(instance, default=None)
+    # Django 1.11 caches the related objects as attributes of the instance.
+    return getattr(instance, field.get_cache_name(), None)
+
+
+def _set_cached_related_object(instance, field, related_object):
+    """
+    Caches the given object as related to the given model instance by the
+    given relation field.
+    """
+    if hasattr(field, 'set_cached_value'):
+        field.set_cached_value(instance, related_object)
+    else:
+        # Django 1.11 caches the related objects as attributes of the instance.
+        setattr(instance, field.get_cache_name(), related_object)
+
+
 def _invalidate_overview_cache(**kwargs):  # pylint: disable=unused-argument
     """
     Invalidate the course overview request cache.
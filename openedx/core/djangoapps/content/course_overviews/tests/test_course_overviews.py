@@ -42,6 +42,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls_range
 
+from .. import models as course_overviews_models
 from ..models import CourseOverview, CourseOverviewImageConfig, CourseOverviewImageSet
 from .factories import CourseOverviewFactory
 
@@ -594,6 +595,112 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase, Cache
         assert overviews_by_id[non_existent_course_key] is None
         assert mock_load_from_modulestore.call_count == 3
 
+    @mock.patch.dict('openedx.core.djangoapps.content.course_overviews.models._PREFETCHED_OVERVIEWS', clear=True)
+    @mock.patch('openedx.core.djangoapps.content.course_overviews.tasks.enqueue_async_course_overview_update_tasks')
+    def test_get_prefetched_from_ids(self, mock_enqueue_update):
+        """
+        Assert that CourseOverviews.get_prefetched_from_ids only loads the
+        missing course overviews from the modulestore, and requests the update
+        of the out-of-date ones.
+        """
+        course_with_overview = CourseFactory.create(emit_signals=True)
+        course_without_overview = CourseFactory.create(emit_signals=False)
+        course_with_old_overview = CourseFactory.create(emit_signals=True)
+        old_overview = CourseOverview.objects.get(id=course_with_old_overview.id)
+        old_overview.version = CourseOverview.VERSION - 1
+        old_overview.save()
+
+        non_existent_course_key = CourseKey.from_string('course-v1:This+Course+IsFake')
+        course_ids = [
+            course_with_overview.id, course_without_overview.id, course_with_old_overview.id, non_existent_course_key
+        ]
+
+        with mock.patch.object(
+            CourseOverview,
+            'load_from_module_store',
+            wraps=CourseOverview.load_from_module_store
+        ) as mock_load_from_modulestore:
+            overviews_by_id = CourseOverview.get_prefetched_from_ids(course_ids)
+        assert mock_load_from_modulestore.call_count == 2
+        assert overviews_by_id[course_with_overview.id].id == course_with_overview.id
+        assert overviews_by_id[course_without_overview.id].id == course_without_overview.id
+        assert overviews_by_id[course_with_old_overview.id].version == CourseOverview.VERSION - 1
+        assert overviews_by_id[non_existent_course_key] is None
+        mock_enqueue_update.assert_called_once_with([six.text_type(course_with_old_overview.id)], force_update=True)
+
+        # The tabs are prefetched.
+        with self.assertNumQueries(0):
+            assert list(overviews_by_id[course_with_overview.id].tabs)
+
+        # Unchanged overviews are not selected again, only their versions and the image config are.
+        with self.assertNumQueries(2):
+            overview = CourseOverview.get_prefetched_from_ids([course_with_overview.id])[course_with_overview.id]
+        assert overview is not overviews_by_id[course_with_overview.id]
+        assert overview.display_name == course_with_overview.display_name
+
+        overview.display_name = 'Updated display name'
+        overview.save()
+        overview = CourseOverview.get_prefetched_from_ids([course_with_overview.id])[course_with_overview.id]
+        assert overview.display_name == 'Updated display name'
+
+    @mock.patch.dict('openedx.core.djangoapps.content.course_overviews.models._PREFETCHED_OVERVIEWS', clear=True)
+    def test_get_prefetched_from_ids_copies(self):
+        """
+        Assert that the image sets and tabs of the overviews returned by
+        CourseOverviews.get_prefetched_from_ids are copies too.
+        """
+        course = CourseFactory.create(emit_signals=True)
+        CourseOverviewImageSet.objects.create(course_overview=CourseOverview.get_from_id(course.id))
+
+        overview = CourseOverview.get_prefetched_from_ids([course.id])[course.id]
+        overview.image_set.small_url = 'http://example.com/modified.png'
+        tab = overview.tab_set.all()[0]
+        tab.tab_id = 'modified'
+        assert tab.course_overview is overview
+
+        with self.assertNumQueries(2):
+            overview = CourseOverview.get_prefetched_from_ids([course.id])[course.id]
+        assert overview.image_set.small_url != 'http://example.com/modified.png'
+        assert overview.image_set.course_overview is overview
+        assert 'modified' not in [tab.tab_id for tab in overview.tab_set.all()]
+
+    @mock.patch.dict('openedx.core.djangoapps.content.course_overviews.models._PREFETCHED_OVERVIEWS', clear=True)
+    def test_get_prefetched_from_ids_image_set_copy(self):
+        """
+        Assert that modifying the image set of an overview returned by
+        CourseOverviews.get_prefetched_from_ids doesn't modify the image
+        set of the overview in the process-local cache.
+        """
+        course = CourseFactory.create(emit_signals=True)
+        CourseOverviewImageSet.objects.create(
+            course_overview=CourseOverview.get_from_id(course.id), small_url='http://example.com/small.png',
+        )
+
+        overview = CourseOverview.get_prefetched_from_ids([course.id])[course.id]
+        overview.image_set.small_url = 'http://example.com/modified.png'
+
+        prefetched_overviews = course_overviews_models._PREFETCHED_OVERVIEWS  # pylint: disable=protected-access
+        __, prefetched_overview = prefetched_overviews[course.id]
+        assert overview.image_set is not prefetched_overview.image_set
+        assert prefetched_overview.image_set.small_url == 'http://example.com/small.png'
+        assert prefetched_overview.image_set.course_overview is prefetched_overview
+
+    @mock.patch.dict('openedx.core.djangoapps.content.course_overviews.models._PREFETCHED_OVERVIEWS', clear=True)
+    @mock.patch('openedx.core.djangoapps.content.course_overviews.models.PREFETCHED_OVERVIEWS_MAX_SIZE', 2)
+    def test_get_prefetched_from_ids_lru(self):
+        """
+        Assert that the least recently used overviews are evicted from the
+        process-local cache of CourseOverviews.get_prefetched_from_ids.
+        """
+        course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
+        for course_id in course_ids[:2]:
+            CourseOverview.get_prefetched_from_ids([course_id])
+        CourseOverview.get_prefetched_from_ids([course_ids[0]])
+        CourseOverview.get_prefetched_from_ids([course_ids[2]])
+
+        prefetched_overviews = course_overviews_models._PREFETCHED_OVERVIEWS  # pylint: disable=protected-access
+        assert list(prefetched_overviews) == [course_ids[0], course_ids[2]]
+
 
 @ddt.ddt
 class CourseOverviewImageSetTestCase(ModuleStoreTestCase):
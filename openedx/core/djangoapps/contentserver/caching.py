@@ -3,13 +3,29 @@ Helper functions for caching course assets.
 """
 
 
-import six
+import errno
+import hashlib
+import logging
+import os
+import time
 
+import six
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.assetstore.assetmgr import AssetManager
+from xmodule.contentstore.content import STATIC_CONTENT_VERSION, StaticContentStream
+
+log = logging.getLogger(__name__)
+
+# Prefix of the files of the disk cache being written.
+DISK_CACHE_TEMP_PREFIX = '.tmp'
+
+# Age, in seconds, after which a file of the disk cache being written is
+# considered left behind by a process that died while writing it.
+DISK_CACHE_TEMP_TIMEOUT = 10 * 60
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -52,3 +68,142 @@ def del_cached_content(location):
         pass
 
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+
+
+class DiskCachedContent(StaticContentStream):
+    """
+    Content of an asset read from its file in the local disk cache.
+    """
+    def __init__(self, content, path):
+        super(DiskCachedContent, self).__init__(
+            content.location, content.name, content.content_type, open(path, 'rb'),
+            last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+            import_path=content.import_path, length=content.length, locked=content.locked,
+            content_digest=content.content_digest,
+        )
+        self.path = path
+
+    @property
+    def file(self):
+        """
+        The open file of the asset, e.g. to be sent with a FileResponse.
+        """
+        return self._stream
+
+
+def get_disk_cached_content(content):
+    """
+    Returns the given streamed content read from its file in the local disk
+    cache, after copying it there if needed.
+
+    The files are named after the location and the digest of the content, so a
+    changed asset gets a new file, and the least recently served files are
+    removed when the cache grows over COURSE_ASSETS_DISK_CACHE_MAX_SIZE bytes.
+    Only one process copies a given asset to the disk cache at a time, the
+    others keep streaming it from the contentstore meanwhile.
+    Returns the given content if the disk cache is disabled, or the content
+    can't be cached.
+    """
+    cache_dir = settings.COURSE_ASSETS_DISK_CACHE_DIR
+    max_size = settings.COURSE_ASSETS_DISK_CACHE_MAX_SIZE
+    if not cache_dir or content.content_digest is None or content.length is None or content.length > max_size:
+        return content
+
+    cache_key = u'{}:{}'.format(content.location, content.content_digest)
+    path = os.path.join(cache_dir, hashlib.sha1(cache_key.encode('utf-8')).hexdigest())
+    try:
+        # Mark the file as recently served.
+        os.utime(path, None)
+        return DiskCachedContent(content, path)
+    except (IOError, OSError):
+        # The file isn't cached, or it was just removed by another process.
+        pass
+
+    try:
+        if not _save_to_disk_cache(content, cache_dir, path):
+            # Another process is copying the asset to the disk cache.
+            return content
+        cached_content = DiskCachedContent(content, path)
+    except (IOError, OSError):
+        log.exception(u'Failed to save %s to the disk cache of the course assets.', content.location)
+        # The stream of the content may have been read, so get a new one.
+        return AssetManager.find(content.location, as_stream=True)
+
+    _evict_from_disk_cache(cache_dir, max_size)
+    return cached_content
+
+
+def _save_to_disk_cache(content, cache_dir, path):
+    """
+    Writes the data of the given content to the given file of the disk cache.
+
+    The data is written to a temporary file named after the file, which is
+    then renamed, so that the other processes never read a partially written
+    file.  The temporary file is created exclusively, so that the other
+    processes don't copy the same content at the same time.
+
+    Returns whether the data was written, or False if another process is
+    writing it.
+    """
+    if not os.path.isdir(cache_dir):
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            # The directory can be created by another process meanwhile.
+            if not os.path.isdir(cache_dir):
+                raise
+
+    temp_path = os.path.join(cache_dir, DISK_CACHE_TEMP_PREFIX + os.path.basename(path))
+    try:
+        temp_fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+        try:
+            if time.time() - os.path.getmtime(temp_path) > DISK_CACHE_TEMP_TIMEOUT:
+                # The file was left behind by a process that died while writing it.
+                os.remove(temp_path)
+        except OSError:
+            # The file was just renamed or removed by the process writing it.
+            pass
+        return False
+
+    try:
+        with os.fdopen(temp_fd, 'wb') as temp_file:
+            for chunk in content.stream_data():
+                temp_file.write(chunk)
+        if os.path.getsize(temp_path) != content.length:
+            raise IOError(u'Incomplete data for {}'.format(content.location))
+        os.rename(temp_path, path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    return True
+
+
+def _evict_from_disk_cache(cache_dir, max_size):
+    """
+    Removes the least recently served files of the disk cache, until it holds at
+    most max_size bytes.
+    """
+    files = []
+    for name in os.listdir(cache_dir):
+        if name.startswith(DISK_CACHE_TEMP_PREFIX):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # The file was removed by another process.
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+
+    total_size = sum(size for __, size, __ in files)
+    for __, size, path in sorted(files):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
@@ -8,6 +8,7 @@ import logging
 
 import six
 from django.http import (
+    FileResponse,
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseForbidden,
@@ -23,12 +24,12 @@ from six import text_type
 from openedx.core.djangoapps.header_control import force_header_for_response
 from student.models import CourseEnrollment
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent
+from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent, StaticContentStream
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import InvalidLocationError
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
-from .caching import get_cached_content, set_cached_content
+from .caching import DiskCachedContent, get_cached_content, get_disk_cached_content, set_cached_content
 from .models import CdnUserAgentsConfig, CourseAssetCacheTtlConfig
 
 log = logging.getLogger(__name__)
@@ -133,56 +134,74 @@ class StaticContentServer(MiddlewareMixin):
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
-            if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
-                header_value = request.META['HTTP_RANGE']
-                try:
-                    unit, ranges = parse_range_header(header_value, content.length)
-                except ValueError as exception:
-                    # If the header field is syntactically invalid it should be ignored.
-                    log.exception(
-                        u"%s in Range header: %s for content: %s",
-                        text_type(exception), header_value, six.text_type(loc)
-                    )
-                else:
-                    if unit != 'bytes':
-                        # Only accept ranges in bytes
-                        log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, text_type(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
-                        log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, text_type(loc)
+
+            # Assets too large for the cache are read from the local disk cache, when enabled,
+            # rather than from the contentstore.
+            if isinstance(content, StaticContentStream):
+                content = get_disk_cached_content(content)
+
+            try:
+                if request.META.get('HTTP_RANGE'):
+                    # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
+                    if not isinstance(content, StaticContentStream):
+                        content = AssetManager.find(loc, as_stream=True)
+
+                    header_value = request.META['HTTP_RANGE']
+                    try:
+                        unit, ranges = parse_range_header(header_value, content.length)
+                    except ValueError as exception:
+                        # If the header field is syntactically invalid it should be ignored.
+                        log.exception(
+                            u"%s in Range header: %s for content: %s",
+                            text_type(exception), header_value, six.text_type(loc)
                         )
                     else:
-                        first, last = ranges[0]
-
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
-                            response['Content-Range'] = u'bytes {first}-{last}/{length}'.format(
-                                first=first, last=last, length=content.length
+                        if unit != 'bytes':
+                            # Only accept ranges in bytes
+                            log.warning(
+                                u"Unknown unit in Range header: %s for content: %s", header_value, text_type(loc)
                             )
-                            response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            if newrelic:
-                                newrelic.agent.add_custom_parameter('contentserver.ranged', True)
-                        else:
+                        elif len(ranges) > 1:
+                            # According to Http/1.1 spec content for multiple ranges should be sent as a
+                            # multipart message.
+                            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                            # But we send back the full content.
                             log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s",
-                                header_value, text_type(loc)
+                                u"More than 1 ranges in Range header: %s for content: %s", header_value, text_type(loc)
                             )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
-
-            # If Range header is absent or syntactically invalid return a full content response.
-            if response is None:
-                response = HttpResponse(content.stream_data())
-                response['Content-Length'] = content.length
+                        else:
+                            first, last = ranges[0]
+
+                            if 0 <= first <= last < content.length:
+                                # If the byte range is satisfiable
+                                response = HttpResponse(content.stream_data_in_range(first, last))
+                                response['Content-Range'] = u'bytes {first}-{last}/{length}'.format(
+                                    first=first, last=last, length=content.length
+                                )
+                                response['Content-Length'] = str(last - first + 1)
+                                response.status_code = 206  # Partial Content
+
+                                if newrelic:
+                                    newrelic.agent.add_custom_parameter('contentserver.ranged', True)
+                            else:
+                                log.warning(
+                                    u"Cannot satisfy ranges in Range header: %s for content: %s",
+                                    header_value, text_type(loc)
+                                )
+                                return HttpResponse(status=416)  # Requested Range Not Satisfiable
+
+                # If Range header is absent or syntactically invalid return a full content response.
+                if response is None:
+                    if isinstance(content, DiskCachedContent):
+                        # Let the server send the file itself, e.g. with sendfile.
+                        response = FileResponse(content.file)
+                    else:
+                        response = HttpResponse(content.stream_data())
+                    response['Content-Length'] = content.length
+            finally:
+                # The file of disk cached content is closed by the FileResponse sending it, if any.
+                if isinstance(content, DiskCachedContent) and not isinstance(response, FileResponse):
+                    content.close()
 
             if newrelic:
                 newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
@@ -8,7 +8,10 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
 import six
+import tempfile
 import unittest
 from uuid import uuid4
 
@@ -19,7 +22,7 @@ from django.test.utils import override_settings
 from mock import patch
 
 from xmodule.contentstore.django import contentstore
-from xmodule.contentstore.content import StaticContent, VERSIONED_ASSETS_PREFIX
+from xmodule.contentstore.content import StaticContent, StaticContentStream, VERSIONED_ASSETS_PREFIX
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.xml_importer import import_course_from_xml
@@ -30,6 +33,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
+from ..caching import DISK_CACHE_TEMP_PREFIX, DiskCachedContent
 from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
@@ -293,6 +297,95 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual('Origin', resp['Vary'])
 
+    @patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content', return_value=None)
+    def test_disk_cache(self, _mock_get_cached_content):
+        """
+        Test that assets which aren't in the cache are served from the disk cache,
+        including range requests.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        data = self.contentstore.find(self.unlocked_asset).data
+
+        with override_settings(COURSE_ASSETS_DISK_CACHE_DIR=cache_dir):
+            resp = self.client.get(self.url_unlocked)
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(b''.join(resp.streaming_content), data)
+            resp.close()
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            with patch('openedx.core.djangoapps.contentserver.caching._save_to_disk_cache') as mock_save:
+                resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-3')
+            self.assertFalse(mock_save.called)
+            self.assertEqual(resp.status_code, 206)
+            self.assertEqual(resp.content, data[1:4])
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content', return_value=None)
+    def test_disk_cache_unsatisfiable_range(self, _mock_get_cached_content):
+        """
+        Test that the file of a disk cached asset is closed when its range can't be served.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        close_patcher = patch.object(
+            DiskCachedContent, 'close', autospec=True, side_effect=StaticContentStream.close
+        )
+        with override_settings(COURSE_ASSETS_DISK_CACHE_DIR=cache_dir), close_patcher as close:
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-{}'.format(self.length_unlocked))
+        self.assertEqual(resp.status_code, 416)
+        self.assertEqual(close.call_count, 1)
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content', return_value=None)
+    def test_disk_cache_being_written(self, _mock_get_cached_content):
+        """
+        Test that an asset being copied to the disk cache by another process is
+        served from the contentstore meanwhile, unless that process died while
+        copying it.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        data = self.contentstore.find(self.unlocked_asset).data
+
+        with override_settings(COURSE_ASSETS_DISK_CACHE_DIR=cache_dir):
+            self.client.get(self.url_unlocked).close()
+            cached_file_name = os.listdir(cache_dir)[0]
+            temp_file = os.path.join(cache_dir, DISK_CACHE_TEMP_PREFIX + cached_file_name)
+            os.rename(os.path.join(cache_dir, cached_file_name), temp_file)
+
+            resp = self.client.get(self.url_unlocked)
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.content, data)
+            self.assertEqual(os.listdir(cache_dir), [os.path.basename(temp_file)])
+
+            os.utime(temp_file, (0, 0))
+            self.client.get(self.url_unlocked)
+            self.assertEqual(os.listdir(cache_dir), [])
+            self.client.get(self.url_unlocked).close()
+            self.assertEqual(os.listdir(cache_dir), [cached_file_name])
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content', return_value=None)
+    def test_disk_cache_eviction(self, _mock_get_cached_content):
+        """
+        Test that the least recently served assets are removed from the disk cache
+        when it grows over its maximum size.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        old_file = os.path.join(cache_dir, 'old')
+        with open(old_file, 'wb') as cached_file:
+            cached_file.write(b'x' * 10)
+        os.utime(old_file, (0, 0))
+
+        with override_settings(
+            COURSE_ASSETS_DISK_CACHE_DIR=cache_dir, COURSE_ASSETS_DISK_CACHE_MAX_SIZE=self.length_unlocked
+        ):
+            resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        resp.close()
+        self.assertFalse(os.path.exists(old_file))
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
     @patch('openedx.core.djangoapps.contentserver.models.CourseAssetCacheTtlConfig.get_cache_ttl')
     def test_cache_headers_with_ttl_unlocked(self, mock_get_cache_ttl):
         """
@@ -510,6 +510,128 @@ def add_user_to_cohort(cohort, username_or_email_or_user):
                 raise ex
 
 
+def bulk_add_users_to_cohorts(course_key, assignments):
+    """
+    Add users to cohorts of the course in bulk. This behaves like calling
+    add_user_to_cohort for each of the given pairs in order, but the existing
+    memberships are read with a single query and the changes are written in one
+    transaction. The cohorts of the users are cached for the rest of the request.
+
+    Arguments:
+        course_key: CourseKey
+        assignments: iterable of (CourseUserGroup, User) pairs
+
+    Returns:
+        A list with, for each of the given pairs, whether the user was added to
+        the cohort (False if they were already present in it) and a string (or
+        None) indicating their previous cohort.
+    """
+    assignments = list(assignments)
+    users_by_id = {user.id: user for __, user in assignments}
+    cohorts_by_user_id = {user.id: cohort for cohort, user in assignments}
+    previous_cohorts = CohortMembership.bulk_assign(
+        course_key,
+        {users_by_id[user_id]: cohort for user_id, cohort in six.iteritems(cohorts_by_user_id)},
+    )
+
+    results = []
+    current_cohorts = dict(previous_cohorts)
+    for cohort, user in assignments:
+        previous_cohort = current_cohorts[user.id]
+        if previous_cohort == cohort:
+            results.append((False, None))
+            continue
+        tracker.emit(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": user.id,
+                "cohort_id": cohort.id,
+                "cohort_name": cohort.name,
+                "previous_cohort_id": getattr(previous_cohort, 'id', None),
+                "previous_cohort_name": getattr(previous_cohort, 'name', None),
+            }
+        )
+        current_cohorts[user.id] = cohort
+        results.append((True, getattr(previous_cohort, 'name', None)))
+
+    cache = RequestCache(COHORT_CACHE_NAMESPACE).data
+    for user_id, cohort in six.iteritems(cohorts_by_user_id):
+        cache[_cohort_cache_key(user_id, course_key)] = cohort
+        if previous_cohorts[user_id] != cohort:
+            COHORT_MEMBERSHIP_UPDATED.send(sender=None, user=users_by_id[user_id], course_key=course_key)
+    return results
+
+
+def bulk_assign_cohorts(course_key, users):
+    """
+    Returns the cohorts of the given users in the course, assigning the users
+    who have none yet the way get_cohort does: to the cohort they were
+    preassigned to by email, or else to a random cohort. The memberships are
+    read and written in bulk, and the cohorts of the users are cached for the
+    rest of the request.
+
+    Arguments:
+        course_key: CourseKey
+        users: list of Django User objects
+
+    Returns:
+        A dict mapping the ids of the users to their CourseUserGroup, or to
+        None if the course is not cohorted.
+    """
+    cache = RequestCache(COHORT_CACHE_NAMESPACE).data
+    if not is_course_cohorted(course_key):
+        for user in users:
+            cache[_cohort_cache_key(user.id, course_key)] = None
+        return {user.id: None for user in users}
+
+    cohorts_by_user_id = {
+        membership.user_id: membership.course_user_group
+        for membership in CohortMembership.objects.filter(
+            course_id=course_key,
+            user_id__in=[user.id for user in users],
+        ).select_related('course_user_group')
+    }
+    for user_id, cohort in six.iteritems(cohorts_by_user_id):
+        cache[_cohort_cache_key(user_id, course_key)] = cohort
+
+    uncohorted_users = list({
+        user.id: user for user in users if user.id not in cohorts_by_user_id
+    }.values())
+    if not uncohorted_users:
+        return cohorts_by_user_id
+
+    preassigned_cohorts = {
+        assignment.email: assignment.course_user_group
+        for assignment in UnregisteredLearnerCohortAssignments.objects.filter(
+            course_id=course_key,
+            email__in=[user.email for user in uncohorted_users],
+        ).select_related('course_user_group')
+    }
+
+    random_cohorts = None
+    assignments = []
+    for user in uncohorted_users:
+        cohort = preassigned_cohorts.get(user.email)
+        if cohort is None:
+            if random_cohorts is None:
+                course = courses.get_course(course_key)
+                random_cohorts = get_course_cohorts(course, assignment_type=CourseCohort.RANDOM) or [
+                    get_random_cohort(course_key)
+                ]
+            cohort = local_random().choice(random_cohorts)
+        assignments.append((cohort, user))
+
+    bulk_add_users_to_cohorts(course_key, assignments)
+    if preassigned_cohorts:
+        UnregisteredLearnerCohortAssignments.objects.filter(
+            course_id=course_key,
+            email__in=list(preassigned_cohorts),
+        ).delete()
+
+    cohorts_by_user_id.update((user.id, cohort) for cohort, user in assignments)
+    return cohorts_by_user_id
+
+
 def get_group_info_for_cohort(cohort, use_cached=False):
     """
     Get the ids of the group and partition to which this cohort has been linked
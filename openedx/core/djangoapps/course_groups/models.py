@@ -5,10 +5,12 @@ Django models related to course groups functionality.
 
 import json
 import logging
+from collections import defaultdict
 
+import six
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
 from django.db.models.signals import pre_delete
 from django.dispatch import receiver
 from django.utils.encoding import python_2_unicode_compatible
@@ -18,6 +20,10 @@ from openedx.core.djangolib.model_mixins import DeletableByUserValue
 
 log = logging.getLogger(__name__)
 
+# Number of times CohortMembership.bulk_assign assigns a batch again when another
+# worker creates the membership of one of its users meanwhile.
+BULK_ASSIGN_MAX_RETRIES = 2
+
 
 @python_2_unicode_compatible
 class CourseUserGroup(models.Model):
@@ -127,6 +133,86 @@ class CohortMembership(models.Model):
                 membership.save()
         return membership, previous_cohort
 
+    @classmethod
+    def bulk_assign(cls, course_id, cohorts_by_user, retry_count=0):
+        """
+        Assign each of the given users to their cohort in the course, switching them to it if they had
+        previously been assigned to another cohort. The existing memberships are read with a single query
+        and the changes are written with set-based inserts and updates.
+
+        Arguments:
+            course_id: CourseKey of the course the cohorts belong to
+            cohorts_by_user: dict mapping User objects to the CourseUserGroup they should be in
+            retry_count: number of times the assignment of this batch was already retried
+
+        Returns a dict mapping the ids of the given users to their previous cohort (or None).
+        """
+        cohorts = {cohort.id: cohort for cohort in six.itervalues(cohorts_by_user)}
+        for cohort in six.itervalues(cohorts):
+            if cohort.group_type != CourseUserGroup.COHORT:
+                raise ValidationError("CohortMembership cannot be used with CourseGroup types other than COHORT")
+            if cohort.course_id != course_id:
+                raise ValidationError("Non-matching course_ids provided")
+
+        cohort_ids_by_user_id = {user.id: cohort.id for user, cohort in six.iteritems(cohorts_by_user)}
+        try:
+            with transaction.atomic():
+                previous_cohort_ids = dict(
+                    cls.objects.select_for_update().filter(
+                        course_id=course_id,
+                        user_id__in=list(cohort_ids_by_user_id),
+                    ).values_list('user_id', 'course_user_group_id')
+                )
+                missing_cohort_ids = set(six.itervalues(previous_cohort_ids)) - set(cohorts)
+                if missing_cohort_ids:
+                    cohorts.update(CourseUserGroup.objects.in_bulk(list(missing_cohort_ids)))
+
+                new_memberships = []
+                moved_user_ids_by_cohort_id = defaultdict(list)
+                removed_user_ids_by_cohort_id = defaultdict(list)
+                added_user_ids_by_cohort_id = defaultdict(list)
+                for user_id, cohort_id in six.iteritems(cohort_ids_by_user_id):
+                    previous_cohort_id = previous_cohort_ids.get(user_id)
+                    if previous_cohort_id == cohort_id:
+                        continue
+                    if previous_cohort_id is None:
+                        new_memberships.append(
+                            cls(course_user_group_id=cohort_id, user_id=user_id, course_id=course_id)
+                        )
+                    else:
+                        moved_user_ids_by_cohort_id[cohort_id].append(user_id)
+                        removed_user_ids_by_cohort_id[previous_cohort_id].append(user_id)
+                    added_user_ids_by_cohort_id[cohort_id].append(user_id)
+
+                cls.objects.bulk_create(new_memberships)
+                for cohort_id, user_ids in six.iteritems(moved_user_ids_by_cohort_id):
+                    cls.objects.filter(course_id=course_id, user_id__in=user_ids).update(course_user_group_id=cohort_id)
+                for cohort_id, user_ids in six.iteritems(removed_user_ids_by_cohort_id):
+                    cohorts[cohort_id].users.remove(*user_ids)
+                for cohort_id, user_ids in six.iteritems(added_user_ids_by_cohort_id):
+                    cohorts[cohort_id].users.add(*user_ids)
+        except IntegrityError as integrity_error:
+            # An IntegrityError is raised when another worker creates the membership
+            # of one of the users meanwhile, e.g. in get_cohort, so assign the batch again.
+            if retry_count >= BULK_ASSIGN_MAX_RETRIES:
+                raise
+            log.info(
+                u"HANDLING_INTEGRITY_ERROR: IntegrityError encountered while assigning %d users to cohorts in '%s': %s",
+                len(cohorts_by_user), course_id, six.text_type(integrity_error)
+            )
+            return cls.bulk_assign(course_id, cohorts_by_user, retry_count + 1)
+
+        log.info(
+            u"Assigned %d users to cohorts in '%s' (%d new memberships)",
+            sum(len(user_ids) for user_ids in six.itervalues(added_user_ids_by_cohort_id)),
+            course_id,
+            len(new_memberships),
+        )
+        return {
+            user_id: cohorts.get(previous_cohort_ids.get(user_id))
+            for user_id in cohort_ids_by_user_id
+        }
+
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
         self.full_clean(validate_unique=False)
 
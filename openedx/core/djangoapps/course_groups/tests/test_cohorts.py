@@ -22,7 +22,14 @@ from xmodule.modulestore.tests.django_utils import TEST_DATA_MIXED_MODULESTORE,
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
 from .. import cohorts
-from ..models import CourseCohort, CourseUserGroup, CourseUserGroupPartitionGroup, UnregisteredLearnerCohortAssignments
+from ..models import (
+    BULK_ASSIGN_MAX_RETRIES,
+    CohortMembership,
+    CourseCohort,
+    CourseUserGroup,
+    CourseUserGroupPartitionGroup,
+    UnregisteredLearnerCohortAssignments
+)
 from ..tests.helpers import CohortFactory, CourseCohortFactory, config_course_cohorts, config_course_cohorts_legacy
 
 
@@ -690,6 +697,160 @@ class TestCohorts(ModuleStoreTestCase):
             lambda: cohorts.add_user_to_cohort(first_cohort, "non_existent_username")
         )
 
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    @patch("openedx.core.djangoapps.course_groups.cohorts.COHORT_MEMBERSHIP_UPDATED")
+    def test_bulk_add_users_to_cohorts(self, mock_signal, mock_tracker):
+        """
+        Make sure cohorts.bulk_add_users_to_cohorts() adds, moves and skips users
+        like cohorts.add_user_to_cohort() would.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort")
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+        new_user, moved_user, unchanged_user = UserFactory.create_batch(3)
+        cohorts.add_user_to_cohort(first_cohort, moved_user)
+        cohorts.add_user_to_cohort(second_cohort, unchanged_user)
+        mock_signal.reset_mock()
+        mock_tracker.reset_mock()
+
+        self.assertEqual(
+            cohorts.bulk_add_users_to_cohorts(course.id, [
+                (first_cohort, new_user),
+                (second_cohort, moved_user),
+                (second_cohort, unchanged_user),
+                (second_cohort, new_user),
+            ]),
+            [(True, None), (True, "FirstCohort"), (False, None), (True, "FirstCohort")]
+        )
+
+        self.assertEqual(list(first_cohort.users.all()), [])
+        self.assertEqual(set(second_cohort.users.all()), {new_user, moved_user, unchanged_user})
+        for user in (new_user, moved_user, unchanged_user):
+            self.assertEqual(cohorts.get_cohort(user, course.id), second_cohort)
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": moved_user.id,
+                "cohort_id": second_cohort.id,
+                "cohort_name": second_cohort.name,
+                "previous_cohort_id": first_cohort.id,
+                "previous_cohort_name": first_cohort.name,
+            }
+        )
+        self.assertEqual(
+            sorted(call_args[1]['user'].id for call_args in mock_signal.send.call_args_list),
+            sorted([new_user.id, moved_user.id])
+        )
+
+        # The cohorts of the users are cached for the rest of the request
+        with self.assertNumQueries(0):
+            self.assertEqual(cohorts.get_cohort(new_user, course.id, use_cached=True), second_cohort)
+
+    def test_bulk_add_users_to_cohorts_integrity_error(self):
+        """
+        Make sure cohorts.bulk_add_users_to_cohorts() assigns the users again when
+        another worker creates the membership of one of them meanwhile.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        cohort = CohortFactory(course_id=course.id, name="Cohort")
+        users = UserFactory.create_batch(2)
+        bulk_create = CohortMembership.objects.bulk_create
+        bulk_create_calls = []
+
+        def bulk_create_after_concurrent_assignment(memberships):
+            bulk_create_calls.append(memberships)
+            if len(bulk_create_calls) == 1:
+                raise IntegrityError("Duplicate entry")
+            return bulk_create(memberships)
+
+        with patch.object(
+            CohortMembership.objects, 'bulk_create', side_effect=bulk_create_after_concurrent_assignment
+        ):
+            self.assertEqual(
+                cohorts.bulk_add_users_to_cohorts(course.id, [(cohort, user) for user in users]),
+                [(True, None), (True, None)]
+            )
+
+        self.assertEqual(len(bulk_create_calls), 2)
+        self.assertEqual(set(cohort.users.all()), set(users))
+        for user in users:
+            self.assertEqual(cohorts.get_cohort(user, course.id), cohort)
+
+    def test_bulk_add_users_to_cohorts_repeated_integrity_error(self):
+        """
+        Make sure cohorts.bulk_add_users_to_cohorts() gives up assigning the users again
+        after a few IntegrityErrors.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        cohort = CohortFactory(course_id=course.id, name="Cohort")
+        user = UserFactory()
+
+        with patch.object(
+            CohortMembership.objects, 'bulk_create', side_effect=IntegrityError("Duplicate entry")
+        ) as mock_bulk_create:
+            with self.assertRaises(IntegrityError):
+                cohorts.bulk_add_users_to_cohorts(course.id, [(cohort, user)])
+
+        self.assertEqual(mock_bulk_create.call_count, BULK_ASSIGN_MAX_RETRIES + 1)
+        self.assertEqual(list(cohort.users.all()), [])
+
+    def test_bulk_assign_cohorts(self):
+        """
+        Make sure cohorts.bulk_assign_cohorts() keeps the existing cohorts of the users,
+        and assigns the others to the cohort they were preassigned to or to a random cohort.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True, auto_cohorts=["AutoGroup"])
+        manual_cohort = CohortFactory(course_id=course.id, name="ManualCohort")
+        auto_cohort = cohorts.get_cohort_by_name(course.id, "AutoGroup")
+        cohorted_user, preassigned_user, random_user = UserFactory.create_batch(3)
+        cohorts.add_user_to_cohort(manual_cohort, cohorted_user)
+        UnregisteredLearnerCohortAssignments.objects.create(
+            course_user_group=manual_cohort, email=preassigned_user.email, course_id=course.id
+        )
+
+        self.assertEqual(
+            cohorts.bulk_assign_cohorts(course.id, [cohorted_user, preassigned_user, random_user]),
+            {
+                cohorted_user.id: manual_cohort,
+                preassigned_user.id: manual_cohort,
+                random_user.id: auto_cohort,
+            }
+        )
+        self.assertEqual(cohorts.get_cohort(preassigned_user, course.id), manual_cohort)
+        self.assertEqual(cohorts.get_cohort(random_user, course.id), auto_cohort)
+        self.assertFalse(
+            UnregisteredLearnerCohortAssignments.objects.filter(course_id=course.id).exists()
+        )
+
+    def test_bulk_assign_cohorts_default_cohort(self):
+        """
+        Make sure cohorts.bulk_assign_cohorts() creates the default cohort once when
+        there are no random cohorts in the course.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        users = UserFactory.create_batch(3)
+
+        assigned_cohorts = cohorts.bulk_assign_cohorts(course.id, users)
+
+        self.assertEqual({cohort.name for cohort in assigned_cohorts.values()}, {cohorts.DEFAULT_COHORT_NAME})
+        self.assertEqual(len(cohorts.get_course_cohorts(course)), 1)
+
+    def test_bulk_assign_cohorts_not_cohorted(self):
+        """
+        Make sure cohorts.bulk_assign_cohorts() does not assign cohorts in a course
+        that is not cohorted.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        user = UserFactory()
+
+        self.assertEqual(cohorts.bulk_assign_cohorts(course.id, [user]), {user.id: None})
+        self.assertEqual(cohorts.get_course_cohorts(course), [])
+
     def test_set_cohorted_with_invalid_data_type(self):
         """
         Test that cohorts.set_course_cohorted raises exception if argument is not a boolean.
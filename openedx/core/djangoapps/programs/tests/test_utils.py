@@ -12,6 +12,7 @@ import mock
 import six
 from six.moves import range
 from django.conf import settings
+from django.core.cache import cache
 from django.test import TestCase
 from django.test.utils import override_settings
 from django.urls import reverse
@@ -26,6 +27,13 @@ from lms.djangoapps.certificates.tests.factories import GeneratedCertificateFact
 from lms.djangoapps.commerce.tests.test_utils import update_commerce_config
 from lms.djangoapps.commerce.utils import EcommerceService
 from lms.djangoapps.grades.tests.utils import mock_passing_grade
+from openedx.core.djangoapps.catalog import snapshot as catalog_snapshot
+from openedx.core.djangoapps.catalog.cache import (
+    PROGRAM_CACHE_KEY_TPL,
+    PROGRAMS_SNAPSHOT_INDEX_CACHE_KEY,
+    PROGRAMS_SNAPSHOT_VERSION_CACHE_KEY
+)
+from openedx.core.djangoapps.catalog.snapshot import ProgramsSnapshot
 from openedx.core.djangoapps.catalog.tests.factories import (
     CourseFactory,
     CourseRunFactory,
@@ -34,6 +42,7 @@ from openedx.core.djangoapps.catalog.tests.factories import (
     SeatFactory,
     generate_course_run_key
 )
+from openedx.core.djangoapps.catalog.utils import get_programs
 from openedx.core.djangoapps.programs import ALWAYS_CALCULATE_PROGRAM_PRICE_AS_ANONYMOUS_USER
 from openedx.core.djangoapps.programs.tests.factories import ProgressFactory
 from openedx.core.djangoapps.programs.utils import (
@@ -611,6 +620,66 @@ class TestProgramProgressMeter(TestCase):
         )
         self.assertEqual(list(meter.completed_programs_with_available_dates.keys()), [program_uuid])
 
+    def test_programs_snapshot(self, mock_get_programs):
+        """
+        Verify that the engaged programs and their progress are computed from
+        the indexes of the programs snapshot, reading only the engaged programs.
+        """
+        newer_course_run_key, older_course_run_key = (generate_course_run_key() for __ in range(2))
+        data = [
+            ProgramFactory(
+                courses=[
+                    CourseFactory(course_runs=[
+                        CourseRunFactory(key=newer_course_run_key, type='honor'),
+                    ]),
+                    CourseFactory(),
+                ]
+            ),
+            ProgramFactory(
+                courses=[
+                    CourseFactory(course_runs=[
+                        CourseRunFactory(key=older_course_run_key),
+                    ]),
+                ]
+            ),
+            ProgramFactory(),
+        ]
+        snapshot = ProgramsSnapshot(
+            {
+                'version': '1',
+                'sites': {
+                    self.site.domain: {
+                        'id': self.site.id,
+                        'program_uuids': [program['uuid'] for program in data],
+                        'pathway_ids': [],
+                    },
+                },
+            },
+            {program['uuid']: program for program in data},
+            {},
+        )
+        mock_get_programs.side_effect = lambda uuids: [program for program in data if program['uuid'] in uuids]
+
+        self._create_enrollments(older_course_run_key, newer_course_run_key)
+        self._create_certificates(newer_course_run_key)
+        with mock.patch(UTILS_MODULE + '.get_programs_snapshot', return_value=snapshot):
+            meter = ProgramProgressMeter(self.site, self.user)
+
+        self._attach_detail_url(data)
+        programs = data[:2]
+        self.assertEqual(meter.engaged_programs, programs)
+        six.assertCountEqual(self, mock_get_programs.call_args[1]['uuids'], [program['uuid'] for program in programs])
+
+        grades = {
+            newer_course_run_key: 0.0,
+            older_course_run_key: 0.0,
+        }
+        self._assert_progress(
+            meter,
+            ProgressFactory(uuid=data[0]['uuid'], completed=1, not_started=1, grades=grades),
+            ProgressFactory(uuid=data[1]['uuid'], in_progress=1, grades=grades),
+        )
+
     @mock.patch(UTILS_MODULE + '.available_date_for_certificate')
     def test_completed_programs_with_available_dates(self, mock_available_date_for_certificate, mock_get_programs):
         # First we want to set up the scenario:
@@ -947,6 +1016,35 @@ class TestProgramDataExtender(ModuleStoreTestCase):
 
         self._assert_supplemented(data, is_enrolled=True, upgrade_url=None)
 
+    @override_settings(CATALOG_PROGRAMS_SNAPSHOT_REFRESH_INTERVAL=60)
+    def test_extend_snapshot_program(self):
+        """
+        Verify that extending a program read from the programs snapshot for
+        one user doesn't leak into the program extended for another user.
+        """
+        site = SiteFactory()
+        cache.set(PROGRAM_CACHE_KEY_TPL.format(uuid=self.program['uuid']), self.program, None)
+        cache.set(PROGRAMS_SNAPSHOT_INDEX_CACHE_KEY, {
+            'version': '1',
+            'sites': {
+                site.domain: {'id': site.id, 'program_uuids': [self.program['uuid']], 'pathway_ids': []},
+            },
+        }, None)
+        cache.set(PROGRAMS_SNAPSHOT_VERSION_CACHE_KEY, '1', None)
+
+        CourseEnrollmentFactory(user=self.user, course_id=self.course.id, mode=MODES.audit)
+        other_user = UserFactory()
+
+        holder = catalog_snapshot._ProgramsSnapshotHolder()  # pylint: disable=protected-access
+        with mock.patch.object(catalog_snapshot, '_holder', holder):
+            data = ProgramDataExtender(get_programs(uuid=self.program['uuid']), self.user).extend()
+            self._assert_supplemented(data, is_enrolled=True)
+
+            data = ProgramDataExtender(get_programs(uuid=self.program['uuid']), other_user).extend()
+            self._assert_supplemented(data)
+
+            self.assertEqual(get_programs(uuid=self.program['uuid']), self.program)
+
     @ddt.data(
         (1, 1, False),
         (1, -1, True),
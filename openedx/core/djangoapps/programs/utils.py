@@ -27,6 +27,7 @@ from lms.djangoapps.certificates import api as certificate_api
 from lms.djangoapps.certificates.models import GeneratedCertificate
 from lms.djangoapps.commerce.utils import EcommerceService
 from lms.djangoapps.grades.api import CourseGradeFactory
+from openedx.core.djangoapps.catalog.snapshot import get_programs_snapshot
 from openedx.core.djangoapps.catalog.utils import get_fulfillable_course_runs_for_entitlement, get_programs
 from openedx.core.djangoapps.certificates.api import available_date_for_certificate
 from openedx.core.djangoapps.commerce.utils import ecommerce_api_client
@@ -90,10 +91,16 @@ class ProgramProgressMeter(object):
         uuid (str): UUID identifying a specific program. If provided, the meter
             will only inspect this one program, not all programs the user may be
             engaged with.
+
+    When the programs snapshot is available, the programs the user is engaged
+    with are found with its indexes of the course runs and courses of the
+    programs of the site, rather than by walking all the programs, see
+    ProgramsSnapshot.
     """
     def __init__(self, site, user, enrollments=None, uuid=None, mobile_only=False):
         self.site = site
         self.user = user
+        self.uuid = uuid
         self.mobile_only = mobile_only
 
         self.enrollments = enrollments or list(CourseEnrollment.enrollments_for_user(self.user))
@@ -115,11 +122,16 @@ class ProgramProgressMeter(object):
         self.course_uuids = [str(entitlement.course_uuid) for entitlement in self.entitlements]
 
         self.course_grade_factory = CourseGradeFactory()
+        self.programs_snapshot = get_programs_snapshot()
 
-        if uuid:
-            self.programs = [get_programs(uuid=uuid)]
-        else:
-            self.programs = attach_program_detail_url(get_programs(self.site), self.mobile_only)
+    @cached_property
+    def programs(self):
+        """
+        The program inspected by the meter, or all the programs of the site.
+        """
+        if self.uuid:
+            return [get_programs(uuid=self.uuid)]
+        return attach_program_detail_url(get_programs(self.site), self.mobile_only)
 
     def invert_programs(self):
         """Intersect programs and enrollments.
@@ -131,6 +143,53 @@ class ProgramProgressMeter(object):
         Returns:
             defaultdict, programs keyed by course run ID
         """
+        if self.programs_snapshot is not None and not self.uuid:
+            inverted_programs = self._invert_programs_with_snapshot()
+        else:
+            inverted_programs = self._invert_programs()
+
+        # Sort programs by title for consistent presentation.
+        for program_list in six.itervalues(inverted_programs):
+            program_list.sort(key=lambda p: p['title'])
+
+        return inverted_programs
+
+    def _invert_programs_with_snapshot(self):
+        """
+        Intersects the course runs and courses of the user's enrollments and
+        entitlements with the indexes of the programs of the site, and reads
+        only the programs that the user is engaged with.
+        """
+        domain = self.site.domain
+        course_run_program_uuids = self.programs_snapshot.site_course_run_program_uuids.get(domain, {})
+        catalog_course_program_uuids = self.programs_snapshot.site_catalog_course_program_uuids.get(domain, {})
+
+        program_uuids_by_key = {}
+        for course_run_id in self.course_run_ids:
+            if course_run_id in course_run_program_uuids:
+                program_uuids_by_key[course_run_id] = course_run_program_uuids[course_run_id]
+        for course_uuid in self.course_uuids:
+            if course_uuid in catalog_course_program_uuids:
+                program_uuids_by_key[course_uuid] = catalog_course_program_uuids[course_uuid]
+
+        engaged_program_uuids = set().union(*six.itervalues(program_uuids_by_key))
+        programs = {
+            program['uuid']: program
+            for program in attach_program_detail_url(get_programs(uuids=list(engaged_program_uuids)), self.mobile_only)
+        }
+
+        inverted_programs = defaultdict(list)
+        for key, program_uuids in six.iteritems(program_uuids_by_key):
+            program_list = [programs[uuid] for uuid in program_uuids if uuid in programs]
+            if program_list:
+                inverted_programs[key] = program_list
+        return inverted_programs
+
+    def _invert_programs(self):
+        """
+        Walks the courses and course runs of all the programs to find those
+        that the user is engaged with.
+        """
         inverted_programs = defaultdict(list)
 
         for program in self.programs:
@@ -147,10 +206,6 @@ class ProgramProgressMeter(object):
                         if program not in program_list:
                             program_list.append(program)
 
-        # Sort programs by title for consistent presentation.
-        for program_list in six.itervalues(inverted_programs):
-            program_list.sort(key=lambda p: p['title'])
-
         return inverted_programs
 
     @cached_property
@@ -194,7 +249,7 @@ class ProgramProgressMeter(object):
         Returns:
             bool, indicating whether the course is in progress.
         """
-        enrolled_runs = [run for run in course['course_runs'] if run['key'] in self.course_run_ids]
+        enrolled_runs = [run for run in course['course_runs'] if run['key'] in self.enrolled_run_modes]
 
         # Check if the user is enrolled in a required run and mode/seat.
         runs_with_required_mode = [
@@ -241,13 +296,11 @@ class ProgramProgressMeter(object):
             completed, in_progress, not_started = [], [], []
 
             for course in program_copy['courses']:
-                active_entitlement = CourseEntitlement.get_entitlement_if_active(
-                    user=self.user,
-                    course_uuid=course['uuid']
-                )
-                if self._is_course_complete(course):
+                course_run_keys = self._course_run_keys(program_copy['uuid'], course)
+                active_entitlement = self.active_entitlements.get(course['uuid'])
+                if self._is_course_complete(course, course_run_keys):
                     completed.append(course)
-                elif self._is_course_enrolled(course) or active_entitlement:
+                elif self._is_course_enrolled(course, course_run_keys) or active_entitlement:
                     # Show all currently enrolled courses and active entitlements as in progress
                     if active_entitlement:
                         course['course_runs'] = get_fulfillable_course_runs_for_entitlement(
@@ -270,21 +323,53 @@ class ProgramProgressMeter(object):
                 else:
                     not_started.append(course)
 
-            grades = {}
-            for run in self.course_run_ids:
-                grade = self.course_grade_factory.read(self.user, course_key=CourseKey.from_string(run))
-                grades[run] = grade.percent
-
             progress.append({
                 'uuid': program_copy['uuid'],
                 'completed': len(completed) if count_only else completed,
                 'in_progress': len(in_progress) if count_only else in_progress,
                 'not_started': len(not_started) if count_only else not_started,
-                'grades': grades,
+                'grades': dict(self.grades),
             })
 
         return progress
 
+    @cached_property
+    def grades(self):
+        """
+        The user's grade percent in each of the course runs they're enrolled in,
+        read once for all the programs.
+
+        Returns:
+            dict, grade percents keyed by course run ID
+        """
+        grades = {}
+        for run in self.course_run_ids:
+            grade = self.course_grade_factory.read(self.user, course_key=CourseKey.from_string(run))
+            grades[run] = grade.percent
+        return grades
+
+    @cached_property
+    def active_entitlements(self):
+        """
+        The user's active entitlements, read with a single query.
+
+        Returns:
+            dict, the most recently created active entitlement keyed by course UUID
+        """
+        entitlements = CourseEntitlement.get_active_entitlements_for_user(self.user).order_by('created')
+        return {str(entitlement.course_uuid): entitlement for entitlement in entitlements}
+
+    def _course_run_keys(self, program_uuid, course):
+        """
+        Returns the set of the keys of the runs of the given course of the program,
+        from the programs snapshot if available.
+        """
+        if self.programs_snapshot is not None:
+            course_run_keys = self.programs_snapshot.program_course_run_keys.get(program_uuid, {}).get(course['uuid'])
+            if course_run_keys is not None:
+                return course_run_keys
+        return frozenset(course_run['key'] for course_run in course['course_runs'])
+
     @property
     def completed_programs_with_available_dates(self):
         """
@@ -372,7 +457,7 @@ class ProgramProgressMeter(object):
         }
         return mappings.get(certificate_mode, certificate_mode)
 
-    def _is_course_complete(self, course):
+    def _is_course_complete(self, course, course_run_keys=None):
         """Check if a user has completed a course.
 
         A course is completed if the user has earned a certificate for any of
@@ -380,29 +465,27 @@ class ProgramProgressMeter(object):
 
         Arguments:
             course (dict): Containing nested course runs.
+            course_run_keys (set): The keys of the nested course runs, if known.
 
         Returns:
             bool, indicating whether the course is complete.
         """
-
-        def reshape(course_run):
-            """
-            Modify the structure of a course run dict to facilitate comparison
-            with course run certificates.
-            """
-            return {
-                'course_run_id': course_run['key'],
-                # A course run's type is assumed to indicate which mode must be
-                # completed in order for the run to count towards program completion.
-                # This supports the same flexible program construction allowed by the
-                # old programs service (e.g., completion of an old honor-only run may
-                # count towards completion of a course in a program). This may change
-                # in the future to make use of the more rigid set of "applicable seat
-                # types" associated with each program type in the catalog.
-                'type': self._course_run_mode_translation(course_run['type']),
-            }
-
-        return any(reshape(course_run) in self.completed_course_runs for course_run in course['course_runs'])
+        completed_course_run_modes = self.completed_course_run_modes
+        if course_run_keys is not None and course_run_keys.isdisjoint(completed_course_run_modes):
+            return False
+
+        # A course run's type is assumed to indicate which mode must be
+        # completed in order for the run to count towards program completion.
+        # This supports the same flexible program construction allowed by the
+        # old programs service (e.g., completion of an old honor-only run may
+        # count towards completion of a course in a program). This may change
+        # in the future to make use of the more rigid set of "applicable seat
+        # types" associated with each program type in the catalog.
+        for course_run in course['course_runs']:
+            completed_modes = completed_course_run_modes.get(course_run['key'], ())
+            if self._course_run_mode_translation(course_run['type']) in completed_modes:
+                return True
+        return False
 
     @cached_property
     def completed_course_runs(self):
@@ -414,6 +497,19 @@ class ProgramProgressMeter(object):
         """
         return self.course_runs_with_state['completed']
 
+    @cached_property
+    def completed_course_run_modes(self):
+        """
+        Determine the modes in which each course run has been completed by the user.
+
+        Returns:
+            dict, sets of certificate modes keyed by course run ID
+        """
+        completed_course_run_modes = defaultdict(set)
+        for course_run in self.completed_course_runs:
+            completed_course_run_modes[course_run['course_run_id']].add(course_run['type'])
+        return dict(completed_course_run_modes)
+
     @cached_property
     def failed_course_runs(self):
         """
@@ -448,7 +544,7 @@ class ProgramProgressMeter(object):
 
         return {'completed': completed_runs, 'failed': failed_runs}
 
-    def _is_course_enrolled(self, course):
+    def _is_course_enrolled(self, course, course_run_keys=None):
         """Check if a user is enrolled in a course.
 
         A user is considered to be enrolled in a course if
@@ -456,11 +552,14 @@ class ProgramProgressMeter(object):
 
         Arguments:
             course (dict): Containing nested course runs.
+            course_run_keys (set): The keys of the nested course runs, if known.
 
         Returns:
             bool, indicating whether the course is in progress.
         """
-        return any(course_run['key'] in self.course_run_ids for course_run in course['course_runs'])
+        if course_run_keys is None:
+            course_run_keys = [course_run['key'] for course_run in course['course_runs']]
+        return any(course_run_key in self.enrolled_run_modes for course_run_key in course_run_keys)
 
 
 # pylint: disable=missing-docstring
@@ -500,6 +599,12 @@ class ProgramDataExtender(object):
 
     def _extend_course_runs(self):
         """Execute course run data handlers."""
+        # Load the overviews of all the course runs of the program at once.
+        course_overviews = CourseOverview.get_prefetched_from_ids([
+            CourseKey.from_string(course_run['key'])
+            for course in self.data['courses']
+            for course_run in course['course_runs']
+        ])
         for course in self.data['courses']:
             for course_run in course['course_runs']:
                 # State to be shared across handlers.
@@ -507,9 +612,8 @@ class ProgramDataExtender(object):
 
                 # Some (old) course runs may exist for a program which do not exist in LMS. In that case,
                 # continue without the course run.
-                try:
-                    self.course_overview = CourseOverview.get_from_id(self.course_run_key)
-                except CourseOverview.DoesNotExist:
+                self.course_overview = course_overviews.get(self.course_run_key)
+                if self.course_overview is None:
                     log.warning(u'Failed to get course overview for course run key: %s', course_run.get('key'))
                 else:
                     self.enrollment_start = self.course_overview.enrollment_start or DEFAULT_ENROLLMENT_START_DATE
@@ -7,6 +7,7 @@ import pytz
 from django.db.models import F, Subquery
 from django.db.models.functions import Greatest
 
+from lms.djangoapps.course_blocks.api import invalidate_user_course_blocks
 from openedx.core.djangoapps.schedules.models import Schedule
 from student.models import CourseEnrollment
 
@@ -70,3 +71,7 @@ def reset_self_paced_schedule(user, course_key, use_availability_date=False):
         schedule.update(start_date=Subquery(enrollments.values('availability')[:1]))
     else:
         schedule.update(start_date=datetime.datetime.now(pytz.utc))
+
+    # The schedule is updated in bulk, without sending the signals that
+    # invalidate the user's cached course blocks.
+    invalidate_user_course_blocks(course_key, user.id)
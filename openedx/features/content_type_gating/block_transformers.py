@@ -35,6 +35,18 @@ class ContentTypeGateTransformer(BlockStructureTransformer):
         """
         block_structure.request_xblock_fields('group_access', 'graded', 'has_score', 'weight')
 
+    def transform_fingerprint(self, usage_info):
+        # Content type gating is determined by the user's enrollment,
+        # part of the user's fingerprint, and by the gating configuration,
+        # which is read here so that configuration changes take effect.
+        return u'{}.{}'.format(
+            usage_info.user_fingerprint,
+            int(bool(ContentTypeGatingConfig.enabled_for_enrollment(
+                user=usage_info.user,
+                course_key=usage_info.course_key,
+            ))),
+        )
+
     def transform(self, usage_info, block_structure):
         if not ContentTypeGatingConfig.enabled_for_enrollment(
             user=usage_info.user,